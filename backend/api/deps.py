@@ -28,6 +28,20 @@ def get_retriever(request: Request):
     return request.app.state.retriever
 
 
+def get_ready_retriever(request: Request):
+    """The retriever once startup warm-up has finished; 503 before that (FAST_BOOT)."""
+    state = request.app.state
+    retriever = getattr(state, "retriever", None)
+    if not getattr(state, "ready", False) or retriever is None:
+        phase = (getattr(state, "warmup", None) or {}).get("phase", "starting")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Retriever not initialized (warm-up: {phase})",
+            headers={"Retry-After": "5"},
+        )
+    return retriever
+
+
 def get_session_store(request: Request):
     return request.app.state.session_store
 
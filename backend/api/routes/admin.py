@@ -9,7 +9,7 @@ import os
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import Annotated, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
@@ -20,7 +20,7 @@ _ROOT = Path(__file__).parent.parent.parent.parent
 if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
 
-from backend.api.deps import get_admin_user, get_retriever, _secret, _ALGORITHM
+from backend.api.deps import get_admin_user, get_ready_retriever, get_retriever, _secret, _ALGORITHM
 from backend.core import google_db as _google_db
 from config.settings import get_settings
 
@@ -185,158 +185,126 @@ async def get_query_logs(
         raise HTTPException(status_code=503, detail=f"Query logs unavailable: {exc}")
 
 
-@router.get("/export/queries/excel")
-async def export_queries_excel(
-    _: Annotated[str, Depends(get_admin_user)],
-    date_from: Optional[str] = None,
-    date_to: Optional[str] = None,
-):
-    """Export all query logs as an Excel file."""
-    import io
-    from datetime import date, datetime
-    from fastapi.responses import StreamingResponse
-    import openpyxl
-    from openpyxl.styles import Font
-    from openpyxl.utils import get_column_letter
+_XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
-    try:
-        records = _google_db.export_all_query_logs(date_from=date_from, date_to=date_to)
-    except Exception as exc:
-        raise HTTPException(status_code=503, detail=f"Export failed: {exc}")
+_QUERY_EXPORT_HEADERS = [
+    "Time", "User Email", "Query", "Model", "Input Tokens", "Output Tokens", "Cost (USD)", "Feedback",
+]
+_USER_EXPORT_HEADERS = [
+    "Name", "Email", "First Seen", "Last Seen", "Total Queries",
+    "Admin", "Disabled", "Daily Limit", "Used Today", "Daily Resets At",
+    "Monthly Limit", "Monthly Used", "Quota Reset Date",
+]
 
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Query Logs"
-
-    headers = ["Time", "User Email", "Query", "Model", "Input Tokens", "Output Tokens", "Cost (USD)", "Feedback"]
-    ws.append(headers)
-    for cell in ws[1]:
-        cell.font = Font(bold=True)
-
-    for r in records:
-        created_at = r.get("created_at", "")
-        try:
-            dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-            created_at = dt.strftime("%Y-%m-%d %H:%M:%S")
-        except Exception:
-            pass
-        fb_rating = r.get("feedback_rating")
-        fb_comment = (r.get("feedback_comment") or "").strip()
-        if fb_rating == 1:
-            feedback_val = "Positive"
-        elif fb_rating == -1:
-            feedback_val = f"Negative: {fb_comment}" if fb_comment else "Negative"
-        else:
-            feedback_val = ""
-        ws.append([
-            created_at,
-            r.get("email", ""),
-            r.get("query_text", ""),
-            r.get("llm_model", ""),
-            r.get("input_tokens", 0),
-            r.get("output_tokens", 0),
-            round(float(r.get("cost_usd") or 0), 2),
-            feedback_val,
-        ])
-
-    for col_idx in range(1, len(headers) + 1):
-        col_letter = get_column_letter(col_idx)
-        max_len = max(
-            (len(str(ws.cell(row=row, column=col_idx).value or "")) for row in range(1, ws.max_row + 1)),
-            default=10,
-        )
-        ws.column_dimensions[col_letter].width = min(max_len + 4, 80)
 
-    buf = io.BytesIO()
-    wb.save(buf)
-    buf.seek(0)
+def _fmt_export_ts(val: object) -> str:
+    if not val:
+        return ""
+    try:
+        if hasattr(val, "strftime"):
+            return val.strftime("%Y-%m-%d %H:%M:%S")
+        dt = datetime.fromisoformat(str(val).replace("Z", "+00:00"))
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return str(val)
+
+
+def _query_export_row(r: dict) -> list:
+    fb_rating = r.get("feedback_rating")
+    fb_comment = (r.get("feedback_comment") or "").strip()
+    if fb_rating == 1:
+        feedback_val = "Positive"
+    elif fb_rating == -1:
+        feedback_val = f"Negative: {fb_comment}" if fb_comment else "Negative"
+    else:
+        feedback_val = ""
+    return [
+        _fmt_export_ts(r.get("created_at", "")),
+        r.get("email", ""),
+        r.get("query_text", ""),
+        r.get("llm_model", ""),
+        r.get("input_tokens", 0),
+        r.get("output_tokens", 0),
+        round(float(r.get("cost_usd") or 0), 2),
+        feedback_val,
+    ]
 
-    filename = f"rovr-queries-{date.today().isoformat()}.xlsx"
-    return StreamingResponse(
-        buf,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
 
+def _user_export_row(r: dict) -> list:
+    monthly_limit = r.get("monthly_query_limit")
+    monthly_display = "Unlimited" if monthly_limit is not None and monthly_limit >= 999999 else monthly_limit
+    return [
+        r.get("name", ""),
+        r.get("email", ""),
+        _fmt_export_ts(r.get("first_seen")),
+        _fmt_export_ts(r.get("last_seen")),
+        r.get("total_queries", 0),
+        "Yes" if r.get("is_admin") else "No",
+        "Yes" if r.get("is_disabled") else "No",
+        r.get("daily_query_limit", _google_db.DEFAULT_DAILY_QUERY_LIMIT),
+        r.get("daily_query_count", 0),
+        _fmt_export_ts(r.get("daily_reset_at")),
+        monthly_display,
+        r.get("monthly_queries_used", 0),
+        _fmt_export_ts(r.get("quota_reset_date")),
+    ]
 
-@router.get("/export/users/excel")
-async def export_users_excel(
-    _: Annotated[str, Depends(get_admin_user)],
-    search: Optional[str] = None,
-):
-    """Export all Google OAuth users as an Excel file."""
-    import io
-    from datetime import date, datetime
+
+async def _export_response(records, to_row, headers: list[str], fmt: str, title: str, basename: str):
+    """
+    Stream `records` (a DB row iterator) as .xlsx or .csv. The first row is
+    fetched here, so a database failure is still a 503 rather than a broken
+    download; the rest is pulled by StreamingResponse on a worker thread.
+    """
+    import asyncio
+    from datetime import date
     from fastapi.responses import StreamingResponse
-    import openpyxl
-    from openpyxl.styles import Font
-    from openpyxl.utils import get_column_letter
+    from backend.core import export_stream
 
     try:
-        records = _google_db.export_all_users(search=search or "")
+        _, records = await asyncio.to_thread(export_stream.peek, records, 1)
     except Exception as exc:
         raise HTTPException(status_code=503, detail=f"Export failed: {exc}")
 
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Users"
+    rows = (to_row(r) for r in records)
+    filename = f"{basename}-{date.today().isoformat()}.{fmt}"
+    if fmt == "csv":
+        body, media_type = export_stream.csv_chunks(headers, rows), "text/csv; charset=utf-8"
+    else:
+        body, media_type = export_stream.xlsx_chunks(title, headers, rows), _XLSX_MEDIA_TYPE
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
-    headers = [
-        "Name", "Email", "First Seen", "Last Seen", "Total Queries",
-        "Admin", "Disabled", "Daily Limit", "Used Today", "Daily Resets At",
-        "Monthly Limit", "Monthly Used", "Quota Reset Date",
-    ]
-    ws.append(headers)
-    for cell in ws[1]:
-        cell.font = Font(bold=True)
-
-    def _fmt_ts(val: object) -> str:
-        if not val:
-            return ""
-        try:
-            if hasattr(val, "strftime"):
-                return val.strftime("%Y-%m-%d %H:%M:%S")
-            dt = datetime.fromisoformat(str(val).replace("Z", "+00:00"))
-            return dt.strftime("%Y-%m-%d %H:%M:%S")
-        except Exception:
-            return str(val)
-
-    for r in records:
-        monthly_limit = r.get("monthly_query_limit")
-        monthly_display = "Unlimited" if monthly_limit is not None and monthly_limit >= 999999 else monthly_limit
-        ws.append([
-            r.get("name", ""),
-            r.get("email", ""),
-            _fmt_ts(r.get("first_seen")),
-            _fmt_ts(r.get("last_seen")),
-            r.get("total_queries", 0),
-            "Yes" if r.get("is_admin") else "No",
-            "Yes" if r.get("is_disabled") else "No",
-            r.get("daily_query_limit", _google_db.DEFAULT_DAILY_QUERY_LIMIT),
-            r.get("daily_query_count", 0),
-            _fmt_ts(r.get("daily_reset_at")),
-            monthly_display,
-            r.get("monthly_queries_used", 0),
-            _fmt_ts(r.get("quota_reset_date")),
-        ])
-
-    for col_idx in range(1, len(headers) + 1):
-        col_letter = get_column_letter(col_idx)
-        max_len = max(
-            (len(str(ws.cell(row=row, column=col_idx).value or "")) for row in range(1, ws.max_row + 1)),
-            default=10,
-        )
-        ws.column_dimensions[col_letter].width = min(max_len + 4, 80)
 
-    buf = io.BytesIO()
-    wb.save(buf)
-    buf.seek(0)
+@router.get("/export/queries/{fmt}")
+async def export_queries(
+    fmt: Literal["excel", "csv"],
+    _: Annotated[str, Depends(get_admin_user)],
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+):
+    """Export all query logs as an Excel or CSV file."""
+    return await _export_response(
+        _google_db.iter_query_logs_for_export(date_from=date_from, date_to=date_to),
+        _query_export_row, _QUERY_EXPORT_HEADERS,
+        "csv" if fmt == "csv" else "xlsx", "Query Logs", "rovr-queries",
+    )
 
-    filename = f"rovr-users-{date.today().isoformat()}.xlsx"
-    return StreamingResponse(
-        buf,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+
+@router.get("/export/users/{fmt}")
+async def export_users(
+    fmt: Literal["excel", "csv"],
+    _: Annotated[str, Depends(get_admin_user)],
+    search: Optional[str] = None,
+):
+    """Export all Google OAuth users as an Excel or CSV file."""
+    return await _export_response(
+        _google_db.iter_users_for_export(search=search or ""),
+        _user_export_row, _USER_EXPORT_HEADERS,
+        "csv" if fmt == "csv" else "xlsx", "Users", "rovr-users",
     )
 
 
@@ -365,9 +333,13 @@ async def refresh_status(request: Request, _: Annotated[str, Depends(get_admin_u
 
 
 @router.post("/refresh/start")
-async def refresh_start(_: Annotated[str, Depends(get_admin_user)], force: bool = False):
+async def refresh_start(
+    _: Annotated[str, Depends(get_admin_user)],
+    force: bool = False,
+    resume: bool = False,
+):
     from backend.core.refresh_pipeline import trigger_refresh
-    return trigger_refresh(force=force)
+    return trigger_refresh(force=force, resume=resume)
 
 
 @router.post("/refresh/trigger-actions")
@@ -456,11 +428,32 @@ async def demo_status_admin(_: Annotated[str, Depends(get_admin_user)]):
 
 # ── System status ─────────────────────────────────────────────────────────────
 
+async def _session_store_health(store) -> dict:
+    import asyncio
+
+    try:
+        stats = await asyncio.to_thread(store.stats)
+        return {"healthy": True, "active_sessions": stats["sessions"], **stats}
+    except Exception as exc:
+        return {"healthy": False, "error": str(exc)}
+
+
+def _speculative_routing_health() -> dict:
+    from backend.core import speculative_routing
+
+    info = {"healthy": True, "enabled": get_settings().speculative_routing_enabled, **speculative_routing.stats()}
+    try:
+        info["budget_used_today"] = _google_db.get_daily_budget_used(speculative_routing.BUDGET_KEY)
+    except Exception:
+        pass
+    return info
+
+
 @router.get("/status")
 async def system_status(request: Request, _: Annotated[str, Depends(get_admin_user)]):
-    retriever = get_retriever(request)
+    retriever = get_ready_retriever(request)
     chroma_stats = retriever.collection_stats()
-    product_breakdown = retriever.product_breakdown()
+    corpus = retriever.corpus_stats()
 
     bedrock_ok = True
     try:
@@ -473,37 +466,107 @@ async def system_status(request: Request, _: Annotated[str, Depends(get_admin_us
     from backend.core.refresh_pipeline import get_status as get_refresh_status
     rs = get_refresh_status()
     kb_refresh = get_knowledge_base_last_refreshed()
-    total_pages = sum(int(row.get("pages") or 0) for row in product_breakdown)
 
     return {
         "components": {
             "chromadb": {"healthy": True, **chroma_stats},
             "bedrock": {"healthy": bedrock_ok},
-            "session_store": {
-                "healthy": True,
-                "active_sessions": len(request.app.state.session_store.list_sessions()),
-            },
+            "session_store": await _session_store_health(request.app.state.session_store),
+            "speculative_routing": _speculative_routing_health(),
         },
         "environment": os.getenv("ENVIRONMENT", "development"),
         "knowledge_base": {
             "last_refreshed": kb_refresh.get("last_refreshed") or rs.get("last_run"),
             "last_refreshed_source": kb_refresh.get("source"),
-            "total_pages": total_pages,
+            "total_pages": corpus["total_pages"],
             "total_chunks": chroma_stats.get("document_count", 0),
-            "product_breakdown": product_breakdown,
+            "product_breakdown": corpus["product_breakdown"],
+            "release_notes": corpus["release_notes"],
+            "metadata_coverage": corpus["metadata_coverage"],
+            "stats_built_at": corpus["built_at"],
         },
     }
 
 
+@router.get("/latency")
+async def latency(_: Annotated[str, Depends(get_admin_user)]):
+    """p50/p95/p99 per chat pipeline stage (backend/core/stage_timing.py)."""
+    from backend.core import stage_timing
+
+    return {"stages": stage_timing.snapshot()}
+
+
+class ProfileRequest(BaseModel):
+    seconds: float = 10.0
+    interval_ms: Optional[float] = None  # cpu only
+    include_idle: bool = False  # cpu only
+    top: int = 25  # memory only
+
+
+async def _run_profile(fn, *args, **kwargs):
+    import asyncio
+    from backend.core import profiler
+
+    try:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    except profiler.ProfilingDisabled as exc:
+        raise HTTPException(status_code=403, detail=str(exc))
+    except profiler.ProfilerBusy as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
+@router.get("/profile")
+async def profile_status(_: Annotated[str, Depends(get_admin_user)]):
+    from backend.core import profiler
+
+    return {"enabled": get_settings().profiling_enabled, "running": profiler.status()}
+
+
+@router.post("/profile/cpu")
+async def profile_cpu(body: ProfileRequest, _: Annotated[str, Depends(get_admin_user)]):
+    """
+    Sample this worker's Python stacks for `seconds` and download them as
+    collapsed stacks (flamegraph.pl / speedscope). Summary in X-Profile-* headers.
+    """
+    from datetime import datetime
+    from fastapi.responses import PlainTextResponse
+    from backend.core import profiler
+
+    result = await _run_profile(
+        profiler.cpu_profile, body.seconds, get_settings(),
+        interval_ms=body.interval_ms, include_idle=body.include_idle,
+    )
+    summary = result.summary()
+    filename = f"cpu-{os.getpid()}-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.folded"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    headers.update({f"X-Profile-{k.replace('_', '-').title()}": str(v) for k, v in summary.items()})
+    return PlainTextResponse(result.collapsed(), headers=headers)
+
+
+@router.post("/profile/memory")
+async def profile_memory(body: ProfileRequest, _: Annotated[str, Depends(get_admin_user)]):
+    """tracemalloc over `seconds`: top-N allocation sites by growth and by size."""
+    from backend.core import profiler
+
+    report = await _run_profile(profiler.memory_profile, body.seconds, get_settings(), top=body.top)
+    return {"pid": os.getpid(), **report}
+
+
+@router.delete("/profile")
+async def stop_profile(_: Annotated[str, Depends(get_admin_user)]):
+    """Stop the running profile early; its request returns what was collected."""
+    from backend.core import profiler
+
+    return {"stopped": profiler.stop()}
+
+
 @router.get("/readiness/cja")
 async def cja_readiness(request: Request, _: Annotated[str, Depends(get_admin_user)]):
     """Retrieval-only CJA smoke test — no LLM tokens."""
     from backend.core.cja_readiness import evaluate_cja_readiness
     from config.settings import get_settings
 
-    retriever = get_retriever(request)
-    if not retriever:
-        raise HTTPException(status_code=503, detail="Retriever not initialized")
+    retriever = get_ready_retriever(request)
     report = evaluate_cja_readiness(retriever, get_settings())
     status_code = 200 if report.passed else 422
     return JSONResponse(content=report.to_dict(), status_code=status_code)
@@ -585,13 +648,14 @@ async def apply_default_monthly_limit(_: Annotated[str, Depends(get_admin_user)]
 
 @router.get("/analytics")
 async def analytics(request: Request, _: Annotated[str, Depends(get_admin_user)]):
+    import asyncio
     from datetime import datetime, timezone
 
-    sessions = request.app.state.session_store.list_sessions()
-    total_turns = sum(
-        len(request.app.state.session_store.get_history(s)) // 2
-        for s in sessions
-    )
+    try:
+        store_stats = await asyncio.to_thread(request.app.state.session_store.stats)
+    except Exception:
+        store_stats = {"sessions": 0, "turns": 0}
+    total_turns = store_stats["turns"] // 2
     rate_limits: dict = {}
     usage_summary: dict = {}
     try:
@@ -602,11 +666,18 @@ async def analytics(request: Request, _: Annotated[str, Depends(get_admin_user)]
         usage_summary = _google_db.get_summary()
     except Exception:
         pass
+    usage_rollup: dict = {}
+    try:
+        usage_rollup = _google_db.get_usage_rollup(days=30)
+    except Exception:
+        pass
     return {
         "fetched_at": datetime.now(timezone.utc).isoformat(),
-        "active_sessions": len(sessions),
+        "active_sessions": store_stats["sessions"],
         "total_turns": total_turns,
         "rate_limits": rate_limits,
         "total_users": usage_summary.get("total_users"),
         "total_queries_all_time": usage_summary.get("total_queries_all_time"),
+        "usage_by_day": usage_rollup.get("by_day", []),
+        "usage_by_model": usage_rollup.get("by_model", []),
     }
@@ -5,6 +5,7 @@ Streams tokens + citations back to the client using Server-Sent Events.
 Usage tracking via google_db (total_queries counter on exl_users).
 """
 
+import asyncio
 import json
 import logging
 import sys
@@ -12,13 +13,13 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status as http_status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status as http_status
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sse_starlette.sse import EventSourceResponse
 
 from backend.api.deps import get_pipeline, get_session_store, get_site_user
-from backend.core import google_db
-from backend.core.llm_factory import get_messages_client
+from backend.core import follow_ups, google_db, history_window, landing_cache, stage_timing
 from backend.core.landing_questions import build_landing_payload, classify_solution
 from backend.core.rag_pipeline import RAGPipeline
 from backend.core.session_store import SessionStore
@@ -116,7 +117,7 @@ async def chat(
     user: Annotated[dict, Depends(get_site_user)],
 ):
     uid: Optional[str] = user.get("uid")
-    session_id = body.session_id or session_store.new_session()
+    session_id = body.session_id or await asyncio.to_thread(session_store.new_session)
 
     # Check daily rate limit BEFORE starting the SSE stream
     if uid:
@@ -177,10 +178,14 @@ async def chat(
         return EventSourceResponse(_non_english_gen())
 
     async def event_generator():
+        settings = get_settings()
+        turn = stage_timing.start_turn()
+        first_token = True
         full_response = ""
         last_citations: list = []
         last_evidence: Optional[dict] = None
         last_done: Optional[dict] = None
+        follow_ups_task: Optional[asyncio.Task] = None
 
         async for event in pipeline.stream(
             query=body.query,
@@ -189,6 +194,9 @@ async def chat(
             user_email=user.get("email"),
         ):
             if event["type"] == "token":
+                if first_token:
+                    stage_timing.record("first_token", turn.elapsed())
+                    first_token = False
                 full_response += event.get("content", "")
             elif event["type"] == "citations":
                 last_citations = event.get("citations", [])
@@ -197,12 +205,20 @@ async def chat(
             elif event["type"] == "done":
                 # Buffer the done event — augment it with usage info before yielding
                 last_done = event
+                # The answer is final: start follow-up suggestions now so the
+                # Haiku call overlaps the DB writes below.
+                if settings.follow_ups_enabled and event.get("model") != "none" and full_response.strip():
+                    follow_ups_task = asyncio.ensure_future(
+                        follow_ups.generate(body.query, full_response, settings)
+                    )
                 continue
             yield {"data": json.dumps(event)}
 
         # After the pipeline loop: augment done event with usage counts, then yield it
         if last_done is not None:
+            stage_timing.record("pipeline", turn.elapsed())
             if uid:
+                db_started = turn.elapsed()
                 try:
                     usage = google_db.increment_daily_count(uid)
                     last_done = {
@@ -238,40 +254,77 @@ async def chat(
                     )
                     google_db.append_conversation_message(
                         conversation_id, "assistant", full_response, citations=last_citations,
-                        slug=slug, is_published=bool(slug), evidence=last_evidence,
+                        slug=slug, is_published=bool(slug), evidence=last_evidence, query=body.query,
                     )
                     last_done = {**last_done, "conversation_id": conversation_id}
                 except Exception as e:
                     logger.warning(f"Conversation history persistence failed (non-fatal): {e}")
+                stage_timing.record("db_writes", turn.elapsed() - db_started)
+            if settings.stage_timings_in_done and pipeline._is_admin_request(user.get("email")):
+                last_done = {**last_done, "timings": {**turn.breakdown(), "total": round(turn.elapsed() * 1000, 1)}}
             yield {"data": json.dumps(last_done)}
 
         # After streaming: track usage + log query
         if uid and last_done:
             try:
-                google_db.increment_total_queries(uid)
-                google_db.touch_last_seen(uid)
-                google_db.log_query(
-                    user_id=uid,
-                    email=user.get("email", ""),
-                    query_text=body.query,
-                    llm_model=last_done.get("model", "unknown"),
-                    input_tokens=int(last_done.get("input_tokens", 0)),
-                    output_tokens=int(last_done.get("output_tokens", 0)),
-                    message_id=body.message_id or "",
-                )
+                with stage_timing.stage("usage_logging"):
+                    google_db.increment_total_queries(uid)
+                    google_db.touch_last_seen(uid)
+                    google_db.log_query(
+                        user_id=uid,
+                        email=user.get("email", ""),
+                        query_text=body.query,
+                        llm_model=last_done.get("model", "unknown"),
+                        input_tokens=int(last_done.get("input_tokens", 0)),
+                        output_tokens=int(last_done.get("output_tokens", 0)),
+                        message_id=body.message_id or "",
+                        cache_read_tokens=int(last_done.get("cache_read_tokens", 0)),
+                        cache_write_tokens=int(last_done.get("cache_write_tokens", 0)),
+                    )
             except Exception as e:
                 logger.warning(f"Usage tracking failed (non-fatal): {e}")
 
+        if follow_ups_task is not None:
+            try:
+                suggestions = await asyncio.wait_for(
+                    asyncio.shield(follow_ups_task), timeout=settings.follow_ups_timeout_s,
+                )
+            except asyncio.TimeoutError:
+                logger.info("Follow-ups not ready within %.1fs — skipped", settings.follow_ups_timeout_s)
+                suggestions = []
+            if suggestions:
+                yield {"data": json.dumps({"type": "follow_ups", "follow_ups": suggestions})}
+
     return EventSourceResponse(event_generator())
 
 
+# Published pages never change; let browsers revalidate after 5 minutes and a
+# CDN serve them for a day (and stale for a week while it revalidates).
+_LANDING_CACHE_CONTROL = "public, max-age=300, s-maxage=86400, stale-while-revalidate=604800"
+_LANDING_MISS_CACHE_CONTROL = "public, max-age=60, s-maxage=300"
+
+
 @router.get("/landing/{slug}")
-async def get_landing(slug: str):
+async def get_landing(slug: str, request: Request):
     """Public, unauthenticated SEO landing page for a single recorded query+answer."""
-    result = google_db.get_landing_by_slug(slug)
-    if not result:
-        raise HTTPException(status_code=http_status.HTTP_404_NOT_FOUND, detail="Not found")
-    return result
+    known, entry = landing_cache.lookup(slug)
+    if not known:
+        entry = await asyncio.to_thread(landing_cache.get, slug, google_db.get_landing_by_slug)
+    if entry is None:
+        raise HTTPException(
+            status_code=http_status.HTTP_404_NOT_FOUND, detail="Not found",
+            headers={"Cache-Control": _LANDING_MISS_CACHE_CONTROL},
+        )
+
+    headers = {"ETag": entry.etag, "Cache-Control": _LANDING_CACHE_CONTROL}
+    if entry.last_modified:
+        headers["Last-Modified"] = entry.last_modified
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and entry.etag in {t.strip() for t in if_none_match.split(",")}:
+        return Response(status_code=http_status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if not if_none_match and entry.last_modified and request.headers.get("if-modified-since") == entry.last_modified:
+        return Response(status_code=http_status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(content=entry.payload, headers=headers)
 
 
 @router.get("/chat/landing-questions")
@@ -290,7 +343,8 @@ async def get_history(
     session_id: str,
     session_store: Annotated[SessionStore, Depends(get_session_store)],
 ):
-    return {"session_id": session_id, "history": session_store.get_history(session_id)}
+    history = await asyncio.to_thread(session_store.get_history, session_id)
+    return {"session_id": session_id, "history": history}
 
 
 @router.delete("/chat/history/{session_id}")
@@ -298,7 +352,8 @@ async def clear_history(
     session_id: str,
     session_store: Annotated[SessionStore, Depends(get_session_store)],
 ):
-    session_store.clear(session_id)
+    await asyncio.to_thread(session_store.clear, session_id)
+    history_window.forget_session(session_id)
     return {"session_id": session_id, "cleared": True}
 
 
@@ -306,7 +361,7 @@ async def clear_history(
 async def new_session(
     session_store: Annotated[SessionStore, Depends(get_session_store)],
 ):
-    return {"session_id": session_store.new_session()}
+    return {"session_id": await asyncio.to_thread(session_store.new_session)}
 
 
 class FollowUpsRequest(BaseModel):
@@ -316,26 +371,9 @@ class FollowUpsRequest(BaseModel):
 
 @router.post("/chat/follow-ups")
 async def get_follow_ups(body: FollowUpsRequest, _user: Annotated[dict, Depends(get_site_user)]):
-    client = get_messages_client(get_settings())
-    prompt = (
-        f"Based on this question and answer, suggest exactly 3 concise follow-up questions "
-        f"a user might ask next. Return only the 3 questions as a JSON array of strings, "
-        f"nothing else.\n\nQuestion: {body.query}\n\nAnswer summary: {body.answer[:500]}"
-    )
-    try:
-        resp = await client.messages.create(
-            model="claude-haiku-4-5-20251001",
-            max_tokens=200,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        raw = resp.content[0].text.strip()
-        import re
-        match = re.search(r'\[.*?\]', raw, re.DOTALL)
-        follow_ups = json.loads(match.group()) if match else []
-        return {"follow_ups": follow_ups[:3]}
-    except Exception as e:
-        logger.warning(f"Follow-ups generation failed: {e}")
-        return {"follow_ups": []}
+    """Standalone follow-ups for clients that don't read the `follow_ups` SSE
+    event — served from the same cache the chat stream fills."""
+    return {"follow_ups": await follow_ups.generate(body.query, body.answer, get_settings())}
 
 
 class FeedbackRequest(BaseModel):
@@ -1,11 +1,17 @@
-"""Health check endpoint."""
+"""Health check, liveness/readiness and Prometheus metrics endpoints."""
 
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+import hmac
 
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from backend.core import stage_timing
 from backend.core.knowledge_bank_status import build_health_payload
+from config.settings import get_settings
 
 router = APIRouter()
+# Mounted at the root (/metrics), where scrapers expect it.
+metrics_router = APIRouter()
 
 
 @router.get("/health")
@@ -18,3 +24,40 @@ async def health(request: Request):
     else:
         status_code = 503
     return JSONResponse(content=payload, status_code=status_code)
+
+
+@router.get("/health/live")
+async def live(request: Request):
+    """Liveness: the process is up and serving (true during FAST_BOOT warm-up).
+
+    A background warm-up that failed will never become ready, so liveness
+    fails too and the platform restarts the instance.
+    """
+    warmup = getattr(request.app.state, "warmup", None) or {}
+    if warmup.get("phase") == "failed":
+        return JSONResponse(content={"status": "failed", "error": warmup.get("error")}, status_code=503)
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def ready(request: Request):
+    """Readiness: startup warm-up (DB, Chroma, BM25) has finished."""
+    warmup = getattr(request.app.state, "warmup", None) or {"phase": "starting"}
+    is_ready = bool(getattr(request.app.state, "ready", False))
+    payload = {"status": "ready" if is_ready else "warming", **warmup}
+    return JSONResponse(content=payload, status_code=200 if is_ready else 503)
+
+
+@metrics_router.get("/metrics")
+async def metrics(request: Request):
+    """Chat stage latency quantiles in Prometheus text format.
+
+    Off (404) unless METRICS_TOKEN is set; then it requires the bearer token.
+    """
+    token = get_settings().metrics_token
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+    if not hmac.compare_digest(supplied, token):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return PlainTextResponse(stage_timing.prometheus_text(), media_type="text/plain; version=0.0.4")
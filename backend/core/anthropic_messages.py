@@ -1,6 +1,6 @@
 """
 Direct-Anthropic-API sibling of BedrockMessagesClient — same duck-typed
-`.messages.create(...)` interface, so call sites written against either
+`.messages.create(...)` and `.messages.stream(...)` interface, so call sites written against either
 client don't need to branch on provider themselves (see llm_factory.py).
 """
 
@@ -12,45 +12,85 @@ from typing import Any
 import anthropic
 
 from backend.core.llm_exceptions import ContentFilterError, ProviderError, RateLimitError
+from backend.core.message_stream import MessageStream
+
+
+def _usage(usage: Any) -> SimpleNamespace:
+    return SimpleNamespace(
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        cache_read_input_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+        cache_creation_input_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
+    )
+
+
+def _translate(exc: Exception) -> ProviderError:
+    if isinstance(exc, anthropic.RateLimitError):
+        return RateLimitError(f"Anthropic rate limit: {exc}", original=exc)
+    # True SDK root (APIError, plus anything else the SDK might raise
+    # before/around the request) — see bedrock_messages.py's
+    # analogous BotoCoreError fix for why the assumed common base
+    # isn't always the actual one.
+    return ProviderError(f"Anthropic API error: {exc}", original=exc)
+
+
+def _refused() -> ContentFilterError:
+    return ContentFilterError("Anthropic response blocked by content filtering (stop_reason=refusal)")
 
 
 class _Messages:
     def __init__(self, client: anthropic.AsyncAnthropic) -> None:
         self._client = client
 
+    @staticmethod
+    def _request(model: str, max_tokens: int, messages: list[dict], system: str | list[dict] | None) -> dict:
+        kwargs: dict[str, Any] = {"model": model, "max_tokens": max_tokens, "messages": messages}
+        if system:
+            kwargs["system"] = system
+        return kwargs
+
     async def create(
         self,
         *,
         model: str,
         max_tokens: int,
         messages: list[dict],
-        system: str | None = None,
+        system: str | list[dict] | None = None,
     ) -> Any:
-        kwargs: dict[str, Any] = {"model": model, "max_tokens": max_tokens, "messages": messages}
-        if system:
-            kwargs["system"] = system
         try:
-            resp = await self._client.messages.create(**kwargs)
-        except anthropic.RateLimitError as exc:
-            raise RateLimitError(f"Anthropic rate limit: {exc}", original=exc) from exc
+            resp = await self._client.messages.create(**self._request(model, max_tokens, messages, system))
         except anthropic.AnthropicError as exc:
-            # True SDK root (APIError, plus anything else the SDK might raise
-            # before/around the request) — see bedrock_messages.py's
-            # analogous BotoCoreError fix for why the assumed common base
-            # isn't always the actual one.
-            raise ProviderError(f"Anthropic API error: {exc}", original=exc) from exc
+            raise _translate(exc) from exc
 
         if resp.stop_reason == "refusal":
-            raise ContentFilterError("Anthropic response blocked by content filtering (stop_reason=refusal)")
+            raise _refused()
 
         text = resp.content[0].text if resp.content else ""
-        return SimpleNamespace(
-            content=[SimpleNamespace(text=text)],
-            usage=SimpleNamespace(
-                input_tokens=resp.usage.input_tokens,
-                output_tokens=resp.usage.output_tokens,
-            ),
-        )
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=_usage(resp.usage))
+
+    def stream(
+        self,
+        *,
+        model: str,
+        max_tokens: int,
+        messages: list[dict],
+        system: str | list[dict] | None = None,
+    ) -> MessageStream:
+        """SDK-streaming MessageStream (see message_stream.py)."""
+        return MessageStream(self._stream_events(self._request(model, max_tokens, messages, system)))
+
+    async def _stream_events(self, kwargs: dict):
+        try:
+            async with self._client.messages.stream(**kwargs) as stream:
+                async for text in stream.text_stream:
+                    yield "text", text
+                final = await stream.get_final_message()
+        except anthropic.AnthropicError as exc:
+            raise _translate(exc) from exc
+        if final.stop_reason == "refusal":
+            raise _refused()
+        yield "usage", _usage(final.usage)
+        yield "stop", final.stop_reason
 
 
 class AnthropicMessagesClient:
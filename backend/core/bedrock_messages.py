@@ -2,7 +2,8 @@
 Drop-in replacement for `AsyncAnthropic().messages.create(...)` backed by AWS
 Bedrock Converse, so call sites written against the Anthropic Messages API
 shape (model, max_tokens, messages, system) don't need to change beyond
-swapping the client construction.
+swapping the client construction. `.messages.stream(...)` is the
+ConverseStream counterpart (see message_stream.py).
 """
 
 from __future__ import annotations
@@ -15,6 +16,7 @@ import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 
 from backend.core.llm_exceptions import ContentFilterError, ProviderError, RateLimitError
+from backend.core.message_stream import MessageStream, iterate_in_thread
 
 # The only two Anthropic model ids referenced anywhere in this codebase.
 _MODEL_MAP = {
@@ -25,57 +27,112 @@ _MODEL_MAP = {
 _THROTTLING_CODES = {"ThrottlingException", "TooManyRequestsException"}
 
 
+def _converse_content(content: str | list[dict]) -> list[dict]:
+    """Anthropic-style content (a string, or text blocks optionally carrying
+    `cache_control`) as Converse content blocks — a cache breakpoint becomes
+    a cachePoint block right after the text it closes."""
+    if isinstance(content, str):
+        return [{"text": content}]
+    blocks = []
+    for block in content:
+        blocks.append({"text": block["text"]})
+        if block.get("cache_control"):
+            blocks.append({"cachePoint": {"type": "default"}})
+    return blocks
+
+
+def _usage(usage: dict) -> SimpleNamespace:
+    return SimpleNamespace(
+        input_tokens=usage.get("inputTokens", 0),
+        output_tokens=usage.get("outputTokens", 0),
+        cache_read_input_tokens=usage.get("cacheReadInputTokens", 0),
+        cache_creation_input_tokens=usage.get("cacheWriteInputTokens", 0),
+    )
+
+
+def _translate(exc: Exception) -> ProviderError:
+    if isinstance(exc, ClientError):
+        # Server-side rejection (the request reached Bedrock) — includes
+        # throttling, and errors raised mid-stream (EventStreamError).
+        code = exc.response.get("Error", {}).get("Code", "")
+        if code in _THROTTLING_CODES:
+            return RateLimitError(f"Bedrock throttled: {exc}", original=exc)
+        return ProviderError(f"Bedrock Converse error: {exc}", original=exc)
+    # Client-side rejection before any request was sent (e.g.
+    # ParamValidationError, NoCredentialsError) — does not inherit
+    # from ClientError, so needs its own translation, not just a
+    # narrower except clause.
+    return ProviderError(f"Bedrock request error: {exc}", original=exc)
+
+
+def _content_filtered() -> ContentFilterError:
+    return ContentFilterError("Bedrock response blocked by content filtering (stopReason=content_filtered)")
+
+
 class _Messages:
     def __init__(self, bedrock) -> None:
         self._bedrock = bedrock
 
+    @staticmethod
+    def _request(model: str, max_tokens: int, messages: list[dict], system: str | list[dict] | None) -> dict:
+        kwargs = {
+            "modelId": _MODEL_MAP.get(model, model),
+            "messages": [
+                {"role": m["role"], "content": _converse_content(m["content"])} for m in messages
+            ],
+            "inferenceConfig": {"maxTokens": max_tokens},
+        }
+        if system:
+            kwargs["system"] = _converse_content(system)
+        return kwargs
+
     async def create(
         self,
         *,
         model: str,
         max_tokens: int,
         messages: list[dict],
-        system: str | None = None,
+        system: str | list[dict] | None = None,
     ) -> Any:
-        model_id = _MODEL_MAP.get(model, model)
-        converse_messages = [
-            {"role": m["role"], "content": [{"text": m["content"]}]} for m in messages
-        ]
-        kwargs = {
-            "modelId": model_id,
-            "messages": converse_messages,
-            "inferenceConfig": {"maxTokens": max_tokens},
-        }
-        if system:
-            kwargs["system"] = [{"text": system}]
+        kwargs = self._request(model, max_tokens, messages, system)
         try:
             resp = await asyncio.to_thread(self._bedrock.converse, **kwargs)
-        except ClientError as exc:
-            # Server-side rejection (the request reached Bedrock) — includes
-            # throttling.
-            code = exc.response.get("Error", {}).get("Code", "")
-            if code in _THROTTLING_CODES:
-                raise RateLimitError(f"Bedrock throttled: {exc}", original=exc) from exc
-            raise ProviderError(f"Bedrock Converse error: {exc}", original=exc) from exc
-        except BotoCoreError as exc:
-            # Client-side rejection before any request was sent (e.g.
-            # ParamValidationError, NoCredentialsError) — does not inherit
-            # from ClientError, so needs its own translation, not just a
-            # narrower except clause.
-            raise ProviderError(f"Bedrock request error: {exc}", original=exc) from exc
+        except (ClientError, BotoCoreError) as exc:
+            raise _translate(exc) from exc
 
         if resp.get("stopReason") == "content_filtered":
-            raise ContentFilterError("Bedrock response blocked by content filtering (stopReason=content_filtered)")
+            raise _content_filtered()
 
         text = resp["output"]["message"]["content"][0]["text"]
-        usage = resp.get("usage", {})
-        return SimpleNamespace(
-            content=[SimpleNamespace(text=text)],
-            usage=SimpleNamespace(
-                input_tokens=usage.get("inputTokens", 0),
-                output_tokens=usage.get("outputTokens", 0),
-            ),
-        )
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=_usage(resp.get("usage", {})))
+
+    def stream(
+        self,
+        *,
+        model: str,
+        max_tokens: int,
+        messages: list[dict],
+        system: str | list[dict] | None = None,
+    ) -> MessageStream:
+        """converse_stream-backed MessageStream (see message_stream.py)."""
+        return MessageStream(self._stream_events(self._request(model, max_tokens, messages, system)))
+
+    async def _stream_events(self, kwargs: dict):
+        try:
+            async for event in iterate_in_thread(lambda: self._bedrock.converse_stream(**kwargs)["stream"]):
+                if "contentBlockDelta" in event:
+                    text = event["contentBlockDelta"].get("delta", {}).get("text")
+                    if text:
+                        yield "text", text
+                elif "messageStop" in event:
+                    reason = event["messageStop"].get("stopReason")
+                    if reason == "content_filtered":
+                        raise _content_filtered()
+                    yield "stop", reason
+                elif "metadata" in event:
+                    yield "usage", _usage(event["metadata"].get("usage", {}))
+        except (ClientError, BotoCoreError) as exc:
+            raise _translate(exc) from exc
 
 
 class BedrockMessagesClient:
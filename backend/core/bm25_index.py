@@ -13,8 +13,10 @@ from __future__ import annotations
 import logging
 import re
 import threading
+from typing import TYPE_CHECKING
 
-from rank_bm25 import BM25Okapi
+if TYPE_CHECKING:
+    from rank_bm25 import BM25Okapi
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +100,8 @@ class BM25Index:
             if len(batch_ids) < _PAGE_SIZE:
                 break
 
+        from rank_bm25 import BM25Okapi  # pulls in numpy; only needed to build
+
         tokenized_corpus = [tokenize(doc) for doc in contents]
         self._bm25 = BM25Okapi(tokenized_corpus) if tokenized_corpus else None
         self._ids = ids
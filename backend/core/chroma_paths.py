@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import os
+import sqlite3
 from pathlib import Path
+from typing import Optional
 
 _ROOT = Path(__file__).parent.parent.parent
 
@@ -33,3 +35,29 @@ def chroma_persist_dir() -> Path:
     if override:
         return Path(override)
     return _ROOT / "chroma_db"
+
+
+def index_generation(chroma_dir: Path, collection: str = "experience_league") -> Optional[str]:
+    """
+    Identity of the indexed contents, for keying sidecars built from them:
+    the collection's id plus Chroma's write-log high-water mark. Every
+    add/upsert/delete advances the mark and a rebuilt collection gets a new id,
+    so this changes whenever the chunks do — same-size edits included — and is
+    identical in a restored copy of the same files. None when chroma_dir holds
+    no readable Chroma database.
+    """
+    path = Path(chroma_dir) / "chroma.sqlite3"
+    if not path.is_file():
+        return None
+    try:
+        conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True, timeout=5)
+        try:
+            row = conn.execute("SELECT id FROM collections WHERE name = ?", (collection,)).fetchone()
+            seq = conn.execute("SELECT MAX(seq_id) FROM max_seq_id").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    if not row:
+        return None
+    return f"{row[0]}:{seq[0] if seq and seq[0] is not None else 0}"
@@ -0,0 +1,251 @@
+"""
+Streaming Chroma restore — S3 GetObject → decompressor → tar extraction.
+
+The archive never touches disk: the object body (one GET, or parallel ranged
+GETs for large archives) is piped through gzip or zstd straight into tarfile's
+stream mode, and permissions are fixed as each member is written. Replaces the
+old download → extractall → chmod walk sequence on Railway cold start.
+
+Usage:
+  stream_restore(s3, bucket, key, dest_parent, on_progress=cb)
+      → {"bytes": ..., "files": ..., "seconds": ...}
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import stat
+import tarfile
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DIR_MODE = stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH
+FILE_MODE = stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IWGRP | stat.S_IROTH
+
+_READ_SIZE = 1024 * 1024
+_PROGRESS_INTERVAL_S = 1.0
+_DEFAULT_PART_SIZE = 32 * 1024 * 1024
+_DEFAULT_CONCURRENCY = 8
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _is_zstd_key(key: str) -> bool:
+    return key.endswith((".tar.zst", ".tzst", ".zst"))
+
+
+class _ChunkStreamReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks (counts bytes read)."""
+
+    def __init__(
+        self,
+        chunks: Iterator[bytes],
+        total: int,
+        on_progress: Optional[ProgressCallback] = None,
+    ):
+        self._chunks = chunks
+        self._buf = memoryview(b"")
+        self._total = total
+        self._on_progress = on_progress
+        self._last_report = 0.0
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buf:
+            try:
+                self._buf = memoryview(next(self._chunks))
+            except StopIteration:
+                self._report(force=True)
+                return 0
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        self.bytes_read += n
+        self._report()
+        return n
+
+    def _report(self, force: bool = False) -> None:
+        if not self._on_progress:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_report < _PROGRESS_INTERVAL_S:
+            return
+        self._last_report = now
+        try:
+            self._on_progress(self.bytes_read, self._total)
+        except Exception as exc:
+            logger.debug("Restore progress callback failed: %s", exc)
+
+    def close(self) -> None:
+        close = getattr(self._chunks, "close", None)
+        if close:
+            close()
+        super().close()
+
+
+def _single_get_chunks(s3: Any, bucket: str, key: str) -> Iterator[bytes]:
+    body = s3.get_object(Bucket=bucket, Key=key)["Body"]
+    try:
+        while True:
+            chunk = body.read(_READ_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        body.close()
+
+
+def _ranged_chunks(
+    s3: Any,
+    bucket: str,
+    key: str,
+    size: int,
+    *,
+    part_size: int,
+    concurrency: int,
+    etag: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    Yield the object in order while up to `concurrency` ranged GETs run ahead.
+
+    Memory is bounded by concurrency × part_size. IfMatch pins every part to the
+    ETag seen at HEAD so a concurrent re-upload cannot splice two archives.
+    """
+    ranges = iter(
+        (start, min(start + part_size, size) - 1) for start in range(0, size, part_size)
+    )
+
+    def _fetch(start: int, end: int) -> bytes:
+        kwargs: dict[str, Any] = {"Bucket": bucket, "Key": key, "Range": f"bytes={start}-{end}"}
+        if etag:
+            kwargs["IfMatch"] = etag
+        body = s3.get_object(**kwargs)["Body"]
+        try:
+            data = body.read()
+        finally:
+            body.close()
+        if len(data) != end - start + 1:
+            raise IOError(f"Short read for bytes={start}-{end}: got {len(data)} bytes")
+        return data
+
+    pending: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="chroma-restore") as pool:
+        try:
+            for _ in range(concurrency):
+                nxt = next(ranges, None)
+                if nxt is None:
+                    break
+                pending.append(pool.submit(_fetch, *nxt))
+            while pending:
+                data = pending.popleft().result()
+                nxt = next(ranges, None)
+                if nxt is not None:
+                    pending.append(pool.submit(_fetch, *nxt))
+                yield data
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+
+def _safe_target(dest: Path, name: str) -> Path:
+    target = (dest / name).resolve()
+    root = dest.resolve()
+    if target != root and root not in target.parents:
+        raise tarfile.TarError(f"Refusing to extract outside {dest}: {name}")
+    return target
+
+
+def _extract_stream(fileobj: Any, dest: Path, mode: str) -> int:
+    """Extract a sequential tar stream into dest, fixing permissions per member."""
+    files = 0
+    root = dest.resolve()
+    fixed_dirs: set[Path] = {root}
+    extract_kwargs: dict[str, Any] = {}
+    if hasattr(tarfile, "data_filter"):
+        extract_kwargs["filter"] = "data"
+
+    with tarfile.open(fileobj=fileobj, mode=mode) as tar:
+        for member in tar:
+            if not (member.isfile() or member.isdir()):
+                logger.debug("Skipping non-regular tar member %s", member.name)
+                continue
+            target = _safe_target(dest, member.name)
+            tar.extract(member, dest, **extract_kwargs)
+            if member.isdir():
+                os.chmod(target, DIR_MODE)
+                fixed_dirs.add(target)
+                continue
+            os.chmod(target, FILE_MODE)
+            files += 1
+            # Archives without explicit dir entries still get writable parents.
+            parent = target.parent
+            while parent not in fixed_dirs and root in parent.parents:
+                os.chmod(parent, DIR_MODE)
+                fixed_dirs.add(parent)
+                parent = parent.parent
+    return files
+
+
+def stream_restore(
+    s3: Any,
+    bucket: str,
+    key: str,
+    dest_parent: Path,
+    *,
+    part_size: int = _DEFAULT_PART_SIZE,
+    concurrency: int = _DEFAULT_CONCURRENCY,
+    on_progress: Optional[ProgressCallback] = None,
+) -> dict[str, Any]:
+    """
+    Extract s3://bucket/key (tar.gz or tar.zst) into dest_parent while downloading.
+
+    Archives larger than one part are fetched with parallel ranged GETs.
+    on_progress(bytes_done, bytes_total) is called at most once per second.
+    """
+    started = time.monotonic()
+    head = s3.head_object(Bucket=bucket, Key=key)
+    size = int(head.get("ContentLength") or 0)
+    etag = head.get("ETag")
+
+    if size > part_size and concurrency > 1:
+        chunks = _ranged_chunks(
+            s3, bucket, key, size, part_size=part_size, concurrency=concurrency, etag=etag
+        )
+        logger.info(
+            "Streaming %.1f MB from s3://%s/%s (%d parallel ranges of %d MB)",
+            size / 1024 / 1024, bucket, key, concurrency, part_size // 1024 // 1024,
+        )
+    else:
+        chunks = _single_get_chunks(s3, bucket, key)
+        logger.info("Streaming %.1f MB from s3://%s/%s", size / 1024 / 1024, bucket, key)
+
+    dest_parent.mkdir(parents=True, exist_ok=True)
+    raw = _ChunkStreamReader(chunks, size, on_progress)
+    reader = io.BufferedReader(raw, buffer_size=_READ_SIZE)
+    try:
+        if _is_zstd_key(key):
+            import zstandard
+
+            with zstandard.ZstdDecompressor().stream_reader(reader) as decompressed:
+                files = _extract_stream(decompressed, dest_parent, "r|")
+        else:
+            files = _extract_stream(reader, dest_parent, "r|gz")
+    finally:
+        reader.close()
+
+    elapsed = time.monotonic() - started
+    logger.info(
+        "Streamed restore extracted %d files (%.1f MB) in %.1fs",
+        files, raw.bytes_read / 1024 / 1024, elapsed,
+    )
+    return {"bytes": raw.bytes_read, "files": files, "seconds": round(elapsed, 2)}
@@ -12,11 +12,8 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-import boto3
-import chromadb
-from chromadb.config import Settings as ChromaSettings
-
 from backend.core.chroma_paths import chroma_persist_dir
+from backend.core.stage_timing import stage
 
 logger = logging.getLogger(__name__)
 
@@ -39,16 +36,29 @@ def _get_titan_embedding(text: str, bedrock_client) -> list[float]:
 
 class ChromaRetriever:
     def __init__(self, persist_dir: str | None = None):
+        # chromadb and boto3 cost ~0.5s to import; load them when a retriever
+        # is built, not when the API process imports this module.
+        import boto3
+        import chromadb
+        from chromadb.config import Settings as ChromaSettings
+
         persist_dir = persist_dir or str(chroma_persist_dir())
+        self.persist_dir = Path(persist_dir)
         logger.info(f"Initialising ChromaDB at {persist_dir}")
         self.client = chromadb.PersistentClient(
             path=persist_dir,
             settings=ChromaSettings(anonymized_telemetry=False),
         )
 
-        region = os.getenv("BEDROCK_REGION", os.getenv("AWS_DEFAULT_REGION", "us-east-1"))
-        self.bedrock = boto3.client("bedrock-runtime", region_name=region)
-        logger.info(f"Using Titan Embed v2 for embeddings (region: {region})")
+        if os.getenv("LLM_PROVIDER", "").lower() == "mock":
+            from backend.core.mock_llm import MockEmbeddingsClient
+
+            self.bedrock = MockEmbeddingsClient()
+            logger.info("Using the mock hashing embedder (LLM_PROVIDER=mock)")
+        else:
+            region = os.getenv("BEDROCK_REGION", os.getenv("AWS_DEFAULT_REGION", "us-east-1"))
+            self.bedrock = boto3.client("bedrock-runtime", region_name=region)
+            logger.info(f"Using Titan Embed v2 for embeddings (region: {region})")
 
         try:
             self.collection = self.client.get_collection(name=COLLECTION_NAME)
@@ -73,7 +83,8 @@ class ChromaRetriever:
             return []
 
         n = min(n_results, count)
-        embedding = _get_titan_embedding(query, self.bedrock)
+        with stage("embed"):
+            embedding = _get_titan_embedding(query, self.bedrock)
 
         kwargs: dict = dict(
             query_embeddings=[embedding],
@@ -85,7 +96,8 @@ class ChromaRetriever:
         if where_document:
             kwargs["where_document"] = where_document
 
-        results = self.collection.query(**kwargs)
+        with stage("vector_query"):
+            results = self.collection.query(**kwargs)
 
         docs = results.get("documents", [[]])[0]
         metas = results.get("metadatas", [[]])[0]
@@ -138,39 +150,13 @@ class ChromaRetriever:
             "embedding_model": TITAN_MODEL_ID,
         }
 
+    def corpus_stats(self) -> dict:
+        """Per-product, release-notes and metadata-coverage summary, cached per
+        index generation (backend/core/corpus_stats.py)."""
+        from backend.core import corpus_stats
+
+        return corpus_stats.current(self.collection, self.persist_dir)
+
     def product_breakdown(self) -> list[dict]:
         """Return per-product chunk + unique-page counts, sorted by chunk count desc."""
-        total = self.collection.count()
-        if total == 0:
-            return []
-
-        metas = []
-        offset = 0
-        PAGE = 500
-        while True:
-            page = self.collection.get(include=["metadatas"], limit=PAGE, offset=offset)
-            batch = page.get("metadatas", [])
-            if not batch:
-                break
-            metas.extend(batch)
-            offset += len(batch)
-            if len(batch) < PAGE:
-                break
-
-        from collections import defaultdict
-        chunks: dict[str, int] = defaultdict(int)
-        pages: dict[str, set] = defaultdict(set)
-
-        for m in metas:
-            product = m.get("product") or "Unknown"
-            url = m.get("url") or m.get("s3_key") or ""
-            chunks[product] += 1
-            if url:
-                pages[product].add(url)
-
-        breakdown = [
-            {"product": p, "chunks": chunks[p], "pages": len(pages[p])}
-            for p in chunks
-        ]
-        breakdown.sort(key=lambda x: x["chunks"], reverse=True)
-        return breakdown
+        return self.corpus_stats()["product_breakdown"]
@@ -0,0 +1,284 @@
+"""
+Content-addressed Chroma snapshots — publish and restore only changed chunks.
+
+Every file under chroma_db/ is split into fixed-size chunks keyed by the
+SHA-256 of their bytes. Chunks are stored zlib-compressed at
+chroma_db/chunks/<sha256>; the manifest (file → ordered chunk hashes) is
+written under "snapshot" in state/chroma_last_refreshed.json. SQLite and HNSW
+files are rewritten in place, so a refresh that re-ingests a few dozen docs
+changes only a handful of chunks.
+
+  publish_snapshot(s3, bucket, chroma_dir, previous=...)
+      uploads chunks not referenced by the previous manifest
+  restore_snapshot(s3, bucket, manifest, dest, seed_dir=...)
+      copies chunks already present in seed_dir, fetches only the rest
+
+Unreferenced chunks are never deleted here — expire chroma_db/chunks/ with an
+S3 lifecycle rule once no manifest points at them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from backend.core.chroma_restore import DIR_MODE, FILE_MODE
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+CHUNK_SIZE = 4 * 1024 * 1024
+CHUNK_PREFIX = "chroma_db/chunks/"
+META_KEY = "state/chroma_last_refreshed.json"
+MARKER_NAME = ".snapshot.json"
+
+_DEFAULT_CONCURRENCY = 8
+
+# hash → [(path, offset, length), ...]
+_Locations = dict[str, list[tuple[Path, int, int]]]
+
+
+def _iter_file_chunks(path: Path, chunk_size: int) -> Iterator[bytes]:
+    with open(path, "rb") as fh:
+        while True:
+            data = fh.read(chunk_size)
+            if not data:
+                break
+            yield data
+
+
+def build_manifest(chroma_dir: Path, chunk_size: int = CHUNK_SIZE) -> dict[str, Any]:
+    """Hash every file under chroma_dir into an ordered chunk list."""
+    files = []
+    for path in sorted(p for p in chroma_dir.rglob("*") if p.is_file()):
+        if path.name == MARKER_NAME:
+            continue
+        chunks = [
+            hashlib.sha256(data).hexdigest() for data in _iter_file_chunks(path, chunk_size)
+        ]
+        files.append({
+            "path": path.relative_to(chroma_dir).as_posix(),
+            "size": path.stat().st_size,
+            "chunks": chunks,
+        })
+    snapshot_id = hashlib.sha256(
+        json.dumps(files, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "id": snapshot_id,
+        "chunk_size": chunk_size,
+        "chunk_prefix": CHUNK_PREFIX,
+        "files": files,
+    }
+
+
+def manifest_chunks(manifest: Optional[dict]) -> set[str]:
+    if not manifest:
+        return set()
+    return {h for f in manifest.get("files", []) for h in f.get("chunks", [])}
+
+
+def _chunk_locations(manifest: dict, root: Path) -> _Locations:
+    chunk_size = manifest["chunk_size"]
+    locations: _Locations = {}
+    for entry in manifest["files"]:
+        path = root / entry["path"]
+        size = entry["size"]
+        for idx, digest in enumerate(entry["chunks"]):
+            offset = idx * chunk_size
+            length = min(chunk_size, size - offset)
+            locations.setdefault(digest, []).append((path, offset, length))
+    return locations
+
+
+def _read_range(path: Path, offset: int, length: int) -> bytes:
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        return fh.read(length)
+
+
+def _chunk_key(manifest: dict, digest: str) -> str:
+    return f"{manifest.get('chunk_prefix', CHUNK_PREFIX)}{digest}"
+
+
+def load_published_manifest(s3: Any, bucket: str) -> Optional[dict[str, Any]]:
+    """Return the snapshot manifest from state/chroma_last_refreshed.json, if any."""
+    try:
+        obj = s3.get_object(Bucket=bucket, Key=META_KEY)
+        meta = json.loads(obj["Body"].read().decode("utf-8"))
+    except Exception as exc:
+        logger.debug("Chroma snapshot metadata unavailable: %s", exc)
+        return None
+    snapshot = meta.get("snapshot") if isinstance(meta, dict) else None
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+
+def publish_snapshot(
+    s3: Any,
+    bucket: str,
+    chroma_dir: Path,
+    *,
+    previous: Optional[dict] = None,
+    chunk_size: int = CHUNK_SIZE,
+    concurrency: int = _DEFAULT_CONCURRENCY,
+) -> tuple[dict[str, Any], dict[str, int]]:
+    """
+    Upload chunks the previous manifest does not reference; return (manifest, stats).
+
+    The caller writes the manifest into state/chroma_last_refreshed.json only
+    after this returns, so readers never see a manifest with missing chunks.
+    """
+    manifest = build_manifest(chroma_dir, chunk_size)
+    known = set()
+    if previous and previous.get("chunk_size") == chunk_size and (
+        previous.get("chunk_prefix", CHUNK_PREFIX) == CHUNK_PREFIX
+    ):
+        known = manifest_chunks(previous)
+    locations = _chunk_locations(manifest, chroma_dir)
+    new = [digest for digest in locations if digest not in known]
+    uploaded_bytes = 0
+    lock = threading.Lock()
+
+    def _upload(digest: str) -> None:
+        nonlocal uploaded_bytes
+        path, offset, length = locations[digest][0]
+        data = _read_range(path, offset, length)
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise RuntimeError(f"{path} changed while publishing snapshot")
+        body = zlib.compress(data, 6)
+        s3.put_object(
+            Bucket=bucket,
+            Key=_chunk_key(manifest, digest),
+            Body=body,
+            ContentType="application/octet-stream",
+        )
+        with lock:
+            uploaded_bytes += len(body)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="chroma-publish") as pool:
+        list(pool.map(_upload, new))
+
+    stats = {
+        "chunks_total": len(locations),
+        "chunks_uploaded": len(new),
+        "bytes_uploaded": uploaded_bytes,
+    }
+    logger.info(
+        "Published Chroma snapshot %s: %d/%d chunks uploaded (%.1f MB)",
+        manifest["id"][:12], stats["chunks_uploaded"], stats["chunks_total"],
+        uploaded_bytes / 1024 / 1024,
+    )
+    return manifest, stats
+
+
+def _write_at(path: Path, offset: int, data: bytes) -> None:
+    with open(path, "r+b") as fh:
+        fh.seek(offset)
+        fh.write(data)
+
+
+def read_local_marker(chroma_dir: Path) -> Optional[dict[str, Any]]:
+    try:
+        return json.loads((chroma_dir / MARKER_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def restore_snapshot(
+    s3: Any,
+    bucket: str,
+    manifest: dict,
+    dest: Path,
+    *,
+    seed_dir: Optional[Path] = None,
+    concurrency: int = _DEFAULT_CONCURRENCY,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> dict[str, int]:
+    """
+    Materialise `manifest` into dest, reusing matching chunks from seed_dir.
+
+    Every chunk — seeded or downloaded — is verified against its hash before
+    it is written, so a stale or half-written seed directory is safe to pass.
+    """
+    chunk_size = manifest["chunk_size"]
+    targets = _chunk_locations(manifest, dest)
+    total_bytes = sum(f["size"] for f in manifest["files"])
+
+    seed: _Locations = {}
+    if seed_dir and seed_dir.is_dir() and any(seed_dir.iterdir()):
+        seed = _chunk_locations(build_manifest(seed_dir, chunk_size), seed_dir)
+
+    dest.mkdir(parents=True, exist_ok=True)
+    os.chmod(dest, DIR_MODE)
+    for entry in manifest["files"]:
+        path = dest / entry["path"]
+        if path.parent != dest:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.chmod(path.parent, DIR_MODE)
+        with open(path, "wb") as fh:
+            fh.truncate(entry["size"])
+        os.chmod(path, FILE_MODE)
+
+    done_bytes = 0
+    lock = threading.Lock()
+    stats = {"chunks_total": len(targets), "chunks_reused": 0, "chunks_fetched": 0, "bytes_fetched": 0}
+
+    def _fill(digest: str) -> None:
+        nonlocal done_bytes
+        data = None
+        for path, offset, length in seed.get(digest, []):
+            candidate = _read_range(path, offset, length)
+            if hashlib.sha256(candidate).hexdigest() == digest:
+                data = candidate
+                break
+        fetched = 0
+        if data is None:
+            body = s3.get_object(Bucket=bucket, Key=_chunk_key(manifest, digest))["Body"]
+            try:
+                raw = body.read()
+            finally:
+                body.close()
+            data = zlib.decompress(raw)
+            fetched = len(raw)
+            if hashlib.sha256(data).hexdigest() != digest:
+                raise IOError(f"Chunk {digest} failed hash verification")
+        written = 0
+        for path, offset, length in targets[digest]:
+            _write_at(path, offset, data[:length])
+            written += length
+        with lock:
+            key = "chunks_fetched" if fetched else "chunks_reused"
+            stats[key] += 1
+            stats["bytes_fetched"] += fetched
+            done_bytes += written
+            progress = done_bytes
+        if on_progress:
+            try:
+                on_progress(progress, total_bytes)
+            except Exception as exc:
+                logger.debug("Snapshot progress callback failed: %s", exc)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="chroma-snapshot") as pool:
+        list(pool.map(_fill, list(targets)))
+
+    (dest / MARKER_NAME).write_text(json.dumps({
+        "id": manifest.get("id"),
+        "restored_at": datetime.now(timezone.utc).isoformat(),
+    }))
+    logger.info(
+        "Restored Chroma snapshot %s into %s: %d chunks reused, %d fetched (%.1f MB)",
+        str(manifest.get("id", ""))[:12], dest, stats["chunks_reused"],
+        stats["chunks_fetched"], stats["bytes_fetched"] / 1024 / 1024,
+    )
+    return stats
@@ -0,0 +1,311 @@
+"""
+Corpus statistics for the served Chroma collection.
+
+Per-product chunk/page counts, release-notes counts by period and metadata
+coverage used to be recomputed by paging through every chunk's metadata on
+each /api/admin/status poll (and by cja_readiness and check_chroma_sync).
+They only change when the index does, so they are computed once per index
+generation and kept as chroma_db/corpus_stats.json.gz — inside the Chroma
+directory, so the sidecar ships with the snapshot like retrieval_pack.
+
+The sidecar stores one small record per source document (s3_key): its chunk
+counts by product, page URLs, release-notes period and per-field metadata
+coverage. That makes refreshes incremental — refresh() re-reads only the
+changed documents' chunks and replaces their records — and the summary the
+endpoints serve is derived from the records in memory.
+
+  python scripts/build_corpus_stats.py [--changed-only]   # after enrichment, before upload
+
+The sidecar is stamped with chroma_paths.index_generation() — the Chroma
+write-log high-water mark, which moves on every upsert or delete even when
+the chunk count does not. current() serves the in-memory summary while its
+generation and chunk_count match the collection; otherwise it loads the
+sidecar, or rebuilds it with one scan. Without a chroma.sqlite3 to read
+(tests, non-persistent clients) the generation is None and only the chunk
+count is compared.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from backend.core.chroma_paths import index_generation
+
+logger = logging.getLogger(__name__)
+
+STATS_NAME = "corpus_stats.json.gz"
+STATS_FORMAT = 1
+_PAGE_SIZE = 500
+_KEY_BATCH = 200
+# Metadata fields whose presence is reported as coverage (share of chunks).
+COVERAGE_FIELDS = ("title", "product", "doc_type", "url", "exl_url", "video_url", "image_urls")
+
+_MONTHS = [
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+]
+_MONTH_RE = re.compile(r"(" + "|".join(_MONTHS) + r")[-_]?(\d{4})")
+_YEAR_RE = re.compile(r"(\d{4})")
+
+_lock = threading.Lock()
+_summary: Optional[dict[str, Any]] = None
+
+
+def parse_release_period(s3_key: str) -> str:
+    """Best-effort month/year label for a release-notes path, e.g.
+    '.../release-notes/2024/april-2024.md' -> '2024-04',
+    '.../release-notes/2020.md' -> '2020',
+    '.../release-notes/2019-earlier.md' -> '2019 & earlier',
+    '.../release-notes/current.md' -> 'undated' (no month/year in the path)."""
+    key = s3_key.lower()
+    month_match = _MONTH_RE.search(key)
+    if month_match:
+        month_name, year = month_match.groups()
+        month_num = _MONTHS.index(month_name) + 1
+        return f"{year}-{month_num:02d}"
+    if "-earlier" in key:
+        year_match = _YEAR_RE.search(key)
+        if year_match:
+            return f"{year_match.group(1)} & earlier"
+    year_match = _YEAR_RE.search(key)
+    if year_match:
+        return year_match.group(1)
+    return "undated"
+
+
+def is_release_notes(s3_key: str) -> bool:
+    key = s3_key.lower()
+    return "release-notes" in key or "/rn/" in key
+
+
+# ── Per-document records ─────────────────────────────────────────────────────
+
+def document_records(metadatas: Iterable[dict]) -> dict[str, dict]:
+    """Fold chunk metadata into one record per source document."""
+    records: dict[str, dict] = {}
+    for m in metadatas:
+        m = m or {}
+        s3_key = m.get("s3_key") or ""
+        rec = records.get(s3_key)
+        if rec is None:
+            rec = records[s3_key] = {
+                "products": {},
+                "pages": [],
+                "release_period": parse_release_period(s3_key) if is_release_notes(s3_key) else None,
+                "coverage": {},
+            }
+        product = m.get("product") or "Unknown"
+        rec["products"][product] = rec["products"].get(product, 0) + 1
+        page = m.get("url") or s3_key
+        if page and page not in rec["pages"]:
+            rec["pages"].append(page)
+        for field in COVERAGE_FIELDS:
+            if m.get(field):
+                rec["coverage"][field] = rec["coverage"].get(field, 0) + 1
+    return records
+
+
+def _scan(collection: Any, where: Optional[dict] = None) -> Iterable[dict]:
+    offset = 0
+    while True:
+        kwargs: dict = dict(include=["metadatas"], limit=_PAGE_SIZE, offset=offset)
+        if where:
+            kwargs["where"] = where
+        batch = collection.get(**kwargs).get("metadatas") or []
+        yield from batch
+        offset += len(batch)
+        if len(batch) < _PAGE_SIZE:
+            return
+
+
+def build(collection: Any, generation: Optional[str] = None) -> dict[str, Any]:
+    """Full scan — the only path that reads every chunk."""
+    chunk_count = collection.count()
+    documents = document_records(_scan(collection)) if chunk_count else {}
+    return _stats(documents, chunk_count, generation)
+
+
+def update(
+    collection: Any, previous: Optional[dict], changed_keys: Optional[Iterable[str]],
+    generation: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Re-read only the chunks of `changed_keys` and replace their records.
+    Falls back to build() without a previous sidecar, without a changed-key
+    set, or when the patched records don't add up to the collection count.
+    """
+    if previous is None or changed_keys is None:
+        return build(collection, generation)
+    keys = sorted(set(changed_keys))
+    documents = dict(previous.get("documents") or {})
+    for key in keys:
+        documents.pop(key, None)
+    for i in range(0, len(keys), _KEY_BATCH):
+        where = {"s3_key": {"$in": keys[i:i + _KEY_BATCH]}}
+        documents.update(document_records(_scan(collection, where)))
+
+    chunk_count = collection.count()
+    counted = sum(sum(rec["products"].values()) for rec in documents.values())
+    if counted != chunk_count:
+        logger.warning(
+            "Corpus stats drifted (%d chunks in records, %d in collection) — rebuilding", counted, chunk_count,
+        )
+        return build(collection, generation)
+    logger.info("Corpus stats updated for %d changed documents", len(keys))
+    return _stats(documents, chunk_count, generation)
+
+
+def _stats(documents: dict[str, dict], chunk_count: int, generation: Optional[str] = None) -> dict[str, Any]:
+    return {
+        "format": STATS_FORMAT,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "chunk_count": chunk_count,
+        "index_generation": generation,
+        "documents": documents,
+    }
+
+
+def _is_current(stats: Optional[dict], chunk_count: int, generation: Optional[str]) -> bool:
+    return (
+        stats is not None
+        and stats.get("chunk_count") == chunk_count
+        and stats.get("index_generation") == generation
+    )
+
+
+# ── Summary served to the endpoints ──────────────────────────────────────────
+
+def summarize(stats: dict[str, Any]) -> dict[str, Any]:
+    chunks: dict[str, int] = defaultdict(int)
+    pages: dict[str, set] = defaultdict(set)
+    coverage: dict[str, int] = defaultdict(int)
+    rn_docs: set[str] = set()
+    rn_by_product: dict[str, dict] = defaultdict(lambda: {"chunks": 0, "docs": 0})
+    rn_timeline: dict[str, dict[str, dict]] = defaultdict(lambda: defaultdict(lambda: {"chunks": 0, "docs": 0}))
+
+    for s3_key, rec in (stats.get("documents") or {}).items():
+        period = rec.get("release_period")
+        for product, n in rec["products"].items():
+            chunks[product] += n
+            pages[product].update(rec["pages"])
+            if period is not None:
+                rn_by_product[product]["chunks"] += n
+                rn_by_product[product]["docs"] += 1
+                rn_timeline[product][period]["chunks"] += n
+                rn_timeline[product][period]["docs"] += 1
+        if period is not None:
+            rn_docs.add(s3_key)
+        for field, n in rec.get("coverage", {}).items():
+            coverage[field] += n
+
+    total = stats.get("chunk_count") or 0
+    breakdown = [{"product": p, "chunks": chunks[p], "pages": len(pages[p])} for p in chunks]
+    breakdown.sort(key=lambda x: x["chunks"], reverse=True)
+    return {
+        "built_at": stats.get("built_at"),
+        "index_generation": stats.get("index_generation"),
+        "chunk_count": total,
+        "total_pages": sum(len(v) for v in pages.values()),
+        "product_breakdown": breakdown,
+        "release_notes": {
+            "chunks": sum(v["chunks"] for v in rn_by_product.values()),
+            "docs": len(rn_docs),
+            "by_product": {p: dict(v) for p, v in rn_by_product.items()},
+            "timeline": {p: {k: dict(v) for k, v in periods.items()} for p, periods in rn_timeline.items()},
+        },
+        "metadata_coverage": {
+            field: round(coverage[field] / total, 4) if total else 0.0 for field in COVERAGE_FIELDS
+        },
+    }
+
+
+# ── Sidecar I/O ──────────────────────────────────────────────────────────────
+
+def write(stats: dict[str, Any], chroma_dir: Path) -> Path:
+    path = Path(chroma_dir) / STATS_NAME
+    tmp = path.with_suffix(".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+        json.dump(stats, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
+
+
+def read(chroma_dir: Path) -> Optional[dict[str, Any]]:
+    try:
+        with gzip.open(Path(chroma_dir) / STATS_NAME, "rt", encoding="utf-8") as fh:
+            stats = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(stats, dict) or stats.get("format") != STATS_FORMAT:
+        return None
+    return stats
+
+
+def refresh(collection: Any, chroma_dir: Path, changed_keys: Optional[Iterable[str]] = None) -> dict[str, Any]:
+    """Update the sidecar after an ingest (incrementally when changed_keys is
+    known) and serve the result from this process."""
+    global _summary
+    stats = update(collection, read(chroma_dir), changed_keys, index_generation(chroma_dir))
+    write(stats, chroma_dir)
+    summary = summarize(stats)
+    with _lock:
+        _summary = summary
+    return summary
+
+
+def load(chroma_dir: Path, chunk_count: int) -> bool:
+    """Serve the sidecar from chroma_dir if it was built against this index generation."""
+    global _summary
+    stats = read(chroma_dir)
+    if not _is_current(stats, chunk_count, index_generation(chroma_dir)):
+        logger.info("No current corpus stats in %s — will compute on first use", chroma_dir)
+        return False
+    summary = summarize(stats)
+    with _lock:
+        _summary = summary
+    logger.info("Corpus stats loaded: %d chunks (built %s)", summary["chunk_count"], summary["built_at"])
+    return True
+
+
+def current(collection: Any, chroma_dir: Optional[Path] = None) -> dict[str, Any]:
+    """
+    Summary for `collection`: from memory while the index generation and
+    chunk count match, else from the sidecar, else one full scan (written back
+    to the sidecar when chroma_dir is given). Concurrent callers wait for a
+    single rebuild.
+    """
+    global _summary
+    count = collection.count()
+    generation = index_generation(chroma_dir) if chroma_dir else None
+    summary = _summary
+    if _is_current(summary, count, generation):
+        return summary
+    with _lock:
+        if _is_current(_summary, count, generation):
+            return _summary
+        stats = read(chroma_dir) if chroma_dir else None
+        if not _is_current(stats, count, generation):
+            logger.info("Corpus stats stale or missing — scanning %d chunks", count)
+            stats = build(collection, generation)
+            if chroma_dir:
+                try:
+                    write(stats, chroma_dir)
+                except OSError as exc:
+                    logger.warning(f"Corpus stats sidecar not written ({exc})")
+        _summary = summarize(stats)
+        return _summary
+
+
+def unload() -> None:
+    global _summary
+    with _lock:
+        _summary = None
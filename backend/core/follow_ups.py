@@ -0,0 +1,149 @@
+"""
+Follow-up question suggestions for answered chat messages.
+
+The chat route starts generate() as soon as the pipeline's `done` event
+arrives and pushes the result to the client as a `follow_ups` SSE event, so
+the frontend no longer makes its own round trip after every answer.
+
+Suggestions depend only on the question and the answer, and popular
+questions get identical answers, so results are cached process-wide under
+(normalized query, answer hash). Concurrent requests for one key share a
+single in-flight Haiku call; empty results (a failed or unparseable call)
+are not cached. The messages client is built once per provider and event
+loop — its connection pool belongs to the loop it was first used on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_MODEL = "claude-haiku-4-5-20251001"
+_MAX_TOKENS = 200
+_ANSWER_CLIP = 500
+_MAX_ENTRIES = 4096
+_TTL_S = 24 * 3600
+
+_PROMPT = (
+    "Based on this question and answer, suggest exactly 3 concise follow-up questions "
+    "a user might ask next. Return only the 3 questions as a JSON array of strings, "
+    "nothing else.\n\nQuestion: {query}\n\nAnswer summary: {answer}"
+)
+
+CacheKey = tuple[str, str]
+
+_entries: OrderedDict[CacheKey, tuple[list[str], float]] = OrderedDict()
+_inflight: dict[CacheKey, asyncio.Task] = {}
+# event loop -> {provider: client}; entries go away with their loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]]" = weakref.WeakKeyDictionary()
+_stats = {"hits": 0, "misses": 0}
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query).strip().rstrip("?!. ").lower()
+
+
+def make_key(query: str, answer: str) -> CacheKey:
+    return (normalize_query(query), hashlib.sha1(answer.strip().encode("utf-8")).hexdigest())
+
+
+def get(key: CacheKey) -> Optional[list[str]]:
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    follow_ups, stored_at = entry
+    if time.monotonic() - stored_at > _TTL_S:
+        _entries.pop(key, None)
+        return None
+    _entries.move_to_end(key)
+    return follow_ups
+
+
+def put(key: CacheKey, follow_ups: list[str]) -> None:
+    _entries[key] = (follow_ups, time.monotonic())
+    _entries.move_to_end(key)
+    while len(_entries) > _MAX_ENTRIES:
+        _entries.popitem(last=False)
+
+
+def _client(settings: Any) -> Any:
+    per_loop = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = per_loop.get(settings.llm_provider)
+    if client is None:
+        from backend.core.llm_factory import get_messages_client
+
+        client = per_loop[settings.llm_provider] = get_messages_client(settings)
+    return client
+
+
+def _parse(raw: str) -> list[str]:
+    match = re.search(r"\[.*?\]", raw, re.DOTALL)
+    if not match:
+        return []
+    try:
+        items = json.loads(match.group())
+    except ValueError:
+        return []
+    return [q.strip() for q in items if isinstance(q, str) and q.strip()][:3]
+
+
+async def _fetch(query: str, answer: str, settings: Any) -> list[str]:
+    try:
+        resp = await _client(settings).messages.create(
+            model=_MODEL,
+            max_tokens=_MAX_TOKENS,
+            messages=[{"role": "user", "content": _PROMPT.format(query=query, answer=answer[:_ANSWER_CLIP])}],
+        )
+        return _parse(resp.content[0].text.strip())
+    except Exception as exc:
+        logger.warning(f"Follow-ups generation failed: {exc}")
+        return []
+
+
+async def generate(query: str, answer: str, settings: Any) -> list[str]:
+    """Up to three follow-up questions for an answered query — cached, else one
+    shared Haiku call per (normalized query, answer)."""
+    key = make_key(query, answer)
+    cached = get(key)
+    if cached is not None:
+        _stats["hits"] += 1
+        return cached
+    _stats["misses"] += 1
+
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(_fetch(query, answer, settings))
+        _inflight[key] = task
+
+        def _done(t: asyncio.Task, key: CacheKey = key) -> None:
+            if _inflight.get(key) is t:
+                _inflight.pop(key, None)
+            if not t.cancelled() and t.exception() is None and t.result():
+                put(key, t.result())
+
+        task.add_done_callback(_done)
+
+    # Shielded: a client disconnecting (or timing out) must not cancel the call
+    # other requests are waiting on, and the result still lands in the cache.
+    return await asyncio.shield(task)
+
+
+def stats() -> dict[str, int]:
+    return {"entries": len(_entries), "inflight": len(_inflight), **_stats}
+
+
+def clear() -> None:
+    _entries.clear()
+    _inflight.clear()
+    _clients.clear()
+    _stats.update(hits=0, misses=0)
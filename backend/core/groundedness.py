@@ -15,18 +15,37 @@ which is safe by construction (it authors no new claims beyond source URLs
 already verified by the retrieval/evidence layer) and is therefore not
 reverified — verifying a check that cannot fail by construction is pure
 overhead, not a safety measure.
+
+IncrementalGroundednessCheck overlaps the check with generation: the answer
+is fed in as it streams, each completed section (markdown heading block, or
+paragraph run past _MIN_SECTION_CHARS) is checked while later ones are still
+being written, and finish() merges the per-section verdicts into the same
+shape run_groundedness_check() returns. Every candidate the ladder ships is
+still reverified as a whole answer.
+
+The retrieved CONTEXT goes in the system prompt behind a prompt-cache
+breakpoint, so the check, the fallback rewrite and each reverification in one
+turn re-read it from the provider's cache instead of paying for it again.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Any
+import re
+from typing import Any, Optional
 
 _CHECK_MODEL = "claude-haiku-4-5-20251001"
 
+_REVIEW_SYSTEM = """You review AI-generated answers about Adobe Experience Cloud against the \
+documentation CONTEXT they were generated from.
+
+CONTEXT:
+{context}"""
+
 _GROUNDEDNESS_PROMPT = """You are auditing an AI-generated answer for fabricated specifics.
 
-Compare the ANSWER below against the CONTEXT it was generated from. Flag only
+Compare the ANSWER below against the CONTEXT in the system prompt. Flag only
 specific, checkable claims (UI navigation paths, button/menu names, API endpoint
 names, field names, dropdown values, exact URLs) that do NOT appear in — and
 cannot be reasonably inferred from — the CONTEXT. Do not flag general concepts,
@@ -48,9 +67,6 @@ If you flag any unsupported claims, also classify their CONCENTRATION:
 
 Only set concentration when has_unsupported_specifics is true; otherwise use null.
 {known_urls_section}
-CONTEXT:
-{context}
-
 ANSWER:
 {answer}
 
@@ -94,7 +110,7 @@ no new procedural content beyond the single pointer sentence specified above."""
 _FALLBACK_PROMPT = """You are writing a deliberately conservative fallback answer because an earlier \
 draft contained fabricated specifics that were too interwoven with legitimate content to safely edit.
 
-Write a short, honest answer to the QUESTION using ONLY facts from CONTEXT. Structure it as:
+Write a short, honest answer to the QUESTION using ONLY facts from the CONTEXT in the system prompt. Structure it as:
 1. What the documentation DOES confirm (only if CONTEXT actually supports something concrete for this \
 question — if it supports nothing concrete, say so plainly instead of stretching).
 2. An explicit, plain statement of what it does NOT cover for this specific question.
@@ -108,9 +124,6 @@ and honesty are valued over completeness here.
 QUESTION:
 {query}
 
-CONTEXT:
-{context}
-
 UNSUPPORTED_CLAIMS (do not include these, even hedged):
 {unsupported_claims}
 
@@ -153,11 +166,23 @@ def _format_source_docs(evidence: dict) -> str:
     return "\n".join(lines)
 
 
-async def _call(client: Any, prompt: str, max_tokens: int = 2000) -> str:
+def _context_system(context: str) -> list[dict]:
+    return [{
+        "type": "text",
+        "text": _REVIEW_SYSTEM.format(context=context),
+        "cache_control": {"type": "ephemeral"},
+    }]
+
+
+async def _call(client: Any, prompt: str, max_tokens: int = 2000, context: str | None = None) -> str:
+    kwargs: dict[str, Any] = {}
+    if context is not None:
+        kwargs["system"] = _context_system(context)
     resp = await client.messages.create(
         model=_CHECK_MODEL,
         max_tokens=max_tokens,
         messages=[{"role": "user", "content": prompt}],
+        **kwargs,
     )
     return resp.content[0].text.strip()
 
@@ -178,8 +203,9 @@ async def run_groundedness_check(
         )
     raw = await _call(
         client,
-        _GROUNDEDNESS_PROMPT.format(context=context, answer=answer, known_urls_section=known_urls_section),
+        _GROUNDEDNESS_PROMPT.format(answer=answer, known_urls_section=known_urls_section),
         max_tokens=1000,
+        context=context,
     )
     if raw.startswith("```"):
         raw = raw.strip("`")
@@ -190,6 +216,111 @@ async def run_groundedness_check(
         return {"has_unsupported_specifics": None, "unsupported_claims": [], "reasoning": f"PARSE_ERROR: {raw[:300]}"}
 
 
+def merge_check_results(results: list[dict]) -> dict:
+    """Combine per-section run_groundedness_check() results into one verdict
+    for the whole answer. Claims flagged in more than one section are, by
+    the prompt's own definition, not ISOLATED."""
+    flagged = [r for r in results if r.get("has_unsupported_specifics")]
+    if not flagged:
+        unparsed = [r for r in results if r.get("has_unsupported_specifics") is None]
+        if unparsed:
+            return {"has_unsupported_specifics": None, "unsupported_claims": [],
+                    "reasoning": unparsed[0].get("reasoning", "")}
+        return {"has_unsupported_specifics": False, "unsupported_claims": [],
+                "fabrication_concentration": None,
+                "reasoning": " | ".join(r.get("reasoning", "") for r in results if r.get("reasoning"))}
+    if len(flagged) > 1:
+        concentration = "INTEGRATED"
+    else:
+        concentration = flagged[0].get("fabrication_concentration") or "UNCERTAIN"
+    return {
+        "has_unsupported_specifics": True,
+        "unsupported_claims": [c for r in flagged for c in (r.get("unsupported_claims") or [])],
+        "fabrication_concentration": concentration,
+        "reasoning": " | ".join(r.get("reasoning", "") for r in flagged),
+    }
+
+
+# A paragraph break only closes a section once this much text has built up,
+# so short answers are checked in one piece.
+_MIN_SECTION_CHARS = 800
+_HEADING_RE = re.compile(r"\n(?=#{1,6}\s)")
+_PARAGRAPH_RE = re.compile(r"\n[ \t]*\n+(?=\S)")
+_LIST_ITEM_RE = re.compile(r"(\d+[.)]|[-*+])\s")
+
+
+class IncrementalGroundednessCheck:
+    """
+    Feed streamed answer text with feed(); completed sections are checked in
+    the background. finish() checks the remainder and returns the merged
+    result. A paragraph break inside a code fence or followed by a list item
+    does not end a section.
+    """
+
+    def __init__(self, client: Any, context: str, known_urls: list[str] | None = None,
+                 min_section_chars: int = _MIN_SECTION_CHARS):
+        self._client = client
+        self._context = context
+        self._known_urls = known_urls
+        self._min_section_chars = min_section_chars
+        self._text = ""
+        self._start = 0
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def sections_checked(self) -> int:
+        return len(self._tasks)
+
+    def _next_boundary(self) -> Optional[int]:
+        text, start = self._text, self._start
+        for m in _HEADING_RE.finditer(text, start):
+            if text[start:m.start()].strip():
+                heading_at = m.end()
+                break
+        else:
+            heading_at = None
+        for m in _PARAGRAPH_RE.finditer(text, start):
+            if heading_at is not None and m.end() >= heading_at:
+                break
+            if m.start() - start < self._min_section_chars:
+                continue
+            if text.count("```", start, m.start()) % 2 or _LIST_ITEM_RE.match(text, m.end()):
+                continue
+            return m.end()
+        return heading_at
+
+    def _check(self, section: str) -> None:
+        self._tasks.append(asyncio.ensure_future(
+            run_groundedness_check(self._client, self._context, section, known_urls=self._known_urls)
+        ))
+
+    def feed(self, chunk: str) -> None:
+        self._text += chunk
+        while (boundary := self._next_boundary()) is not None:
+            section = self._text[self._start:boundary].strip()
+            self._start = boundary
+            if section:
+                self._check(section)
+
+    async def finish(self) -> dict:
+        tail = self._text[self._start:].strip()
+        self._start = len(self._text)
+        if tail:
+            self._check(tail)
+        if not self._tasks:
+            return {"has_unsupported_specifics": False, "unsupported_claims": [],
+                    "fabrication_concentration": None, "reasoning": "empty answer"}
+        try:
+            return merge_check_results(list(await asyncio.gather(*self._tasks)))
+        except BaseException:
+            self.cancel()
+            raise
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+
 async def _build_surgical(client: Any, answer: str, check_result: dict, evidence: dict) -> str:
     return await _call(
         client,
@@ -206,10 +337,10 @@ async def _build_llm_fallback(client: Any, query: str, context: str, check_resul
         client,
         _FALLBACK_PROMPT.format(
             query=query,
-            context=context,
             unsupported_claims="\n".join(f"- {c}" for c in (check_result.get("unsupported_claims") or [])),
             source_docs=_format_source_docs(evidence),
         ),
+        context=context,
     )
 
 
@@ -0,0 +1,241 @@
+"""
+Token-budgeted conversation history for the RAG chains.
+
+build_window() turns a session's history into the LangChain messages sent as
+the prompt's {history}: the most recent `history_verbatim_messages` messages
+as-is, preceded by a running summary of everything older, all within
+`history_token_budget` tokens (token_counter.count_tokens).
+
+Summaries are written by Haiku after a turn has been answered —
+schedule_summary() is called once per turn, after the `done` event's content
+is final — and cached per session under the last message they cover, so the
+request path only does a dictionary lookup. Each summary extends the
+previous one with just the newly aged-out turns. With a session store
+passed in, the latest summary is also saved with the session, and
+load_summary() pulls it into a worker whose cache lacks it — so with a
+shared backend (SESSION_STORE_BACKEND=postgres/sqlite) a turn served by
+another worker or replica still gets the summary. Until one exists (the
+first turn past the window, or a summary still being written), older turns
+are sent as clipped excerpts, newest first, in whatever budget the verbatim
+window leaves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from backend.core.token_counter import clip_to_tokens, count_tokens
+
+logger = logging.getLogger(__name__)
+
+_SUMMARY_MODEL = "claude-haiku-4-5-20251001"
+_SUMMARY_MAX_TOKENS = 300
+# Per-message cap on what the summariser and the no-summary fallback read.
+_SUMMARY_INPUT_CLIP = 600
+_EXCERPT_CLIP = 150
+_MAX_CACHED = 4096
+
+_SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and an Adobe Experience League documentation assistant.
+
+Previous summary:
+{previous}
+
+New turns to fold in:
+{transcript}
+
+Write the updated summary in at most 120 words: the products, features and settings discussed, what the user is trying to do, and any conclusions or specific values the assistant gave. Plain prose, no preamble."""
+
+_summaries: OrderedDict[tuple[str, str], str] = OrderedDict()
+_inflight: set[tuple[str, str]] = set()
+_background: set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True)
+class HistoryWindow:
+    messages: list
+    tokens: int
+    summarized: bool
+    dropped: int
+
+
+def _fingerprint(turn: dict) -> str:
+    return hashlib.sha1(f"{turn['role']}\0{turn['content']}".encode("utf-8")).hexdigest()[:16]
+
+
+def _key(session_id: str, turn: dict) -> tuple[str, str]:
+    return (session_id, _fingerprint(turn))
+
+
+def _get_summary(key: tuple[str, str]) -> Optional[str]:
+    summary = _summaries.get(key)
+    if summary is not None:
+        _summaries.move_to_end(key)
+    return summary
+
+
+def _put_summary(key: tuple[str, str], summary: str) -> None:
+    _summaries[key] = summary
+    _summaries.move_to_end(key)
+    while len(_summaries) > _MAX_CACHED:
+        _summaries.popitem(last=False)
+
+
+def _to_message(role: str, content: str):
+    return HumanMessage(content=content) if role == "user" else AIMessage(content=content)
+
+
+def _split(history: list[dict], verbatim: int) -> tuple[list[dict], list[dict]]:
+    verbatim = max(0, verbatim)
+    # Start the verbatim window on a user message so roles still alternate.
+    cut = max(0, len(history) - verbatim)
+    while cut < len(history) and history[cut]["role"] != "user":
+        cut += 1
+    return history[:cut], history[cut:]
+
+
+def build_window(session_id: str, history: list[dict], settings: Any) -> HistoryWindow:
+    budget = settings.history_token_budget
+    older, recent = _split(history, settings.history_verbatim_messages)
+
+    recent_turns = [dict(t) for t in recent]
+    # Clip the oldest verbatim assistant answers first until the window fits.
+    recent_tokens = [count_tokens(t["content"]) for t in recent_turns]
+    for i, turn in enumerate(recent_turns):
+        if sum(recent_tokens) <= budget:
+            break
+        if turn["role"] != "assistant":
+            continue
+        over = sum(recent_tokens) - budget
+        turn["content"] = clip_to_tokens(turn["content"], max(_EXCERPT_CLIP, recent_tokens[i] - over))
+        recent_tokens[i] = count_tokens(turn["content"])
+
+    remaining = budget - sum(recent_tokens)
+    preamble = ""
+    summarized = False
+    dropped = 0
+    if older:
+        summary = _get_summary(_key(session_id, older[-1]))
+        if summary is not None and count_tokens(summary) <= remaining:
+            preamble = f"Summary of the earlier conversation: {summary}"
+            summarized = True
+        else:
+            excerpts: list[str] = []
+            for turn in reversed(older):
+                line = f"{turn['role']}: {clip_to_tokens(turn['content'], _EXCERPT_CLIP)}"
+                cost = count_tokens(line)
+                if cost > remaining:
+                    break
+                excerpts.append(line)
+                remaining -= cost
+            dropped = len(older) - len(excerpts)
+            if excerpts:
+                preamble = "Earlier in this conversation:\n" + "\n".join(reversed(excerpts))
+
+    if preamble:
+        if recent_turns:
+            # Fold into the first verbatim user message — a separate message
+            # would break user/assistant alternation.
+            recent_turns[0]["content"] = f"{preamble}\n\n{recent_turns[0]['content']}"
+        else:
+            recent_turns = [{"role": "user", "content": preamble},
+                            {"role": "assistant", "content": "Understood."}]
+
+    messages = [_to_message(t["role"], t["content"]) for t in recent_turns]
+    tokens = sum(count_tokens(t["content"]) for t in recent_turns)
+    return HistoryWindow(messages=messages, tokens=tokens, summarized=summarized, dropped=dropped)
+
+
+async def _summarize(previous: Optional[str], turns: list[dict], settings: Any) -> str:
+    from backend.core.llm_factory import get_messages_client
+
+    transcript = "\n".join(
+        f"{t['role']}: {clip_to_tokens(t['content'], _SUMMARY_INPUT_CLIP)}" for t in turns
+    )
+    client = get_messages_client(settings)
+    resp = await client.messages.create(
+        model=_SUMMARY_MODEL,
+        max_tokens=_SUMMARY_MAX_TOKENS,
+        messages=[{"role": "user", "content": _SUMMARY_PROMPT.format(
+            previous=previous or "(none)", transcript=transcript,
+        )}],
+    )
+    return resp.content[0].text.strip()
+
+
+async def load_summary(session_id: str, history: list[dict], settings: Any, store: Any) -> None:
+    """Before build_window(): fetch the session's stored summary when this
+    worker has none for the current window (one store read, off the loop)."""
+    if store is None or not settings.history_summaries_enabled:
+        return
+    older, _ = _split(history, settings.history_verbatim_messages)
+    if not older or _key(session_id, older[-1]) in _summaries:
+        return
+    try:
+        stored = await asyncio.to_thread(store.get_summary, session_id)
+        if stored is not None:
+            covers, summary = stored
+            _put_summary((session_id, covers), summary)
+    except Exception as exc:
+        logger.warning("Stored history summary unavailable for session %s: %s", session_id, exc)
+
+
+def schedule_summary(
+    session_id: str, history: list[dict], settings: Any, store: Any = None,
+) -> Optional[asyncio.Task]:
+    """
+    After a turn: start a background summary of whatever now sits outside the
+    verbatim window, unless one is cached or already running. The result is
+    also saved to `store` (a SessionStore) for other workers. Returns the
+    task (None if there is nothing to do).
+    """
+    if not settings.history_summaries_enabled:
+        return None
+    older, _ = _split(history, settings.history_verbatim_messages)
+    if not older:
+        return None
+    key = _key(session_id, older[-1])
+    if key in _summaries or key in _inflight:
+        return None
+
+    # Extend the newest cached summary rather than re-reading everything.
+    previous, start = None, 0
+    for j in range(len(older) - 2, -1, -1):
+        cached = _get_summary(_key(session_id, older[j]))
+        if cached is not None:
+            previous, start = cached, j + 1
+            break
+    new_turns = older[start:]
+
+    async def _run() -> None:
+        try:
+            summary = await _summarize(previous, new_turns, settings)
+            _put_summary(key, summary)
+            if store is not None:
+                await asyncio.to_thread(store.put_summary, session_id, key[1], summary)
+        except Exception as exc:
+            logger.warning("History summary failed for session %s: %s", session_id, exc)
+        finally:
+            _inflight.discard(key)
+
+    _inflight.add(key)
+    task = asyncio.get_running_loop().create_task(_run())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    return task
+
+
+def forget_session(session_id: str) -> None:
+    for key in [k for k in _summaries if k[0] == session_id]:
+        _summaries.pop(key, None)
+
+
+def clear() -> None:
+    _summaries.clear()
+    _inflight.clear()
@@ -0,0 +1,112 @@
+"""
+Process-wide cache of interview question retrieval context.
+
+A question's grading context depends only on the question (id + version), the
+session's product scope and the knowledge base contents — not on the candidate.
+InterviewerPipeline.stream_start prefetches every question in the background,
+and follow-up detection and grading then reuse the same docs instead of
+re-running the retrieve_with_refinement fan-out (Titan embeddings + Chroma).
+Question banks are shared across users, so most lookups are hits.
+
+Keys: (question_id, version, product, kb_version). kb_version is the restored
+Chroma snapshot id plus a generation bumped after an in-process refresh, so a
+new knowledge base never serves docs retrieved from the old one. Concurrent
+lookups of one key share a single in-flight retrieval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MAX_ENTRIES = 2048
+_TTL_S = 6 * 3600
+
+CacheKey = tuple[str, int, str, str]
+
+_entries: OrderedDict[CacheKey, tuple[list[dict], float]] = OrderedDict()
+_inflight: dict[CacheKey, asyncio.Task] = {}
+_generation = 0
+_kb_version: Optional[str] = None
+
+
+def kb_version() -> str:
+    """Identity of the knowledge base this process is serving."""
+    global _kb_version
+    if _kb_version is None:
+        from backend.core.chroma_paths import chroma_persist_dir
+        from backend.core.chroma_snapshot import read_local_marker
+
+        marker = read_local_marker(chroma_persist_dir()) or {}
+        _kb_version = f"{(marker.get('id') or 'local')[:16]}:{_generation}"
+    return _kb_version
+
+
+def bump_kb_generation() -> None:
+    """Invalidate everything — called after the knowledge base changes in-process."""
+    global _generation, _kb_version
+    _generation += 1
+    _kb_version = None
+    _entries.clear()
+    logger.info("Interview retrieval cache invalidated (generation %d)", _generation)
+
+
+def make_key(question_id: str, version: int, product: Optional[str]) -> CacheKey:
+    return (question_id, int(version or 1), product or "", kb_version())
+
+
+def get(key: CacheKey) -> Optional[list[dict]]:
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    docs, stored_at = entry
+    if time.monotonic() - stored_at > _TTL_S:
+        _entries.pop(key, None)
+        return None
+    _entries.move_to_end(key)
+    return docs
+
+
+def put(key: CacheKey, docs: list[dict]) -> None:
+    _entries[key] = (docs, time.monotonic())
+    _entries.move_to_end(key)
+    while len(_entries) > _MAX_ENTRIES:
+        _entries.popitem(last=False)
+
+
+async def get_or_fetch(key: CacheKey, fetch: Callable[[], Awaitable[list[dict]]]) -> list[dict]:
+    """
+    Cached docs for `key`, else run `fetch` once — concurrent callers await the
+    same task. Empty results (no retriever, or a failed retrieval) are not cached.
+    """
+    docs = get(key)
+    if docs is not None:
+        return docs
+
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(fetch())
+        _inflight[key] = task
+
+        def _done(t: asyncio.Task, key: CacheKey = key) -> None:
+            if _inflight.get(key) is t:
+                _inflight.pop(key, None)
+            if not t.cancelled() and t.exception() is None and t.result():
+                put(key, t.result())
+
+        task.add_done_callback(_done)
+
+    # Shielded: one caller being cancelled (e.g. /submit losing its claim) must
+    # not cancel the retrieval other sessions are waiting on.
+    return await asyncio.shield(task)
+
+
+def clear() -> None:
+    _entries.clear()
+    _inflight.clear()
@@ -12,6 +12,7 @@ import uuid
 from dataclasses import dataclass, field
 from typing import Any, AsyncGenerator, Literal
 
+from backend.core import interview_retrieval_cache, retrieval_pack
 from backend.core.llm_exceptions import ContentFilterError, RateLimitError
 from backend.core.llm_factory import get_messages_client
 from backend.core.chroma_retriever import ChromaRetriever
@@ -27,6 +28,11 @@ from backend.core.interviewer_prompt import (
 from backend.core.query_processor import QueryProcessor
 from backend.core.retrieval_refiner import retrieve_with_refinement
 from backend.core.smart_router import detect_product_intent
+from backend.core.topical_relevance import (
+    TOPICAL_THRESHOLD,
+    has_direct_url_match,
+    topical_match_score,
+)
 from config.interview_profiles import InterviewQuestion, get_question_set, profile_label
 from config.settings import get_settings
 
@@ -45,6 +51,11 @@ SessionPhase = Literal["questioning", "review", "complete"]
 # scenario-grading data exists.
 LEVEL_SCENARIO_MULTIPLIER = {"senior": 1.15, "architect": 1.0, "principal": 0.90}
 
+# Background retrievals per session while the candidate reads the first question.
+_PREFETCH_CONCURRENCY = 3
+# Strong refs so fire-and-forget prefetch tasks aren't garbage-collected mid-run.
+_background_tasks: set[asyncio.Task] = set()
+
 
 @dataclass
 class InterviewSession:
@@ -313,6 +324,33 @@ def _product_filter(profile_id: str) -> str | None:
     return mapping.get(profile_id)
 
 
+def question_search_query(q: InterviewQuestion) -> str:
+    return f"{q.retrieval_hint} {q.topic}"
+
+
+def retrieve_scoped_docs(
+    retriever: ChromaRetriever,
+    processor: QueryProcessor,
+    search_query: str,
+    product: str | None,
+) -> list[dict]:
+    """Blocking product-scoped refinement retrieval (also used offline by
+    backend/core/retrieval_pack.py to precompute grading context)."""
+    where_filter = {"product": {"$eq": product}} if product else None
+    settings = get_settings()
+    enhanced, _ = processor.preprocess_query(search_query)
+    docs, _ = retrieve_with_refinement(
+        retriever,
+        enhanced,
+        search_query,
+        n_results=settings.max_retrieval_results,
+        similarity_threshold=settings.similarity_threshold,
+        product_filter=product,
+        where_filter=where_filter,
+    )
+    return docs
+
+
 def _build_doc_context(docs: list[dict]) -> str:
     if not docs:
         return "(No documentation retrieved — evaluate from general Adobe product knowledge.)"
@@ -510,6 +548,11 @@ class InterviewerPipeline:
         if q:
             yield _question_event(q, session.current_index, session.total)
 
+        if self.retriever:
+            task = asyncio.create_task(self._prefetch_questions(session))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+
         yield {
             "type": "done",
             "model": "interviewer",
@@ -517,6 +560,24 @@ class InterviewerPipeline:
             **session.to_dict(),
         }
 
+    async def _prefetch_questions(self, session: InterviewSession) -> None:
+        """Warm interview_retrieval_cache for every question so follow-up
+        detection and grading don't wait on retrieval."""
+        sem = asyncio.Semaphore(_PREFETCH_CONCURRENCY)
+
+        async def _one(q: InterviewQuestion) -> None:
+            async with sem:
+                await self._retrieve_for_question(q, session)
+
+        try:
+            await asyncio.gather(*[_one(q) for q in list(session.questions)])
+        except Exception as exc:
+            logger.debug("Interviewer retrieval prefetch failed: %s", exc)
+
+    @staticmethod
+    def _product_scope(search_query: str, session: InterviewSession) -> str | None:
+        return _product_filter(session.profile_id) or detect_product_intent(search_query)
+
     async def _retrieve_for_query(self, search_query: str, session: InterviewSession) -> list[dict]:
         """Shared retrieval helper, scoped to the session's product — used both for
         per-question grading context and for grounding "topics to study" in real
@@ -529,27 +590,32 @@ class InterviewerPipeline:
         doc (e.g. Marketo Engage) as a citation."""
         if not self.retriever:
             return []
-        product = _product_filter(session.profile_id) or detect_product_intent(search_query)
-        where_filter = {"product": {"$eq": product}} if product else None
-        settings = get_settings()
+        product = self._product_scope(search_query, session)
         try:
-            enhanced, _ = self._processor.preprocess_query(search_query)
-            docs, _ = retrieve_with_refinement(
-                self.retriever,
-                enhanced,
-                search_query,
-                n_results=settings.max_retrieval_results,
-                similarity_threshold=settings.similarity_threshold,
-                product_filter=product,
-                where_filter=where_filter,
+            # Off the event loop so concurrent per-question grading overlaps retrieval.
+            return await asyncio.to_thread(
+                retrieve_scoped_docs, self.retriever, self._processor, search_query, product
             )
-            return docs
         except Exception as exc:
             logger.warning("Interviewer retrieval failed: %s", exc)
             return []
 
     async def _retrieve_for_question(self, q: InterviewQuestion, session: InterviewSession) -> list[dict]:
-        return await self._retrieve_for_query(f"{q.retrieval_hint} {q.topic}", session)
+        """Grading/follow-up context for a question — the offline retrieval pack
+        when it covers this (question, version, product) and matches the served
+        KB, else shared across sessions via interview_retrieval_cache
+        (prefetched at stream_start)."""
+        if not self.retriever:
+            return []
+        search_query = question_search_query(q)
+        product = self._product_scope(search_query, session)
+        packed = retrieval_pack.lookup(q.id, q.version, product)
+        if packed is not None:
+            return packed
+        key = interview_retrieval_cache.make_key(q.id, q.version, product)
+        return await interview_retrieval_cache.get_or_fetch(
+            key, lambda: self._retrieve_for_query(search_query, session)
+        )
 
     @staticmethod
     def _citation_from_contributing_questions(
@@ -582,11 +648,46 @@ class InterviewerPipeline:
         top = max(best_by_url.values(), key=lambda c: c.get("score") or 0)
         return {"url": top["url"], "title": top.get("title") or top["url"]}
 
-    async def _ground_topic_link(self, topic: str, session: InterviewSession) -> dict[str, str] | None:
+    @staticmethod
+    def _link_from_docs(topic: str, docs: list[dict]) -> dict[str, str] | None:
+        """In-memory lookup over docs already retrieved for this session's
+        grading: the best topical match (title/URL must carry the topic) among
+        docs that cleared the retrieval threshold."""
+        settings = get_settings()
+        best: tuple[float, dict[str, str]] | None = None
+        seen: set[str] = set()
+        for doc in docs:
+            score = doc.get("score")
+            if score is not None and score < settings.similarity_threshold:
+                continue
+            meta = doc.get("metadata") or {}
+            url = meta.get("url") or meta.get("source_url") or ""
+            if not url or url in seen:
+                continue
+            seen.add(url)
+            if not has_direct_url_match(topic, doc):
+                continue
+            match = topical_match_score(topic, doc)
+            if match < TOPICAL_THRESHOLD:
+                continue
+            if best is None or match > best[0]:
+                best = (match, {"url": url, "title": meta.get("title") or url})
+        return best[1] if best else None
+
+    async def _ground_topic_link(
+        self,
+        topic: str,
+        session: InterviewSession,
+        candidate_docs: list[dict] | None = None,
+    ) -> dict[str, str] | None:
         """Fallback only: used when the synthesis step didn't tag a topic with
         source_question_indices (or those questions had no citations), so there's
-        nothing to ground against — fresh scoped retrieval on the topic label is a
-        last resort, not the primary path."""
+        nothing to ground against. Tries the session's already-retrieved grading
+        docs first; fresh scoped retrieval on the topic label is the last resort."""
+        if candidate_docs:
+            link = self._link_from_docs(topic, candidate_docs)
+            if link:
+                return link
         docs = await self._retrieve_for_query(topic, session)
         settings = get_settings()
         for doc in docs:
@@ -810,62 +911,97 @@ class InterviewerPipeline:
 
         yield {"type": "evaluating", "message": "Evaluating your answers against Experience League documentation…", "total": questions_answered}
 
-        per_question: list[dict[str, Any]] = []
-        all_citations: list[dict[str, Any]] = []
-        seen_urls: set[str] = set()
+        # Retrieval + grading run concurrently (bounded by the provider rate-limit
+        # cap); events and claim-guarded writes happen here, as each finishes.
+        # Results are keyed by position so the report never depends on which
+        # question happened to finish first.
+        results_by_index: dict[int, dict[str, Any]] = {}
+        docs_by_index: dict[int, list[dict]] = {}
+        events: asyncio.Queue = asyncio.Queue()
+        sem = asyncio.Semaphore(max(1, get_settings().interviewer_eval_concurrency))
 
-        for i, q in enumerate(answered_questions):
-            yield {
-                "type": "evaluation_progress",
-                "question_index": i + 1,
-                "total": questions_answered,
-                "status": "evaluating",
-            }
-            answer = session.draft_answers.get(q.id, "").strip()
-            docs = await self._retrieve_for_question(q, session)
-            result = await self._evaluate_single(session, q, answer, docs)
-            per_question.append(result)
-            wrote = google_db.record_question_evaluation(
-                session.session_id,
-                result["question_id"],
-                result["score"],
-                result["score_pct"],
-                result["strengths"],
-                result["gaps"],
-                result["model_answer_outline"],
-                result["feedback"],
-                result["citations"],
-                claim_token,
-            )
-            if not wrote:
-                # A stale reclaim took this session's evaluation away from us mid-flight
-                # (e.g. a duplicate /submit fired after we'd been sitting stalled long
-                # enough to look abandoned). Stop burning further LLM calls — whichever
-                # run now holds the claim owns finishing this evaluation.
-                logger.warning(
-                    "Interviewer session %s lost its evaluation claim mid-submit; stopping.",
+        async def _grade(i: int, q: InterviewQuestion) -> None:
+            try:
+                async with sem:
+                    events.put_nowait(("started", i, None))
+                    answer = session.draft_answers.get(q.id, "").strip()
+                    docs = await self._retrieve_for_question(q, session)
+                    result = await self._evaluate_single(session, q, answer, docs)
+                docs_by_index[i] = docs
+                events.put_nowait(("done", i, result))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                events.put_nowait(("failed", i, exc))
+
+        tasks = [asyncio.create_task(_grade(i, q)) for i, q in enumerate(answered_questions)]
+        try:
+            while len(results_by_index) < questions_answered:
+                kind, i, payload = await events.get()
+                if kind == "started":
+                    yield {
+                        "type": "evaluation_progress",
+                        "question_index": i + 1,
+                        "total": questions_answered,
+                        "status": "evaluating",
+                    }
+                    continue
+                if kind == "failed":
+                    raise payload
+                result = payload
+                results_by_index[i] = result
+                wrote = google_db.record_question_evaluation(
                     session.session_id,
+                    result["question_id"],
+                    result["score"],
+                    result["score_pct"],
+                    result["strengths"],
+                    result["gaps"],
+                    result["model_answer_outline"],
+                    result["feedback"],
+                    result["citations"],
+                    claim_token,
                 )
-                yield {"type": "error", "message": "Evaluation was taken over by another request."}
-                return
-            yield {
-                "type": "question_evaluation",
-                "question_id": result["question_id"],
-                "question_index": i + 1,
-                "score": result["score"],
-                "score_pct": result["score_pct"],
-                "strengths": result["strengths"],
-                "gaps": result["gaps"],
-                "model_answer_outline": result["model_answer_outline"],
-                "citations": result["citations"],
-            }
-            yield {
-                "type": "evaluation_progress",
-                "question_index": i + 1,
-                "total": questions_answered,
-                "status": "done",
-                "score": result["score"],
-            }
+                if not wrote:
+                    # A stale reclaim took this session's evaluation away from us mid-flight
+                    # (e.g. a duplicate /submit fired after we'd been sitting stalled long
+                    # enough to look abandoned). Stop burning further LLM calls — whichever
+                    # run now holds the claim owns finishing this evaluation.
+                    logger.warning(
+                        "Interviewer session %s lost its evaluation claim mid-submit; stopping.",
+                        session.session_id,
+                    )
+                    yield {"type": "error", "message": "Evaluation was taken over by another request."}
+                    return
+                yield {
+                    "type": "question_evaluation",
+                    "question_id": result["question_id"],
+                    "question_index": i + 1,
+                    "score": result["score"],
+                    "score_pct": result["score_pct"],
+                    "strengths": result["strengths"],
+                    "gaps": result["gaps"],
+                    "model_answer_outline": result["model_answer_outline"],
+                    "citations": result["citations"],
+                }
+                yield {
+                    "type": "evaluation_progress",
+                    "question_index": i + 1,
+                    "total": questions_answered,
+                    "status": "done",
+                    "score": result["score"],
+                }
+        finally:
+            # Lost claim, failure, or client disconnect (aclose) — don't leave
+            # grading calls running for a result nobody will write.
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        per_question = [results_by_index[i] for i in range(questions_answered)]
+        all_citations: list[dict[str, Any]] = []
+        seen_urls: set[str] = set()
+        for result in per_question:
             for c in result["citations"]:
                 if c["url"] not in seen_urls:
                     seen_urls.add(c["url"])
@@ -898,19 +1034,26 @@ class InterviewerPipeline:
         else:
             report = {}
 
-        topics_to_read: list[dict[str, Any]] = []
-        for entry in (report.get("topics_to_read") or [])[:8]:
+        grading_docs = [d for i in range(questions_answered) for d in docs_by_index.get(i, [])]
+
+        async def _topic_item(entry: dict[str, Any]) -> dict[str, Any]:
             topic_text = (entry.get("topic") or "").strip()
             item = {"topic": topic_text, "reason": entry.get("reason") or ""}
             link = self._citation_from_contributing_questions(
                 entry.get("source_question_indices") or [], per_question
             )
             if link is None and topic_text:
-                link = await self._ground_topic_link(topic_text, session)
+                link = await self._ground_topic_link(topic_text, session, grading_docs)
             if link:
                 item["url"] = link["url"]
                 item["title"] = link["title"]
-            topics_to_read.append(item)
+            return item
+
+        # Groundings that still need a fresh search run concurrently; gather
+        # keeps the synthesis order.
+        topics_to_read: list[dict[str, Any]] = list(await asyncio.gather(
+            *[_topic_item(entry) for entry in (report.get("topics_to_read") or [])[:8]]
+        ))
 
         default_summary = f"Average score {avg_score}/5 across {questions_answered} questions."
         if questions_answered < questions_total:
@@ -4,12 +4,16 @@ Knowledge bank maintenance status — shown during Chroma restore / redeploy.
 Set KNOWLEDGE_BANK_UPDATING=true on Railway before a FORCE redeploy so users
 see a friendly message instead of empty answers. Optional
 KNOWLEDGE_BANK_UPDATE_STARTED_AT (ISO-8601) anchors the ETA; otherwise the
-server uses the time maintenance was first detected.
+server uses the time maintenance was first detected. While a streaming S3
+restore is running, its byte progress replaces the static ETA with a projection.
 """
 
 from __future__ import annotations
 
+import math
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
@@ -17,6 +21,12 @@ from config.settings import get_settings
 
 _DETAIL = "KNOWLEDGE_BANK_UPDATING"
 
+# Headroom for opening Chroma + BM25 warm-up after the last byte lands.
+_POST_RESTORE_BUFFER_S = 60
+
+_progress_lock = threading.Lock()
+_restore_progress: dict[str, Any] = {}
+
 
 def _env_truthy(name: str) -> bool:
     return os.getenv(name, "").strip().lower() in ("1", "true", "yes")
@@ -87,6 +97,39 @@ def is_knowledge_bank_updating(app: Any) -> bool:
         return True
 
 
+def record_restore_progress(bytes_done: int, bytes_total: int) -> None:
+    """Progress callback for chroma_restore.stream_restore (thread-safe)."""
+    with _progress_lock:
+        if not _restore_progress:
+            _restore_progress["started_mono"] = time.monotonic()
+        _restore_progress["bytes_done"] = int(bytes_done)
+        _restore_progress["bytes_total"] = int(bytes_total)
+        _restore_progress["updated_mono"] = time.monotonic()
+
+
+def clear_restore_progress() -> None:
+    with _progress_lock:
+        _restore_progress.clear()
+
+
+def restore_progress() -> Optional[dict[str, Any]]:
+    """Return {bytes_done, bytes_total, percent, remaining_s} or None when idle."""
+    with _progress_lock:
+        snap = dict(_restore_progress)
+    done = snap.get("bytes_done", 0)
+    total = snap.get("bytes_total", 0)
+    if not total or done <= 0:
+        return None
+    elapsed = max(snap["updated_mono"] - snap["started_mono"], 0.001)
+    remaining_s = elapsed * max(total - done, 0) / done
+    return {
+        "bytes_done": done,
+        "bytes_total": total,
+        "percent": round(min(done / total, 1.0) * 100, 1),
+        "remaining_s": round(remaining_s),
+    }
+
+
 def format_check_back_at(dt: datetime) -> str:
     """Human-readable local time hint (UTC stored, formatted for display)."""
     return dt.astimezone(timezone.utc).strftime("%H:%M UTC on %d %b %Y")
@@ -96,20 +139,26 @@ def build_maintenance_payload(app: Any) -> dict[str, Any]:
     started = resolve_started_at(app)
     eta = get_eta_minutes()
     check_back = started + timedelta(minutes=eta)
+    progress = restore_progress()
+    if progress:
+        check_back = datetime.now(timezone.utc) + timedelta(
+            seconds=progress["remaining_s"] + _POST_RESTORE_BUFFER_S
+        )
+        eta = max(1, math.ceil((check_back - started).total_seconds() / 60))
     message = (
         "The application knowledge bank is being updated. "
         f"Please check back at {format_check_back_at(check_back)}."
     )
-    return {
-        "detail": _DETAIL,
-        "maintenance": {
-            "active": True,
-            "message": message,
-            "check_back_at": check_back.isoformat(),
-            "started_at": started.isoformat(),
-            "eta_minutes": eta,
-        },
+    maintenance: dict[str, Any] = {
+        "active": True,
+        "message": message,
+        "check_back_at": check_back.isoformat(),
+        "started_at": started.isoformat(),
+        "eta_minutes": eta,
     }
+    if progress:
+        maintenance["progress"] = progress
+    return {"detail": _DETAIL, "maintenance": maintenance}
 
 
 def build_health_payload(app: Any) -> dict[str, Any]:
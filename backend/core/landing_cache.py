@@ -0,0 +1,98 @@
+"""
+Process-wide cache of published SEO landing pages (/api/landing/{slug}).
+
+A published page never changes — make_slug() hashes the question and the
+slug is claimed once — so entries need no TTL, only an LRU bound. The chat
+route fills the cache at publish time (google_db.append_conversation_message
+calls publish()), other workers fill it on first read, and unknown slugs are
+remembered briefly so crawler bursts for dead links don't reach Postgres.
+
+Each entry carries a content ETag and Last-Modified for conditional requests;
+the route adds Cache-Control so a CDN in front can absorb crawler traffic.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime
+from typing import Callable, Optional
+
+_MAX_ENTRIES = 4096
+_MISS_TTL_S = 60.0
+
+
+@dataclass(frozen=True)
+class LandingEntry:
+    payload: dict
+    etag: str
+    last_modified: Optional[str]
+
+
+_entries: OrderedDict[str, LandingEntry] = OrderedDict()
+_misses: dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def make_entry(payload: dict) -> LandingEntry:
+    body = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+    last_modified = None
+    created_at = payload.get("created_at")
+    if created_at:
+        try:
+            last_modified = format_datetime(datetime.fromisoformat(str(created_at)), usegmt=True)
+        except (TypeError, ValueError):
+            pass
+    return LandingEntry(payload=payload, etag=etag, last_modified=last_modified)
+
+
+def publish(payload: dict) -> LandingEntry:
+    entry = make_entry(payload)
+    with _lock:
+        _misses.pop(payload["slug"], None)
+        _entries[payload["slug"]] = entry
+        _entries.move_to_end(payload["slug"])
+        while len(_entries) > _MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return entry
+
+
+def lookup(slug: str) -> tuple[bool, Optional[LandingEntry]]:
+    """(known, entry) from memory alone: known is False when only the database
+    can answer; (True, None) is a remembered miss."""
+    with _lock:
+        entry = _entries.get(slug)
+        if entry is not None:
+            _entries.move_to_end(slug)
+            return True, entry
+        missed_at = _misses.get(slug)
+        if missed_at is not None and time.monotonic() - missed_at < _MISS_TTL_S:
+            return True, None
+    return False, None
+
+
+def get(slug: str, load: Callable[[str], Optional[dict]]) -> Optional[LandingEntry]:
+    """Cached entry for `slug`, else `load(slug)` (None = not published)."""
+    known, entry = lookup(slug)
+    if known:
+        return entry
+    payload = load(slug)
+    if payload is None:
+        with _lock:
+            if len(_misses) >= _MAX_ENTRIES:
+                _misses.clear()
+            _misses[slug] = time.monotonic()
+        return None
+    return publish(payload)
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+        _misses.clear()
@@ -4,17 +4,21 @@ that needs an LLM — the LangChain chains in rag_pipeline.py, and the raw
 messages-API clients used by groundedness.py, interviewer_pipeline.py, and
 chat.py's follow-ups endpoint — routes through get_chat_model() or
 get_messages_client() instead of branching on provider itself.
+
+LLM_PROVIDER=mock swaps in the offline stand-ins from mock_llm.py (load tests).
+
+Provider SDKs are imported inside the branch that uses them: langchain_anthropic
+alone is ~2s of import time, and a process only ever needs one provider.
+
+Prompt caching: both messages clients accept Anthropic-style content blocks
+with `cache_control` (the Bedrock client translates them to cachePoint
+blocks); LCEL prompts get provider-specific blocks from cached_text_blocks().
 """
 
 from __future__ import annotations
 
 from typing import Literal
 
-from langchain_anthropic import ChatAnthropic
-from langchain_aws import ChatBedrockConverse
-
-from backend.core.anthropic_messages import AnthropicMessagesClient
-from backend.core.bedrock_messages import BedrockMessagesClient
 from config.settings import Settings
 
 # Logical model name -> (direct-Anthropic id, Bedrock id). The Bedrock id
@@ -31,8 +35,16 @@ def get_chat_model(size: Literal["haiku", "sonnet"], settings: Settings, max_tok
     ChatAnthropic and ChatBedrockConverse both implement BaseChatModel, so
     callers can pipe either into the same LCEL chain unchanged."""
     anthropic_id, bedrock_id = _MODEL_IDS[size]
+    if settings.llm_provider == "mock":
+        from backend.core import mock_llm
+
+        return mock_llm.chat_model(settings, max_tokens)
     if settings.llm_provider == "bedrock":
+        from langchain_aws import ChatBedrockConverse
+
         return ChatBedrockConverse(model_id=bedrock_id, region_name=settings.bedrock_region, max_tokens=max_tokens)
+    from langchain_anthropic import ChatAnthropic
+
     return ChatAnthropic(model=anthropic_id, api_key=settings.anthropic_api_key, max_tokens=max_tokens, streaming=True)
 
 
@@ -41,6 +53,24 @@ def get_messages_client(settings: Settings):
     AnthropicMessagesClient) chosen per settings.llm_provider. Both duck-type
     AsyncAnthropic's `.messages.create(...)` interface identically, including
     the `usage` field on the response."""
+    if settings.llm_provider == "mock":
+        from backend.core import mock_llm
+
+        return mock_llm.messages_client(settings)
     if settings.llm_provider == "bedrock":
+        from backend.core.bedrock_messages import BedrockMessagesClient
+
         return BedrockMessagesClient(region_name=settings.bedrock_region)
+    from backend.core.anthropic_messages import AnthropicMessagesClient
+
     return AnthropicMessagesClient(api_key=settings.anthropic_api_key)
+
+
+def cached_text_blocks(settings: Settings, text: str) -> list[dict]:
+    """Content blocks for `text` followed by a prompt-cache breakpoint, in the
+    form the LangChain model for settings.llm_provider passes through:
+    ChatAnthropic keeps `cache_control` on the block, ChatBedrockConverse
+    needs a separate cachePoint block."""
+    if settings.llm_provider == "bedrock":
+        return [{"type": "text", "text": text}, {"cachePoint": {"type": "default"}}]
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
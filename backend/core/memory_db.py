@@ -0,0 +1,144 @@
+"""
+DB_BACKEND=memory — an in-process stand-in for the google_db functions a chat
+turn touches, so /api/chat can be load-tested without PostgreSQL.
+
+install() rebinds those names on the google_db module (callers use
+`google_db.fn(...)`, so they pick up the stand-in); everything else in
+google_db is untouched and still needs DATABASE_URL. Sessions are synthetic:
+any bearer token starting with "loadtest-" is a signed-in user whose uid is
+the token itself. Limits are unlimited; writes are counted, not stored
+beyond what the chat path reads back.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PREFIX = "loadtest-"
+_UNLIMITED = 1_000_000
+
+_lock = threading.Lock()
+_counts: Counter = Counter()
+_conversations: dict[str, str] = {}  # conversation_id -> user_id
+_messages: list[dict] = []
+_landing: dict[str, dict] = {}
+
+
+def init_tables() -> None:
+    return None
+
+
+def get_session(session_token: str) -> Optional[dict]:
+    if not session_token.startswith(TOKEN_PREFIX):
+        return None
+    return {
+        "session_token": session_token, "user_id": session_token,
+        "email": f"{session_token}@load.test", "name": session_token, "picture": None,
+        "expires_at": None, "is_admin": False, "is_disabled": False,
+    }
+
+
+def check_rate_limit(user_id: str) -> dict:
+    with _lock:
+        return {"allowed": True, "count": _counts[("daily", user_id)], "limit": _UNLIMITED}
+
+
+def check_monthly_quota(user_id: str) -> dict:
+    with _lock:
+        return {"allowed": True, "used": _counts[("monthly", user_id)], "limit": _UNLIMITED, "reset_date": None}
+
+
+def increment_daily_count(user_id: str) -> dict:
+    with _lock:
+        _counts[("daily", user_id)] += 1
+        return {"count": _counts[("daily", user_id)], "limit": _UNLIMITED}
+
+
+def increment_monthly_count(user_id: str) -> dict:
+    with _lock:
+        _counts[("monthly", user_id)] += 1
+        return {"used": _counts[("monthly", user_id)], "limit": _UNLIMITED}
+
+
+def increment_total_queries(user_id: str) -> None:
+    with _lock:
+        _counts[("total", user_id)] += 1
+
+
+def touch_last_seen(user_id: str) -> None:
+    return None
+
+
+def log_query(user_id: str, email: str, query_text: str, llm_model: str, *args, **kwargs) -> None:
+    with _lock:
+        _counts["query_logs"] += 1
+
+
+def create_conversation(user_id: str, session_id: Optional[str], title: str) -> str:
+    conversation_id = str(uuid.uuid4())
+    with _lock:
+        _conversations[conversation_id] = user_id
+    return conversation_id
+
+
+def conversation_belongs_to_user(conversation_id: str, user_id: str) -> bool:
+    with _lock:
+        return _conversations.get(conversation_id) == user_id
+
+
+def append_conversation_message(
+    conversation_id: str,
+    role: str,
+    content: str,
+    citations: Optional[list] = None,
+    slug: Optional[str] = None,
+    is_published: bool = False,
+    evidence: Optional[dict] = None,
+    query: Optional[str] = None,
+) -> None:
+    created_at = datetime.now(timezone.utc).isoformat()
+    with _lock:
+        _messages.append({"conversation_id": conversation_id, "role": role, "chars": len(content)})
+        if slug and is_published and query and role == "assistant" and slug not in _landing:
+            _landing[slug] = {
+                "slug": slug, "query": query, "answer": content, "citations": citations or [],
+                "evidence": evidence, "created_at": created_at,
+            }
+
+
+def get_landing_by_slug(slug: str) -> Optional[dict]:
+    with _lock:
+        return _landing.get(slug)
+
+
+_FUNCTIONS = (
+    init_tables, get_session, check_rate_limit, check_monthly_quota,
+    increment_daily_count, increment_monthly_count, increment_total_queries,
+    touch_last_seen, log_query, create_conversation, conversation_belongs_to_user,
+    append_conversation_message, get_landing_by_slug,
+)
+
+
+def install() -> None:
+    from backend.core import google_db
+
+    for fn in _FUNCTIONS:
+        setattr(google_db, fn.__name__, fn)
+    logger.warning("DB_BACKEND=memory — chat-path google_db calls are in-memory stand-ins")
+
+
+def stats() -> dict:
+    with _lock:
+        return {
+            "conversations": len(_conversations),
+            "messages": len(_messages),
+            "query_logs": _counts["query_logs"],
+            "landing_pages": len(_landing),
+        }
@@ -0,0 +1,89 @@
+"""
+Streaming interface shared by the messages-API clients.
+
+AnthropicMessagesClient.messages.stream(...) and
+BedrockMessagesClient.messages.stream(...) take the same arguments as
+.create(...) and return a MessageStream — an async iterator of text deltas.
+Once iteration finishes, .text holds the whole completion and .usage has the
+same fields as the `usage` on a .create(...) response:
+
+    stream = client.messages.stream(model=..., max_tokens=..., messages=[...])
+    async for delta in stream:
+        ...
+    stream.usage.output_tokens
+
+Providers feed MessageStream ("text", str), ("usage", SimpleNamespace) and
+("stop", reason) events; errors are raised as llm_exceptions types, like
+.create(...).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+
+class MessageStream:
+    def __init__(self, events: AsyncIterator[tuple[str, Any]]) -> None:
+        self._events = events
+        self.text = ""
+        self.usage: Optional[Any] = None
+        self.stop_reason: Optional[str] = None
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._deltas()
+
+    async def _deltas(self) -> AsyncIterator[str]:
+        async for kind, value in self._events:
+            if kind == "text":
+                self.text += value
+                yield value
+            elif kind == "usage":
+                self.usage = value
+            elif kind == "stop":
+                self.stop_reason = value
+
+    async def collect(self) -> str:
+        """Drain the stream and return the full text."""
+        async for _ in self:
+            pass
+        return self.text
+
+
+_END = object()
+
+
+async def iterate_in_thread(open_stream: Callable[[], Iterable]) -> AsyncIterator[Any]:
+    """
+    Consume a blocking iterator (e.g. boto3's EventStream) on a worker thread
+    and yield its items on the event loop as they arrive. Exceptions raised by
+    open_stream() or the iterator are re-raised here. Abandoning the generator
+    stops the worker at its next item.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def _pump() -> None:
+        try:
+            for item in open_stream():
+                if stop.is_set():
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+        except BaseException as exc:
+            loop.call_soon_threadsafe(queue.put_nowait, (None, exc))
+            return
+        loop.call_soon_threadsafe(queue.put_nowait, (_END, None))
+
+    loop.run_in_executor(None, _pump)
+    try:
+        while True:
+            item, exc = await queue.get()
+            if exc is not None:
+                raise exc
+            if item is _END:
+                return
+            yield item
+    finally:
+        stop.set()
@@ -0,0 +1,205 @@
+"""
+LLM_PROVIDER=mock — deterministic, offline stand-ins for every model call, so
+/api/chat can be load-tested without spending Bedrock/Anthropic tokens.
+
+  MockChatModel        LangChain chat model for the LCEL chains; streams a
+                       fixed-length answer after `first_token_ms`, at
+                       `tokens_per_s` (MOCK_LLM_* settings)
+  MockMessagesClient   .messages.create / .messages.stream, same duck type as
+                       AnthropicMessagesClient (follow-ups, summaries, checks)
+  MockEmbeddingsClient invoke_model() in the Titan Embed v2 response shape,
+                       backed by embed() — ChromaRetriever uses it in mock mode
+
+Output depends only on the prompt, so runs are repeatable. Token timing uses
+asyncio.sleep, so a slow mock never blocks the event loop — any lag measured
+under load comes from the app, not the stand-in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import json
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Iterator
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from backend.core.bm25_index import tokenize
+from backend.core.message_stream import MessageStream
+
+EMBED_DIM = 1024  # Titan Embed v2
+
+_WORDS = (
+    "Adobe", "Experience", "Platform", "dataset", "schema", "profile", "audience",
+    "segment", "journey", "destination", "data view", "connection", "report suite",
+    "dimension", "metric", "Workspace", "datastream", "Web SDK", "identity", "sandbox",
+    "configure", "select", "then", "the", "and", "to", "in", "for", "with", "your",
+)
+_METADATA = {"model_name": "mock"}
+_FOLLOW_UPS = [
+    "How do I verify the setup worked?",
+    "What are the limits I should know about?",
+    "Can this be automated with the API?",
+]
+
+
+def embed(text: str, dim: int = EMBED_DIM) -> list[float]:
+    """Signed feature hashing over bm25_index.tokenize(), L2-normalised."""
+    vec = np.zeros(dim, dtype=np.float32)
+    for token in tokenize(text):
+        h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+        vec[h % dim] += 1.0 if (h >> 63) & 1 else -1.0
+    norm = float(np.linalg.norm(vec))
+    return (vec / norm).tolist() if norm else vec.tolist()
+
+
+class MockEmbeddingsClient:
+    """Stands in for the bedrock-runtime client in ChromaRetriever."""
+
+    def __init__(self, dim: int = EMBED_DIM):
+        self.dim = dim
+
+    def invoke_model(self, *, body: str, **_kwargs) -> dict:
+        payload = json.dumps({"embedding": embed(json.loads(body)["inputText"], self.dim)})
+        return {"body": io.BytesIO(payload.encode())}
+
+
+def answer_tokens(prompt: str, n: int) -> list[str]:
+    """`n` deterministic tokens seeded by the prompt; cites [1] up front."""
+    rng = random.Random(hashlib.sha1(prompt.encode("utf-8")).hexdigest())
+    tokens = ["Based", " on", " the", " documentation", " [1],"]
+    while len(tokens) < n:
+        tokens.append(" " + rng.choice(_WORDS))
+    return tokens[:n]
+
+
+def _prompt_text(messages: list[BaseMessage]) -> str:
+    return "\n".join(str(m.content) for m in messages)
+
+
+class MockChatModel(BaseChatModel):
+    output_tokens: int = 200
+    first_token_ms: float = 300.0
+    tokens_per_s: float = 60.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock"
+
+    def _usage(self, prompt: str, n: int) -> dict:
+        input_tokens = max(1, len(prompt) // 4)
+        return {"input_tokens": input_tokens, "output_tokens": n, "total_tokens": input_tokens + n}
+
+    def _final_chunk(self, prompt: str, n: int) -> ChatGenerationChunk:
+        # UsageMetadataCallbackHandler only counts messages that name a model.
+        return ChatGenerationChunk(
+            message=AIMessageChunk(content="", usage_metadata=self._usage(prompt, n), response_metadata=_METADATA)
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = _prompt_text(messages)
+        tokens = answer_tokens(prompt, self.output_tokens)
+        time.sleep(self.first_token_ms / 1000 + len(tokens) / self.tokens_per_s)
+        message = AIMessage(
+            content="".join(tokens), usage_metadata=self._usage(prompt, len(tokens)), response_metadata=_METADATA,
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        prompt = _prompt_text(messages)
+        tokens = answer_tokens(prompt, self.output_tokens)
+        time.sleep(self.first_token_ms / 1000)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(1 / self.tokens_per_s)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+        yield self._final_chunk(prompt, len(tokens))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        prompt = _prompt_text(messages)
+        tokens = answer_tokens(prompt, self.output_tokens)
+        await asyncio.sleep(self.first_token_ms / 1000)
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(1 / self.tokens_per_s)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield self._final_chunk(prompt, len(tokens))
+
+
+class _Messages:
+    def __init__(self, first_token_ms: float, tokens_per_s: float) -> None:
+        self._first_token_ms = first_token_ms
+        self._tokens_per_s = tokens_per_s
+
+    @staticmethod
+    def _reply(messages: list[dict], max_tokens: int) -> tuple[str, SimpleNamespace]:
+        # A JSON array parses as follow-ups and reads fine as a summary.
+        text = json.dumps(_FOLLOW_UPS)
+        prompt = json.dumps(messages, default=str)
+        usage = SimpleNamespace(
+            input_tokens=max(1, len(prompt) // 4),
+            output_tokens=min(max_tokens, max(1, len(text) // 4)),
+            cache_read_input_tokens=0,
+            cache_creation_input_tokens=0,
+        )
+        return text, usage
+
+    async def create(
+        self,
+        *,
+        model: str,
+        max_tokens: int,
+        messages: list[dict],
+        system: str | list[dict] | None = None,
+    ) -> Any:
+        text, usage = self._reply(messages, max_tokens)
+        await asyncio.sleep(self._first_token_ms / 1000 + usage.output_tokens / self._tokens_per_s)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage)
+
+    def stream(
+        self,
+        *,
+        model: str,
+        max_tokens: int,
+        messages: list[dict],
+        system: str | list[dict] | None = None,
+    ) -> MessageStream:
+        return MessageStream(self._stream_events(messages, max_tokens))
+
+    async def _stream_events(self, messages: list[dict], max_tokens: int):
+        text, usage = self._reply(messages, max_tokens)
+        await asyncio.sleep(self._first_token_ms / 1000)
+        for i in range(0, len(text), 4):
+            yield "text", text[i:i + 4]
+            await asyncio.sleep(1 / self._tokens_per_s)
+        yield "usage", usage
+        yield "stop", "end_turn"
+
+
+class MockMessagesClient:
+    """Duck-types AnthropicMessagesClient (.messages.create / .messages.stream)."""
+
+    def __init__(self, first_token_ms: float = 300.0, tokens_per_s: float = 60.0) -> None:
+        self.messages = _Messages(first_token_ms, tokens_per_s)
+
+
+def chat_model(settings: Any, max_tokens: int) -> MockChatModel:
+    return MockChatModel(
+        output_tokens=min(max_tokens, settings.mock_llm_output_tokens),
+        first_token_ms=settings.mock_llm_first_token_ms,
+        tokens_per_s=settings.mock_llm_tokens_per_s,
+    )
+
+
+def messages_client(settings: Any) -> MockMessagesClient:
+    return MockMessagesClient(settings.mock_llm_first_token_ms, settings.mock_llm_tokens_per_s)
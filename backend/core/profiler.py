@@ -0,0 +1,262 @@
+"""
+On-demand profiling of the live worker — admin-only, time-boxed, one at a time.
+
+  cpu_profile(seconds, interval_ms)  a background thread samples every
+      thread's Python stack via sys._current_frames() and returns
+      collapsed stacks ("thread;module:func;module:func N" per line) —
+      feed straight to flamegraph.pl or speedscope.
+  memory_profile(seconds, top)       tracemalloc over the window; the top-N
+      allocation sites by retained growth, plus current/peak traced size.
+
+Overhead limits:
+  - seconds is clamped to PROFILING_MAX_SECONDS, interval to >= _MIN_INTERVAL_MS.
+  - The sampler times its own work (it holds the GIL while walking frames);
+    when that exceeds PROFILING_MAX_OVERHEAD of wall time it doubles the
+    interval, up to _MAX_INTERVAL_MS. The result reports the achieved overhead.
+  - tracemalloc slows every allocation while it runs, so memory profiles keep
+    PROFILING_TRACEMALLOC_FRAMES shallow and always stop tracing afterwards
+    (unless something else had already started it).
+  - Only one profile runs per worker; a second request gets ProfilerBusy.
+
+Kill switch: PROFILING_ENABLED=false refuses new profiles (ProfilingDisabled),
+and stop() ends the running one early with whatever it has collected.
+
+Idle stacks (threads parked in select/wait/queue.get) are dropped from CPU
+profiles unless include_idle is set — otherwise the thread pool dominates.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_MIN_INTERVAL_MS = 5.0
+_MAX_INTERVAL_MS = 1000.0
+_MAX_DEPTH = 128
+
+# (file basename, function) of a leaf frame that means "parked, not working".
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+    ("socket.py", "readinto"),
+    ("ssl.py", "read"),
+}
+
+
+class ProfilingDisabled(RuntimeError):
+    pass
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+@dataclass
+class CpuProfile:
+    stacks: Counter = field(default_factory=Counter)
+    samples: int = 0
+    duration_s: float = 0.0
+    interval_ms: float = 0.0
+    overhead: float = 0.0
+    stopped_early: bool = False
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format, hottest stacks first."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def summary(self) -> dict:
+        return {
+            "samples": self.samples,
+            "stacks": len(self.stacks),
+            "duration_s": round(self.duration_s, 3),
+            "interval_ms": round(self.interval_ms, 1),
+            "overhead_pct": round(self.overhead * 100, 2),
+            "stopped_early": self.stopped_early,
+        }
+
+
+_lock = threading.Lock()
+_active: Optional[dict] = None  # {"kind", "started", "seconds", "stop": Event}
+
+
+def status() -> Optional[dict]:
+    """The running profile, if any."""
+    with _lock:
+        if _active is None:
+            return None
+        return {
+            "kind": _active["kind"],
+            "seconds": _active["seconds"],
+            "elapsed_s": round(time.monotonic() - _active["started"], 2),
+        }
+
+
+def stop() -> bool:
+    """Ask the running profile to finish now. True if one was running."""
+    with _lock:
+        if _active is None:
+            return False
+        _active["stop"].set()
+        return True
+
+
+def _begin(kind: str, seconds: float, settings) -> threading.Event:
+    global _active
+    if not settings.profiling_enabled:
+        raise ProfilingDisabled("Profiling is disabled (PROFILING_ENABLED=false)")
+    with _lock:
+        if _active is not None:
+            raise ProfilerBusy(f"A {_active['kind']} profile is already running")
+        stop_event = threading.Event()
+        _active = {"kind": kind, "started": time.monotonic(), "seconds": seconds, "stop": stop_event}
+    logger.warning("Profiling started: %s for %.1fs", kind, seconds)
+    return stop_event
+
+
+def _end() -> None:
+    global _active
+    with _lock:
+        _active = None
+
+
+def _clamp_seconds(seconds: float, settings) -> float:
+    return max(0.1, min(float(seconds), float(settings.profiling_max_seconds)))
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or os.path.basename(code.co_filename)
+    return f"{module}:{code.co_name}"
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_LEAVES
+
+
+def _collapse(frame, thread_name: str) -> str:
+    labels = []
+    while frame is not None and len(labels) < _MAX_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+def _sample(profile: CpuProfile, own_ident: int, include_idle: bool) -> None:
+    names = {t.ident: t.name for t in threading.enumerate()}
+    for ident, frame in sys._current_frames().items():
+        if ident == own_ident or (not include_idle and _is_idle(frame)):
+            continue
+        profile.stacks[_collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+    profile.samples += 1
+
+
+def _run_sampler(
+    profile: CpuProfile, seconds: float, interval_ms: float, max_overhead: float,
+    include_idle: bool, stop_event: threading.Event,
+) -> None:
+    own_ident = threading.get_ident()
+    started = time.perf_counter()
+    spent = 0.0
+    interval = interval_ms / 1000
+    while True:
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            break
+        if stop_event.wait(min(interval, seconds - elapsed)):
+            profile.stopped_early = True
+            break
+        t0 = time.perf_counter()
+        _sample(profile, own_ident, include_idle)
+        spent += time.perf_counter() - t0
+        wall = time.perf_counter() - started
+        if wall and spent / wall > max_overhead and interval * 1000 < _MAX_INTERVAL_MS:
+            interval = min(interval * 2, _MAX_INTERVAL_MS / 1000)
+    profile.duration_s = time.perf_counter() - started
+    profile.interval_ms = interval * 1000
+    profile.overhead = spent / profile.duration_s if profile.duration_s else 0.0
+
+
+def cpu_profile(
+    seconds: float, settings, interval_ms: Optional[float] = None, include_idle: bool = False,
+) -> CpuProfile:
+    """Sample every thread for `seconds` (blocking — call via asyncio.to_thread)."""
+    seconds = _clamp_seconds(seconds, settings)
+    interval_ms = max(_MIN_INTERVAL_MS, min(interval_ms or settings.profiling_interval_ms, _MAX_INTERVAL_MS))
+    stop_event = _begin("cpu", seconds, settings)
+    profile = CpuProfile(interval_ms=interval_ms)
+    try:
+        sampler = threading.Thread(
+            target=_run_sampler,
+            args=(profile, seconds, interval_ms, settings.profiling_max_overhead, include_idle, stop_event),
+            name="profiler-sampler",
+            daemon=True,
+        )
+        sampler.start()
+        sampler.join()
+    finally:
+        _end()
+    logger.warning("Profiling finished: cpu %s", profile.summary())
+    return profile
+
+
+def _site(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def memory_profile(seconds: float, settings, top: int = 25) -> dict:
+    """tracemalloc growth over `seconds` (blocking — call via asyncio.to_thread)."""
+    seconds = _clamp_seconds(seconds, settings)
+    top = max(1, min(int(top), 200))
+    stop_event = _begin("memory", seconds, settings)
+    owns_tracing = not tracemalloc.is_tracing()
+    try:
+        if owns_tracing:
+            tracemalloc.start(max(1, settings.profiling_tracemalloc_frames))
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+        stopped_early = stop_event.wait(seconds)
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        duration = time.perf_counter() - started
+    finally:
+        if owns_tracing:
+            tracemalloc.stop()
+        _end()
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    growth = sorted(diff, key=lambda s: s.size_diff, reverse=True)[:top]
+    retained = after.filter_traces(filters).statistics("lineno")[:top]
+    report = {
+        "duration_s": round(duration, 3),
+        "stopped_early": stopped_early,
+        "traced_current_kb": round(current / 1024, 1),
+        "traced_peak_kb": round(peak / 1024, 1),
+        "top_growth": [
+            {"site": _site(s), "size_diff_kb": round(s.size_diff / 1024, 1), "count_diff": s.count_diff,
+             "size_kb": round(s.size / 1024, 1)}
+            for s in growth if s.size_diff > 0
+        ],
+        "top_retained": [
+            {"site": _site(s), "size_kb": round(s.size / 1024, 1), "count": s.count}
+            for s in retained
+        ],
+    }
+    logger.warning("Profiling finished: memory %.1fs, peak %.0f KB", duration, report["traced_peak_kb"])
+    return report
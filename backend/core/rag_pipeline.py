@@ -8,15 +8,17 @@ Routing:
 Both paths: retrieve once → build context → stream answer.
 """
 
+import asyncio
 import json as _json
 import logging
 import re
 import sys
+import time
 from pathlib import Path
 from typing import AsyncGenerator
 
-from backend.core.llm_factory import get_chat_model, get_messages_client
-from langchain_core.messages import AIMessage, HumanMessage
+from backend.core.llm_factory import cached_text_blocks, get_chat_model, get_messages_client
+from langchain_core.callbacks import UsageMetadataCallbackHandler
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
@@ -26,7 +28,10 @@ if str(_PROJECT_ROOT) not in sys.path:
 
 from backend.core.chroma_retriever import ChromaRetriever
 from backend.core.evidence import build_evidence
+from backend.core.history_window import build_window, load_summary, schedule_summary
+from backend.core.token_counter import count_tokens, reported_usage
 from backend.core.groundedness import (
+    IncrementalGroundednessCheck,
     extract_known_urls,
     pseudo_chunk,
     resolve_with_escalation,
@@ -45,7 +50,9 @@ from backend.core.topical_relevance import (
     topical_match_score,
 )
 from backend.core.session_store import SessionStore
-from backend.core.smart_router import classify_query, detect_product_intent
+from backend.core.stage_timing import record as record_stage, stage
+from backend.core import speculative_routing
+from backend.core.smart_router import classify_query, detect_product_intent, is_borderline
 from backend.core.url_validator import filter_valid_citations
 from config.prompts import NO_CONTEXT_MESSAGE, NO_DIRECT_MATCH_MESSAGE
 from config.settings import get_settings
@@ -161,29 +168,33 @@ Media embedding rules:
 Retrieved documentation context:
 {context}"""
 
-_HAIKU_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", _HAIKU_SYSTEM),
-    MessagesPlaceholder("history"),
-    ("human", "{query}"),
-])
+_CONTEXT_SECTION = "Retrieved documentation context:\n{context}"
 
-_SONNET_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", _SONNET_SYSTEM),
-    MessagesPlaceholder("history"),
-    ("human", "{query}"),
-])
+
+def _chat_prompt(system: str, settings) -> ChatPromptTemplate:
+    # The instructions are identical on every request: put a prompt-cache
+    # breakpoint after them, ahead of the per-query context.
+    instructions = system[: system.index(_CONTEXT_SECTION)]
+    return ChatPromptTemplate.from_messages([
+        ("system", [
+            *cached_text_blocks(settings, instructions),
+            {"type": "text", "text": _CONTEXT_SECTION},
+        ]),
+        MessagesPlaceholder("history"),
+        ("human", "{query}"),
+    ])
 
 
 # ── LCEL chains ───────────────────────────────────────────────────────────────
 
 def _build_haiku_chain(settings, max_tokens: int = 2000):
     llm = get_chat_model("haiku", settings, max_tokens)
-    return _HAIKU_PROMPT | llm | StrOutputParser()
+    return _chat_prompt(_HAIKU_SYSTEM, settings) | llm | StrOutputParser()
 
 
 def _build_sonnet_chain(settings, max_tokens: int = 4000):
     llm = get_chat_model("sonnet", settings, max_tokens)
-    return _SONNET_PROMPT | llm | StrOutputParser()
+    return _chat_prompt(_SONNET_SYSTEM, settings) | llm | StrOutputParser()
 
 
 # Tail-latency safety net for the admin-only groundedness-check path: real
@@ -196,14 +207,22 @@ _ADMIN_TRIGGERED_HAIKU_MAX_TOKENS = 1200
 _ADMIN_TRIGGERED_SONNET_MAX_TOKENS = 1400
 
 
-def _to_lc_history(history: list[dict]) -> list:
-    messages = []
-    for turn in history:
-        if turn["role"] == "user":
-            messages.append(HumanMessage(content=turn["content"]))
-        else:
-            messages.append(AIMessage(content=turn["content"]))
-    return messages
+def _prompt_tokens(system: str, context: str, query: str, window) -> int:
+    return count_tokens(system) + count_tokens(context) + count_tokens(query) + window.tokens
+
+
+def _usage_for_done(usage_handler, system: str, context: str, query: str, window, response: str) -> dict:
+    """Provider-reported token usage for the `done` event, or a local count
+    of the same prompt parts when the provider reported none."""
+    usage = reported_usage(usage_handler)
+    if usage is None:
+        usage = {
+            "input_tokens": _prompt_tokens(system, context, query, window),
+            "output_tokens": count_tokens(response),
+            "cache_read_tokens": 0,
+            "cache_write_tokens": 0,
+        }
+    return {**usage, "history_tokens": window.tokens, "history_summarized": window.summarized}
 
 
 def _contextualize_query(query: str, history: list[dict]) -> str:
@@ -245,6 +264,20 @@ def _build_media_context(docs: list[dict]) -> str:
     return "\n".join(lines)
 
 
+async def _timed_llm(chunks):
+    """Pass LLM chunks through, recording time-to-first-token and total stream time."""
+    started = time.perf_counter()
+    first = True
+    try:
+        async for chunk in chunks:
+            if first:
+                record_stage("llm_first_token", time.perf_counter() - started)
+                first = False
+            yield chunk
+    finally:
+        record_stage("llm_stream", time.perf_counter() - started)
+
+
 # ── Pipeline ──────────────────────────────────────────────────────────────────
 
 class RAGPipeline:
@@ -264,13 +297,27 @@ class RAGPipeline:
             yield {"type": "status", "stage": "understanding"}
 
             settings = get_settings()
-            history = self.session_store.get_history(session_id)
+            history = await asyncio.to_thread(self.session_store.get_history, session_id)
 
             # Route: haiku_only flag overrides auto-routing
             routed = "haiku" if haiku_only else classify_query(query)
             logger.info(f"SmartRouter: '{query[:60]}' → {routed}")
 
-            if routed == "sonnet":
+            speculative = (
+                not haiku_only
+                and settings.speculative_routing_enabled
+                and is_borderline(query)
+                and await asyncio.to_thread(speculative_routing.try_acquire, settings)
+            )
+            if speculative:
+                try:
+                    async for event in self._stream_chain(
+                        query, session_id, history, settings, user_email, speculative=True,
+                    ):
+                        yield event
+                finally:
+                    speculative_routing.release()
+            elif routed == "sonnet":
                 async for event in self._stream_agent(query, session_id, history, settings, user_email):
                     yield event
             else:
@@ -281,6 +328,13 @@ class RAGPipeline:
             logger.exception("RAG pipeline error")
             yield {"type": "error", "message": str(exc)}
 
+    async def _save_exchange(self, session_id: str, query: str, answer: str) -> None:
+        """Append both turns in one worker-thread hop — the store may be a network DB."""
+        def _append():
+            self.session_store.append_turn(session_id, "user", query)
+            self.session_store.append_turn(session_id, "assistant", answer)
+        await asyncio.to_thread(_append)
+
     def _is_admin_request(self, user_email: str | None) -> bool:
         """Gate for the admin-only groundedness-check rollout — reuses the same
         ADMIN_EMAIL identity mechanism as backend/api/deps.py:get_admin_user()
@@ -320,15 +374,16 @@ class RAGPipeline:
         return evidence
 
     def _retrieve_docs(self, search_query, user_query, settings, product_intent, where_filter):
-        return retrieve_with_refinement(
-            self.retriever,
-            search_query,
-            user_query,
-            n_results=settings.max_retrieval_results,
-            similarity_threshold=settings.similarity_threshold,
-            product_filter=product_intent,
-            where_filter=where_filter,
-        )
+        with stage("retrieval"):
+            return retrieve_with_refinement(
+                self.retriever,
+                search_query,
+                user_query,
+                n_results=settings.max_retrieval_results,
+                similarity_threshold=settings.similarity_threshold,
+                product_filter=product_intent,
+                where_filter=where_filter,
+            )
 
     async def _run_retrieval_path(
         self,
@@ -342,7 +397,8 @@ class RAGPipeline:
         raw_docs, refinement = self._retrieve_docs(
             search_query, query, settings, product_intent, where_filter
         )
-        assessment = assess_retrieval(query, raw_docs, product_intent)
+        with stage("topical_gate"):
+            assessment = assess_retrieval(query, raw_docs, product_intent)
         relevant_docs = assessment["relevant_docs"]
         product_docs = assessment["product_docs"]
         topical_scores = assessment["topical_scores"]
@@ -364,7 +420,8 @@ class RAGPipeline:
             unscoped_docs, unscoped_refinement = self._retrieve_docs(
                 search_query, query, settings, None, None,
             )
-            unscoped_assessment = assess_retrieval(query, unscoped_docs, None)
+            with stage("topical_gate"):
+                unscoped_assessment = assess_retrieval(query, unscoped_docs, None)
             if unscoped_assessment["relevant_docs"]:
                 raw_docs = unscoped_docs
                 refinement = unscoped_refinement
@@ -447,9 +504,10 @@ class RAGPipeline:
         history: list[dict],
     ) -> tuple[str, str, str | None, dict | None]:
         """Return (query, search_query, product_intent, where_filter)."""
-        enhanced, _ = self.query_processor.preprocess_query(query)
-        search_query = _contextualize_query(enhanced, history)
-        product_intent = detect_product_intent(query)
+        with stage("preprocess"):
+            enhanced, _ = self.query_processor.preprocess_query(query)
+            search_query = _contextualize_query(enhanced, history)
+            product_intent = detect_product_intent(query)
         where_filter = {"product": {"$eq": product_intent}} if product_intent else None
         return query, search_query, product_intent, where_filter
 
@@ -481,7 +539,7 @@ class RAGPipeline:
 
     # ── Haiku: single-pass LCEL chain ─────────────────────────────────────────
 
-    async def _stream_chain(self, query, session_id, history, settings, user_email=None):
+    async def _stream_chain(self, query, session_id, history, settings, user_email=None, speculative=False):
         query_to_use, search_query, product_intent, where_filter = (
             self._resolve_retrieval_inputs(query, history)
         )
@@ -513,8 +571,7 @@ class RAGPipeline:
             )
             yield {"type": "evidence", **evidence}
             yield {"type": "token", "content": _OUT_OF_SCOPE_RESPONSE}
-            self.session_store.append_turn(session_id, "user", query_to_use)
-            self.session_store.append_turn(session_id, "assistant", _OUT_OF_SCOPE_RESPONSE)
+            await self._save_exchange(session_id, query_to_use, _OUT_OF_SCOPE_RESPONSE)
             yield {"type": "citations", "citations": []}
             yield {"type": "done", "model": "none", "session_id": session_id,
                    "input_tokens": 0, "output_tokens": 0}
@@ -533,7 +590,10 @@ class RAGPipeline:
         yield {"type": "context", "context": context}
 
         raw_citations = self._extract_citations(raw_docs)
-        lc_history = _to_lc_history(history)
+        await load_summary(session_id, history, settings, self.session_store)
+        window = build_window(session_id, history, settings)
+        lc_history = window.messages
+        usage_handler = UsageMetadataCallbackHandler()
 
         admin_triggered = is_admin and should_run_groundedness_check(evidence)
         chain = (
@@ -552,15 +612,28 @@ class RAGPipeline:
             yield {"type": "status", "stage": "writing"}
 
         full_response = ""
+        model_label = "haiku"
         if admin_triggered:
-            async for chunk in chain.astream({"context": context, "history": lc_history, "query": query_to_use}):
-                full_response += chunk
+            # Check completed sections while the rest is still generating.
+            checker = IncrementalGroundednessCheck(
+                get_messages_client(settings), context, known_urls=extract_known_urls(evidence),
+            )
+            try:
+                async for chunk in _timed_llm(chain.astream(
+                    {"context": context, "history": lc_history, "query": query_to_use},
+                    config={"callbacks": [usage_handler]},
+                )):
+                    full_response += chunk
+                    checker.feed(chunk)
+            except BaseException:
+                checker.cancel()
+                raise
             yield {
                 "type": "status", "stage": "reviewing",
                 "message": "Double-checking this against the source docs before showing it to you…",
             }
             groundedness_task = _asyncio.create_task(
-                self._apply_groundedness_ux(settings, query_to_use, full_response, context, evidence)
+                self._apply_groundedness_ux(settings, query_to_use, full_response, context, evidence, checker)
             )
             done, pending = await _asyncio.wait({groundedness_task}, timeout=15)
             if pending:
@@ -573,21 +646,45 @@ class RAGPipeline:
             yield {"type": "groundedness", "ux_action": resolved["ux_action"], "escalated": resolved["escalated"]}
             for piece in pseudo_chunk(full_response):
                 yield {"type": "token", "content": piece}
+        elif speculative:
+            # Borderline route: Haiku's opening decides between Haiku and a
+            # Sonnet run already generating on the same context.
+            # Separate usage per branch: only the winner's is reported in `done`.
+            outcome: dict = {}
+            branch_usage = {"haiku": usage_handler, "sonnet": UsageMetadataCallbackHandler()}
+            async for chunk in _timed_llm(speculative_routing.speculate(
+                chain,
+                _build_sonnet_chain(settings),
+                {"context": context, "history": lc_history, "query": query_to_use},
+                {model: {"callbacks": [handler]} for model, handler in branch_usage.items()},
+                outcome,
+                prompt_tokens={
+                    "haiku": _prompt_tokens(_HAIKU_SYSTEM, context, query_to_use, window),
+                    "sonnet": _prompt_tokens(_SONNET_SYSTEM, context, query_to_use, window),
+                },
+            )):
+                full_response += chunk
+                yield {"type": "token", "content": chunk}
+            model_label = outcome.get("model", "haiku")
+            usage_handler = branch_usage[model_label]
         else:
-            async for chunk in chain.astream({"context": context, "history": lc_history, "query": query_to_use}):
+            async for chunk in _timed_llm(chain.astream(
+                {"context": context, "history": lc_history, "query": query_to_use},
+                config={"callbacks": [usage_handler]},
+            )):
                 full_response += chunk
                 yield {"type": "token", "content": chunk}
 
         citations = await validation_task
-        self.session_store.append_turn(session_id, "user", query_to_use)
-        self.session_store.append_turn(session_id, "assistant", full_response)
+        await self._save_exchange(session_id, query_to_use, full_response)
+        schedule_summary(session_id, history + [
+            {"role": "user", "content": query_to_use}, {"role": "assistant", "content": full_response},
+        ], settings, self.session_store)
         yield {"type": "citations", "citations": citations}
-        # Estimate token counts from text lengths (÷4 chars per token)
-        input_tokens = (len(_HAIKU_SYSTEM) + len(context) + len(query_to_use)
-                        + sum(len(getattr(m, "content", "")) for m in lc_history)) // 4
-        output_tokens = len(full_response) // 4
-        yield {"type": "done", "model": "haiku", "session_id": session_id,
-               "input_tokens": input_tokens, "output_tokens": output_tokens}
+        system = _SONNET_SYSTEM if model_label == "sonnet" else _HAIKU_SYSTEM
+        yield {"type": "done", "model": model_label, "session_id": session_id,
+               **({"speculative": True} if speculative else {}),
+               **_usage_for_done(usage_handler, system, context, query_to_use, window, full_response)}
 
     # ── Sonnet: single-pass LCEL chain ───────────────────────────────────────
 
@@ -623,8 +720,7 @@ class RAGPipeline:
             )
             yield {"type": "evidence", **evidence}
             yield {"type": "token", "content": _OUT_OF_SCOPE_RESPONSE}
-            self.session_store.append_turn(session_id, "user", query_to_use)
-            self.session_store.append_turn(session_id, "assistant", _OUT_OF_SCOPE_RESPONSE)
+            await self._save_exchange(session_id, query_to_use, _OUT_OF_SCOPE_RESPONSE)
             yield {"type": "citations", "citations": []}
             yield {"type": "done", "model": "none", "session_id": session_id,
                    "input_tokens": 0, "output_tokens": 0}
@@ -642,7 +738,10 @@ class RAGPipeline:
         yield {"type": "context", "context": context}
 
         raw_citations = self._extract_citations(raw_docs)
-        lc_history = _to_lc_history(history)
+        await load_summary(session_id, history, settings, self.session_store)
+        window = build_window(session_id, history, settings)
+        lc_history = window.messages
+        usage_handler = UsageMetadataCallbackHandler()
 
         admin_triggered = is_admin and should_run_groundedness_check(evidence)
         chain = (
@@ -661,14 +760,26 @@ class RAGPipeline:
 
         full_response = ""
         if admin_triggered:
-            async for chunk in chain.astream({"context": context, "history": lc_history, "query": query_to_use}):
-                full_response += chunk
+            # Check completed sections while the rest is still generating.
+            checker = IncrementalGroundednessCheck(
+                get_messages_client(settings), context, known_urls=extract_known_urls(evidence),
+            )
+            try:
+                async for chunk in _timed_llm(chain.astream(
+                    {"context": context, "history": lc_history, "query": query_to_use},
+                    config={"callbacks": [usage_handler]},
+                )):
+                    full_response += chunk
+                    checker.feed(chunk)
+            except BaseException:
+                checker.cancel()
+                raise
             yield {
                 "type": "status", "stage": "reviewing",
                 "message": "Double-checking this against the source docs before showing it to you…",
             }
             groundedness_task = _asyncio.create_task(
-                self._apply_groundedness_ux(settings, query_to_use, full_response, context, evidence)
+                self._apply_groundedness_ux(settings, query_to_use, full_response, context, evidence, checker)
             )
             done, pending = await _asyncio.wait({groundedness_task}, timeout=15)
             if pending:
@@ -682,24 +793,27 @@ class RAGPipeline:
             for piece in pseudo_chunk(full_response):
                 yield {"type": "token", "content": piece}
         else:
-            async for chunk in chain.astream({"context": context, "history": lc_history, "query": query_to_use}):
+            async for chunk in _timed_llm(chain.astream(
+                {"context": context, "history": lc_history, "query": query_to_use},
+                config={"callbacks": [usage_handler]},
+            )):
                 full_response += chunk
                 yield {"type": "token", "content": chunk}
 
         citations = await validation_task
-        self.session_store.append_turn(session_id, "user", query_to_use)
-        self.session_store.append_turn(session_id, "assistant", full_response)
+        await self._save_exchange(session_id, query_to_use, full_response)
+        schedule_summary(session_id, history + [
+            {"role": "user", "content": query_to_use}, {"role": "assistant", "content": full_response},
+        ], settings, self.session_store)
         yield {"type": "citations", "citations": citations}
-        input_tokens = (len(_SONNET_SYSTEM) + len(context) + len(query_to_use)
-                        + sum(len(getattr(m, "content", "")) for m in lc_history)) // 4
-        output_tokens = len(full_response) // 4
         yield {"type": "done", "model": "sonnet", "session_id": session_id,
-               "input_tokens": input_tokens, "output_tokens": output_tokens}
+               **_usage_for_done(usage_handler, _SONNET_SYSTEM, context, query_to_use, window, full_response)}
 
     # ── Helpers ───────────────────────────────────────────────────────────────
 
     async def _apply_groundedness_ux(
         self, settings, query: str, answer: str, context: str, evidence: dict,
+        checker: IncrementalGroundednessCheck | None = None,
     ) -> dict:
         """Buffered-path post-processing: check the complete answer against its
         context, and if it fabricates specifics, surgically remove or replace
@@ -711,11 +825,18 @@ class RAGPipeline:
         result["final_answer"]. Exposing the full dict lets callers (production
         SSE stream, eval harness) observe what the check actually decided instead
         of having to re-run it, which would trivially find nothing wrong since
-        the answer is already post-UX-layer."""
+        the answer is already post-UX-layer.
+
+        With `checker` (fed while the answer streamed), the initial check is
+        its merged per-section result instead of a fresh whole-answer call."""
         client = get_messages_client(settings)
-        known_urls = extract_known_urls(evidence)
-        check_result = await run_groundedness_check(client, context, answer, known_urls=known_urls)
-        return await resolve_with_escalation(client, query, answer, context, evidence, check_result)
+        with stage("groundedness"):
+            if checker is not None:
+                check_result = await checker.finish()
+            else:
+                known_urls = extract_known_urls(evidence)
+                check_result = await run_groundedness_check(client, context, answer, known_urls=known_urls)
+            return await resolve_with_escalation(client, query, answer, context, evidence, check_result)
 
     # Minimum similarity score for a doc to become a citation.
     # Docs retrieved below this threshold are used for LLM context but not shown as sources.
@@ -1,24 +1,30 @@
 """
 Data refresh pipeline — runs in background when triggered from admin panel.
 
-Steps:
-  1. Sync changed docs from AdobeDocs GitHub → S3
-  2. Re-ingest changed files into ChromaDB
-  3. Validate + attach citation URLs for the newly ingested chunks
-  4. Re-run media enrichment
-  5. Upload updated ChromaDB to S3 (for Railway cold starts)
-
-Status is written to data/refresh_status.json so the admin panel can poll it.
+Stages (a small DAG, executed in-process in dependency order):
+  1. sync       Sync changed docs from AdobeDocs GitHub → S3
+  2. ingest     Re-ingest changed files into ChromaDB
+  3. citations  Validate + attach citation URLs for the newly ingested chunks
+  4. media      Re-run media enrichment
+  5. upload     Publish the ChromaDB snapshot to S3 (for Railway cold starts)
+     (preceded by the interview retrieval pack and corpus statistics sidecars)
+
+Every stage shares one Chroma client and receives the changed-key set from
+the sync stage in memory. Per-stage state, timings and live log lines are
+written to data/refresh_status.json so the admin panel can poll it; a failed
+run can be resumed from the first stage that did not complete.
 """
 
+import asyncio
 import json
 import logging
-import subprocess
-import sys
+import os
 import threading
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from backend.core.knowledge_base_refresh import refresh_source_label
 
@@ -30,6 +36,9 @@ STATUS_FILE = _ROOT / "data" / "refresh_status.json"
 _lock = threading.Lock()
 _running = False
 
+_LOG_TAIL = 200
+_STATUS_WRITE_INTERVAL_S = 2.0
+
 
 def get_status() -> dict:
     if STATUS_FILE.exists():
@@ -98,44 +107,277 @@ def enrich_status_for_admin(
 
 def _write_status(status: dict) -> None:
     STATUS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    STATUS_FILE.write_text(json.dumps(status, indent=2))
+    # Atomic replace — the admin panel polls this file while stages write it.
+    tmp = STATUS_FILE.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(status, indent=2, default=str))
+    os.replace(tmp, STATUS_FILE)
 
 
-def _run_script(script: str, args: list[str], status: dict, log: list) -> bool:
-    """Run a script as subprocess, stream output to log list."""
-    cmd = [sys.executable, str(_ROOT / "scripts" / script)] + args
-    log.append(f"▶ Running {script}...")
-    _write_status(status)
+# ── Stage graph ──────────────────────────────────────────────────────────────
 
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=str(_ROOT),
-            timeout=3600,
+@dataclass
+class RefreshContext:
+    """State shared by every stage of one refresh run."""
+
+    force: bool = False
+    # S3 keys re-synced this run; None means "unknown" (stages fall back to all).
+    changed_keys: Optional[set[str]] = None
+    files_updated: int = 0
+    results: dict[str, Any] = field(default_factory=dict)
+    _collection: Any = None
+
+    def collection(self):
+        """Lazily open the one Chroma client every stage shares."""
+        if self._collection is None:
+            from scripts.ingest_to_chroma import open_collection
+
+            self._collection = open_collection()
+        return self._collection
+
+    @property
+    def has_changes(self) -> bool:
+        return self.force or self.files_updated > 0
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    label: str
+    run: Callable[[RefreshContext], Optional[str]]
+    deps: tuple[str, ...] = ()
+    # Required stages abort the run on failure; optional ones log and continue.
+    required: bool = True
+    # Skip when the sync stage reports no changed files (unless force).
+    needs_changes: bool = True
+
+
+def _stage_sync(ctx: RefreshContext) -> str:
+    from scripts.sync_docs_to_s3 import run_sync
+
+    result = run_sync(force=ctx.force)
+    ctx.changed_keys = set(result["changed_keys"])
+    ctx.files_updated = result["updated"]
+    return f"{ctx.files_updated} files updated"
+
+
+def _stage_ingest(ctx: RefreshContext) -> str:
+    from scripts.ingest_to_chroma import ingest_entries, load_registry_entries
+
+    entries = load_registry_entries(ctx.changed_keys)
+    result = ingest_entries(ctx.collection(), entries)
+    ctx.results["ingest"] = result
+    return f"{result['chunks']} chunks from {result['documents']} documents"
+
+
+def _stage_citations(ctx: RefreshContext) -> None:
+    # Without this, newly ingested chunks keep url="" and won't produce a live
+    # citation link until the next GitHub Actions run happens to patch them.
+    from src.utils.chroma_citation_enrich import enrich_chroma_collection
+
+    asyncio.run(
+        enrich_chroma_collection(
+            changed_s3_keys=ctx.changed_keys,
+            collection=ctx.collection(),
         )
-        lines = (result.stdout + result.stderr).strip().splitlines()
-        for line in lines[-20:]:       # keep last 20 lines per script
-            log.append(line)
+    )
+
+
+def _stage_media(ctx: RefreshContext) -> str:
+    from scripts.ingest_with_media import process_collection
+
+    # Ingest already writes media for the chunks it upserts; this re-checks only
+    # the changed documents instead of rescanning the whole collection.
+    stats, _ = process_collection(ctx.collection(), changed_keys=ctx.changed_keys)
+    return f"{stats['chunks']} chunks across {stats['pages']} pages with media"
+
+
+def _stage_retrieval_pack(ctx: RefreshContext) -> str:
+    from backend.core import retrieval_pack
+    from backend.core.chroma_retriever import ChromaRetriever
+    from scripts.ingest_to_chroma import CHROMA_DIR
+
+    retriever = ChromaRetriever(persist_dir=str(CHROMA_DIR))
+    pack = retrieval_pack.build_pack(retriever, chunk_count=ctx.collection().count())
+    retrieval_pack.write_pack(pack, CHROMA_DIR)
+    return f"{len(pack['entries'])} interview questions precomputed"
+
+
+def _stage_corpus_stats(ctx: RefreshContext) -> str:
+    from backend.core import corpus_stats
+    from scripts.ingest_to_chroma import CHROMA_DIR
+
+    summary = corpus_stats.refresh(ctx.collection(), CHROMA_DIR, ctx.changed_keys)
+    return f"{summary['chunk_count']} chunks across {len(summary['product_breakdown'])} products"
+
+
+def _stage_upload(ctx: RefreshContext) -> str:
+    from scripts.upload_chroma_to_s3 import publish
+
+    meta = publish(collection=ctx.collection())
+    stats = meta["stats"]
+    return f"{stats['chunks_uploaded']}/{stats['chunks_total']} snapshot chunks uploaded"
+
+
+STAGES: tuple[Stage, ...] = (
+    Stage("sync", "Sync GitHub → S3", _stage_sync, needs_changes=False),
+    Stage("ingest", "Ingest into ChromaDB", _stage_ingest, deps=("sync",)),
+    Stage("citations", "Citation metadata enrichment", _stage_citations,
+          deps=("ingest",), required=False),
+    # Media groups chunks by the url the citation stage writes.
+    Stage("media", "Media enrichment", _stage_media, deps=("citations",), required=False),
+    # Built from the final metadata so the pack ships inside the uploaded snapshot.
+    Stage("retrieval_pack", "Interview retrieval pack", _stage_retrieval_pack,
+          deps=("media",), required=False),
+    # Incremental over the changed documents; also ships inside the snapshot.
+    Stage("corpus_stats", "Corpus statistics", _stage_corpus_stats, deps=("media",), required=False),
+    Stage("upload", "Upload ChromaDB → S3", _stage_upload, deps=("retrieval_pack", "corpus_stats"),
+          required=False),
+)
+
+
+def _topological(stages: tuple[Stage, ...]) -> list[Stage]:
+    by_name = {s.name: s for s in stages}
+    ordered: list[Stage] = []
+    seen: set[str] = set()
+
+    def visit(stage: Stage, path: tuple[str, ...]) -> None:
+        if stage.name in seen:
+            return
+        if stage.name in path:
+            raise ValueError(f"Refresh stage cycle: {' → '.join(path + (stage.name,))}")
+        for dep in stage.deps:
+            visit(by_name[dep], path + (stage.name,))
+        seen.add(stage.name)
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage, ())
+    return ordered
+
+
+class _StatusLogHandler(logging.Handler):
+    """Mirror log records from the refresh thread into the live status log."""
+
+    def __init__(self, status: dict, log: list, thread_id: int):
+        super().__init__(level=logging.INFO)
+        self._status = status
+        self._log = log
+        self._thread_id = thread_id
+        self._last_write = 0.0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread != self._thread_id:
+            return
+        try:
+            self._log.append(record.getMessage().strip())
+            del self._log[:-_LOG_TAIL]
+            now = time.monotonic()
+            if now - self._last_write >= _STATUS_WRITE_INTERVAL_S:
+                self._last_write = now
+                _write_status(self._status)
+        except Exception:
+            pass
+
+
+def run_stages(
+    stages: tuple[Stage, ...],
+    ctx: RefreshContext,
+    status: dict,
+    log: list,
+    *,
+    completed: Optional[set[str]] = None,
+) -> None:
+    """
+    Execute `stages` in dependency order, recording per-stage state in status.
+
+    Stages named in `completed` (a resumed run) are skipped. Raises RuntimeError
+    when a required stage fails; the checkpoint in status["checkpoint"] lists the
+    stages that finished so a later run can resume after them.
+    """
+    completed = set(completed or ())
+    stage_status: dict[str, dict] = status.setdefault("stages", {})
+    outcome: dict[str, str] = {name: "success" for name in completed}
+
+    for stage in _topological(stages):
+        entry = stage_status.setdefault(stage.name, {"label": stage.label})
+        if stage.name in completed:
+            entry["state"] = "success"
+            entry["resumed"] = True
+            continue
+        if any(outcome.get(dep) == "skipped" for dep in stage.deps) or (
+            stage.needs_changes and not ctx.has_changes
+        ):
+            entry.update({"state": "skipped", "duration_s": 0})
+            outcome[stage.name] = "skipped"
+            log.append(f"↷ {stage.label} skipped — no files changed")
+            continue
+
+        log.append(f"=== {stage.label} ===")
+        started = time.monotonic()
+        entry.update({
+            "state": "running",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "detail": None,
+            "error": None,
+        })
+        status["current_stage"] = stage.name
+        _write_status(status)
+        try:
+            detail = stage.run(ctx)
+        except Exception as exc:
+            logger.exception("Refresh stage %s failed", stage.name)
+            entry.update({
+                "state": "failed",
+                "duration_s": round(time.monotonic() - started, 1),
+                "error": str(exc),
+            })
+            outcome[stage.name] = "failed"
+            if stage.required:
+                log.append(f"✗ {stage.label} failed: {exc}")
+                _write_status(status)
+                raise RuntimeError(f"{stage.label} failed: {exc}") from exc
+            log.append(f"⚠ {stage.label} failed — continuing ({exc})")
+            _write_status(status)
+            continue
+
+        entry.update({
+            "state": "success",
+            "duration_s": round(time.monotonic() - started, 1),
+            "detail": detail,
+        })
+        outcome[stage.name] = "success"
+        completed.add(stage.name)
+        status["checkpoint"] = {
+            "completed": sorted(completed),
+            "force": ctx.force,
+            "files_updated": ctx.files_updated,
+        }
+        log.append(f"✓ {stage.label} completed" + (f" — {detail}" if detail else ""))
         _write_status(status)
 
-        if result.returncode != 0:
-            log.append(f"✗ {script} exited with code {result.returncode}")
-            return False
-        log.append(f"✓ {script} completed")
-        return True
-    except subprocess.TimeoutExpired:
-        log.append(f"✗ {script} timed out after 1 hour")
-        return False
-    except Exception as e:
-        log.append(f"✗ {script} failed: {e}")
-        return False
+    status["current_stage"] = None
+
 
+def _load_changed_keys() -> Optional[set[str]]:
+    from scripts.sync_docs_to_s3 import CHANGED_KEYS_PATH
 
-def _run_refresh(force: bool = False):
+    if not CHANGED_KEYS_PATH.exists():
+        return None
+    return {line.strip() for line in CHANGED_KEYS_PATH.read_text().splitlines() if line.strip()}
+
+
+def _run_refresh(force: bool = False, resume: bool = False):
     global _running
     status = get_status()
+    checkpoint = status.get("checkpoint") if resume else None
+    completed: set[str] = set()
+    ctx = RefreshContext(force=force)
+    if checkpoint and status.get("state") == "failed":
+        completed = set(checkpoint.get("completed") or [])
+        ctx.force = bool(checkpoint.get("force", force))
+        ctx.files_updated = int(checkpoint.get("files_updated") or 0)
+        ctx.changed_keys = _load_changed_keys()
+
     log: list[str] = []
     started = datetime.now(timezone.utc)
 
@@ -144,69 +386,46 @@ def _run_refresh(force: bool = False):
         "started_at": started.isoformat(),
         "log": log,
         "error": None,
+        "stages": {} if not completed else status.get("stages", {}),
     })
+    if completed:
+        log.append(f"↻ Resuming after: {', '.join(sorted(completed))}")
     _write_status(status)
 
+    handler = _StatusLogHandler(status, log, threading.get_ident())
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
     try:
-        # Step 1: Sync from GitHub → S3
-        log.append("=== Step 1: Sync GitHub → S3 ===")
-        sync_args = ["--force"] if force else []
-        if not _run_script("sync_docs_to_s3.py", sync_args, status, log):
-            raise RuntimeError("Sync failed")
-
-        # Read how many files were updated
-        from scripts.sync_docs_to_s3 import _load_manifest
-        manifest = _load_manifest()
-        files_updated = manifest.get("_last_updated_count", 0)
-        status["files_updated"] = files_updated
-
-        if files_updated == 0 and not force:
-            log.append("✓ No files changed — skipping ingest")
-        else:
-            # Step 2: Re-ingest into ChromaDB
-            log.append("=== Step 2: Ingest into ChromaDB ===")
-            if not _run_script("ingest_to_chroma.py", ["--changed-only"], status, log):
-                raise RuntimeError("Ingest failed")
-
-            # Step 3: Citation metadata enrichment (URL validation) — without this,
-            # newly ingested chunks keep url="" and won't produce a live citation
-            # link until the next GitHub Actions run happens to patch them.
-            log.append("=== Step 3: Citation metadata enrichment ===")
-            if not _run_script("enrich_citation_metadata.py", ["--changed-only"], status, log):
-                log.append("⚠ Citation enrichment failed — continuing")
-
-            # Step 4: Media enrichment
-            log.append("=== Step 4: Media enrichment ===")
-            if not _run_script("ingest_with_media.py", [], status, log):
-                log.append("⚠ Media enrichment failed — continuing")
-
-            # Step 5: Upload ChromaDB to S3
-            log.append("=== Step 5: Upload ChromaDB → S3 ===")
-            if not _run_script("upload_chroma_to_s3.py", [], status, log):
-                log.append("⚠ ChromaDB upload failed — local DB updated but S3 backup failed")
+        run_stages(STAGES, ctx, status, log, completed=completed)
+        status["files_updated"] = ctx.files_updated
 
         # Get final chunk count
         try:
-            import chromadb
-            from chromadb.config import Settings as ChromaSettings
-            client = chromadb.PersistentClient(
-                path=str(_ROOT / "chroma_db"),
-                settings=ChromaSettings(anonymized_telemetry=False),
-            )
-            col = client.get_collection("experience_league")
-            status["chunks_indexed"] = col.count()
+            status["chunks_indexed"] = ctx.collection().count()
         except Exception:
             pass
 
         duration = (datetime.now(timezone.utc) - started).total_seconds()
+        status.pop("checkpoint", None)
         status.update({
             "state": "success",
             "last_run": started.isoformat(),
             "last_run_duration_s": round(duration),
-            "log": log[-50:],      # keep last 50 log lines
         })
         log.append(f"✅ Refresh complete in {round(duration)}s")
-        logger.info(f"Refresh complete: {files_updated} files updated, {status['chunks_indexed']} chunks")
+
+        # Interview grading context was retrieved from the previous KB.
+        from backend.core import retrieval_pack
+        from backend.core.chroma_paths import chroma_persist_dir
+        from backend.core.interview_retrieval_cache import bump_kb_generation
+
+        bump_kb_generation()
+        retrieval_pack.load(chroma_persist_dir())
+        status["log"] = log[-50:]      # keep last 50 log lines
+        logger.info(
+            f"Refresh complete: {ctx.files_updated} files updated, "
+            f"{status.get('chunks_indexed', 0)} chunks"
+        )
 
     except Exception as e:
         duration = (datetime.now(timezone.utc) - started).total_seconds()
@@ -219,19 +438,24 @@ def _run_refresh(force: bool = False):
         })
         logger.exception("Refresh failed")
     finally:
+        root_logger.removeHandler(handler)
+        status["current_stage"] = None
         _write_status(status)
         with _lock:
             _running = False
 
 
-def trigger_refresh(force: bool = False) -> dict:
-    """Start a background refresh. Returns immediately with current status."""
+def trigger_refresh(force: bool = False, resume: bool = False) -> dict:
+    """Start a background refresh. Returns immediately with current status.
+
+    resume=True continues a failed run after its last successful stage.
+    """
     global _running
     with _lock:
         if _running:
             return {"started": False, "reason": "Refresh already running"}
         _running = True
 
-    thread = threading.Thread(target=_run_refresh, args=(force,), daemon=True)
+    thread = threading.Thread(target=_run_refresh, args=(force, resume), daemon=True)
     thread.start()
     return {"started": True}
@@ -0,0 +1,186 @@
+"""
+Offline precomputed retrieval context for the interview question seed bank.
+
+The seed questions (config/interview_profiles._SEED_BANK, including the
+scenario bank) are a fixed, versioned set, so their grading context can be
+retrieved once per knowledge-base build instead of in every live interview.
+build_pack() runs the same product-scoped refinement retrieval the
+interviewer uses (interviewer_pipeline.retrieve_scoped_docs) and stores the
+top docs, trimmed to what grading reads, as chroma_db/retrieval_pack.json.gz —
+inside the Chroma directory, so it ships with the snapshot.
+
+  python scripts/build_retrieval_pack.py          # after ingest, before upload
+
+The pack is stamped with the index generation it was built from
+(chroma_paths.index_generation). At startup load() keeps it only if that still
+matches the served index — a same-size doc edit, or a failed pack stage that
+left the previous pack next to a new index, makes it stale. lookup() then
+answers per (question_id, version, product) and anything missing falls back to
+live retrieval.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from backend.core.chroma_paths import index_generation
+
+logger = logging.getLogger(__name__)
+
+PACK_NAME = "retrieval_pack.json.gz"
+PACK_FORMAT = 1
+# _build_doc_context reads the top 6 docs (1200 chars each); citations the top 5.
+# topical_match_score reads 1500 chars and falls back to repo_path/s3_key, so
+# those are kept too — pack docs must score exactly like live ones.
+_MAX_DOCS = 6
+_MAX_CONTENT = 1500
+_META_FIELDS = ("title", "source", "url", "source_url", "product", "repo_path", "s3_key")
+
+_pack: Optional[dict[str, Any]] = None
+
+
+def pack_key(question_id: str, version: int, product: Optional[str]) -> str:
+    return f"{question_id}@{int(version or 1)}@{product or ''}"
+
+
+def compact_docs(docs: list[dict]) -> list[dict]:
+    compact = []
+    for doc in docs[:_MAX_DOCS]:
+        meta = doc.get("metadata") or {}
+        compact.append({
+            "content": (doc.get("content") or doc.get("page_content") or "")[:_MAX_CONTENT],
+            "score": doc.get("score"),
+            "metadata": {k: meta[k] for k in _META_FIELDS if meta.get(k)},
+        })
+    return compact
+
+
+def seed_questions() -> Iterable[tuple[str, Any]]:
+    """(bank profile_id, InterviewQuestion) for every seed question."""
+    from config.interview_profiles import _SEED_BANK
+
+    for (_level, profile_id), bank in _SEED_BANK.items():
+        for q in bank:
+            yield profile_id, q
+
+
+def build_pack(
+    retriever: Any, *, chunk_count: Optional[int] = None, generation: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Retrieve context for every seed question under each product scope it can
+    be served with: its own bank's product, and the intent-detected product
+    used when it is drawn into an "all"-solutions interview.
+    """
+    from backend.core.interviewer_pipeline import (
+        _product_filter,
+        question_search_query,
+        retrieve_scoped_docs,
+    )
+    from backend.core.query_processor import QueryProcessor
+    from backend.core.smart_router import detect_product_intent
+
+    processor = QueryProcessor()
+    entries: dict[str, list[dict]] = {}
+    failed = 0
+    for profile_id, q in seed_questions():
+        query = question_search_query(q)
+        detected = detect_product_intent(query)
+        for product in {_product_filter(profile_id) or detected, detected}:
+            key = pack_key(q.id, q.version, product)
+            if key in entries:
+                continue
+            try:
+                docs = retrieve_scoped_docs(retriever, processor, query, product)
+            except Exception as exc:
+                failed += 1
+                logger.warning("Retrieval pack: %s failed: %s", key, exc)
+                continue
+            if docs:
+                entries[key] = compact_docs(docs)
+
+    if chunk_count is None:
+        chunk_count = retriever.collection.count()
+    if generation is None and getattr(retriever, "persist_dir", None):
+        generation = index_generation(retriever.persist_dir)
+    logger.info(
+        "Retrieval pack: %d entries (%d failed), chunk_count=%d, index %s",
+        len(entries), failed, chunk_count, generation,
+    )
+    return {
+        "format": PACK_FORMAT,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "chunk_count": chunk_count,
+        "index_generation": generation,
+        "entries": entries,
+    }
+
+
+def write_pack(pack: dict[str, Any], chroma_dir: Path) -> Path:
+    path = Path(chroma_dir) / PACK_NAME
+    tmp = path.with_suffix(".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+        json.dump(pack, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
+
+
+def read_pack(chroma_dir: Path) -> Optional[dict[str, Any]]:
+    try:
+        with gzip.open(Path(chroma_dir) / PACK_NAME, "rt", encoding="utf-8") as fh:
+            pack = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(pack, dict) or pack.get("format") != PACK_FORMAT:
+        return None
+    return pack
+
+
+def is_current(chroma_dir: Path) -> bool:
+    """True if chroma_dir holds a pack built from the index stored there."""
+    pack = read_pack(chroma_dir)
+    generation = index_generation(chroma_dir)
+    return pack is not None and generation is not None and pack.get("index_generation") == generation
+
+
+def load(chroma_dir: Path, generation: Optional[str] = None) -> bool:
+    """Serve the pack from chroma_dir if it was built from the index served
+    there (`generation` defaults to that directory's index_generation)."""
+    global _pack
+    pack = read_pack(chroma_dir)
+    if pack is None:
+        _pack = None
+        logger.info("No interview retrieval pack in %s — live retrieval only", chroma_dir)
+        return False
+    if generation is None:
+        generation = index_generation(chroma_dir)
+    if generation is None or pack.get("index_generation") != generation:
+        _pack = None
+        logger.warning(
+            "Interview retrieval pack is stale (built for index %s, serving %s) — ignoring",
+            pack.get("index_generation"), generation,
+        )
+        return False
+    _pack = pack
+    logger.info(
+        "Interview retrieval pack loaded: %d entries (built %s)",
+        len(pack.get("entries") or {}), pack.get("built_at"),
+    )
+    return True
+
+
+def unload() -> None:
+    global _pack
+    _pack = None
+
+
+def lookup(question_id: str, version: int, product: Optional[str]) -> Optional[list[dict]]:
+    if _pack is None:
+        return None
+    return (_pack.get("entries") or {}).get(pack_key(question_id, version, product))
@@ -20,6 +20,7 @@ from backend.core.query_keywords import (
     hybrid_doc_score,
 )
 from backend.core.rrf import reciprocal_rank_fusion
+from backend.core.stage_timing import stage
 
 logger = logging.getLogger(__name__)
 
@@ -399,17 +400,19 @@ def _fuse_dense_and_sparse(
     names, XDM field names) that dense retrieval alone missed — those get
     merged into the fused pool, not just re-ordered within it.
     """
-    bm25_docs = bm25_search(
-        retriever, user_query, n_results=_BM25_POOL_SIZE, where=where_filter,
-    )
-    dense_ranked = sorted(dense_docs, key=lambda d: float(d.get("score", 0.0)), reverse=True)
-    keyword_ranked = _rank_hybrid(dense_docs, keywords, user_query)
+    with stage("bm25"):
+        bm25_docs = bm25_search(
+            retriever, user_query, n_results=_BM25_POOL_SIZE, where=where_filter,
+        )
+    with stage("rrf"):
+        dense_ranked = sorted(dense_docs, key=lambda d: float(d.get("score", 0.0)), reverse=True)
+        keyword_ranked = _rank_hybrid(dense_docs, keywords, user_query)
 
-    # reciprocal_rank_fusion already dedupes by doc key across the three lists,
-    # keeping fused rank order — do not re-sort by raw "score" afterward
-    # (that field is whichever list first produced the doc, not comparable
-    # across embedding/BM25 scales).
-    return reciprocal_rank_fusion([dense_ranked, keyword_ranked, bm25_docs])
+        # reciprocal_rank_fusion already dedupes by doc key across the three lists,
+        # keeping fused rank order — do not re-sort by raw "score" afterward
+        # (that field is whichever list first produced the doc, not comparable
+        # across embedding/BM25 scales).
+        return reciprocal_rank_fusion([dense_ranked, keyword_ranked, bm25_docs])
 
 
 def retrieve_with_refinement(
@@ -428,27 +431,30 @@ def retrieve_with_refinement(
     """
     keywords = extract_query_keywords(user_query, product_filter)
 
-    initial = retriever.retrieve(
-        search_query,
-        n_results=n_results,
-        similarity_threshold=similarity_threshold,
-        where=where_filter,
-    )
+    with stage("retrieve_initial"):
+        initial = retriever.retrieve(
+            search_query,
+            n_results=n_results,
+            similarity_threshold=similarity_threshold,
+            where=where_filter,
+        )
 
-    keyword_docs = _keyword_retrieval_pass(
-        retriever,
-        keywords,
-        n_results=n_results,
-        where_filter=where_filter,
-    )
-    multi_hop_docs = _multi_hop_retrieval_pass(
-        retriever,
-        user_query,
-        keywords,
-        product_filter,
-        n_results=n_results,
-        where_filter=where_filter,
-    )
+    with stage("retrieve_keyword"):
+        keyword_docs = _keyword_retrieval_pass(
+            retriever,
+            keywords,
+            n_results=n_results,
+            where_filter=where_filter,
+        )
+    with stage("retrieve_multi_hop"):
+        multi_hop_docs = _multi_hop_retrieval_pass(
+            retriever,
+            user_query,
+            keywords,
+            product_filter,
+            n_results=n_results,
+            where_filter=where_filter,
+        )
     merged = _merge_docs([initial, keyword_docs, multi_hop_docs])
     if merged:
         ranked = _fuse_dense_and_sparse(
@@ -476,15 +482,16 @@ def retrieve_with_refinement(
     if not _needs_refinement(initial):
         return initial, None
 
-    unfiltered_neighbors = _probe_neighbors(retriever, user_query, search_query)
-    filtered_neighbors: list[dict] = []
-    if where_filter:
-        filtered_neighbors = retriever.retrieve(
-            search_query,
-            n_results=_PROBE_NEIGHBORS,
-            similarity_threshold=0.0,
-            where=where_filter,
-        )
+    with stage("retrieve_neighbors"):
+        unfiltered_neighbors = _probe_neighbors(retriever, user_query, search_query)
+        filtered_neighbors: list[dict] = []
+        if where_filter:
+            filtered_neighbors = retriever.retrieve(
+                search_query,
+                n_results=_PROBE_NEIGHBORS,
+                similarity_threshold=0.0,
+                where=where_filter,
+            )
 
     meta.gap_reasons = _assess_gap(
         initial_docs=initial,
@@ -520,12 +527,13 @@ def retrieve_with_refinement(
     retry_batches: list[list[dict]] = []
 
     for rq in refined_queries:
-        docs = retriever.retrieve(
-            rq,
-            n_results=n_results,
-            similarity_threshold=_REFINEMENT_MIN_SCORE,
-            where=where_filter,
-        )
+        with stage("retrieve_refined"):
+            docs = retriever.retrieve(
+                rq,
+                n_results=n_results,
+                similarity_threshold=_REFINEMENT_MIN_SCORE,
+                where=where_filter,
+            )
         if not docs:
             continue
         retry_batches.append(docs)
@@ -1,35 +1,585 @@
-"""In-memory session store for conversation history."""
+"""
+Bounded session store for conversation history.
 
+Every session keeps at most `max_turns` messages (oldest dropped first), is
+forgotten after `idle_ttl_s` without activity, and all sessions together stay
+under `max_bytes` — least-recently-used sessions are evicted first.
+
+Backends:
+  memory    — per-process OrderedDict of deques (default; O(1) appends)
+  postgres  — shared chat_sessions / chat_session_turns tables on DATABASE_URL,
+              so every uvicorn worker and replica sees the same conversation;
+              connections come from a small per-process pool
+  sqlite    — same schema in a local file (data/sessions.db); shared by the
+              workers of one host, and the stand-in for postgres in tests
+
+Each session also holds its latest running summary (history_window), tagged
+with the fingerprint of the last message it covers, so a summary written by
+one worker is reused by the others.
+
+SessionStore.from_settings() picks the backend from SESSION_STORE_BACKEND;
+stats() reports sessions, turns, approximate bytes and eviction counters.
+Every call is blocking — async callers go through asyncio.to_thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
 import uuid
-from threading import Lock
-from typing import Optional
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, Optional
 
+logger = logging.getLogger(__name__)
 
-class SessionStore:
-    def __init__(self):
-        self._sessions: dict[str, list[dict]] = {}
+_ROOT = Path(__file__).parent.parent.parent
+_SQLITE_PATH = _ROOT / "data" / "sessions.db"
+
+DEFAULT_MAX_TURNS = 40
+DEFAULT_IDLE_TTL_S = 6 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Rough per-message cost of the dict, its two strings and the deque slot.
+_TURN_OVERHEAD = 300
+# SQL backends sweep idle / over-budget sessions at most this often.
+_SWEEP_INTERVAL_S = 30.0
+# Postgres connections kept open per process; callers beyond this wait.
+_PG_POOL_MAX = 8
+
+
+def _turn_bytes(role: str, content: str) -> int:
+    return len(role) + len(content) + _TURN_OVERHEAD
+
+
+@dataclass
+class _Session:
+    turns: deque
+    last_seen: float
+    nbytes: int = 0
+    summary: Optional[tuple[str, str]] = None  # (covers, text)
+
+
+@dataclass
+class _Counters:
+    evicted_idle: int = 0
+    evicted_memory: int = 0
+    trimmed_turns: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "evicted_idle": self.evicted_idle,
+            "evicted_memory": self.evicted_memory,
+            "trimmed_turns": self.trimmed_turns,
+        }
+
+
+class InMemorySessionBackend:
+    """Per-process store: OrderedDict in LRU order, one bounded deque per session."""
+
+    name = "memory"
+
+    def __init__(self, max_turns: int, idle_ttl_s: float, max_bytes: int,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_turns = max(2, max_turns)
+        self.idle_ttl_s = idle_ttl_s
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+        self._bytes = 0
+        self._counters = _Counters()
         self._lock = Lock()
 
+    def _expire_idle(self, now: float) -> None:
+        # LRU order is last-activity order, so idle sessions sit at the front.
+        while self._sessions:
+            sid, sess = next(iter(self._sessions.items()))
+            if now - sess.last_seen <= self.idle_ttl_s:
+                break
+            self._drop(sid)
+            self._counters.evicted_idle += 1
+
+    def _enforce_budget(self, keep: Optional[str] = None) -> None:
+        while self._bytes > self.max_bytes and len(self._sessions) > 1:
+            sid = next(iter(self._sessions))
+            if sid == keep:
+                break
+            self._drop(sid)
+            self._counters.evicted_memory += 1
+
+    def _drop(self, session_id: str) -> None:
+        sess = self._sessions.pop(session_id, None)
+        if sess is not None:
+            self._bytes -= sess.nbytes
+
+    def _touch(self, session_id: str, now: float) -> Optional[_Session]:
+        sess = self._sessions.get(session_id)
+        if sess is None:
+            return None
+        if now - sess.last_seen > self.idle_ttl_s:
+            self._drop(session_id)
+            self._counters.evicted_idle += 1
+            return None
+        sess.last_seen = now
+        self._sessions.move_to_end(session_id)
+        return sess
+
+    def create(self, session_id: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._expire_idle(now)
+            self._sessions[session_id] = _Session(deque(maxlen=self.max_turns), now)
+
+    def history(self, session_id: str) -> list[dict]:
+        with self._lock:
+            sess = self._touch(session_id, self._clock())
+            return list(sess.turns) if sess is not None else []
+
+    def append(self, session_id: str, role: str, content: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._expire_idle(now)
+            sess = self._touch(session_id, now)
+            if sess is None:
+                sess = _Session(deque(maxlen=self.max_turns), now)
+                self._sessions[session_id] = sess
+            if len(sess.turns) == self.max_turns:
+                oldest = sess.turns[0]
+                dropped = _turn_bytes(oldest["role"], oldest["content"])
+                sess.nbytes -= dropped
+                self._bytes -= dropped
+                self._counters.trimmed_turns += 1
+            sess.turns.append({"role": role, "content": content})
+            added = _turn_bytes(role, content)
+            sess.nbytes += added
+            self._bytes += added
+            self._enforce_budget(keep=session_id)
+
+    def get_summary(self, session_id: str) -> Optional[tuple[str, str]]:
+        with self._lock:
+            sess = self._sessions.get(session_id)
+            return sess.summary if sess is not None else None
+
+    def put_summary(self, session_id: str, covers: str, summary: str) -> None:
+        with self._lock:
+            sess = self._sessions.get(session_id)
+            if sess is not None:
+                sess.summary = (covers, summary)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._drop(session_id)
+
+    def session_ids(self) -> list[str]:
+        with self._lock:
+            self._expire_idle(self._clock())
+            return list(self._sessions.keys())
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._expire_idle(self._clock())
+            return {
+                "sessions": len(self._sessions),
+                "turns": sum(len(s.turns) for s in self._sessions.values()),
+                "bytes": self._bytes,
+                **self._counters.as_dict(),
+            }
+
+
+class _SQLSessionBackend(ABC):
+    """
+    Shared store on two tables. Per-session turn counts and byte totals are
+    kept on chat_sessions so appends, budget checks and stats never scan
+    transcripts. Eviction counters are per process.
+
+    Subclasses supply _connect(); _release() hands the connection back
+    (closing it by default).
+    """
+
+    name = "sql"
+    _ph = "?"
+    _serial = "INTEGER PRIMARY KEY AUTOINCREMENT"
+
+    def __init__(self, max_turns: int, idle_ttl_s: float, max_bytes: int,
+                 clock: Callable[[], float] = time.time):
+        self.max_turns = max(2, max_turns)
+        self.idle_ttl_s = idle_ttl_s
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._counters = _Counters()
+        self._last_sweep = 0.0
+        self._sweep_lock = Lock()
+
+    @abstractmethod
+    def _connect(self):
+        """A DB-API connection with the schema in place."""
+
+    def _release(self, conn, broken: bool = False) -> None:
+        conn.close()
+
+    def _sql(self, statement: str) -> str:
+        return statement.replace("?", self._ph)
+
+    def _schema(self) -> list[str]:
+        return [
+            """
+            CREATE TABLE IF NOT EXISTS chat_sessions (
+                session_id TEXT PRIMARY KEY,
+                last_seen  DOUBLE PRECISION NOT NULL,
+                turns      INTEGER NOT NULL DEFAULT 0,
+                bytes      BIGINT NOT NULL DEFAULT 0
+            )
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS chat_session_turns (
+                id         {self._serial},
+                session_id TEXT NOT NULL,
+                role       TEXT NOT NULL,
+                content    TEXT NOT NULL,
+                bytes      INTEGER NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS chat_session_summaries (
+                session_id TEXT PRIMARY KEY,
+                covers     TEXT NOT NULL,
+                summary    TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS chat_session_turns_session_idx "
+            "ON chat_session_turns (session_id, id)",
+            "CREATE INDEX IF NOT EXISTS chat_sessions_last_seen_idx ON chat_sessions (last_seen)",
+        ]
+
+    def _run(self, fn: Callable[[Any], Any]) -> Any:
+        conn = self._connect()
+        broken = False
+        try:
+            cur = conn.cursor()
+            try:
+                result = fn(cur)
+            finally:
+                cur.close()
+            conn.commit()
+            return result
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self._release(conn, broken)
+
+    @staticmethod
+    def _value(row: Any, index: int) -> Any:
+        return list(row.values())[index] if isinstance(row, dict) else row[index]
+
+    def _delete_sessions(self, cur, session_ids: list[str]) -> None:
+        for sid in session_ids:
+            cur.execute(self._sql("DELETE FROM chat_session_turns WHERE session_id = ?"), (sid,))
+            cur.execute(self._sql("DELETE FROM chat_session_summaries WHERE session_id = ?"), (sid,))
+            cur.execute(self._sql("DELETE FROM chat_sessions WHERE session_id = ?"), (sid,))
+
+    def _maybe_sweep(self, cur, now: float) -> None:
+        with self._sweep_lock:
+            if now - self._last_sweep < _SWEEP_INTERVAL_S:
+                return
+            self._last_sweep = now
+        cur.execute(
+            self._sql("SELECT session_id FROM chat_sessions WHERE last_seen < ?"),
+            (now - self.idle_ttl_s,),
+        )
+        idle = [self._value(r, 0) for r in cur.fetchall()]
+        self._delete_sessions(cur, idle)
+        self._counters.evicted_idle += len(idle)
+
+        cur.execute("SELECT COALESCE(SUM(bytes), 0) FROM chat_sessions")
+        total = int(self._value(cur.fetchone(), 0))
+        if total <= self.max_bytes:
+            return
+        cur.execute("SELECT session_id, bytes FROM chat_sessions ORDER BY last_seen")
+        victims = []
+        for row in cur.fetchall():
+            if total <= self.max_bytes:
+                break
+            victims.append(self._value(row, 0))
+            total -= int(self._value(row, 1))
+        self._delete_sessions(cur, victims)
+        self._counters.evicted_memory += len(victims)
+
+    def create(self, session_id: str) -> None:
+        now = self._clock()
+
+        def _do(cur):
+            self._maybe_sweep(cur, now)
+            cur.execute(
+                self._sql("INSERT INTO chat_sessions (session_id, last_seen) VALUES (?, ?)"),
+                (session_id, now),
+            )
+        self._run(_do)
+
+    def history(self, session_id: str) -> list[dict]:
+        now = self._clock()
+
+        def _do(cur):
+            cur.execute(
+                self._sql("UPDATE chat_sessions SET last_seen = ? WHERE session_id = ? AND last_seen >= ?"),
+                (now, session_id, now - self.idle_ttl_s),
+            )
+            if cur.rowcount == 0:
+                return []
+            cur.execute(
+                self._sql("SELECT role, content FROM chat_session_turns WHERE session_id = ? ORDER BY id"),
+                (session_id,),
+            )
+            return [
+                {"role": self._value(r, 0), "content": self._value(r, 1)}
+                for r in cur.fetchall()
+            ]
+        return self._run(_do)
+
+    def append(self, session_id: str, role: str, content: str) -> None:
+        now = self._clock()
+        nbytes = _turn_bytes(role, content)
+
+        def _do(cur):
+            cur.execute(
+                self._sql(
+                    "UPDATE chat_sessions SET last_seen = ?, turns = turns + 1, bytes = bytes + ? "
+                    "WHERE session_id = ?"
+                ),
+                (now, nbytes, session_id),
+            )
+            if cur.rowcount == 0:
+                cur.execute(
+                    self._sql("INSERT INTO chat_sessions (session_id, last_seen, turns, bytes) VALUES (?, ?, 1, ?)"),
+                    (session_id, now, nbytes),
+                )
+            cur.execute(
+                self._sql("INSERT INTO chat_session_turns (session_id, role, content, bytes) VALUES (?, ?, ?, ?)"),
+                (session_id, role, content, nbytes),
+            )
+            cur.execute(self._sql("SELECT turns FROM chat_sessions WHERE session_id = ?"), (session_id,))
+            excess = int(self._value(cur.fetchone(), 0)) - self.max_turns
+            if excess > 0:
+                self._trim(cur, session_id, excess)
+            self._maybe_sweep(cur, now)
+        self._run(_do)
+
+    def _trim(self, cur, session_id: str, excess: int) -> None:
+        cur.execute(
+            self._sql("SELECT id, bytes FROM chat_session_turns WHERE session_id = ? ORDER BY id LIMIT ?"),
+            (session_id, excess),
+        )
+        rows = cur.fetchall()
+        ids = [self._value(r, 0) for r in rows]
+        freed = sum(int(self._value(r, 1)) for r in rows)
+        for turn_id in ids:
+            cur.execute(self._sql("DELETE FROM chat_session_turns WHERE id = ?"), (turn_id,))
+        cur.execute(
+            self._sql("UPDATE chat_sessions SET turns = turns - ?, bytes = bytes - ? WHERE session_id = ?"),
+            (len(ids), freed, session_id),
+        )
+        self._counters.trimmed_turns += len(ids)
+
+    def get_summary(self, session_id: str) -> Optional[tuple[str, str]]:
+        def _do(cur):
+            cur.execute(
+                self._sql("SELECT covers, summary FROM chat_session_summaries WHERE session_id = ?"),
+                (session_id,),
+            )
+            row = cur.fetchone()
+            return (self._value(row, 0), self._value(row, 1)) if row else None
+        return self._run(_do)
+
+    def put_summary(self, session_id: str, covers: str, summary: str) -> None:
+        self._run(lambda cur: cur.execute(
+            self._sql(
+                "INSERT INTO chat_session_summaries (session_id, covers, summary) VALUES (?, ?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET covers = excluded.covers, summary = excluded.summary"
+            ),
+            (session_id, covers, summary),
+        ))
+
+    def delete(self, session_id: str) -> None:
+        self._run(lambda cur: self._delete_sessions(cur, [session_id]))
+
+    def session_ids(self) -> list[str]:
+        cutoff = self._clock() - self.idle_ttl_s
+
+        def _do(cur):
+            cur.execute(self._sql("SELECT session_id FROM chat_sessions WHERE last_seen >= ?"), (cutoff,))
+            return [self._value(r, 0) for r in cur.fetchall()]
+        return self._run(_do)
+
+    def stats(self) -> dict[str, Any]:
+        cutoff = self._clock() - self.idle_ttl_s
+
+        def _do(cur):
+            cur.execute(
+                self._sql(
+                    "SELECT COUNT(*), COALESCE(SUM(turns), 0), COALESCE(SUM(bytes), 0) "
+                    "FROM chat_sessions WHERE last_seen >= ?"
+                ),
+                (cutoff,),
+            )
+            row = cur.fetchone()
+            return {
+                "sessions": int(self._value(row, 0)),
+                "turns": int(self._value(row, 1)),
+                "bytes": int(self._value(row, 2)),
+                **self._counters.as_dict(),
+            }
+        return self._run(_do)
+
+
+class SqliteSessionBackend(_SQLSessionBackend):
+    """Local-file stand-in for the shared backend (one connection per call, WAL)."""
+
+    name = "sqlite"
+
+    def __init__(self, path: Path = _SQLITE_PATH, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        if not self._initialized:
+            for statement in self._schema():
+                conn.execute(statement)
+            conn.commit()
+            self._initialized = True
+        return conn
+
+
+class PostgresSessionBackend(_SQLSessionBackend):
+    """
+    Shared store on DATABASE_URL — same connection settings as google_db, but
+    connections are pooled (psycopg2 ThreadedConnectionPool, opened lazily)
+    instead of opened per call. A semaphore makes callers wait for a free
+    connection rather than hit PoolError when every slot is checked out.
+    """
+
+    name = "postgres"
+    _ph = "%s"
+    _serial = "BIGSERIAL PRIMARY KEY"
+
+    def __init__(self, pool_max: int = _PG_POOL_MAX, **kwargs):
+        super().__init__(**kwargs)
+        self.pool_max = max(1, pool_max)
+        self._pool = None
+        self._pool_lock = Lock()
+        self._slots = BoundedSemaphore(self.pool_max)
+        self._initialized = False
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                from psycopg2.pool import ThreadedConnectionPool
+
+                from backend.core.google_db import _connect_kwargs
+
+                self._pool = ThreadedConnectionPool(1, self.pool_max, **_connect_kwargs())
+            return self._pool
+
+    def _connect(self):
+        self._slots.acquire()
+        try:
+            pool = self._get_pool()
+            conn = pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+        try:
+            if conn.closed:
+                pool.putconn(conn, close=True)
+                conn = pool.getconn()
+            conn.autocommit = False
+            if not self._initialized:
+                with conn.cursor() as cur:
+                    for statement in self._schema():
+                        cur.execute(statement)
+                conn.commit()
+                self._initialized = True
+        except Exception:
+            self._release(conn, broken=True)
+            raise
+        return conn
+
+    def _release(self, conn, broken: bool = False) -> None:
+        try:
+            self._pool.putconn(conn, close=broken or bool(conn.closed))
+        finally:
+            self._slots.release()
+
+
+_BACKENDS = {
+    "memory": InMemorySessionBackend,
+    "sqlite": SqliteSessionBackend,
+    "postgres": PostgresSessionBackend,
+}
+
+
+class SessionStore:
+    def __init__(self, backend: Any = None):
+        self.backend = backend or InMemorySessionBackend(
+            DEFAULT_MAX_TURNS, DEFAULT_IDLE_TTL_S, DEFAULT_MAX_BYTES,
+        )
+
+    @classmethod
+    def from_settings(cls, settings=None) -> "SessionStore":
+        if settings is None:
+            from config.settings import get_settings
+            settings = get_settings()
+        limits = dict(
+            max_turns=settings.session_max_turns,
+            idle_ttl_s=settings.session_idle_ttl_s,
+            max_bytes=settings.session_memory_budget_mb * 1024 * 1024,
+        )
+        kind = (settings.session_store_backend or "memory").strip().lower()
+        backend_cls = _BACKENDS.get(kind)
+        if backend_cls is None:
+            logger.warning("Unknown SESSION_STORE_BACKEND %r — using in-memory sessions", kind)
+            backend_cls = InMemorySessionBackend
+        backend = backend_cls(**limits)
+        logger.info(
+            "Session store: %s (max_turns=%d, idle_ttl=%ss, budget=%dMB)",
+            backend.name, limits["max_turns"], limits["idle_ttl_s"], settings.session_memory_budget_mb,
+        )
+        return cls(backend)
+
     def new_session(self) -> str:
         session_id = str(uuid.uuid4())
-        with self._lock:
-            self._sessions[session_id] = []
+        self.backend.create(session_id)
         return session_id
 
     def get_history(self, session_id: str) -> list[dict]:
-        with self._lock:
-            return list(self._sessions.get(session_id, []))
+        return self.backend.history(session_id)
 
     def append_turn(self, session_id: str, role: str, content: str) -> None:
-        with self._lock:
-            if session_id not in self._sessions:
-                self._sessions[session_id] = []
-            self._sessions[session_id].append({"role": role, "content": content})
+        self.backend.append(session_id, role, content)
+
+    def get_summary(self, session_id: str) -> Optional[tuple[str, str]]:
+        """(covers, summary): the latest history summary and the fingerprint of
+        the last message it covers."""
+        return self.backend.get_summary(session_id)
+
+    def put_summary(self, session_id: str, covers: str, summary: str) -> None:
+        self.backend.put_summary(session_id, covers, summary)
 
     def clear(self, session_id: str) -> None:
-        with self._lock:
-            self._sessions.pop(session_id, None)
+        self.backend.delete(session_id)
 
     def list_sessions(self) -> list[str]:
-        with self._lock:
-            return list(self._sessions.keys())
+        return self.backend.session_ids()
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": self.backend.name, **self.backend.stats()}
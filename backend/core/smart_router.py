@@ -140,6 +140,17 @@ def detect_product_intent(query: str) -> str | None:
     return next(iter(matched_products), None)
 
 
+def _signals(query: str) -> dict:
+    q = query.strip()
+    return {
+        "word_count": len(q.split()),
+        "is_definition": bool(_DEFINITION_PATTERNS.match(q)),
+        "has_creation": bool(_CREATION_VERBS.search(q)),
+        "has_complexity": bool(_COMPLEX_KEYWORDS.search(q)),
+        "has_override": bool(_SONNET_OVERRIDE.search(q)),
+    }
+
+
 def classify_query(query: str) -> str:
     """
     Returns 'haiku' or 'sonnet'.
@@ -150,13 +161,12 @@ def classify_query(query: str) -> str:
       3. Long queries (>12 words) with question structure → sonnet
       4. Default → haiku (fast and cheap for lookups)
     """
-    q = query.strip()
-    word_count = len(q.split())
-
-    is_definition = bool(_DEFINITION_PATTERNS.match(q))
-    has_creation = bool(_CREATION_VERBS.search(q))
-    has_complexity = bool(_COMPLEX_KEYWORDS.search(q))
-    has_override = bool(_SONNET_OVERRIDE.search(q))
+    sig = _signals(query)
+    word_count = sig["word_count"]
+    is_definition = sig["is_definition"]
+    has_creation = sig["has_creation"]
+    has_complexity = sig["has_complexity"]
+    has_override = sig["has_override"]
 
     # Definition-started queries → Haiku as long as there's no creation verb
     # Takes priority over comparison/override patterns — "What is the difference
@@ -182,3 +192,27 @@ def classify_query(query: str) -> str:
 
     # Short queries with no signals → Haiku
     return "haiku"
+
+
+def is_borderline(query: str) -> bool:
+    """
+    True when classify_query's decision rests on a weak signal — the band
+    where speculative routing (backend/core/speculative_routing.py) lets
+    Haiku's opening decide instead:
+
+      - long definition questions (16-25 words) routed to Haiku
+      - complexity keyword alone (no creation verb / comparison) → Sonnet
+      - length alone (13-25 words, no other signal) → Sonnet
+      - medium-length queries (8-12 words) with no signal → Haiku
+    """
+    sig = _signals(query)
+    wc = sig["word_count"]
+    if sig["has_override"] and not sig["is_definition"]:
+        return False
+    if sig["has_creation"]:
+        return False
+    if sig["is_definition"]:
+        return 16 <= wc <= 25
+    if sig["has_complexity"]:
+        return wc <= 25
+    return 8 <= wc <= 25
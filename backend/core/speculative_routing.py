@@ -0,0 +1,222 @@
+"""
+Speculative Haiku/Sonnet routing for borderline queries.
+
+For queries smart_router.is_borderline() flags, RAGPipeline retrieves once and
+then starts both chains on the same context: Haiku's output is held back until
+its opening (two sentences, or _OPENING_CHARS) is in, while Sonnet generates
+into a buffer. If the opening reads as a confident answer, Haiku streams on
+and Sonnet is cancelled; otherwise Haiku is cancelled and Sonnet's buffered
+output is streamed instead. Nothing from the losing branch reaches the user.
+
+Guardrails (settings):
+  SPECULATIVE_ROUTING_ENABLED      off by default
+  SPECULATIVE_DAILY_BUDGET         speculative runs per UTC day, per deployment
+                                   (google_db.exl_daily_budgets; fails closed
+                                   when Postgres is unavailable)
+  SPECULATIVE_MAX_CONCURRENT       per-process cap on runs in flight
+
+stats() reports per-process counters: started, won_haiku, won_sonnet, failed
+(either branch raised) and skipped_* reasons. The cancelled branch was still
+billed for its prompt and whatever it generated before the cut; that spend
+is logged per run and summed into discarded_input_tokens,
+discarded_output_tokens and discarded_cost_usd (priced like google_db's
+query log). Each branch runs with its own callbacks, so only the winner's
+usage reaches the `done` event and the user's usage row.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections import Counter
+from threading import Lock
+from typing import Any, AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+BUDGET_KEY = "speculative_routing"
+
+_OPENING_CHARS = 400
+_SENTENCE_END_RE = re.compile(r"[.!?](\s|$)")
+# Hedging or deflection in the first sentences: Haiku is out of its depth.
+_HEDGE_RE = re.compile(
+    r"\b(i'?m not sure|i don'?t have|not (?:specifically )?covered|doesn'?t (?:specifically )?(?:cover|mention|say)|"
+    r"does not (?:cover|mention|say)|isn'?t (?:clear|documented)|unclear|cannot determine|can'?t determine|"
+    r"no (?:specific|direct) (?:information|documentation)|unable to|it depends|"
+    r"more (?:context|details) (?:would|is) needed|could you clarify)\b",
+    re.IGNORECASE,
+)
+
+_counters: Counter = Counter()
+_active = 0
+_lock = Lock()
+
+
+def opening_complete(text: str) -> bool:
+    return len(_SENTENCE_END_RE.findall(text)) >= 2 or len(text) >= _OPENING_CHARS
+
+
+def haiku_opening_confident(opening: str) -> bool:
+    """Cheap, local confidence check on Haiku's first sentences."""
+    stripped = opening.strip()
+    if len(stripped) < 40:
+        return False
+    return not _HEDGE_RE.search(stripped)
+
+
+def try_acquire(settings: Any) -> bool:
+    """Reserve a speculative run: per-process concurrency first, then one unit
+    of today's deployment budget. Call release() when the run ends."""
+    global _active
+    if not settings.speculative_routing_enabled:
+        return False
+    with _lock:
+        if _active >= settings.speculative_max_concurrent:
+            _counters["skipped_concurrency"] += 1
+            return False
+        _active += 1
+    try:
+        from backend.core import google_db
+
+        allowed = google_db.try_consume_daily_budget(BUDGET_KEY, settings.speculative_daily_budget)
+    except Exception as exc:
+        logger.warning("Speculative routing budget unavailable (%s) — routing normally", exc)
+        allowed = False
+    if not allowed:
+        release()
+        _counters["skipped_budget"] += 1
+    return allowed
+
+
+def release() -> None:
+    global _active
+    with _lock:
+        _active = max(0, _active - 1)
+
+
+def stats() -> dict[str, Any]:
+    with _lock:
+        return {
+            "active": _active,
+            **{k: _counters[k] for k in (
+                "started", "won_haiku", "won_sonnet", "failed", "skipped_budget", "skipped_concurrency",
+                "discarded_input_tokens", "discarded_output_tokens",
+            )},
+            "discarded_cost_usd": round(_counters["discarded_cost_usd"], 6),
+        }
+
+
+def _reported(config: dict) -> Optional[dict]:
+    """Provider-reported usage from a branch's callbacks (set if it finished)."""
+    from backend.core.token_counter import reported_usage
+
+    for callback in config.get("callbacks") or []:
+        usage = reported_usage(callback)
+        if usage is not None:
+            return usage
+    return None
+
+
+def _record_discarded(model: str, prompt_tokens: Optional[dict], output_text: str, config: dict) -> None:
+    """Account for the losing branch: its full prompt plus the output it
+    produced — provider-reported when the branch completed, else counted."""
+    from backend.core.google_db import _compute_cost
+    from backend.core.token_counter import count_tokens
+
+    usage = _reported(config)
+    if usage is not None:
+        input_tokens, output_tokens = usage["input_tokens"], usage["output_tokens"]
+        cost = _compute_cost(
+            model, input_tokens, output_tokens, usage["cache_read_tokens"], usage["cache_write_tokens"],
+        )
+    else:
+        input_tokens = int((prompt_tokens or {}).get(model, 0))
+        output_tokens = count_tokens(output_text)
+        cost = _compute_cost(model, input_tokens, output_tokens)
+    with _lock:
+        _counters["discarded_input_tokens"] += input_tokens
+        _counters["discarded_output_tokens"] += output_tokens
+        _counters["discarded_cost_usd"] += cost
+    logger.info(
+        "Speculative routing: discarded %s branch (%d input, %d output tokens, $%.6f)",
+        model, input_tokens, output_tokens, cost,
+    )
+
+
+def _buffered_text(chunks: asyncio.Queue) -> str:
+    parts = []
+    while not chunks.empty():
+        item = chunks.get_nowait()
+        if isinstance(item, str):
+            parts.append(item)
+    return "".join(parts)
+
+
+async def speculate(
+    haiku_chain: Any,
+    sonnet_chain: Any,
+    inputs: dict,
+    configs: dict,
+    outcome: dict,
+    prompt_tokens: Optional[dict] = None,
+) -> AsyncIterator[str]:
+    """
+    Yield the winning branch's output. Sets outcome["model"] to "haiku" or
+    "sonnet" before the first chunk is yielded. configs holds each branch's
+    run config ({"haiku": {...}, "sonnet": {...}}) — give them separate usage
+    callbacks and report only the winner's. prompt_tokens ({"haiku": n,
+    "sonnet": n}) prices the cancelled branch's prompt when it reported none.
+    """
+    _counters["started"] += 1
+    sonnet_chunks: asyncio.Queue = asyncio.Queue()
+
+    async def _run_sonnet() -> None:
+        try:
+            async for chunk in sonnet_chain.astream(inputs, config=configs.get("sonnet")):
+                sonnet_chunks.put_nowait(chunk)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            sonnet_chunks.put_nowait(exc)
+            return
+        sonnet_chunks.put_nowait(None)
+
+    sonnet_task = asyncio.create_task(_run_sonnet())
+    haiku_stream = haiku_chain.astream(inputs, config=configs.get("haiku"))
+    try:
+        opening, haiku_finished = "", False
+        while not opening_complete(opening):
+            try:
+                opening += await haiku_stream.__anext__()
+            except StopAsyncIteration:
+                haiku_finished = True
+                break
+
+        if haiku_opening_confident(opening):
+            outcome["model"] = "haiku"
+            _counters["won_haiku"] += 1
+            sonnet_task.cancel()
+            _record_discarded("sonnet", prompt_tokens, _buffered_text(sonnet_chunks), configs.get("sonnet") or {})
+            yield opening
+            if not haiku_finished:
+                async for chunk in haiku_stream:
+                    yield chunk
+            return
+
+        outcome["model"] = "sonnet"
+        _counters["won_sonnet"] += 1
+        logger.info("Speculative routing: cutting over to Sonnet after opening %r", opening[:80])
+        await haiku_stream.aclose()
+        _record_discarded("haiku", prompt_tokens, opening, configs.get("haiku") or {})
+        while (item := await sonnet_chunks.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    except Exception:
+        _counters["failed"] += 1
+        raise
+    finally:
+        if not sonnet_task.done():
+            sonnet_task.cancel()
+        await haiku_stream.aclose()
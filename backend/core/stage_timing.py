@@ -0,0 +1,149 @@
+"""
+Per-stage latency instrumentation for chat turns — no external service.
+
+chat.py opens a turn with start_turn(); everything below it (RAGPipeline,
+retrieval_refiner, ChromaRetriever, URL validation, DB writes) wraps its work
+in `with stage("name"):`. The current turn lives in a ContextVar, so it
+follows the request through async generators, asyncio tasks and
+asyncio.to_thread; with no turn open, stage() only feeds the aggregates.
+
+Two views of the same samples:
+  Turn.breakdown()   compact {stage: ms} for one turn (admin `done` event)
+  snapshot()         p50/p95/p99 per stage over the last _WINDOW samples
+                     (admin /latency, Prometheus /metrics)
+
+Repeated stages within a turn (e.g. one `embed` per retrieval pass) are summed
+in the breakdown but recorded individually in the aggregates.
+
+watch_event_loop_lag() (EVENT_LOOP_LAG_PROBE) records how late a periodic
+sleep wakes up as the `event_loop_lag` stage — blocking work on the loop
+shows up there under load.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+_WINDOW = 2048
+_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Turn:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._stages: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def breakdown(self) -> dict:
+        """{stage: ms} plus {stage_n: calls} for repeated stages."""
+        with self._lock:
+            items = list(self._stages.items())
+        out: dict = {}
+        for name, (total, calls) in items:
+            out[name] = round(total * 1000, 1)
+            if calls > 1:
+                out[f"{name}_n"] = calls
+        return out
+
+
+_current: contextvars.ContextVar[Optional[Turn]] = contextvars.ContextVar("stage_timing_turn", default=None)
+_samples: dict[str, deque] = {}
+_totals: dict[str, list[float]] = {}
+_lock = threading.Lock()
+
+
+def start_turn() -> Turn:
+    turn = Turn()
+    _current.set(turn)
+    return turn
+
+
+def current_turn() -> Optional[Turn]:
+    return _current.get()
+
+
+def record(name: str, seconds: float) -> None:
+    turn = _current.get()
+    if turn is not None:
+        turn.add(name, seconds)
+    with _lock:
+        window = _samples.get(name)
+        if window is None:
+            window = _samples[name] = deque(maxlen=_WINDOW)
+            _totals[name] = [0, 0.0]
+        window.append(seconds)
+        _totals[name][0] += 1
+        _totals[name][1] += seconds
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+async def watch_event_loop_lag(interval_s: float = 0.05) -> None:
+    """Run until cancelled, recording wake-up delay past each `interval_s` sleep."""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval_s)
+        record("event_loop_lag", max(0.0, time.perf_counter() - started - interval_s))
+
+
+def _quantile(ordered: list[float], q: float) -> float:
+    # Nearest-rank on the sorted window.
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def snapshot() -> dict[str, dict]:
+    """{stage: {count, sum_s, window, p50_ms, p95_ms, p99_ms}}; count/sum_s are
+    lifetime totals, quantiles cover the last `window` samples."""
+    with _lock:
+        data = {name: (sorted(window), tuple(_totals[name])) for name, window in _samples.items()}
+    out: dict[str, dict] = {}
+    for name, (ordered, (count, total)) in sorted(data.items()):
+        row = {"count": int(count), "sum_s": round(total, 6), "window": len(ordered)}
+        for q in _QUANTILES:
+            row[f"p{int(q * 100)}_ms"] = round(_quantile(ordered, q) * 1000, 1)
+        out[name] = row
+    return out
+
+
+def prometheus_text(metric: str = "rovr_chat_stage_seconds") -> str:
+    """Prometheus text exposition (a summary per stage)."""
+    lines = [
+        f"# HELP {metric} Chat turn latency by pipeline stage.",
+        f"# TYPE {metric} summary",
+    ]
+    for name, row in snapshot().items():
+        for q in _QUANTILES:
+            value = row[f"p{int(q * 100)}_ms"] / 1000
+            lines.append(f'{metric}{{stage="{name}",quantile="{q}"}} {value:.6f}')
+        lines.append(f'{metric}_sum{{stage="{name}"}} {row["sum_s"]:.6f}')
+        lines.append(f'{metric}_count{{stage="{name}"}} {row["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    with _lock:
+        _samples.clear()
+        _totals.clear()
@@ -0,0 +1,86 @@
+"""
+Token counting for prompt budgets and usage reporting.
+
+Anthropic does not publish Claude's tokenizer, so local budgets use
+tiktoken's cl100k_base BPE (within roughly 10% of Claude's counts on English
+prose and markdown) when tiktoken is installed, and a regex pre-tokenizer
+estimate otherwise. What a request actually consumed comes from the
+provider: reported_usage() reads the usage metadata LangChain collects from
+the streamed response.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Role markers and separators the messages API adds per message.
+_PER_MESSAGE_OVERHEAD = 4
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:
+        logger.info("tiktoken unavailable (%s) — using approximate token counts", exc)
+        return None
+
+
+def _approximate(text: str) -> int:
+    # One token per word or symbol, plus one per further 6 characters of long words.
+    return sum(1 + (len(m.group()) - 1) // 6 for m in _PIECE_RE.finditer(text))
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    enc = _encoding()
+    if enc is None:
+        return _approximate(text)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(contents: Iterable[str]) -> int:
+    return sum(count_tokens(c) + _PER_MESSAGE_OVERHEAD for c in contents)
+
+
+def clip_to_tokens(text: str, max_tokens: int) -> str:
+    """Trim `text` to about `max_tokens` tokens, marking the cut with an ellipsis."""
+    total = count_tokens(text)
+    if total <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    enc = _encoding()
+    if enc is not None:
+        clipped = enc.decode(enc.encode(text, disallowed_special=())[:max_tokens])
+    else:
+        clipped = text[: int(len(text) * max_tokens / total)]
+    return clipped.rstrip() + " …"
+
+
+def reported_usage(handler: Any) -> Optional[dict[str, int]]:
+    """
+    Token usage summed over every model call a langchain_core
+    UsageMetadataCallbackHandler saw, or None when the provider reported
+    nothing. input_tokens includes the cache_read / cache_write subsets.
+    """
+    usage = getattr(handler, "usage_metadata", None) or {}
+    if not usage:
+        return None
+    totals = {"input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0}
+    for u in usage.values():
+        details = u.get("input_token_details") or {}
+        totals["input_tokens"] += int(u.get("input_tokens") or 0)
+        totals["output_tokens"] += int(u.get("output_tokens") or 0)
+        totals["cache_read_tokens"] += int(details.get("cache_read") or 0)
+        totals["cache_write_tokens"] += int(details.get("cache_creation") or 0)
+    return totals
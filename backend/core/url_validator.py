@@ -1,28 +1,32 @@
 """
-Async URL validator with in-process TTL cache.
+Async URL validator with in-process TTL cache over the shared URL ledger.
 
 Drops citations that return a definitive HTTP 404 or 410.
 Fail-open: network errors / timeouts keep the citation (corporate proxies
 and transient connectivity issues should not silently remove valid sources).
 
-Cache TTLs:
+Cache misses go to src/utils/url_ledger.py, which also holds results from the
+offline validators (validate_exl_urls.py, fix_citation_urls.py, the refresh
+pipeline) — a URL checked there inside its window is not re-requested here.
+
+Cache TTLs (match the ledger's freshness windows):
   valid    → 24 h
   invalid  →  1 h  (re-check; EXL occasionally restores pages)
 """
 
-import asyncio
 import logging
 import time
 
-import httpx
+from backend.core.stage_timing import stage
+from config.settings import get_settings
+from src.utils.url_ledger import FRESH_FOR, STATUS_DEAD, STATUS_LIVE, check_urls
 
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = 3.0
-_POS_TTL = 86_400   # 24 h for 200
-_NEG_TTL =  3_600   # 1 h for everything else
+_POS_TTL = FRESH_FOR[STATUS_LIVE]
+_NEG_TTL = FRESH_FOR[STATUS_DEAD]
 _MAX_CONCURRENT = 10
-_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; ExLChatbot/1.0)"}
 
 # url → (is_valid: bool, checked_at: float)
 _cache: dict[str, tuple[bool, float]] = {}
@@ -39,40 +43,40 @@ def _cache_get(url: str) -> bool | None:
     return None
 
 
-async def _check_url(client: httpx.AsyncClient, url: str) -> tuple[str, bool]:
-    cached = _cache_get(url)
-    if cached is not None:
-        return url, cached
-
-    try:
-        r = await client.head(url, follow_redirects=True)
-        valid = r.status_code not in (404, 410)
-    except Exception as exc:
-        logger.debug(f"URL check error for {url}: {exc}")
-        valid = True  # network error / timeout → keep (fail-open)
-
-    _cache[url] = (valid, time.monotonic())
-    logger.debug(f"URL check {'✓' if valid else '✗'} [{200 if valid else 'non-200'}] {url}")
-    return url, valid
+async def _check_urls(urls: list[str]) -> dict[str, bool]:
+    validity = {u: v for u in urls if (v := _cache_get(u)) is not None}
+    misses = [u for u in urls if u not in validity]
+    if not misses:
+        return validity
+
+    # One attempt on the request path; the ledger records "unvalidated" for a
+    # short window so a flaky URL isn't re-requested on every answer.
+    entries = await check_urls(
+        misses, concurrency=_MAX_CONCURRENT, attempts=1, timeout=_TIMEOUT
+    )
+    now = time.monotonic()
+    for url in misses:
+        entry = entries.get(url)
+        valid = entry is None or entry.status != STATUS_DEAD  # fail-open
+        _cache[url] = (valid, now)
+        validity[url] = valid
+        logger.debug(
+            f"URL check {'✓' if valid else '✗'} "
+            f"[{entry.http_status if entry else 'n/a'}] {url}"
+        )
+    return validity
 
 
 async def filter_valid_citations(citations: list) -> list:
     """Return only citations whose URL resolves to HTTP 200."""
-    if not citations:
+    if not citations or not get_settings().url_validation_enabled:
         return citations
 
     unique_urls = list(dict.fromkeys(c.get("url", "") for c in citations if c.get("url")))
-    sem = asyncio.Semaphore(_MAX_CONCURRENT)
-
-    async def _guarded(client: httpx.AsyncClient, url: str):
-        async with sem:
-            return await _check_url(client, url)
-
-    async with httpx.AsyncClient(headers=_HEADERS, timeout=_TIMEOUT) as client:
-        results = await asyncio.gather(*[_guarded(client, u) for u in unique_urls])
+    with stage("url_validation"):
+        validity = await _check_urls(unique_urls)
 
-    valid_urls = {url for url, ok in results if ok}
-    kept = [c for c in citations if c.get("url", "") in valid_urls]
+    kept = [c for c in citations if validity.get(c.get("url", ""), False)]
 
     removed = len(citations) - len(kept)
     if removed:
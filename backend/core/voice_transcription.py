@@ -13,8 +13,6 @@ import json
 import time
 import uuid
 
-import boto3
-
 from config.settings import get_settings
 
 _S3_PREFIX = "interview-voice-tmp"
@@ -28,6 +26,8 @@ class TranscriptionError(Exception):
 
 
 def _clients():
+    import boto3
+
     settings = get_settings()
     region = settings.aws_default_region or "us-east-1"
     s3 = boto3.client("s3", region_name=region)
@@ -30,7 +30,7 @@ except ImportError:
 from backend.api.routes.admin import router as admin_router
 from backend.api.routes.auth import router as auth_router
 from backend.api.routes.chat import router as chat_router
-from backend.api.routes.health import router as health_router
+from backend.api.routes.health import metrics_router, router as health_router
 from backend.api.routes.history import router as history_router
 from backend.api.routes.interviewer import router as interviewer_router
 from backend.api.routes.oauth import router as oauth_router
@@ -61,6 +61,8 @@ def _set_chroma_dir(path: Path) -> None:
 
 
 _CHROMA_DIR = _refresh_chroma_dir()
+# Set by the streaming restore, which chmods files as they are written.
+_PERMISSIONS_FIXED_AT: Path | None = None
 
 
 def _env_truthy(name: str) -> bool:
@@ -183,20 +185,34 @@ def _fix_chroma_permissions(chroma_path: Path | None = None) -> None:
 
 
 def _restore_chroma_from_s3() -> bool:
-    """Download and extract chroma_db.tar.gz from S3 when empty or forced."""
+    """Restore Chroma from S3 into a fresh dir when empty or forced.
+
+    Prefers the content-addressed snapshot (state/chroma_last_refreshed.json),
+    reusing chunks from the existing local dir; streams the chroma_db.tar.gz
+    archive only when no snapshot has been published. Publishes no longer write
+    the tarball by default, so a failed snapshot restore is retried from the
+    snapshot (without the seed dir) rather than falling back to a stale archive.
+    """
     import shutil
-    import tarfile
     import tempfile
 
     import boto3
 
+    from backend.core.chroma_restore import stream_restore
+    from backend.core.chroma_snapshot import load_published_manifest, restore_snapshot
+    from backend.core.knowledge_bank_status import (
+        clear_restore_progress,
+        record_restore_progress,
+    )
+
+    global _PERMISSIONS_FIXED_AT
     force = _env_truthy("FORCE_CHROMA_RESTORE")
+    replace_local = force
 
     if force:
         logger.warning(
-            "FORCE_CHROMA_RESTORE is set — wiping local ChromaDB and restoring from S3"
+            "FORCE_CHROMA_RESTORE is set — replacing local ChromaDB from S3"
         )
-        _clear_chroma_dir()
     else:
         count = _chroma_chunk_count()
         if count > 0:
@@ -204,84 +220,122 @@ def _restore_chroma_from_s3() -> bool:
             return True
         if _CHROMA_DIR.exists():
             logger.warning(
-                "ChromaDB path exists but collection count is 0 — clearing before S3 restore"
+                "ChromaDB path exists but collection count is 0 — replacing from S3"
             )
-            _clear_chroma_dir()
+            replace_local = True
 
     bucket = os.getenv("AWS_S3_BUCKET", "")
     if not bucket:
         logger.warning("AWS_S3_BUCKET not set — skipping S3 restore")
+        if replace_local:
+            _clear_chroma_dir()
         return False
 
-    max_attempts = 2
-    for attempt in range(1, max_attempts + 1):
-        if attempt > 1:
-            logger.warning("Chroma restore produced 0 chunks — retrying S3 download (attempt %d)", attempt)
-
-        # Use a fresh temp dir — /tmp/chroma_db is unreliable on Railway (0 chunks after extract).
-        data_parent = Path(tempfile.mkdtemp(prefix="chroma_data_", dir="/tmp"))
-        tmp_archive: str | None = None
-        try:
-            logger.info(
-                "ChromaDB empty — downloading from s3://%s/%s (attempt %d/%d) ...",
-                bucket,
-                _CHROMA_S3_KEY,
-                attempt,
-                max_attempts,
-            )
-            s3 = boto3.client("s3", region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"))
-            with tempfile.NamedTemporaryFile(suffix=".tar.gz", delete=False) as tmp:
-                tmp_archive = tmp.name
-            s3.download_file(bucket, _CHROMA_S3_KEY, tmp_archive)
-            size_mb = Path(tmp_archive).stat().st_size / 1024 / 1024
-            logger.info("Downloaded %.1f MB — extracting to %s ...", size_mb, data_parent)
+    settings = get_settings()
+    part_size = max(1, settings.chroma_restore_part_mb) * 1024 * 1024
+    concurrency = max(1, settings.chroma_restore_concurrency)
+    s3 = boto3.client("s3", region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"))
+
+    # The old tree seeds the snapshot restore (hash-verified chunks are copied
+    # locally instead of downloaded), so it is only cleared once we are done.
+    old_dir = _CHROMA_DIR
+    manifest = load_published_manifest(s3, bucket)
+    seed_dir = old_dir if replace_local and manifest else None
+    if replace_local and not manifest:
+        _clear_chroma_dir()
 
-            with tarfile.open(tmp_archive, "r:gz") as tar:
-                tar.extractall(data_parent)
+    try:
+        max_attempts = 2
+        for attempt in range(1, max_attempts + 1):
+            if attempt > 1:
+                logger.warning("Chroma restore produced 0 chunks — retrying S3 download (attempt %d)", attempt)
 
+            # Use a fresh temp dir — /tmp/chroma_db is unreliable on Railway (0 chunks after extract).
+            data_parent = Path(tempfile.mkdtemp(prefix="chroma_data_", dir="/tmp"))
             chroma_dir = data_parent / "chroma_db"
-            if not chroma_dir.is_dir() or not (chroma_dir / "chroma.sqlite3").is_file():
-                logger.error("Archive missing chroma_db/chroma.sqlite3 after extract")
-                shutil.rmtree(data_parent, ignore_errors=True)
-                continue
-
-            sqlite_mb = (chroma_dir / "chroma.sqlite3").stat().st_size / 1024 / 1024
-            logger.info(
-                "Extracted ChromaDB archive OK (chroma.sqlite3 %.1f MB at %s)",
-                sqlite_mb,
-                chroma_dir,
-            )
-
-            _fix_chroma_permissions(chroma_dir)
-            import gc
-            gc.collect()
-
-            count = _chroma_chunk_count_at(chroma_dir)
-            if count <= 0:
-                logger.error("Extract finished but collection count is still 0 at %s", chroma_dir)
-                shutil.rmtree(data_parent, ignore_errors=True)
-                continue
+            clear_restore_progress()
+            try:
+                if manifest:
+                    # A retry skips the seed dir in case a reused chunk was the problem.
+                    attempt_seed = seed_dir if attempt == 1 else None
+                    logger.info(
+                        "ChromaDB empty — restoring snapshot %s from s3://%s (seed: %s, attempt %d/%d) ...",
+                        str(manifest.get("id", ""))[:12],
+                        bucket,
+                        attempt_seed or "none",
+                        attempt,
+                        max_attempts,
+                    )
+                    restore_snapshot(
+                        s3,
+                        bucket,
+                        manifest,
+                        chroma_dir,
+                        seed_dir=attempt_seed,
+                        concurrency=concurrency,
+                        on_progress=record_restore_progress,
+                    )
+                else:
+                    logger.info(
+                        "ChromaDB empty — streaming from s3://%s/%s into %s (attempt %d/%d) ...",
+                        bucket,
+                        _CHROMA_S3_KEY,
+                        data_parent,
+                        attempt,
+                        max_attempts,
+                    )
+                    # Extracts while downloading and sets permissions per file — no
+                    # temp archive, no extractall pass, no separate chmod walk.
+                    stream_restore(
+                        s3,
+                        bucket,
+                        _CHROMA_S3_KEY,
+                        data_parent,
+                        part_size=part_size,
+                        concurrency=concurrency,
+                        on_progress=record_restore_progress,
+                    )
+
+                if not chroma_dir.is_dir() or not (chroma_dir / "chroma.sqlite3").is_file():
+                    logger.error("Restore missing chroma_db/chroma.sqlite3")
+                    shutil.rmtree(data_parent, ignore_errors=True)
+                    continue
+
+                sqlite_mb = (chroma_dir / "chroma.sqlite3").stat().st_size / 1024 / 1024
+                logger.info(
+                    "Restored ChromaDB files OK (chroma.sqlite3 %.1f MB at %s)",
+                    sqlite_mb,
+                    chroma_dir,
+                )
 
-            _set_chroma_dir(chroma_dir)
-            logger.info(
-                "ChromaDB restored from S3 ✓ (%d chunks at %s)",
-                count,
-                chroma_dir,
-            )
-            if force:
-                logger.warning(
-                    "Unset FORCE_CHROMA_RESTORE on Railway after verifying /api/health "
-                    "so future deploys do not re-download on every restart"
+                count = _chroma_chunk_count_at(chroma_dir)
+                if count <= 0:
+                    logger.error("Restore finished but collection count is still 0 at %s", chroma_dir)
+                    shutil.rmtree(data_parent, ignore_errors=True)
+                    continue
+
+                _set_chroma_dir(chroma_dir)
+                _PERMISSIONS_FIXED_AT = chroma_dir
+                logger.info(
+                    "ChromaDB restored from S3 ✓ (%d chunks at %s)",
+                    count,
+                    chroma_dir,
                 )
-            return True
-        except Exception as e:
-            logger.warning(f"S3 restore attempt {attempt} failed: {e}")
-            shutil.rmtree(data_parent, ignore_errors=True)
-        finally:
-            if tmp_archive:
-                Path(tmp_archive).unlink(missing_ok=True)
+                if force:
+                    logger.warning(
+                        "Unset FORCE_CHROMA_RESTORE on Railway after verifying /api/health "
+                        "so future deploys do not re-download on every restart"
+                    )
+                return True
+            except Exception as e:
+                logger.warning(f"S3 restore attempt {attempt} failed: {e}")
+                shutil.rmtree(data_parent, ignore_errors=True)
 
-    return False
+        return False
+    finally:
+        clear_restore_progress()
+        if seed_dir is not None:
+            _clear_chroma_dir_at(old_dir)
 
 
 def _configure_langsmith() -> None:
@@ -305,22 +359,8 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    _configure_langsmith()
-    persist = _refresh_chroma_dir()
-    logger.info("Starting up — loading ChromaDB and models…")
-    logger.info("Chroma persist directory: %s", persist)
-
-    if _env_truthy("KNOWLEDGE_BANK_UPDATING") or _env_truthy("FORCE_CHROMA_RESTORE"):
-        app.state.maintenance_started_at = datetime.now(timezone.utc)
-        logger.info("Knowledge bank maintenance window started")
-
-    # Initialise SQLite user DB (kept for demo counter + legacy compat)
-    user_db.init_db()
-    logger.info("SQLite user DB ready")
-
-    # Initialise PostgreSQL Google OAuth tables
+def _init_database() -> None:
+    """PostgreSQL tables, then the interview question bank (needs the tables)."""
     try:
         google_db.init_tables()
         logger.info("Google OAuth DB tables ready (PostgreSQL)")
@@ -333,40 +373,167 @@ async def lifespan(app: FastAPI):
         from config.interview_profiles import seed_all_questions
 
         seed_all_questions()
-        logger.info("Interview question bank seeded (PostgreSQL)")
     except Exception as exc:
         logger.warning(f"Interview question seeding failed: {exc}")
 
+
+def _prepare_chroma() -> Path:
+    """S3 restore when empty/forced, then permissions; returns the persist dir."""
     _restore_chroma_from_s3()
     persist = chroma_persist_dir()
-    _fix_chroma_permissions(persist)
+    if persist != _PERMISSIONS_FIXED_AT:
+        _fix_chroma_permissions(persist)
+    return persist
+
+
+def _load_retriever(persist: Path):
+    """Open Chroma and build everything derived from it (BM25, packs, stats)."""
     import gc
+
     gc.collect()
     try:
         retriever = ChromaRetriever()
     except Exception as e:
         logger.warning(f"ChromaDB init failed ({e}) — starting with empty retriever")
-        retriever = None
+        return None
 
-    if retriever:
+    try:
+        from backend.core.bm25_index import warm_bm25_index
+        logger.info("Building BM25 index at startup…")
+        warm_bm25_index(retriever)
+        logger.info("BM25 index ready")
+    except Exception as e:
+        logger.warning(f"BM25 index build failed at startup ({e}) — will build lazily on first query")
+
+    try:
+        from backend.core import retrieval_pack
+
+        retrieval_pack.load(persist)
+    except Exception as e:
+        logger.warning(f"Interview retrieval pack load failed ({e}) — live retrieval only")
+    try:
+        from backend.core import corpus_stats
+
+        corpus_stats.load(persist, retriever.collection.count())
+    except Exception as e:
+        logger.warning(f"Corpus stats load failed ({e}) — will compute on first use")
+    return retriever
+
+
+async def _warm_up(app: FastAPI) -> None:
+    """
+    DB init + question seeding and the Chroma restore are independent, so they
+    run concurrently on worker threads; the retriever (and BM25) need the
+    restored index and follow. app.state.retriever is set last — until then
+    the maintenance middleware answers chat routes with 503.
+    """
+    import asyncio
+    import time
+
+    warmup = app.state.warmup
+    started = time.perf_counter()
+
+    async def timed(name: str, fn, *args):
+        t0 = time.perf_counter()
         try:
-            from backend.core.bm25_index import warm_bm25_index
-            logger.info("Building BM25 index at startup…")
-            warm_bm25_index(retriever)
-            logger.info("BM25 index ready")
-        except Exception as e:
-            logger.warning(f"BM25 index build failed at startup ({e}) — will build lazily on first query")
+            return await asyncio.to_thread(fn, *args)
+        finally:
+            warmup["durations_s"][name] = round(time.perf_counter() - t0, 2)
+
+    try:
+        warmup["phase"] = "database+chroma"
+        _, persist = await asyncio.gather(
+            timed("database", _init_database),
+            timed("chroma", _prepare_chroma),
+        )
+        warmup["phase"] = "retriever"
+        retriever = await timed("retriever", _load_retriever, persist)
+
+        session_store = app.state.session_store
+        app.state.pipeline = RAGPipeline(retriever=retriever, session_store=session_store) if retriever else None
+        app.state.retriever = retriever
+        warmup["phase"] = "ready"
+        app.state.ready = True
+        logger.info(
+            "Startup complete in %.1fs (%s)",
+            time.perf_counter() - started,
+            ", ".join(f"{k} {v}s" for k, v in warmup["durations_s"].items()),
+        )
+    except Exception as exc:
+        warmup["phase"] = "failed"
+        warmup["error"] = str(exc)
+        logger.exception("Warm-up failed")
+        raise
 
-    session_store = SessionStore()
-    pipeline = RAGPipeline(retriever=retriever, session_store=session_store) if retriever else None
 
-    app.state.retriever = retriever
-    app.state.session_store = session_store
-    app.state.pipeline = pipeline
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    import asyncio
+
+    _configure_langsmith()
+    settings = get_settings()
+    if settings.db_backend == "memory":
+        from backend.core import memory_db
+
+        memory_db.install()
+    persist = _refresh_chroma_dir()
+    logger.info("Starting up — loading ChromaDB and models…")
+    logger.info("Chroma persist directory: %s", persist)
+
+    if _env_truthy("KNOWLEDGE_BANK_UPDATING") or _env_truthy("FORCE_CHROMA_RESTORE"):
+        app.state.maintenance_started_at = datetime.now(timezone.utc)
+        logger.info("Knowledge bank maintenance window started")
+
+    # Initialise SQLite user DB (kept for demo counter + legacy compat)
+    user_db.init_db()
+    logger.info("SQLite user DB ready")
+
+    app.state.retriever = None
+    app.state.pipeline = None
+    app.state.session_store = SessionStore.from_settings()
+    app.state.ready = False
+    app.state.warmup = {"phase": "starting", "durations_s": {}, "error": None}
+
+    # FAST_BOOT serves liveness (/api/health/live) immediately and warms up in
+    # the background; otherwise the server only accepts requests once warm.
+    warmup_task = None
+    if settings.fast_boot:
+        logger.info("FAST_BOOT — serving while warming up")
+        warmup_task = asyncio.create_task(_warm_up(app))
+    else:
+        await _warm_up(app)
+
+    lag_probe = None
+    if settings.event_loop_lag_probe:
+        from backend.core.stage_timing import watch_event_loop_lag
+
+        lag_probe = asyncio.create_task(watch_event_loop_lag())
 
-    logger.info("Startup complete")
     yield
     logger.info("Shutting down")
+    for task in (lag_probe, warmup_task):
+        if task is not None and not task.done():
+            task.cancel()
+
+
+class _LazyASGIApp:
+    """Builds the wrapped ASGI app on its first request, so mounting it does
+    not import its dependencies at boot (mcp alone is ~0.3s)."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._app = None
+
+    async def __call__(self, scope, receive, send):
+        if self._app is None:
+            self._app = self._factory()
+        await self._app(scope, receive, send)
+
+
+def _mcp_asgi_app():
+    from backend.mcp_server import get_mcp_asgi_app
+
+    return get_mcp_asgi_app()
 
 
 app = FastAPI(
@@ -436,8 +603,8 @@ app.include_router(interviewer_router, prefix="/api")
 app.include_router(admin_router, prefix="/api")
 app.include_router(history_router, prefix="/api")
 app.include_router(oauth_router)          # OAuth at root (/.well-known, /oauth/*)
+app.include_router(metrics_router)        # Prometheus scrape at /metrics
 
 # Mount MCP server for Claude.ai integration
-from backend.mcp_server import get_mcp_asgi_app
-app.mount("/mcp", get_mcp_asgi_app())
+app.mount("/mcp", _LazyASGIApp(_mcp_asgi_app))
 app.include_router(health_router, prefix="/api")
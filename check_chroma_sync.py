@@ -22,50 +22,21 @@ from __future__ import annotations
 
 import argparse
 import os
-import re
 import sys
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any
 
 import requests
 
+from backend.core import corpus_stats
+
 ROOT = Path(__file__).parent
 DEFAULT_REMOTE_URL = "https://chatbot.thelearningproject.in"
 DEFAULT_LOCAL_CHROMA_DIR = ROOT / "chroma_db"
 DEFAULT_INTERVAL_SECONDS = 1800  # 30 min
 
-_MONTHS = [
-    "january", "february", "march", "april", "may", "june",
-    "july", "august", "september", "october", "november", "december",
-]
-_MONTH_RE = re.compile(r"(" + "|".join(_MONTHS) + r")[-_]?(\d{4})")
-_YEAR_RE = re.compile(r"(\d{4})")
-
-
-def parse_release_period(s3_key: str) -> str:
-    """Best-effort month/year label for a release-notes path, e.g.
-    '.../release-notes/2024/april-2024.md' -> '2024-04',
-    '.../release-notes/2020.md' -> '2020',
-    '.../release-notes/2019-earlier.md' -> '2019 & earlier',
-    '.../release-notes/current.md' -> 'undated' (no month/year in the path)."""
-    key = s3_key.lower()
-    month_match = _MONTH_RE.search(key)
-    if month_match:
-        month_name, year = month_match.groups()
-        month_num = _MONTHS.index(month_name) + 1
-        return f"{year}-{month_num:02d}"
-    if "-earlier" in key:
-        year_match = _YEAR_RE.search(key)
-        if year_match:
-            return f"{year_match.group(1)} & earlier"
-    year_match = _YEAR_RE.search(key)
-    if year_match:
-        return year_match.group(1)
-    return "undated"
-
-
 def _load_dotenv(path: Path) -> None:
     if not path.exists():
         return
@@ -80,6 +51,8 @@ def _load_dotenv(path: Path) -> None:
 
 
 def get_local_stats(chroma_dir: Path) -> dict[str, Any]:
+    """Local corpus stats — from chroma_db/corpus_stats.json.gz when it matches
+    the collection, else one metadata scan (backend/core/corpus_stats.py)."""
     import chromadb
 
     client = chromadb.PersistentClient(path=str(chroma_dir))
@@ -87,78 +60,21 @@ def get_local_stats(chroma_dir: Path) -> dict[str, Any]:
     if not collections:
         return {"error": f"No collections found in {chroma_dir}"}
     col = client.get_collection(collections[0].name)
-    total = col.count()
-
-    metas: list[dict] = []
-    batch = 1000
-    offset = 0
-    while offset < total:
-        page = col.get(limit=batch, offset=offset, include=["metadatas"])
-        batch_metas = page.get("metadatas", [])
-        if not batch_metas:
-            break
-        metas.extend(batch_metas)
-        offset += len(batch_metas)
-
-    from collections import defaultdict
-
-    chunks: dict[str, int] = defaultdict(int)
-    pages: dict[str, set] = defaultdict(set)
-    release_notes_chunks = 0
-    release_notes_docs: set[str] = set()
-    release_notes_chunks_by_product: dict[str, int] = defaultdict(int)
-    release_notes_docs_by_product: dict[str, set] = defaultdict(set)
-    # product -> period label ("2024-04", "2020", "2019 & earlier", "undated") -> stats
-    release_notes_timeline: dict[str, dict[str, dict[str, Any]]] = defaultdict(
-        lambda: defaultdict(lambda: {"chunks": 0, "docs": set()})
-    )
-
-    for m in metas:
-        product = m.get("product") or "Unknown"
-        url = m.get("url") or m.get("s3_key") or ""
-        chunks[product] += 1
-        if url:
-            pages[product].add(url)
-        raw_s3_key = m.get("s3_key", "")
-        s3_key = raw_s3_key.lower()
-        if "release-notes" in s3_key or "/rn/" in s3_key:
-            release_notes_chunks += 1
-            release_notes_docs.add(raw_s3_key)
-            release_notes_chunks_by_product[product] += 1
-            release_notes_docs_by_product[product].add(raw_s3_key)
-
-            period = parse_release_period(s3_key)
-            bucket = release_notes_timeline[product][period]
-            bucket["chunks"] += 1
-            bucket["docs"].add(raw_s3_key)
-
-    breakdown = {
-        p: {"chunks": chunks[p], "pages": len(pages[p])} for p in chunks
-    }
-    release_notes_breakdown = {
-        p: {
-            "chunks": release_notes_chunks_by_product[p],
-            "docs": len(release_notes_docs_by_product[p]),
-        }
-        for p in release_notes_chunks_by_product
-    }
-    release_notes_timeline_out = {
-        product: {
-            period: {"chunks": stats["chunks"], "docs": len(stats["docs"])}
-            for period, stats in periods.items()
-        }
-        for product, periods in release_notes_timeline.items()
-    }
 
+    summary = corpus_stats.current(col, chroma_dir)
+    release_notes = summary["release_notes"]
     return {
         "collection": collections[0].name,
-        "total_chunks": total,
-        "total_pages": sum(len(v) for v in pages.values()),
-        "product_breakdown": breakdown,
-        "release_notes_chunks": release_notes_chunks,
-        "release_notes_docs": len(release_notes_docs),
-        "release_notes_by_product": release_notes_breakdown,
-        "release_notes_timeline": release_notes_timeline_out,
+        "total_chunks": summary["chunk_count"],
+        "total_pages": summary["total_pages"],
+        "product_breakdown": {
+            row["product"]: {"chunks": row["chunks"], "pages": row["pages"]}
+            for row in summary["product_breakdown"]
+        },
+        "release_notes_chunks": release_notes["chunks"],
+        "release_notes_docs": release_notes["docs"],
+        "release_notes_by_product": release_notes["by_product"],
+        "release_notes_timeline": release_notes["timeline"],
     }
 
 
@@ -6,12 +6,16 @@ Levels × solutions (or Principal collections) with topic metadata for retrieval
 
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
 import random
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
 
+logger = logging.getLogger(__name__)
+
 InterviewLevel = Literal["junior", "senior", "architect", "principal"]
 
 LEVELS: tuple[dict[str, str], ...] = (
@@ -398,25 +402,44 @@ _SINGLE_SOLUTION_IDS = _VALID_SOLUTIONS - {"all"}
 _SINGLE_COLLECTION_IDS = _VALID_COLLECTIONS - {"all"}
 
 
+def _seed_rows() -> list[dict]:
+    return [
+        {
+            "question_id": q.id,
+            "level": level,
+            "profile_id": profile_id,
+            "topic": q.topic,
+            "difficulty": q.difficulty,
+            "prompt_text": q.question,
+            "expected_themes": list(q.expected_themes),
+            "retrieval_hint": q.retrieval_hint,
+            "question_type": q.question_type,
+            "grading_rubric": q.grading_rubric,
+        }
+        for (level, profile_id), bank in _SEED_BANK.items()
+        for q in bank
+    ]
+
+
+def seed_fingerprint(rows: list[dict]) -> str:
+    """sha256 of the seed rows in canonical JSON — changes iff the bank does."""
+    payload = json.dumps(rows, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def seed_all_questions() -> None:
     """Insert every seed question into interview_questions (version 1) if it isn't
-    already there. Idempotent — safe to call on every startup."""
+    already there. Idempotent — safe to call on every startup. When the bank's
+    fingerprint matches the one stored in system_config this is a single read;
+    otherwise one multi-row insert in one transaction."""
     from backend.core import google_db
 
-    for (level, profile_id), bank in _SEED_BANK.items():
-        for q in bank:
-            google_db.seed_interview_question(
-                question_id=q.id,
-                level=level,
-                profile_id=profile_id,
-                topic=q.topic,
-                difficulty=q.difficulty,
-                prompt_text=q.question,
-                expected_themes=list(q.expected_themes),
-                retrieval_hint=q.retrieval_hint,
-                question_type=q.question_type,
-                grading_rubric=q.grading_rubric,
-            )
+    rows = _seed_rows()
+    inserted = google_db.seed_interview_questions(rows, seed_fingerprint(rows))
+    if inserted is None:
+        logger.info("Interview question bank unchanged (%d seed questions) — skipped", len(rows))
+    else:
+        logger.info("Interview question bank seeded: %d of %d seed questions inserted", inserted, len(rows))
 
 
 def _row_to_question(row: dict) -> InterviewQuestion:
@@ -23,6 +23,9 @@ class Settings(BaseSettings):
     chroma_s3_key: str = Field(default="chroma_db/chroma_db.tar.gz", env="CHROMA_S3_KEY")
     force_chroma_restore: bool = Field(default=False, env="FORCE_CHROMA_RESTORE")
     chroma_restore_eta_minutes: int = Field(default=4, env="CHROMA_RESTORE_ETA_MINUTES")
+    # Streaming restore: archives larger than one part use parallel ranged GETs.
+    chroma_restore_part_mb: int = Field(default=32, env="CHROMA_RESTORE_PART_MB")
+    chroma_restore_concurrency: int = Field(default=8, env="CHROMA_RESTORE_CONCURRENCY")
     knowledge_bank_updating: bool = Field(default=False, env="KNOWLEDGE_BANK_UPDATING")
     knowledge_bank_update_started_at: Optional[str] = Field(
         None, env="KNOWLEDGE_BANK_UPDATE_STARTED_AT"
@@ -87,8 +90,8 @@ class Settings(BaseSettings):
 
     # Single source of truth for which LLM backend every call site uses, read
     # once at startup. "anthropic" = direct Anthropic API (local/dev default
-    # use case), "bedrock" = AWS Bedrock Converse (production). See
-    # backend/core/llm_factory.py.
+    # use case), "bedrock" = AWS Bedrock Converse (production), "mock" =
+    # offline load-test stand-in. See backend/core/llm_factory.py.
     llm_provider: str = Field(default="bedrock", env="LLM_PROVIDER")
 
     # Option 3: AWS Bedrock (recommended for AWS-native setup)
@@ -151,7 +154,64 @@ class Settings(BaseSettings):
     # Interviewer Mode (mock job interview prep)
     interviewer_mode_enabled: bool = Field(default=True, env="INTERVIEWER_MODE_ENABLED")
     interviewer_mode_admin_only: bool = Field(default=True, env="INTERVIEWER_MODE_ADMIN_ONLY")
-    
+    # Per-question grading calls in flight during /submit — keep under the
+    # provider's per-account Sonnet request rate.
+    interviewer_eval_concurrency: int = Field(default=4, env="INTERVIEWER_EVAL_CONCURRENCY")
+
+    # Chat session store (backend/core/session_store.py). "postgres" shares
+    # conversation state across workers/replicas; "sqlite" across one host.
+    session_store_backend: str = Field(default="memory", env="SESSION_STORE_BACKEND")
+    session_max_turns: int = Field(default=40, env="SESSION_MAX_TURNS")  # messages, not pairs
+    session_idle_ttl_s: int = Field(default=21600, env="SESSION_IDLE_TTL_S")
+    session_memory_budget_mb: int = Field(default=64, env="SESSION_MEMORY_BUDGET_MB")
+
+    # Conversation history sent to the RAG chains (backend/core/history_window.py).
+    # Summaries are cached per worker and saved with the session, so they are
+    # shared across workers only with a shared SESSION_STORE_BACKEND.
+    history_token_budget: int = Field(default=2000, env="HISTORY_TOKEN_BUDGET")
+    history_verbatim_messages: int = Field(default=4, env="HISTORY_VERBATIM_MESSAGES")
+    history_summaries_enabled: bool = Field(default=True, env="HISTORY_SUMMARIES_ENABLED")
+
+    # Speculative Haiku/Sonnet routing for borderline queries
+    # (backend/core/speculative_routing.py). The budget is per deployment, per UTC day.
+    speculative_routing_enabled: bool = Field(default=False, env="SPECULATIVE_ROUTING_ENABLED")
+    speculative_daily_budget: int = Field(default=500, env="SPECULATIVE_DAILY_BUDGET")
+    speculative_max_concurrent: int = Field(default=4, env="SPECULATIVE_MAX_CONCURRENT")
+
+    # Follow-up suggestions pushed after `done` (backend/core/follow_ups.py).
+    # The client unlocks input on `done`; the timeout only bounds how long the
+    # SSE connection lingers for the optional follow_ups event.
+    follow_ups_enabled: bool = Field(default=True, env="FOLLOW_UPS_ENABLED")
+    follow_ups_timeout_s: float = Field(default=6.0, env="FOLLOW_UPS_TIMEOUT_S")
+
+    # Per-stage chat latency (backend/core/stage_timing.py). /metrics answers
+    # 404 until METRICS_TOKEN is set, then requires "Authorization: Bearer <token>".
+    stage_timings_in_done: bool = Field(default=True, env="STAGE_TIMINGS_IN_DONE")  # admins only
+    metrics_token: str = Field(default="", env="METRICS_TOKEN")
+
+    # Load-test mode (scripts/load_test_chat.py). LLM_PROVIDER=mock streams
+    # deterministic tokens (backend/core/mock_llm.py); DB_BACKEND=memory swaps
+    # the chat path's google_db calls for backend/core/memory_db.py.
+    mock_llm_first_token_ms: float = Field(default=300.0, env="MOCK_LLM_FIRST_TOKEN_MS")
+    mock_llm_tokens_per_s: float = Field(default=60.0, env="MOCK_LLM_TOKENS_PER_S")
+    mock_llm_output_tokens: int = Field(default=200, env="MOCK_LLM_OUTPUT_TOKENS")
+    db_backend: str = Field(default="postgres", env="DB_BACKEND")
+    url_validation_enabled: bool = Field(default=True, env="URL_VALIDATION_ENABLED")
+    event_loop_lag_probe: bool = Field(default=False, env="EVENT_LOOP_LAG_PROBE")
+
+    # Startup (backend/main.py). FAST_BOOT accepts requests while the DB init,
+    # Chroma restore and BM25 build run in the background; /api/health/live is
+    # up immediately, /api/health/ready once warm-up finishes.
+    fast_boot: bool = Field(default=False, env="FAST_BOOT")
+
+    # Admin profiling (backend/core/profiler.py). PROFILING_ENABLED=false is the
+    # kill switch; the sampler backs off when its own cost exceeds the overhead cap.
+    profiling_enabled: bool = Field(default=True, env="PROFILING_ENABLED")
+    profiling_max_seconds: float = Field(default=30.0, env="PROFILING_MAX_SECONDS")
+    profiling_interval_ms: float = Field(default=10.0, env="PROFILING_INTERVAL_MS")
+    profiling_max_overhead: float = Field(default=0.02, env="PROFILING_MAX_OVERHEAD")  # fraction of wall time
+    profiling_tracemalloc_frames: int = Field(default=5, env="PROFILING_TRACEMALLOC_FRAMES")
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
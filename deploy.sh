@@ -110,7 +110,7 @@ if [ "$BACKEND_ONLY" = false ]; then
   echo ""
   echo "▶ [2/4] Generating sitemap.xml…"
   cd "$CHATBOT_ROOT"
-  venv/bin/python scripts/generate_sitemap.py
+  venv/bin/python scripts/generate_sitemap.py --previous-dir "$STATIC_DIR"
   echo ""
   echo "▶ [2/4] Building React frontend…"
   cd "$CHATBOT_ROOT/frontend"
@@ -0,0 +1,316 @@
+"""
+Offline latency/throughput benchmark for the retrieval stack — no Bedrock.
+
+Builds a synthetic Chroma collection at realistic scale from the real page
+registry (data/metadata_registry.json: titles, products, descriptions, URLs),
+embeds it with the deterministic hashing embedder from backend/core/mock_llm.py
+(1024-d like Titan, so --chroma-dir snapshots stay queryable), and drives the real
+retrieval code with the queries in eval/release_queries.json:
+
+  refinement    retrieve_with_refinement (dense + keyword + multi-hop passes,
+                BM25, RRF, neighbour refinement) — the production path
+  bm25          bm25_search against the full corpus
+  rrf           reciprocal_rank_fusion over the dense + BM25 lists
+  topical_gate  assess_retrieval over the refined docs
+
+ChromaRetriever is used unchanged; only its Bedrock client is replaced by
+MockEmbeddingsClient, which answers invoke_model() in the Titan response shape.
+Inner stages (embed, vector_query, bm25, rrf, retrieve_* passes) come from
+backend/core/stage_timing.py, so numbers line up with GET /api/admin/latency.
+
+The embedder hashes tokens, so scores reflect lexical overlap, not semantics —
+this measures speed and memory, not retrieval quality (see
+eval/live_gate_stress_test.py for that).
+
+Usage:
+    python eval/retrieval_benchmark.py                       # 20k chunks, compare to baseline
+    python eval/retrieval_benchmark.py --chunks 100000 --repeat 1
+    python eval/retrieval_benchmark.py --write-baseline      # after an intended change
+    python eval/retrieval_benchmark.py --chroma-dir /tmp/bench-20k  # build once, reuse after
+    python eval/retrieval_benchmark.py --chroma-dir chroma_db  # real snapshot, local embedder
+
+Exit code 1 when a phase's p95 or throughput, or peak RSS, is worse than the
+baseline by more than --tolerance (default 0.25). Baselines are per machine:
+record one on the machine you compare on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_ROOT = Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import chromadb
+from chromadb.config import Settings as ChromaSettings
+
+from backend.core import stage_timing
+from backend.core.bm25_index import bm25_search, warm_bm25_index
+from backend.core.chroma_retriever import COLLECTION_NAME, ChromaRetriever
+from backend.core.mock_llm import EMBED_DIM as DIM, MockEmbeddingsClient, embed
+from backend.core.retrieval_refiner import retrieve_with_refinement
+from backend.core.rrf import reciprocal_rank_fusion
+from backend.core.smart_router import detect_product_intent
+from backend.core.topical_relevance import assess_retrieval
+from config.settings import get_settings
+
+REGISTRY_PATH = _ROOT / "data" / "metadata_registry.json"
+QUERIES_PATH = Path(__file__).parent / "release_queries.json"
+BASELINE_PATH = Path(__file__).parent / "retrieval_benchmark_baseline.json"
+
+_ADD_BATCH = 2000
+_CHUNK_WORDS = 120
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9-]{2,}")
+# Sub-millisecond phases (rrf, topical_gate) jitter by more than any
+# percentage tolerance; a p95 must also be this much slower to count.
+_MIN_DELTA_MS = 1.0
+
+
+# ── Retriever ─────────────────────────────────────────────────────────────────
+
+class BenchRetriever(ChromaRetriever):
+    def __init__(self, persist_dir: Path, dim: int = DIM):
+        # Skips ChromaRetriever.__init__ — no boto3 client, no credentials.
+        self.persist_dir = Path(persist_dir)
+        self.client = chromadb.PersistentClient(
+            path=str(persist_dir), settings=ChromaSettings(anonymized_telemetry=False),
+        )
+        self.bedrock = MockEmbeddingsClient(dim)
+        self.collection = self.client.get_collection(name=COLLECTION_NAME)
+
+
+# ── Synthetic corpus ──────────────────────────────────────────────────────────
+
+def load_pages(path: Path = REGISTRY_PATH) -> list[dict]:
+    registry = json.loads(path.read_text())
+    return [
+        {
+            "s3_key": key,
+            "title": meta.get("title") or "",
+            "product": meta.get("product") or "",
+            "url": meta.get("experience_league_url") or "",
+            "text": " ".join(filter(None, [meta.get("title"), meta.get("description"), meta.get("feature")])),
+        }
+        for key, meta in sorted(registry.items())
+        if meta.get("product")
+    ]
+
+
+def synthetic_chunks(pages: list[dict], n_chunks: int, seed: int = 7):
+    """Yield (id, text, metadata) for `n_chunks` chunks spread over `pages`.
+
+    Each chunk is its page's title/description plus words sampled from the
+    same product's vocabulary, so products form lexical clusters the way the
+    real corpus does."""
+    rng = random.Random(seed)
+    vocab: dict[str, list[str]] = {}
+    for page in pages:
+        vocab.setdefault(page["product"], []).extend(w.lower() for w in _WORD_RE.findall(page["text"]))
+
+    for i in range(n_chunks):
+        page = pages[i % len(pages)]
+        chunk_index = i // len(pages)
+        words = vocab[page["product"]]
+        body = " ".join(rng.choice(words) for _ in range(_CHUNK_WORDS)) if words else ""
+        yield (
+            f"{page['s3_key']}#{chunk_index}",
+            f"# {page['title']}\n\n{page['text']}\n\n{body}",
+            {
+                "s3_key": page["s3_key"],
+                "chunk_index": chunk_index,
+                "title": page["title"],
+                "product": page["product"],
+                "url": page["url"],
+            },
+        )
+
+
+def build_collection(persist_dir: Path, n_chunks: int, *, dim: int = DIM, seed: int = 7) -> float:
+    """Create the synthetic collection; returns build seconds."""
+    started = time.perf_counter()
+    client = chromadb.PersistentClient(path=str(persist_dir), settings=ChromaSettings(anonymized_telemetry=False))
+    collection = client.get_or_create_collection(name=COLLECTION_NAME, metadata={"hnsw:space": "cosine"})
+    batch: list[tuple[str, str, dict]] = []
+    for chunk in synthetic_chunks(load_pages(), n_chunks, seed):
+        batch.append(chunk)
+        if len(batch) >= _ADD_BATCH:
+            _add(collection, batch, dim)
+            batch = []
+    if batch:
+        _add(collection, batch, dim)
+    return time.perf_counter() - started
+
+
+def _add(collection, batch: list[tuple[str, str, dict]], dim: int) -> None:
+    ids, docs, metas = zip(*batch)
+    collection.add(
+        ids=list(ids), documents=list(docs), metadatas=list(metas),
+        embeddings=[embed(d, dim) for d in docs],
+    )
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def load_queries(path: Path = QUERIES_PATH) -> list[str]:
+    data = json.loads(path.read_text())
+    return [
+        q["query"] if isinstance(q, dict) else q
+        for group in data.get("groups", [])
+        for q in group.get("queries", [])
+    ]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _phase(name: str, queries: list[str], repeat: int, fn) -> dict:
+    stage_timing.reset()
+    results = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            with stage_timing.stage(name):
+                results.append(fn(query))
+    wall = time.perf_counter() - started
+    stages = stage_timing.snapshot()
+    calls = repeat * len(queries)
+    return {
+        "calls": calls,
+        "qps": round(calls / wall, 2) if wall else None,
+        **{k: stages[name][k] for k in ("p50_ms", "p95_ms", "p99_ms")},
+        "stages": {k: v for k, v in stages.items() if k != name},
+        "_results": results,
+    }
+
+
+def run(retriever: ChromaRetriever, queries: list[str], repeat: int = 3) -> dict:
+    settings = get_settings()
+    intents = {q: detect_product_intent(q) for q in queries}
+
+    def refine(query):
+        intent = intents[query]
+        docs, _ = retrieve_with_refinement(
+            retriever, query, query,
+            n_results=settings.max_retrieval_results,
+            similarity_threshold=settings.similarity_threshold,
+            product_filter=intent,
+            where_filter={"product": {"$eq": intent}} if intent else None,
+        )
+        return query, docs
+
+    started = time.perf_counter()
+    warm_bm25_index(retriever)
+    bm25_build_s = time.perf_counter() - started
+
+    phases = {"refinement": _phase("refinement", queries, repeat, refine)}
+    refined = dict(phases["refinement"]["_results"])
+    phases["bm25"] = _phase("bm25", queries, repeat, lambda q: (q, bm25_search(retriever, q, n_results=30)))
+    sparse = dict(phases["bm25"]["_results"])
+    phases["rrf"] = _phase("rrf", queries, repeat, lambda q: reciprocal_rank_fusion([refined[q], sparse[q]]))
+    phases["topical_gate"] = _phase(
+        "topical_gate", queries, repeat, lambda q: assess_retrieval(q, refined[q], intents[q]),
+    )
+    for phase in phases.values():
+        phase.pop("_results")
+
+    return {
+        "chunks": retriever.collection.count(),
+        "queries": len(queries),
+        "repeat": repeat,
+        "bm25_build_s": round(bm25_build_s, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+        "phases": phases,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.25) -> list[str]:
+    """Human-readable regressions of `report` against `baseline`."""
+    if report.get("chunks") != baseline.get("chunks"):
+        return [f"baseline was recorded at {baseline.get('chunks')} chunks, not {report.get('chunks')} — not compared"]
+    regressions = []
+    for name, base in baseline.get("phases", {}).items():
+        cur = report["phases"].get(name)
+        if not cur:
+            continue
+        slack_ms = max(base.get("p95_ms", 0) * tolerance, _MIN_DELTA_MS)
+        if base.get("p95_ms") is not None and cur["p95_ms"] > base["p95_ms"] + slack_ms:
+            regressions.append(f"{name}: p95 {cur['p95_ms']}ms vs baseline {base['p95_ms']}ms")
+        if base.get("qps") and base["qps"] < 1000 / _MIN_DELTA_MS and cur["qps"] < base["qps"] / (1 + tolerance):
+            regressions.append(f"{name}: {cur['qps']} q/s vs baseline {base['qps']} q/s")
+    if baseline.get("peak_rss_mb") and report["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + tolerance):
+        regressions.append(f"peak RSS {report['peak_rss_mb']}MB vs baseline {baseline['peak_rss_mb']}MB")
+    return regressions
+
+
+def _print_report(report: dict) -> None:
+    print(f"\n{report['chunks']:,} chunks · {report['queries']} queries × {report['repeat']} · "
+          f"BM25 build {report['bm25_build_s']}s · peak RSS {report['peak_rss_mb']}MB")
+    print(f"{'phase/stage':<28}{'q/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, phase in report["phases"].items():
+        print(f"{name:<28}{phase['qps']:>9}{phase['p50_ms']:>10}{phase['p95_ms']:>10}{phase['p99_ms']:>10}")
+        for stage, row in phase["stages"].items():
+            print(f"  {stage:<26}{'':>9}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline retrieval-stack benchmark (no Bedrock)")
+    parser.add_argument("--chunks", type=int, default=20_000, help="Synthetic collection size")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the query set per phase")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--chroma-dir", type=Path, default=None,
+                        help="Collection to benchmark; built here (and kept) if empty. Default: a temp dir")
+    parser.add_argument("--queries", type=Path, default=QUERIES_PATH)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the report here")
+    args = parser.parse_args()
+
+    workdir = None
+    try:
+        persist_dir, build_s = args.chroma_dir, None
+        if persist_dir is None:
+            workdir = persist_dir = Path(tempfile.mkdtemp(prefix="rovr-bench-"))
+        if not (persist_dir / "chroma.sqlite3").exists():
+            print(f"Building {args.chunks:,}-chunk synthetic collection in {persist_dir}…")
+            build_s = build_collection(persist_dir, args.chunks, seed=args.seed)
+        report = run(BenchRetriever(persist_dir), load_queries(args.queries), args.repeat)
+        report["collection_build_s"] = round(build_s, 1) if build_s is not None else None
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    _print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+    if args.write_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline written → {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline} — run with --write-baseline to record one.")
+        return
+    regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
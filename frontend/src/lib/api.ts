@@ -81,7 +81,8 @@ export type SSEEvent =
   | { type: 'token'; content: string }
   | { type: 'citations'; citations: Citation[] }
   | ({ type: 'evidence' } & RetrievalEvidence)
-  | { type: 'done'; model: string; session_id: string; input_tokens?: number; output_tokens?: number; queries_used?: number; queries_remaining?: number; queries_limit?: number; conversation_id?: string }
+  | { type: 'done'; model: string; session_id: string; input_tokens?: number; output_tokens?: number; queries_used?: number; queries_remaining?: number; queries_limit?: number; conversation_id?: string; timings?: Record<string, number> }
+  | { type: 'follow_ups'; follow_ups: string[] }
   | { type: 'error'; message: string }
 
 export interface KnowledgeBankMaintenance {
@@ -198,21 +199,6 @@ export async function* streamChat(
   }
 }
 
-export async function getFollowUps(query: string, answer: string): Promise<string[]> {
-  try {
-    const res = await fetch(`${API_BASE}/api/chat/follow-ups`, {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json', ...authHeaders() },
-      body: JSON.stringify({ query, answer }),
-    })
-    if (!res.ok) return []
-    const data = await res.json()
-    return data.follow_ups as string[]
-  } catch {
-    return []
-  }
-}
-
 export async function submitFeedback(
   messageId: string,
   sessionId: string,
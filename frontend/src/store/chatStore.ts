@@ -1,5 +1,5 @@
 import { create } from 'zustand'
-import { streamChat, clearHistory, getFollowUps, submitFeedback, type Message, type Citation, type RetrievalEvidence, type ChatStage } from '@/lib/api'
+import { streamChat, clearHistory, submitFeedback, type Message, type Citation, type RetrievalEvidence, type ChatStage } from '@/lib/api'
 import {
   hasAnalyticsSession,
   trackFollowupQuery,
@@ -311,12 +311,15 @@ export const useChatStore = create<ChatState>()(
 
           enqueueStage('understanding')
           let statusCleared = false
+          // Set on `done`: the turn is over and the input is unlocked; the
+          // stream stays open only for the optional trailing follow_ups event.
+          let answered = false
 
           const conversationId = get().sessions[activeSessionId]?.conversationId ?? null
 
           try {
             for await (const event of streamChat(query, activeSessionId, false, assistantId, conversationId)) {
-              if (!get().isStreaming) break
+              if (!answered && !get().isStreaming) break
 
               if (event.type === 'status') {
                 enqueueStage(event.stage)
@@ -346,7 +349,8 @@ export const useChatStore = create<ChatState>()(
                 }))
               } else if (event.type === 'done') {
                 resetStageMachinery()
-                const updatesFromDone: Partial<ChatState> = { currentStage: null, stageStalled: false }
+                answered = true
+                const updatesFromDone: Partial<ChatState> = { isStreaming: false, currentStage: null, stageStalled: false }
                 if (event.queries_used !== undefined) updatesFromDone.queriesUsed = event.queries_used
                 if (event.queries_remaining !== undefined) updatesFromDone.queriesRemaining = event.queries_remaining
                 if (event.queries_limit !== undefined) updatesFromDone.queriesLimit = event.queries_limit
@@ -376,6 +380,13 @@ export const useChatStore = create<ChatState>()(
                       : patched
                   return { ...updatesFromDone, sessions }
                 })
+              } else if (event.type === 'follow_ups') {
+                const { follow_ups } = event
+                set((s) => ({
+                  sessions: patchActiveMessages(s.sessions, s.activeSessionId, (msgs) =>
+                    msgs.map((m) => (m.id === assistantId ? { ...m, follow_ups } : m))
+                  ),
+                }))
               } else if (event.type === 'error') {
                 resetStageMachinery()
                 trackNoAnswer(query, turnNumber, 'error')
@@ -392,6 +403,8 @@ export const useChatStore = create<ChatState>()(
               }
             }
           } catch (err) {
+            // A connection dropped while waiting for follow-ups doesn't undo the answer.
+            if (answered) return
             const msg = err instanceof Error ? err.message : String(err)
             const errStatus = (err as any)?.status
             const isDisabled = errStatus === 403
@@ -432,22 +445,8 @@ export const useChatStore = create<ChatState>()(
             }))
           } finally {
             resetStageMachinery()
-            set({ isStreaming: false, currentStage: null, stageStalled: false })
-          }
-
-          // After streaming: generate follow-up questions (non-blocking)
-          const finalMsg = get().sessions[get().activeSessionId]?.messages
-            .find((m) => m.id === assistantId)
-          if (finalMsg && finalMsg.content && !finalMsg.content.startsWith('Error:') && finalMsg.model !== 'none') {
-            getFollowUps(query, finalMsg.content).then((follow_ups) => {
-              if (follow_ups.length > 0) {
-                set((s) => ({
-                  sessions: patchActiveMessages(s.sessions, s.activeSessionId, (msgs) =>
-                    msgs.map((m) => (m.id === assistantId ? { ...m, follow_ups } : m))
-                  ),
-                }))
-              }
-            })
+            // After `done` the next turn may already be streaming — leave its state alone.
+            if (!answered) set({ isStreaming: false, currentStage: null, stageStalled: false })
           }
         },
 
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Compute corpus statistics for the local Chroma collection.
+
+Writes chroma_db/corpus_stats.json.gz (see backend/core/corpus_stats.py),
+which upload_chroma_to_s3.py then publishes with the snapshot. Run after
+ingest/enrichment so the stats match the collection they ship with:
+
+    python scripts/build_corpus_stats.py                  # full scan
+    python scripts/build_corpus_stats.py --changed-only   # only docs in data/changed_s3_keys.txt
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_ROOT))
+load_dotenv(_ROOT / ".env")
+
+from backend.core import corpus_stats
+from scripts.ingest_to_chroma import CHANGED_KEYS_PATH, CHROMA_DIR, open_collection
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s  %(levelname)-8s  %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build chroma_db/corpus_stats.json.gz")
+    parser.add_argument(
+        "--changed-only", action="store_true",
+        help=f"Update only the documents listed in {CHANGED_KEYS_PATH.name}. "
+             "Falls back to a full scan without an existing sidecar.",
+    )
+    args = parser.parse_args()
+
+    if not CHROMA_DIR.exists():
+        logger.error(f"chroma_db/ not found at {CHROMA_DIR}")
+        sys.exit(1)
+
+    changed_keys = None
+    if args.changed_only and CHANGED_KEYS_PATH.exists():
+        changed_keys = {line.strip() for line in CHANGED_KEYS_PATH.read_text().splitlines() if line.strip()}
+
+    summary = corpus_stats.refresh(open_collection(), CHROMA_DIR, changed_keys)
+    logger.info(
+        f"Wrote {CHROMA_DIR / corpus_stats.STATS_NAME} ({summary['chunk_count']} chunks, "
+        f"{len(summary['product_breakdown'])} products) ✓"
+    )
+
+
+if __name__ == "__main__":
+    main()
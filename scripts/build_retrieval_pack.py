@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Precompute interview grading context for the question seed bank.
+
+Writes chroma_db/retrieval_pack.json.gz (see backend/core/retrieval_pack.py),
+which upload_chroma_to_s3.py then publishes with the snapshot. Run after
+ingest/enrichment so the pack matches the collection it ships with:
+
+    python scripts/build_retrieval_pack.py
+    python scripts/build_retrieval_pack.py --if-stale   # skip if built from this index
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_ROOT))
+load_dotenv(_ROOT / ".env")
+
+from backend.core import retrieval_pack
+from backend.core.chroma_retriever import ChromaRetriever
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s  %(levelname)-8s  %(message)s")
+logger = logging.getLogger(__name__)
+
+CHROMA_DIR = _ROOT / "chroma_db"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build chroma_db/retrieval_pack.json.gz")
+    parser.add_argument(
+        "--if-stale", action="store_true",
+        help="Skip the build when the existing pack's index generation matches chroma_db/.",
+    )
+    args = parser.parse_args()
+
+    if not CHROMA_DIR.exists():
+        logger.error(f"chroma_db/ not found at {CHROMA_DIR}")
+        sys.exit(1)
+    if args.if_stale and retrieval_pack.is_current(CHROMA_DIR):
+        logger.info("Retrieval pack matches the current index — keeping it")
+        return
+
+    retriever = ChromaRetriever(persist_dir=str(CHROMA_DIR))
+    pack = retrieval_pack.build_pack(retriever)
+    path = retrieval_pack.write_pack(pack, CHROMA_DIR)
+    size_kb = path.stat().st_size / 1024
+    logger.info(f"Wrote {path} ({len(pack['entries'])} entries, {size_kb:.0f} KB) ✓")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,10 +20,14 @@ import chromadb
 import httpx
 from chromadb.config import Settings as ChromaSettings
 
+_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_ROOT))
+
+from src.utils.url_ledger import STATUS_DEAD, check_urls
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
-_ROOT = Path(__file__).parent.parent
 _CHROMA_PATH = _ROOT / "chroma_db"
 _TIMEOUT = 5.0
 _CONCURRENCY = 20
@@ -31,25 +35,16 @@ _CONCURRENCY = 20
 
 async def validate_urls(urls: list[str]) -> dict[str, bool]:
     """Return {url: is_valid} for all given URLs. Tests from local machine."""
-    sem = asyncio.Semaphore(_CONCURRENCY)
-    results: dict[str, bool] = {}
-
-    async def _check(client: httpx.AsyncClient, url: str) -> None:
-        async with sem:
-            try:
-                r = await client.head(url, follow_redirects=True)
-                results[url] = r.status_code not in (404, 410)
-            except Exception:
-                results[url] = True  # network error → keep
-
     async with httpx.AsyncClient(
         timeout=_TIMEOUT,
         verify=False,
         headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"},
     ) as client:
-        await asyncio.gather(*[_check(client, u) for u in urls])
+        # Shared ledger: URLs validated recently by any checker are not re-requested.
+        entries = await check_urls(urls, client=client, concurrency=_CONCURRENCY)
 
-    return results
+    # network error → keep
+    return {url: entry.status != STATUS_DEAD for url, entry in entries.items()}
 
 
 def main() -> None:
@@ -1,11 +1,25 @@
-"""Generate frontend/public/sitemap.xml from every published /q/<slug> landing page.
+"""Generate the sitemap for every published /q/<slug> landing page, incrementally.
 
-Run before `npm run build` so Vite copies the fresh sitemap into dist/ (deploy.sh does this).
+Writes into frontend/public/ (Vite copies it into dist/):
+  sitemap.xml           sitemap index pointing at the files below
+  sitemap-pages.xml     the app's root URL
+  sitemap-q-0001.xml …  landing pages in publish order, at most 50,000 URLs each
+  sitemap-state.json    per-shard counts/lastmod and the (created_at, slug) cursor
+
+Published pages are only ever added, so full shards never change. Each run
+reads the previous state (from --previous-dir, e.g. the last published copy of
+the site, else the output directory), fetches only slugs published after its
+cursor, appends them to the last shard and opens new shards as needed.
+
+Run before `npm run build` (deploy.sh and the publish-landing-pages workflow do this).
 
 Usage:
-    venv/bin/python scripts/generate_sitemap.py
+    venv/bin/python scripts/generate_sitemap.py [--previous-dir DIR] [--full]
 """
 
+import argparse
+import json
+import shutil
 import sys
 from pathlib import Path
 from xml.sax.saxutils import escape
@@ -19,26 +33,109 @@ load_dotenv(Path(__file__).parent.parent / ".env", override=False)
 from backend.core import google_db  # noqa: E402
 
 SITE_BASE = "https://thelearningproject.in/tools/rovr"
-OUTPUT_PATH = Path(__file__).parent.parent / "frontend" / "public" / "sitemap.xml"
+OUTPUT_DIR = Path(__file__).parent.parent / "frontend" / "public"
+STATE_NAME = "sitemap-state.json"
+PAGES_NAME = "sitemap-pages.xml"
+MAX_URLS_PER_SHARD = 50_000
+
+_URLSET_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+_URLSET_CLOSE = "</urlset>\n"
+
+
+def shard_name(index: int) -> str:
+    return f"sitemap-q-{index:04d}.xml"
+
+
+def url_entry(loc: str, lastmod: str | None = None) -> str:
+    lines = ["  <url>", f"    <loc>{escape(loc)}</loc>"]
+    if lastmod:
+        lines.append(f"    <lastmod>{lastmod}</lastmod>")
+    lines.append("  </url>")
+    return "\n".join(lines) + "\n"
+
+
+def load_state(directory: Path) -> dict | None:
+    try:
+        state = json.loads((directory / STATE_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+    shards = state.get("shards") or []
+    if not all((directory / s["file"]).exists() for s in shards):
+        return None
+    return state
+
+
+def append_to_shard(path: Path, entries: list[str]) -> None:
+    """Append <url> entries to a shard, creating it if needed."""
+    body = path.read_text()[: -len(_URLSET_CLOSE)] if path.exists() else _URLSET_OPEN
+    path.write_text(body + "".join(entries) + _URLSET_CLOSE)
+
+
+def write_index(directory: Path, shards: list[dict]) -> None:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for name, lastmod in [(PAGES_NAME, None)] + [(s["file"], s.get("lastmod")) for s in shards]:
+        lines.append("  <sitemap>")
+        lines.append(f"    <loc>{escape(f'{SITE_BASE}/{name}')}</loc>")
+        if lastmod:
+            lines.append(f"    <lastmod>{lastmod}</lastmod>")
+        lines.append("  </sitemap>")
+    lines.append("</sitemapindex>")
+    (directory / "sitemap.xml").write_text("\n".join(lines) + "\n")
+
+
+def update_sitemap(output_dir: Path, previous_dir: Path | None = None, full: bool = False) -> dict:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    source = previous_dir or output_dir
+    state = None if full else load_state(source)
+    if state is None:
+        for stale in output_dir.glob("sitemap-q-*.xml"):
+            stale.unlink()
+        state = {"shards": [], "cursor": None}
+    elif source != output_dir:
+        for s in state["shards"]:
+            shutil.copyfile(source / s["file"], output_dir / s["file"])
+
+    shards: list[dict] = state["shards"]
+    cursor = state.get("cursor") or {}
+    pending: list[str] = []
+    added = 0
+
+    def flush() -> None:
+        if pending:
+            append_to_shard(output_dir / shards[-1]["file"], pending)
+            pending.clear()
+
+    for row in google_db.iter_published_slugs_after(cursor.get("created_at"), cursor.get("slug")):
+        if not shards or shards[-1]["count"] >= MAX_URLS_PER_SHARD:
+            flush()
+            shards.append({"file": shard_name(len(shards) + 1), "count": 0, "lastmod": None})
+        lastmod = (row["created_at"] or "")[:10] or None
+        pending.append(url_entry(f"{SITE_BASE}/q/{row['slug']}", lastmod))
+        shards[-1]["count"] += 1
+        shards[-1]["lastmod"] = max(filter(None, [shards[-1]["lastmod"], lastmod]), default=None)
+        cursor = {"created_at": row["created_at"], "slug": row["slug"]}
+        added += 1
+    flush()
+
+    (output_dir / PAGES_NAME).write_text(_URLSET_OPEN + url_entry(f"{SITE_BASE}/") + _URLSET_CLOSE)
+    write_index(output_dir, shards)
+    state = {"shards": shards, "cursor": cursor or None}
+    (output_dir / STATE_NAME).write_text(json.dumps(state, indent=2) + "\n")
+    return {"added": added, "total": sum(s["count"] for s in shards), "shards": len(shards)}
 
 
 def main() -> None:
-    slugs = google_db.list_published_slugs()
-
-    urls = [f"{SITE_BASE}/"] + [f"{SITE_BASE}/q/{s['slug']}" for s in slugs]
-    lastmods = {f"{SITE_BASE}/q/{s['slug']}": s["created_at"][:10] for s in slugs if s.get("created_at")}
-
-    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
-    for url in urls:
-        lines.append("  <url>")
-        lines.append(f"    <loc>{escape(url)}</loc>")
-        if url in lastmods:
-            lines.append(f"    <lastmod>{lastmods[url]}</lastmod>")
-        lines.append("  </url>")
-    lines.append("</urlset>")
-
-    OUTPUT_PATH.write_text("\n".join(lines) + "\n")
-    print(f"Wrote {len(urls)} URLs ({len(slugs)} published questions) → {OUTPUT_PATH}")
+    parser = argparse.ArgumentParser(description="Generate the landing-page sitemap index and shards")
+    parser.add_argument("--previous-dir", type=Path, default=None,
+                        help="Directory holding the last published sitemap files (default: the output directory)")
+    parser.add_argument("--full", action="store_true", help="Ignore previous state and rebuild every shard")
+    args = parser.parse_args()
+
+    result = update_sitemap(OUTPUT_DIR, previous_dir=args.previous_dir, full=args.full)
+    print(
+        f"Sitemap: {result['added']} new URLs, {result['total']} published questions "
+        f"across {result['shards']} shard(s) → {OUTPUT_DIR / 'sitemap.xml'}"
+    )
 
 
 if __name__ == "__main__":
@@ -34,6 +34,7 @@ _ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(_ROOT))
 
 from src.utils.citation_metadata import build_index_metadata, metadata_to_chroma_fields
+from src.utils.media_metadata import document_media, media_to_chroma_fields
 
 logging.basicConfig(
     level=logging.INFO,
@@ -192,104 +193,61 @@ def _embed_with_retry(bedrock, text: str) -> list[float]:
             raise
 
 
-# ── Main ──────────────────────────────────────────────────────────────────────
-
-def main():
-    parser = argparse.ArgumentParser(description="Ingest docs into ChromaDB")
-    parser.add_argument("--limit", type=int, default=0, help="Max documents to process (0 = all)")
-    parser.add_argument("--product", type=str, default="", help="Filter by product name substring")
-    parser.add_argument(
-        "--prefix",
-        action="append",
-        default=[],
-        help="S3 key substring filter — repeat for multiple folders (e.g. --prefix help/ingestion/)",
-    )
-    parser.add_argument("--reset", action="store_true", help="Drop and re-create ChromaDB collection")
-    parser.add_argument(
-        "--changed-only", action="store_true",
-        help=f"Only ingest keys listed in {CHANGED_KEYS_PATH} (written by sync_docs_to_s3.py). "
-             "Falls back to full ingest if the file is missing or empty.",
-    )
-    parser.add_argument(
-        "--skip-existing",
-        action="store_true",
-        help="Skip chunks whose IDs already exist in ChromaDB (resume / avoid re-embedding).",
-    )
-    parser.add_argument(
-        "--start-at",
-        type=int,
-        default=0,
-        help="Skip the first N registry entries (resume after an interrupted ingest).",
-    )
-    args = parser.parse_args()
-
-    # ── Load metadata registry ─────────────────────────────────────────────
-    if not REGISTRY_PATH.exists():
-        logger.error(f"Registry not found: {REGISTRY_PATH}")
-        sys.exit(1)
+# ── Ingest ────────────────────────────────────────────────────────────────────
 
+def load_registry_entries(changed_keys: Optional[set[str]] = None) -> list[tuple[str, dict]]:
+    """Registry entries, narrowed to changed_keys when given (empty set → none)."""
     with open(REGISTRY_PATH) as f:
         registry: dict = json.load(f)
-
     logger.info(f"Loaded registry: {len(registry)} entries")
-
-    # Filter to only changed keys if --changed-only and the file exists with content
     entries = list(registry.items())
-    if args.changed_only:
-        if CHANGED_KEYS_PATH.exists():
-            changed_keys = {
-                line.strip() for line in CHANGED_KEYS_PATH.read_text().splitlines() if line.strip()
-            }
-            if changed_keys:
-                entries = [(k, v) for k, v in entries if k in changed_keys]
-                logger.info(f"--changed-only: {len(entries)} entries to re-ingest "
-                            f"({len(changed_keys)} changed keys from {CHANGED_KEYS_PATH.name})")
-            else:
-                logger.info("--changed-only: changed_s3_keys.txt is empty — nothing to ingest")
-                entries = []
-        else:
-            logger.warning(f"--changed-only set but {CHANGED_KEYS_PATH} not found — ingesting all")
+    if changed_keys is not None:
+        entries = [(k, v) for k, v in entries if k in changed_keys]
+    return entries
+
+
+def open_collection(chroma_client=None, *, reset: bool = False):
+    """Return the experience_league collection, creating the client if needed."""
+    if chroma_client is None:
+        CHROMA_DIR.mkdir(parents=True, exist_ok=True)
+        chroma_client = chromadb.PersistentClient(
+            path=str(CHROMA_DIR),
+            settings=ChromaSettings(anonymized_telemetry=False),
+        )
 
-    # Filter by product if requested
-    if args.product:
-        entries = [
-            (k, v) for k, v in entries
-            if args.product.lower() in v.get("product", "").lower()
-        ]
-        logger.info(f"Filtered to {len(entries)} entries matching product='{args.product}'")
+    if reset:
+        try:
+            chroma_client.delete_collection(COLLECTION_NAME)
+            logger.info(f"Dropped collection '{COLLECTION_NAME}'")
+        except Exception:
+            pass
 
-    if args.prefix:
-        entries = [
-            (k, v) for k, v in entries
-            if any(p in k for p in args.prefix)
-        ]
-        logger.info(
-            f"Filtered to {len(entries)} entries matching prefix(es): {args.prefix}"
-        )
+    return chroma_client.get_or_create_collection(
+        name=COLLECTION_NAME,
+        metadata={"hnsw:space": "cosine"},
+    )
 
-    if args.limit > 0:
-        entries = entries[: args.limit]
-        logger.info(f"Limiting to {len(entries)} entries")
 
-    total_entries = len(entries)
-    start_offset = max(args.start_at, 0)
-    if start_offset > 0:
-        if start_offset >= total_entries:
-            logger.info("--start-at %d >= entry count — nothing to ingest", start_offset)
-            return
-        logger.info(
-            "Resuming ingest at registry index %d/%d (skipping first %d entries)",
-            start_offset,
-            total_entries,
-            start_offset,
-        )
-        entries = entries[start_offset:]
+def ingest_entries(
+    collection,
+    entries: list[tuple[str, dict]],
+    *,
+    skip_existing: bool = False,
+    start_offset: int = 0,
+    total_entries: Optional[int] = None,
+) -> dict:
+    """
+    Download, chunk, embed and upsert `entries` into `collection`.
+
+    Returns {"chunks", "documents", "skipped", "skipped_existing", "s3_keys"}.
+    Called in-process by backend.core.refresh_pipeline and by main() below.
+    """
+    total_entries = total_entries if total_entries is not None else len(entries)
 
     # ── AWS S3 client ──────────────────────────────────────────────────────
     bucket = os.getenv("AWS_S3_BUCKET", "")
     if not bucket:
-        logger.error("AWS_S3_BUCKET env var not set")
-        sys.exit(1)
+        raise RuntimeError("AWS_S3_BUCKET env var not set")
 
     s3 = boto3.client(
         "s3",
@@ -298,28 +256,10 @@ def main():
         aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
     )
 
-    # ── ChromaDB client ────────────────────────────────────────────────────
-    CHROMA_DIR.mkdir(parents=True, exist_ok=True)
-    chroma_client = chromadb.PersistentClient(
-        path=str(CHROMA_DIR),
-        settings=ChromaSettings(anonymized_telemetry=False),
-    )
-
-    if args.reset:
-        try:
-            chroma_client.delete_collection(COLLECTION_NAME)
-            logger.info(f"Dropped collection '{COLLECTION_NAME}'")
-        except Exception:
-            pass
-
-    collection = chroma_client.get_or_create_collection(
-        name=COLLECTION_NAME,
-        metadata={"hnsw:space": "cosine"},
-    )
     logger.info(f"Collection '{COLLECTION_NAME}' has {collection.count()} existing chunks")
 
     existing_ids: set[str] = set()
-    if args.skip_existing:
+    if skip_existing:
         logger.info("Loading existing chunk IDs for --skip-existing…")
         existing_ids = _load_existing_ids(collection)
         logger.info("Found %d existing chunks — will skip re-embedding those", len(existing_ids))
@@ -344,6 +284,7 @@ def main():
     total_chunks = 0
     skipped = 0
     skipped_existing = 0
+    ingested_keys: set[str] = set()
     t0 = time.time()
 
     for doc_idx, (s3_key, meta) in enumerate(entries):
@@ -367,6 +308,11 @@ def main():
             skipped += 1
             continue
 
+        # Media is written with the chunk so ingest_with_media.py has nothing left to do
+        media_fields = media_to_chroma_fields(
+            document_media(chunks[0], [(c, s3_key) for c in chunks[1:]], s3_key=s3_key)
+        )
+
         for chunk_idx, chunk in enumerate(chunks):
             chunk_id = f"{s3_key}#{chunk_idx}"
             if chunk_id in existing_ids:
@@ -390,9 +336,11 @@ def main():
                     "doc_type": meta.get("doc_type", ""),
                     "level": meta.get("level", ""),
                     **citation_fields,
+                    **media_fields,
                 }
             )
             total_chunks += 1
+            ingested_keys.add(s3_key)
 
             # Flush batch
             if len(ids_batch) >= BATCH_SIZE:
@@ -419,6 +367,116 @@ def main():
         f"({skipped} skipped, {skipped_existing} existing) in {elapsed:.1f}s"
     )
     logger.info(f"Collection now has {collection.count()} total chunks")
+    return {
+        "chunks": total_chunks,
+        "documents": len(entries) - skipped,
+        "skipped": skipped,
+        "skipped_existing": skipped_existing,
+        "s3_keys": ingested_keys,
+    }
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest docs into ChromaDB")
+    parser.add_argument("--limit", type=int, default=0, help="Max documents to process (0 = all)")
+    parser.add_argument("--product", type=str, default="", help="Filter by product name substring")
+    parser.add_argument(
+        "--prefix",
+        action="append",
+        default=[],
+        help="S3 key substring filter — repeat for multiple folders (e.g. --prefix help/ingestion/)",
+    )
+    parser.add_argument("--reset", action="store_true", help="Drop and re-create ChromaDB collection")
+    parser.add_argument(
+        "--changed-only", action="store_true",
+        help=f"Only ingest keys listed in {CHANGED_KEYS_PATH} (written by sync_docs_to_s3.py). "
+             "Falls back to full ingest if the file is missing or empty.",
+    )
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Skip chunks whose IDs already exist in ChromaDB (resume / avoid re-embedding).",
+    )
+    parser.add_argument(
+        "--start-at",
+        type=int,
+        default=0,
+        help="Skip the first N registry entries (resume after an interrupted ingest).",
+    )
+    args = parser.parse_args()
+
+    # ── Load metadata registry ─────────────────────────────────────────────
+    if not REGISTRY_PATH.exists():
+        logger.error(f"Registry not found: {REGISTRY_PATH}")
+        sys.exit(1)
+
+    # Filter to only changed keys if --changed-only and the file exists with content
+    changed_keys: Optional[set[str]] = None
+    if args.changed_only:
+        if CHANGED_KEYS_PATH.exists():
+            changed_keys = {
+                line.strip() for line in CHANGED_KEYS_PATH.read_text().splitlines() if line.strip()
+            }
+            if not changed_keys:
+                logger.info("--changed-only: changed_s3_keys.txt is empty — nothing to ingest")
+        else:
+            logger.warning(f"--changed-only set but {CHANGED_KEYS_PATH} not found — ingesting all")
+
+    entries = load_registry_entries(changed_keys)
+    if changed_keys:
+        logger.info(f"--changed-only: {len(entries)} entries to re-ingest "
+                    f"({len(changed_keys)} changed keys from {CHANGED_KEYS_PATH.name})")
+
+    # Filter by product if requested
+    if args.product:
+        entries = [
+            (k, v) for k, v in entries
+            if args.product.lower() in v.get("product", "").lower()
+        ]
+        logger.info(f"Filtered to {len(entries)} entries matching product='{args.product}'")
+
+    if args.prefix:
+        entries = [
+            (k, v) for k, v in entries
+            if any(p in k for p in args.prefix)
+        ]
+        logger.info(
+            f"Filtered to {len(entries)} entries matching prefix(es): {args.prefix}"
+        )
+
+    if args.limit > 0:
+        entries = entries[: args.limit]
+        logger.info(f"Limiting to {len(entries)} entries")
+
+    total_entries = len(entries)
+    start_offset = max(args.start_at, 0)
+    if start_offset > 0:
+        if start_offset >= total_entries:
+            logger.info("--start-at %d >= entry count — nothing to ingest", start_offset)
+            return
+        logger.info(
+            "Resuming ingest at registry index %d/%d (skipping first %d entries)",
+            start_offset,
+            total_entries,
+            start_offset,
+        )
+        entries = entries[start_offset:]
+
+    if not os.getenv("AWS_S3_BUCKET", ""):
+        logger.error("AWS_S3_BUCKET env var not set")
+        sys.exit(1)
+
+    # ── ChromaDB client ────────────────────────────────────────────────────
+    collection = open_collection(reset=args.reset)
+    ingest_entries(
+        collection,
+        entries,
+        skip_existing=args.skip_existing,
+        start_offset=start_offset,
+        total_entries=total_entries,
+    )
 
 
 if __name__ == "__main__":
@@ -2,15 +2,15 @@
 """
 Enrich ChromaDB chunks with media metadata extracted from the markdown content already in the DB.
 
-Extracts from frontmatter and body:
-  - thumbnail URL  (thumbnail: <id>.jpg → https://video.tv.adobe.com/v/<id>)
-  - video URL      (>[!VIDEO](<url>) tags)
-  - image URLs     (![alt](https://...)) in body
+Extraction lives in src/utils/media_metadata.py and already runs at ingest time
+(ingest_to_chroma.py writes the fields on upsert); this script backfills older
+chunks or re-derives media for a set of changed documents.
 
 Writes thumbnail_url, video_url, image_urls back to each chunk's metadata.
 
 Usage:
     python scripts/ingest_with_media.py
+    python scripts/ingest_with_media.py --changed-only   # only data/changed_s3_keys.txt
     python scripts/ingest_with_media.py --dry-run
     python scripts/ingest_with_media.py --product "Customer Journey Analytics"
 """
@@ -18,11 +18,10 @@ Usage:
 import argparse
 import json
 import logging
-import re
 import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import chromadb
 from chromadb.config import Settings as ChromaSettings
@@ -31,115 +30,67 @@ _ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(_ROOT))
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s  %(levelname)-8s  %(message)s")
+from src.utils.media_metadata import (  # noqa: E402 — re-exported for callers
+    RE_IMG_ALL,
+    document_media,
+    extract_media_from_markdown,
+    media_to_chroma_fields,
+    resolve_image_url,
+)
+
 logger = logging.getLogger(__name__)
 
 CHROMA_DIR = _ROOT / "chroma_db"
 COLLECTION_NAME = "experience_league"
 
-ADOBE_THUMB_CDN = "https://cdn.experienceleague.adobe.com/thumb"
-
-# S3 key prefix → GitHub raw CDN base URL
-GITHUB_RAW_BASES = {
-    "adobe-docs/adobe-analytics/": "https://raw.githubusercontent.com/AdobeDocs/analytics.en/main/",
-    "adobe-docs/customer-journey-analytics/": "https://raw.githubusercontent.com/AdobeDocs/analytics-platform.en/main/",
-    "adobe-docs/experience-platform/": "https://raw.githubusercontent.com/AdobeDocs/experience-platform.en/main/",
-    "adobe-docs/adobe-target/": "https://raw.githubusercontent.com/AdobeDocs/target.en/main/",
-    "adobe-docs/adobe-journey-optimizer/": "https://raw.githubusercontent.com/AdobeDocs/journey-optimizer.en/main/",
-}
-
-# Regex patterns
-RE_THUMBNAIL = re.compile(r"^thumbnail:\s*(\S+)", re.MULTILINE)
-RE_VIDEO_TAG = re.compile(r">\[!VIDEO\]\(([^)]+)\)")
-RE_IMG_ALL = re.compile(r"!\[([^\]]*)\]\(([^)]+\.(?:png|jpg|jpeg|gif|webp))[^)]*\)", re.IGNORECASE)
-
-
-def resolve_image_url(img_path: str, s3_key: str) -> Optional[str]:
-    """Resolve a relative markdown image path to an absolute GitHub CDN URL."""
-    if img_path.startswith("http"):
-        return img_path  # already absolute
-
-    # Find the GitHub base for this s3_key
-    github_base = None
-    for prefix, base in GITHUB_RAW_BASES.items():
-        if s3_key.startswith(prefix):
-            # Strip the s3 prefix to get the repo-relative path
-            repo_path = s3_key[len(prefix):]
-            github_base = base + repo_path
-            break
-
-    if not github_base:
-        return None
-
-    # github_base is now the full path to the .md file, get its directory
-    doc_dir = github_base.rsplit("/", 1)[0] + "/"
-
-    if img_path.startswith("/"):
-        # Absolute repo path — resolve against GitHub base root
-        for prefix, base in GITHUB_RAW_BASES.items():
-            if s3_key.startswith(prefix):
-                return base + img_path.lstrip("/")
-    elif img_path.startswith("./"):
-        return doc_dir + img_path[2:]
-    else:
-        return doc_dir + img_path
-
-    return None
-
-
-def extract_media_from_markdown(content: str, page_url: str, s3_key: str = "") -> dict:
-    """Parse markdown frontmatter and body for thumbnail, video, and image URLs."""
-    media = {"thumbnail_url": None, "video_url": None, "image_urls": []}
-
-    # 1. >[!VIDEO](...) tag — most reliable
-    video_match = RE_VIDEO_TAG.search(content)
-    if video_match:
-        media["video_url"] = video_match.group(1).strip()
-
-    # 2. thumbnail: frontmatter field — e.g. "334261.jpg" or "3421621.jpeg"
-    thumb_match = RE_THUMBNAIL.search(content)
-    if thumb_match:
-        thumb_id = thumb_match.group(1).strip()
-        media["thumbnail_url"] = f"{ADOBE_THUMB_CDN}/{thumb_id}"
-
-    # 3. Image references — resolve relative paths to GitHub CDN absolute URLs
-    for m in RE_IMG_ALL.finditer(content):
-        alt = m.group(1).lower()
-        img_path = m.group(2)
-        # Skip icons and tiny decorative images
-        if any(x in alt for x in ["icon", "logo", "badge", "check", "smock"]):
-            continue
-        if any(x in img_path.lower() for x in ["icon", "logo", "smock", ".svg"]):
-            continue
-        resolved = resolve_image_url(img_path, s3_key)
-        if resolved and resolved not in media["image_urls"]:
-            media["image_urls"].append(resolved)
-        if len(media["image_urls"]) >= 4:
-            break
-
-    return media
+CHANGED_KEYS_PATH = _ROOT / "data" / "changed_s3_keys.txt"
+PAGE = 500        # safe under SQLite's 999-variable limit
+KEY_BATCH = 100   # s3_keys per `$in` where-filter
 
 
-def process_collection(collection, product_filter: str = "", dry_run: bool = False) -> dict:
+def _iter_chunks(collection, changed_keys: Optional[set[str]] = None) -> Iterator[tuple[str, str, dict]]:
     """
-    Group chunks by URL, extract media from chunk_index=0 (contains frontmatter),
-    then update all chunks for that URL.
+    Yield (id, document, metadata) — the whole collection in pages, or only
+    chunks whose s3_key is in changed_keys via a `where` filter.
     """
+    if changed_keys is not None:
+        keys = sorted(changed_keys)
+        for i in range(0, len(keys), KEY_BATCH):
+            page = collection.get(
+                where={"s3_key": {"$in": keys[i:i + KEY_BATCH]}},
+                include=["documents", "metadatas"],
+            )
+            yield from zip(page["ids"], page["documents"], page["metadatas"])
+        return
+
     # Fetch all chunks in pages — SQLite has a 999-variable limit that breaks large single fetches
-    logger.info("Fetching all chunks from ChromaDB…")
-    PAGE = 500  # safe under SQLite's 999-variable limit
-    ids, docs, metas = [], [], []
     offset = 0
     while True:
         page = collection.get(include=["documents", "metadatas"], limit=PAGE, offset=offset)
         if not page["ids"]:
             break
-        ids.extend(page["ids"])
-        docs.extend(page["documents"])
-        metas.extend(page["metadatas"])
+        yield from zip(page["ids"], page["documents"], page["metadatas"])
         offset += len(page["ids"])
         if len(page["ids"]) < PAGE:
             break
-    logger.info(f"Total chunks: {len(ids)}")
+
+
+def process_collection(
+    collection,
+    product_filter: str = "",
+    dry_run: bool = False,
+    changed_keys: Optional[set[str]] = None,
+) -> dict:
+    """
+    Group chunks by URL, extract media from chunk_index=0 (contains frontmatter),
+    then update all chunks for that URL.
+
+    changed_keys limits the pass to chunks of those s3_keys (refresh pipeline).
+    """
+    if changed_keys is not None:
+        logger.info(f"Fetching chunks for {len(changed_keys)} changed s3 keys…")
+    else:
+        logger.info("Fetching all chunks from ChromaDB…")
 
     # Group by URL
     # chunk 0 → frontmatter (video, thumbnail)
@@ -149,7 +100,9 @@ def process_collection(collection, product_filter: str = "", dry_run: bool = Fal
     url_to_all_ids: dict[str, list] = defaultdict(list)
     url_to_all_metas: dict[str, list] = defaultdict(list)
 
-    for cid, doc, meta in zip(ids, docs, metas):
+    total = 0
+    for cid, doc, meta in _iter_chunks(collection, changed_keys):
+        total += 1
         url = meta.get("url", "")
         if not url or url == "https://experienceleague.adobe.com/en/docs":
             continue
@@ -163,6 +116,7 @@ def process_collection(collection, product_filter: str = "", dry_run: bool = Fal
         if meta.get("chunk_index", 999) == 0:
             url_to_first_chunk[url] = {"doc": doc, "meta": meta}
 
+    logger.info(f"Total chunks: {total}")
     logger.info(f"Unique URLs to process: {len(url_to_first_chunk)}")
 
     stats = {"pages": 0, "chunks": 0, "with_video": 0, "with_thumbnail": 0, "with_images": 0}
@@ -175,30 +129,12 @@ def process_collection(collection, product_filter: str = "", dry_run: bool = Fal
         first = url_to_first_chunk.get(url)
         s3_key = first["meta"].get("s3_key", "") if first else ""
 
-        # Extract video + thumbnail from frontmatter (chunk 0 only)
-        media = extract_media_from_markdown(first["doc"], url, s3_key=s3_key) if first else \
-                {"thumbnail_url": None, "video_url": None, "image_urls": []}
-
-        # Extract images from ALL chunks (screenshots appear in body, not just frontmatter)
-        if len(media["image_urls"]) < 4:
-            for chunk in url_to_all_chunks[url]:
-                if chunk["meta"].get("chunk_index", 0) == 0:
-                    continue  # already processed above
-                body_s3 = chunk["meta"].get("s3_key", s3_key)
-                for m in RE_IMG_ALL.finditer(chunk["doc"]):
-                    alt = m.group(1).lower()
-                    img_path = m.group(2)
-                    if any(x in alt for x in ["icon", "logo", "badge", "check", "smock"]):
-                        continue
-                    if any(x in img_path.lower() for x in ["icon", "logo", "smock", ".svg"]):
-                        continue
-                    resolved = resolve_image_url(img_path, body_s3)
-                    if resolved and resolved not in media["image_urls"]:
-                        media["image_urls"].append(resolved)
-                    if len(media["image_urls"]) >= 4:
-                        break
-                if len(media["image_urls"]) >= 4:
-                    break
+        body = [
+            (chunk["doc"], chunk["meta"].get("s3_key", s3_key))
+            for chunk in url_to_all_chunks[url]
+            if chunk["meta"].get("chunk_index", 0) != 0
+        ]
+        media = document_media(first["doc"] if first else None, body, s3_key=s3_key)
 
         has_media = media["video_url"] or media["thumbnail_url"] or media["image_urls"]
         if not has_media:
@@ -207,16 +143,11 @@ def process_collection(collection, product_filter: str = "", dry_run: bool = Fal
         chunk_ids = url_to_all_ids[url]
         all_metas = url_to_all_metas[url]
 
-        updated_metas = []
-        for meta in all_metas:
-            new_meta = dict(meta)
-            if media["thumbnail_url"]:
-                new_meta["thumbnail_url"] = media["thumbnail_url"]
-            if media["video_url"]:
-                new_meta["video_url"] = media["video_url"]
-            if media["image_urls"]:
-                new_meta["image_urls"] = json.dumps(media["image_urls"])
-            updated_metas.append(new_meta)
+        media_fields = media_to_chroma_fields(media)
+        if all(all(meta.get(k) == v for k, v in media_fields.items()) for meta in all_metas):
+            continue  # already written at ingest time
+
+        updated_metas = [{**meta, **media_fields} for meta in all_metas]
 
         if not dry_run:
             # Batch updates to avoid SQLite variable limit on large URL chunk sets
@@ -260,15 +191,36 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--dry-run", action="store_true", help="Preview without writing")
     parser.add_argument("--product", default="", help="Filter by product name")
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help=f"Only chunks whose s3_key appears in {CHANGED_KEYS_PATH.name}",
+    )
     args = parser.parse_args()
 
+    changed_keys: Optional[set[str]] = None
+    if args.changed_only:
+        changed_keys = set()
+        if CHANGED_KEYS_PATH.exists():
+            changed_keys = {
+                line.strip() for line in CHANGED_KEYS_PATH.read_text().splitlines() if line.strip()
+            }
+        if not changed_keys:
+            logger.info(f"No changed s3 keys in {CHANGED_KEYS_PATH} — nothing to enrich")
+            return
+
     chroma = chromadb.PersistentClient(
         path=str(CHROMA_DIR),
         settings=ChromaSettings(anonymized_telemetry=False),
     )
     col = chroma.get_collection(COLLECTION_NAME)
 
-    stats, results_log = process_collection(col, product_filter=args.product, dry_run=args.dry_run)
+    stats, results_log = process_collection(
+        col,
+        product_filter=args.product,
+        dry_run=args.dry_run,
+        changed_keys=changed_keys,
+    )
 
     action = "Would update" if args.dry_run else "Updated"
     logger.info(f"\n{'='*60}")
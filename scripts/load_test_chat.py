@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Load-test POST /api/chat over SSE without Bedrock or PostgreSQL.
+
+By default this starts its own server (uvicorn backend.main:app) in load-test
+mode:
+  LLM_PROVIDER=mock             deterministic token stream + hashing embedder
+                                (backend/core/mock_llm.py), timed by --first-token-ms,
+                                --tokens-per-s and --output-tokens
+  DB_BACKEND=memory             chat-path google_db calls in memory (backend/core/memory_db.py)
+  URL_VALIDATION_ENABLED=false  no outbound HEAD requests for citations
+  EVENT_LOOP_LAG_PROBE=true     server records event-loop lag into /metrics
+and a synthetic Chroma collection (eval/retrieval_benchmark.py), built once
+into --chroma-dir and reused.
+
+It then keeps --concurrency SSE streams open until --requests turns finish,
+cycling through the eval/release_queries.json queries, and reports:
+  ttft          request sent → first `token` event
+  inter_token   gap between consecutive `token` events
+  turn          request sent → stream closed
+  error rate    non-200, `error` events, missing `done`, transport failures
+  loop lag      the driver's own event loop (is the client the bottleneck?)
+                and the server's, scraped from /metrics with its stage p95s
+
+Usage:
+    python scripts/load_test_chat.py --concurrency 50 --requests 500
+    python scripts/load_test_chat.py --url http://localhost:8000   # already-running server
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import re
+import secrets
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_ROOT))
+
+from backend.core import stage_timing  # noqa: E402
+from backend.core.memory_db import TOKEN_PREFIX  # noqa: E402
+
+_METRIC_RE = re.compile(r'^rovr_chat_stage_seconds\{stage="([^"]+)",quantile="([^"]+)"\} ([0-9.eE+-]+)$')
+
+
+def load_queries(path: Path) -> list[str]:
+    data = json.loads(path.read_text())
+    return [
+        q["query"] if isinstance(q, dict) else q
+        for group in data.get("groups", [])
+        for q in group.get("queries", [])
+    ]
+
+
+def start_server(args) -> subprocess.Popen:
+    chroma_dir = args.chroma_dir.resolve()
+    if not (chroma_dir / "chroma.sqlite3").exists():
+        from eval.retrieval_benchmark import build_collection
+
+        print(f"Building {args.chunks:,}-chunk synthetic collection in {chroma_dir}…")
+        chroma_dir.mkdir(parents=True, exist_ok=True)
+        build_collection(chroma_dir, args.chunks)
+
+    env = {
+        **os.environ,
+        "LLM_PROVIDER": "mock",
+        "DB_BACKEND": "memory",
+        "URL_VALIDATION_ENABLED": "false",
+        "EVENT_LOOP_LAG_PROBE": "true",
+        "METRICS_TOKEN": args.metrics_token,
+        "MOCK_LLM_FIRST_TOKEN_MS": str(args.first_token_ms),
+        "MOCK_LLM_TOKENS_PER_S": str(args.tokens_per_s),
+        "MOCK_LLM_OUTPUT_TOKENS": str(args.output_tokens),
+        "CHROMA_PERSIST_DIR": str(chroma_dir),
+        # Empty values win over .env (load_dotenv never overrides), so nothing
+        # reaches a real database or bucket.
+        "DATABASE_URL": "",
+        "AWS_S3_BUCKET": "",
+        "FORCE_CHROMA_RESTORE": "false",
+        "KNOWLEDGE_BANK_UPDATING": "false",
+        "LANGCHAIN_TRACING_V2": "false",
+    }
+    cmd = [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(args.port),
+           "--log-level", "warning", "--workers", str(args.workers)]
+    return subprocess.Popen(cmd, cwd=_ROOT, env=env)
+
+
+async def wait_ready(client: httpx.AsyncClient, proc: subprocess.Popen | None, timeout_s: float = 180) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise SystemExit(f"Server exited during startup (code {proc.returncode})")
+        try:
+            if (await client.get("/api/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit("Server did not become healthy in time")
+
+
+async def one_turn(client: httpx.AsyncClient, query: str, user: int, errors: Counter) -> None:
+    started = time.perf_counter()
+    last_token = None
+    done = False
+    try:
+        async with client.stream(
+            "POST", "/api/chat", json={"query": query},
+            headers={"Authorization": f"Bearer {TOKEN_PREFIX}{user}"},
+        ) as resp:
+            if resp.status_code != 200:
+                errors[f"http_{resp.status_code}"] += 1
+                return
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = json.loads(line[5:].strip())
+                now = time.perf_counter()
+                if event.get("type") == "token":
+                    if last_token is None:
+                        stage_timing.record("ttft", now - started)
+                    else:
+                        stage_timing.record("inter_token", now - last_token)
+                    last_token = now
+                elif event.get("type") == "error":
+                    errors["error_event"] += 1
+                    return
+                elif event.get("type") == "done":
+                    done = True
+    except (httpx.HTTPError, ValueError) as exc:
+        errors[type(exc).__name__] += 1
+        return
+    if not done:
+        errors["no_done"] += 1
+        return
+    stage_timing.record("turn", time.perf_counter() - started)
+
+
+def scrape_server_stages(text: str) -> dict[str, dict[str, float]]:
+    stages: dict[str, dict[str, float]] = {}
+    for line in text.splitlines():
+        m = _METRIC_RE.match(line)
+        if m:
+            stages.setdefault(m.group(1), {})[f"p{int(float(m.group(2)) * 100)}_ms"] = round(float(m.group(3)) * 1000, 1)
+    return stages
+
+
+async def run(args) -> dict:
+    queries = load_queries(args.queries)
+    proc = None if args.url else start_server(args)
+    base_url = args.url or f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency + 2, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout, connect=10.0)
+    errors: Counter = Counter()
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+            await wait_ready(client, proc)
+            stage_timing.reset()
+            lag_probe = asyncio.create_task(stage_timing.watch_event_loop_lag())
+            work = iter(enumerate(itertools.islice(itertools.cycle(queries), args.requests)))
+
+            async def worker() -> None:
+                for i, query in work:
+                    await one_turn(client, query, i % args.users, errors)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            wall = time.perf_counter() - started
+            lag_probe.cancel()
+            client_stages = stage_timing.snapshot()
+            metrics = await client.get("/metrics", headers={"Authorization": f"Bearer {args.metrics_token}"})
+            server_stages = scrape_server_stages(metrics.text) if metrics.status_code == 200 else {}
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    failed = sum(errors.values())
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "wall_s": round(wall, 2),
+        "turns_per_s": round((args.requests - failed) / wall, 2),
+        "error_rate": round(failed / args.requests, 4),
+        "errors": dict(errors),
+        "client": {k: v for k, v in client_stages.items() if k != "event_loop_lag"},
+        "client_event_loop_lag": client_stages.get("event_loop_lag"),
+        "server": server_stages,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{report['requests']} turns · concurrency {report['concurrency']} · {report['wall_s']}s · "
+          f"{report['turns_per_s']} turns/s · error rate {report['error_rate']:.2%} {report['errors'] or ''}")
+    print(f"{'':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = [(name, row) for name, row in report["client"].items()]
+    if report["client_event_loop_lag"]:
+        rows.append(("client loop lag", report["client_event_loop_lag"]))
+    for name, row in rows:
+        print(f"{name:<24}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+    if report["server"]:
+        print("server stages:")
+        for name, row in sorted(report["server"].items()):
+            print(f"  {name:<22}{row.get('p50_ms', ''):>10}{row.get('p95_ms', ''):>10}{row.get('p99_ms', ''):>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent SSE load test for /api/chat (mock LLM, in-memory DB)")
+    parser.add_argument("--url", default=None, help="Target an already-running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--users", type=int, default=50, help="Distinct synthetic users to spread turns over")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-stream read timeout (s)")
+    parser.add_argument("--queries", type=Path, default=_ROOT / "eval" / "release_queries.json")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (self-started server)")
+    parser.add_argument("--chroma-dir", type=Path, default=Path("/tmp/rovr-loadtest-chroma"))
+    parser.add_argument("--chunks", type=int, default=10_000, help="Synthetic collection size")
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--tokens-per-s", type=float, default=60.0)
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument("--json", type=Path, default=None, help="Also write the report here")
+    parser.add_argument(
+        "--metrics-token", default=os.getenv("METRICS_TOKEN") or secrets.token_urlsafe(16),
+        help="Bearer token for /metrics (default: $METRICS_TOKEN, else a fresh one for the self-started server)",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+    if report["error_rate"] > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
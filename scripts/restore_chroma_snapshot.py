@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Restore chroma_db/ from the published content-addressed snapshot.
+
+    python scripts/restore_chroma_snapshot.py
+
+Chunks already present in an existing chroma_db/ are reused; only missing ones
+are downloaded. Exits EXIT_NO_SNAPSHOT (3) only when no snapshot manifest is
+published — the one case where callers (the refresh-docs workflow) may fall
+back to chroma_db.tar.gz. Any other failure exits 1: the tarball is written
+only by `upload_chroma_to_s3.py --full-archive` and may be far older than the
+snapshot, so it must not stand in for a snapshot that failed to restore.
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import boto3
+from dotenv import load_dotenv
+
+_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_ROOT))
+load_dotenv(_ROOT / ".env")
+
+from backend.core.chroma_snapshot import load_published_manifest, restore_snapshot
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s  %(levelname)-8s  %(message)s")
+logger = logging.getLogger(__name__)
+
+CHROMA_DIR = _ROOT / "chroma_db"
+S3_BUCKET = os.getenv("AWS_S3_BUCKET", "experienceleaguechatbot")
+EXIT_NO_SNAPSHOT = 3
+
+
+def main() -> None:
+    s3 = boto3.client("s3", region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"))
+    manifest = load_published_manifest(s3, S3_BUCKET)
+    if not manifest:
+        logger.error("No Chroma snapshot manifest in s3://%s", S3_BUCKET)
+        sys.exit(EXIT_NO_SNAPSHOT)
+
+    staging = Path(tempfile.mkdtemp(prefix="chroma_snapshot_", dir=str(_ROOT)))
+    try:
+        stats = restore_snapshot(
+            s3, S3_BUCKET, manifest, staging / "chroma_db", seed_dir=CHROMA_DIR
+        )
+        if CHROMA_DIR.exists():
+            shutil.rmtree(CHROMA_DIR)
+        shutil.move(str(staging / "chroma_db"), str(CHROMA_DIR))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    logger.info(
+        "Restored snapshot %s ✓ (%d reused, %d fetched)",
+        manifest["id"][:12],
+        stats["chunks_reused"],
+        stats["chunks_fetched"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -366,18 +366,18 @@ def sync_repo(repo_key: str, config: dict, s3, manifest: dict,
     return stats
 
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--dry-run", action="store_true")
-    parser.add_argument("--force", action="store_true", help="Re-sync all files ignoring manifest")
-    parser.add_argument("--repo", help="Sync only this repo key (e.g. adobe-docs/adobe-analytics)")
-    args = parser.parse_args()
+def run_sync(*, force: bool = False, dry_run: bool = False, repo: Optional[str] = None) -> dict:
+    """
+    Sync every configured repo (or just `repo`) and persist manifest/registry.
 
+    Returns {"updated": int, "changed_keys": list[str]}. Called in-process by
+    backend.core.refresh_pipeline and by main() below.
+    """
     s3 = boto3.client("s3", region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"))
     manifest = _load_manifest()
     registry = _load_registry()
 
-    repos_to_sync = {args.repo: REPOS[args.repo]} if args.repo and args.repo in REPOS else REPOS
+    repos_to_sync = {repo: REPOS[repo]} if repo and repo in REPOS else REPOS
 
     total_updated = 0
     all_changed_keys: list[str] = []
@@ -386,14 +386,14 @@ def main():
         logger.info(f"\n{'='*50}")
         logger.info(f"Syncing {repo_key}")
         stats = sync_repo(repo_key, config, s3, manifest,
-                          dry_run=args.dry_run, force=args.force,
+                          dry_run=dry_run, force=force,
                           registry=registry)
         logger.info(f"  checked={stats['checked']} updated={stats['updated']} "
                     f"skipped={stats['skipped']} errors={stats['errors']}")
         total_updated += stats["updated"]
         all_changed_keys.extend(stats["changed_keys"])
 
-    if not args.dry_run:
+    if not dry_run:
         manifest["_last_sync"] = datetime.now(timezone.utc).isoformat()
         manifest["_last_updated_count"] = total_updated
         _save_manifest(manifest)
@@ -406,7 +406,17 @@ def main():
         logger.info(f"Changed keys written to {CHANGED_KEYS_PATH} ({len(all_changed_keys)} files)")
 
     logger.info(f"\nSync complete — {total_updated} files updated")
-    return total_updated
+    return {"updated": total_updated, "changed_keys": all_changed_keys}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--force", action="store_true", help="Re-sync all files ignoring manifest")
+    parser.add_argument("--repo", help="Sync only this repo key (e.g. adobe-docs/adobe-analytics)")
+    args = parser.parse_args()
+
+    return run_sync(force=args.force, dry_run=args.dry_run, repo=args.repo)["updated"]
 
 
 if __name__ == "__main__":
@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 """
-Compress chroma_db/ and upload to S3 as chroma_db.tar.gz.
+Publish chroma_db/ to S3 as a content-addressed snapshot.
 
 Run once locally whenever you want to refresh the production database:
     python scripts/upload_chroma_to_s3.py
+    python scripts/upload_chroma_to_s3.py --full-archive   # also write chroma_db.tar.gz
 
-Railway downloads this archive on first startup if chroma_db/ is empty.
-Set FORCE_CHROMA_RESTORE=true on Railway to wipe the volume and re-download.
+Index files are split into hash-keyed chunks (chroma_db/chunks/<sha256>); only
+chunks the previous manifest does not reference are uploaded. The manifest is
+written under "snapshot" in state/chroma_last_refreshed.json — see
+backend/core/chroma_snapshot.py. Railway restores from the snapshot on first
+startup if chroma_db/ is empty, falling back to chroma_db.tar.gz when no
+snapshot exists. Set FORCE_CHROMA_RESTORE=true on Railway to re-sync the volume
+(unchanged chunks are reused from the local copy).
 
 Before a FORCE redeploy, set on Railway (optional but recommended for user messaging):
   KNOWLEDGE_BANK_UPDATING=true
@@ -15,6 +21,7 @@ Before a FORCE redeploy, set on Railway (optional but recommended for user messa
 After /api/health shows expected chunk count, unset KNOWLEDGE_BANK_UPDATING and FORCE.
 """
 
+import argparse
 import json
 import os
 import sys
@@ -28,8 +35,11 @@ import boto3
 from dotenv import load_dotenv
 
 _ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_ROOT))
 load_dotenv(_ROOT / ".env")
 
+from backend.core.chroma_snapshot import META_KEY, load_published_manifest, publish_snapshot
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s  %(levelname)-8s  %(message)s")
 logger = logging.getLogger(__name__)
 
@@ -38,16 +48,7 @@ S3_BUCKET   = os.getenv("AWS_S3_BUCKET", "experienceleaguechatbot")
 S3_KEY      = "chroma_db/chroma_db.tar.gz"
 
 
-def main():
-    if not CHROMA_DIR.exists():
-        logger.error(f"chroma_db/ not found at {CHROMA_DIR}")
-        sys.exit(1)
-
-    s3 = boto3.client(
-        "s3",
-        region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
-    )
-
+def _upload_full_archive(s3) -> None:
     with tempfile.NamedTemporaryFile(suffix=".tar.gz", delete=False) as tmp:
         tmp_path = tmp.name
 
@@ -70,38 +71,84 @@ def main():
 
     Path(tmp_path).unlink()
 
+
+def publish(*, full_archive: bool = False, collection=None) -> dict:
+    """
+    Publish the snapshot (and optionally the tarball); return the metadata written.
+
+    Called in-process by backend.core.refresh_pipeline (which passes its open
+    collection for the chunk count) and by main() below.
+    """
+    if not CHROMA_DIR.exists():
+        raise FileNotFoundError(f"chroma_db/ not found at {CHROMA_DIR}")
+
+    s3 = boto3.client(
+        "s3",
+        region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
+    )
+
+    previous = load_published_manifest(s3, S3_BUCKET)
+    manifest, stats = publish_snapshot(s3, S3_BUCKET, CHROMA_DIR, previous=previous)
+    logger.info(
+        "Snapshot %s: uploaded %d of %d chunks (%.1f MB)",
+        manifest["id"][:12],
+        stats["chunks_uploaded"],
+        stats["chunks_total"],
+        stats["bytes_uploaded"] / 1024 / 1024,
+    )
+
+    if full_archive:
+        _upload_full_archive(s3)
+
     uploaded_at = datetime.now(timezone.utc).isoformat()
     chunk_count = 0
     try:
-        import chromadb
-        from chromadb.config import Settings as ChromaSettings
-        client = chromadb.PersistentClient(
-            path=str(CHROMA_DIR),
-            settings=ChromaSettings(anonymized_telemetry=False),
-        )
-        chunk_count = client.get_collection("experience_league").count()
+        if collection is None:
+            import chromadb
+            from chromadb.config import Settings as ChromaSettings
+            client = chromadb.PersistentClient(
+                path=str(CHROMA_DIR),
+                settings=ChromaSettings(anonymized_telemetry=False),
+            )
+            collection = client.get_collection("experience_league")
+        chunk_count = collection.count()
     except Exception as exc:
         logger.warning("Could not read chunk count for metadata: %s", exc)
 
-    meta_key = "state/chroma_last_refreshed.json"
-    meta_body = json.dumps(
-        {
-            "uploaded_at": uploaded_at,
-            "chunk_count": chunk_count,
-            "s3_key": S3_KEY,
-        },
-        indent=2,
-    )
+    meta: dict = {
+        "uploaded_at": uploaded_at,
+        "chunk_count": chunk_count,
+        "snapshot": manifest,
+    }
+    if full_archive:
+        meta["s3_key"] = S3_KEY
     s3.put_object(
         Bucket=S3_BUCKET,
-        Key=meta_key,
-        Body=meta_body.encode("utf-8"),
+        Key=META_KEY,
+        Body=json.dumps(meta, indent=2).encode("utf-8"),
         ContentType="application/json",
     )
-    logger.info("Wrote %s (uploaded_at=%s, chunks=%s)", meta_key, uploaded_at, chunk_count)
+    logger.info("Wrote %s (uploaded_at=%s, chunks=%s)", META_KEY, uploaded_at, chunk_count)
+    return {**meta, "stats": stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish chroma_db/ to S3")
+    parser.add_argument(
+        "--full-archive",
+        action="store_true",
+        help=f"Also upload the legacy {S3_KEY} tarball",
+    )
+    args = parser.parse_args()
+
+    if not CHROMA_DIR.exists():
+        logger.error(f"chroma_db/ not found at {CHROMA_DIR}")
+        sys.exit(1)
+
+    meta = publish(full_archive=args.full_archive)
 
     logger.info("Done ✓")
-    logger.info(f"Railway will download from s3://{S3_BUCKET}/{S3_KEY} on next cold start")
+    logger.info(f"Railway will restore snapshot {meta['snapshot']['id'][:12]} on next cold start")
 
 
 if __name__ == "__main__":
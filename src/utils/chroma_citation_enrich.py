@@ -26,10 +26,21 @@ DEFAULT_CHROMA_PATH = Path(__file__).parent.parent.parent / "chroma_db"
 COLLECTION = "experience_league"
 GET_PAGE_SIZE = 500
 UPDATE_BATCH = 500
+KEY_BATCH = 100  # s3_keys per `$in` where-filter
+
+
+def _iter_chunks(col, *, s3_keys: set[str] | None = None, page_size: int = GET_PAGE_SIZE):
+    """
+    Yield (id, metadata) without loading the full collection in one SQL query —
+    every chunk in pages, or only chunks of `s3_keys` via batched `where` gets.
+    """
+    if s3_keys is not None:
+        keys = sorted(s3_keys)
+        for i in range(0, len(keys), KEY_BATCH):
+            page = col.get(where={"s3_key": {"$in": keys[i:i + KEY_BATCH]}}, include=["metadatas"])
+            yield from zip(page.get("ids") or [], page.get("metadatas") or [])
+        return
 
-
-def _iter_chunks(col, *, page_size: int = GET_PAGE_SIZE):
-    """Yield (id, metadata) without loading the full collection in one SQL query."""
     offset = 0
     while True:
         page = col.get(include=["metadatas"], limit=page_size, offset=offset)
@@ -51,11 +62,15 @@ async def enrich_chroma_collection(
     prefix_filter: str | None = None,
     skip_validate: bool = False,
     changed_s3_keys: set[str] | None = None,
+    collection=None,
 ) -> None:
-    col = chromadb.PersistentClient(
-        path=str(chroma_path),
-        settings=ChromaSettings(anonymized_telemetry=False),
-    ).get_collection(COLLECTION)
+    """Pass `collection` to reuse an open client (in-process refresh pipeline)."""
+    col = collection
+    if col is None:
+        col = chromadb.PersistentClient(
+            path=str(chroma_path),
+            settings=ChromaSettings(anonymized_telemetry=False),
+        ).get_collection(COLLECTION)
 
     total = col.count()
     logger.info("Collection has %d chunks", total)
@@ -70,9 +85,18 @@ async def enrich_chroma_collection(
             return False
         return bool(sk)
 
+    # Changed-only runs read just those documents' chunks, once; prefix and
+    # product runs page through the collection on each pass.
+    changed_chunks = None
+    if changed_s3_keys is not None:
+        changed_chunks = list(_iter_chunks(col, s3_keys=changed_s3_keys))
+
+    def _chunks():
+        return iter(changed_chunks) if changed_chunks is not None else _iter_chunks(col)
+
     s3_keys: set[str] = set()
     matched = 0
-    for _doc_id, meta in _iter_chunks(col):
+    for _doc_id, meta in _chunks():
         if not _matches(meta):
             continue
         matched += 1
@@ -118,7 +142,7 @@ async def enrich_chroma_collection(
         updated_total += len(ids_to_update)
         ids_to_update, metas_to_update = [], []
 
-    for doc_id, meta in _iter_chunks(col):
+    for doc_id, meta in _chunks():
         if not _matches(meta):
             continue
         sk = meta.get("s3_key", "")
@@ -7,12 +7,9 @@ each chunk. Runtime citation code reads stored metadata only — never re-derive
 
 from __future__ import annotations
 
-import asyncio
 from dataclasses import dataclass
 from typing import Iterable
 
-import httpx
-
 from src.utils.exl_url_mapper import (
     derive_exl_url,
     get_canonical_exl_url,
@@ -20,8 +17,14 @@ from src.utils.exl_url_mapper import (
     repo_from_s3_key,
     repo_path_from_s3_key,
 )
+from src.utils.url_ledger import (
+    STATUS_DEAD,
+    STATUS_LIVE,
+    STATUS_UNVALIDATED,
+    UrlLedger,
+    check_urls,
+)
 
-_HTTP_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; ExLChatbot/1.0)"}
 _DEFAULT_TIMEOUT = 8.0
 # Experience League publishes no documented rate-limit guidance for its CDN.
 # 20 concurrent connections from a single IP is a common bot-detection/WAF
@@ -29,7 +32,6 @@ _DEFAULT_TIMEOUT = 8.0
 # still validating a large URL set in reasonable time.
 _DEFAULT_CONCURRENCY = 5
 _MAX_ATTEMPTS = 3
-_RETRY_BASE_DELAY_S = 1.0
 
 URL_SOURCE_VALIDATED = "validated"
 URL_SOURCE_UNMAPPED = "unmapped"
@@ -42,9 +44,9 @@ URL_SOURCE_DEAD = "dead"
 URL_SOURCE_UNVALIDATED = "unvalidated"
 
 # Status values returned per-URL by validate_urls().
-_STATUS_LIVE = "live"
-_STATUS_DEAD = "dead"
-_STATUS_UNVALIDATED = "unvalidated"
+_STATUS_LIVE = STATUS_LIVE
+_STATUS_DEAD = STATUS_DEAD
+_STATUS_UNVALIDATED = STATUS_UNVALIDATED
 
 
 @dataclass(frozen=True)
@@ -124,7 +126,12 @@ def metadata_to_chroma_fields(meta: CitationIndexMeta) -> dict[str, str]:
     }
 
 
-async def validate_urls(urls: Iterable[str], *, concurrency: int = _DEFAULT_CONCURRENCY) -> dict[str, str]:
+async def validate_urls(
+    urls: Iterable[str],
+    *,
+    concurrency: int = _DEFAULT_CONCURRENCY,
+    ledger: UrlLedger | None = None,
+) -> dict[str, str]:
     """
     Return {url: status} for unique URLs, status in "live" | "dead" | "unvalidated".
 
@@ -133,42 +140,19 @@ async def validate_urls(urls: Iterable[str], *, concurrency: int = _DEFAULT_CONC
     429, 5xx) is retried up to _MAX_ATTEMPTS times with linear backoff before
     falling back to "unvalidated" — never "dead". A transient failure must
     never be indistinguishable from a confirmed-gone page.
+
+    Results come from the shared URL ledger (src/utils/url_ledger.py); only
+    URLs past their freshness window are re-requested, conditionally, with
+    `concurrency` as the ceiling of the adaptive limit.
     """
-    unique = list(dict.fromkeys(u for u in urls if u))
-    if not unique:
-        return {}
-
-    sem = asyncio.Semaphore(concurrency)
-    results: dict[str, str] = {}
-
-    async def _check(client: httpx.AsyncClient, url: str) -> None:
-        async with sem:
-            for attempt in range(1, _MAX_ATTEMPTS + 1):
-                try:
-                    r = await client.head(url, follow_redirects=True)
-                except Exception:
-                    if attempt < _MAX_ATTEMPTS:
-                        await asyncio.sleep(_RETRY_BASE_DELAY_S * attempt)
-                        continue
-                    results[url] = _STATUS_UNVALIDATED
-                    return
-
-                if r.status_code in (404, 410):
-                    results[url] = _STATUS_DEAD
-                    return
-                if r.status_code == 429 or r.status_code >= 500:
-                    if attempt < _MAX_ATTEMPTS:
-                        await asyncio.sleep(_RETRY_BASE_DELAY_S * attempt)
-                        continue
-                    results[url] = _STATUS_UNVALIDATED
-                    return
-                results[url] = _STATUS_LIVE
-                return
-
-    async with httpx.AsyncClient(headers=_HTTP_HEADERS, timeout=_DEFAULT_TIMEOUT) as client:
-        await asyncio.gather(*[_check(client, u) for u in unique])
-
-    return results
+    entries = await check_urls(
+        urls,
+        ledger=ledger,
+        concurrency=concurrency,
+        attempts=_MAX_ATTEMPTS,
+        timeout=_DEFAULT_TIMEOUT,
+    )
+    return {url: entry.status for url, entry in entries.items()}
 
 
 def enrich_s3_key(s3_key: str, validation_map: dict[str, str]) -> CitationIndexMeta:
@@ -0,0 +1,141 @@
+"""
+Media metadata extraction from Experience League markdown.
+
+Extracts from frontmatter and body:
+  - thumbnail URL  (thumbnail: <id>.jpg → Adobe thumbnail CDN)
+  - video URL      (>[!VIDEO](<url>) tags)
+  - image URLs     (![alt](...png|jpg|...)) resolved to GitHub raw URLs
+
+Used at ingest time (scripts/ingest_to_chroma.py writes the fields on upsert)
+and by the backfill in scripts/ingest_with_media.py.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Iterable, Optional
+
+ADOBE_THUMB_CDN = "https://cdn.experienceleague.adobe.com/thumb"
+
+# S3 key prefix → GitHub raw CDN base URL
+GITHUB_RAW_BASES = {
+    "adobe-docs/adobe-analytics/": "https://raw.githubusercontent.com/AdobeDocs/analytics.en/main/",
+    "adobe-docs/customer-journey-analytics/": "https://raw.githubusercontent.com/AdobeDocs/analytics-platform.en/main/",
+    "adobe-docs/experience-platform/": "https://raw.githubusercontent.com/AdobeDocs/experience-platform.en/main/",
+    "adobe-docs/adobe-target/": "https://raw.githubusercontent.com/AdobeDocs/target.en/main/",
+    "adobe-docs/adobe-journey-optimizer/": "https://raw.githubusercontent.com/AdobeDocs/journey-optimizer.en/main/",
+}
+
+MAX_IMAGES = 4
+
+# Regex patterns
+RE_THUMBNAIL = re.compile(r"^thumbnail:\s*(\S+)", re.MULTILINE)
+RE_VIDEO_TAG = re.compile(r">\[!VIDEO\]\(([^)]+)\)")
+RE_IMG_ALL = re.compile(r"!\[([^\]]*)\]\(([^)]+\.(?:png|jpg|jpeg|gif|webp))[^)]*\)", re.IGNORECASE)
+
+_DECORATIVE_ALT = ("icon", "logo", "badge", "check", "smock")
+_DECORATIVE_PATH = ("icon", "logo", "smock", ".svg")
+
+
+def resolve_image_url(img_path: str, s3_key: str) -> Optional[str]:
+    """Resolve a relative markdown image path to an absolute GitHub CDN URL."""
+    if img_path.startswith("http"):
+        return img_path  # already absolute
+
+    # Find the GitHub base for this s3_key
+    github_base = None
+    for prefix, base in GITHUB_RAW_BASES.items():
+        if s3_key.startswith(prefix):
+            # Strip the s3 prefix to get the repo-relative path
+            repo_path = s3_key[len(prefix):]
+            github_base = base + repo_path
+            break
+
+    if not github_base:
+        return None
+
+    # github_base is now the full path to the .md file, get its directory
+    doc_dir = github_base.rsplit("/", 1)[0] + "/"
+
+    if img_path.startswith("/"):
+        # Absolute repo path — resolve against GitHub base root
+        for prefix, base in GITHUB_RAW_BASES.items():
+            if s3_key.startswith(prefix):
+                return base + img_path.lstrip("/")
+    elif img_path.startswith("./"):
+        return doc_dir + img_path[2:]
+    else:
+        return doc_dir + img_path
+
+    return None
+
+
+def _collect_images(content: str, s3_key: str, image_urls: list[str]) -> None:
+    """Append non-decorative image URLs from content until MAX_IMAGES."""
+    for m in RE_IMG_ALL.finditer(content):
+        if len(image_urls) >= MAX_IMAGES:
+            return
+        alt = m.group(1).lower()
+        img_path = m.group(2)
+        # Skip icons and tiny decorative images
+        if any(x in alt for x in _DECORATIVE_ALT):
+            continue
+        if any(x in img_path.lower() for x in _DECORATIVE_PATH):
+            continue
+        resolved = resolve_image_url(img_path, s3_key)
+        if resolved and resolved not in image_urls:
+            image_urls.append(resolved)
+
+
+def extract_media_from_markdown(content: str, page_url: str = "", s3_key: str = "") -> dict:
+    """Parse markdown frontmatter and body for thumbnail, video, and image URLs."""
+    media = {"thumbnail_url": None, "video_url": None, "image_urls": []}
+
+    # 1. >[!VIDEO](...) tag — most reliable
+    video_match = RE_VIDEO_TAG.search(content)
+    if video_match:
+        media["video_url"] = video_match.group(1).strip()
+
+    # 2. thumbnail: frontmatter field — e.g. "334261.jpg" or "3421621.jpeg"
+    thumb_match = RE_THUMBNAIL.search(content)
+    if thumb_match:
+        thumb_id = thumb_match.group(1).strip()
+        media["thumbnail_url"] = f"{ADOBE_THUMB_CDN}/{thumb_id}"
+
+    # 3. Image references — resolve relative paths to GitHub CDN absolute URLs
+    _collect_images(content, s3_key, media["image_urls"])
+    return media
+
+
+def document_media(
+    first_chunk: Optional[str],
+    body_chunks: Iterable[tuple[str, str]],
+    s3_key: str = "",
+) -> dict:
+    """
+    Media for one page: video/thumbnail from chunk 0 (frontmatter), images from
+    chunk 0 first and then the remaining (doc, s3_key) chunks.
+    """
+    if first_chunk is not None:
+        media = extract_media_from_markdown(first_chunk, s3_key=s3_key)
+    else:
+        media = {"thumbnail_url": None, "video_url": None, "image_urls": []}
+    # Screenshots appear in the body, not just frontmatter.
+    for doc, body_s3 in body_chunks:
+        if len(media["image_urls"]) >= MAX_IMAGES:
+            break
+        _collect_images(doc, body_s3 or s3_key, media["image_urls"])
+    return media
+
+
+def media_to_chroma_fields(media: dict) -> dict:
+    """Chroma metadata fields for media (Chroma rejects None values)."""
+    fields: dict[str, str] = {}
+    if media.get("thumbnail_url"):
+        fields["thumbnail_url"] = media["thumbnail_url"]
+    if media.get("video_url"):
+        fields["video_url"] = media["video_url"]
+    if media.get("image_urls"):
+        fields["image_urls"] = json.dumps(media["image_urls"])
+    return fields
@@ -0,0 +1,274 @@
+"""
+Persistent URL validation ledger shared by runtime and offline validators.
+
+One SQLite row per URL: status, HTTP code, checked_at, redirect target and the
+ETag / Last-Modified validators from the last response. check_urls() returns
+ledger rows that are still inside their freshness window without any network
+traffic, and revalidates stale rows with conditional HEAD requests
+(If-None-Match / If-Modified-Since → 304 keeps the page live).
+
+Used by backend.core.url_validator (runtime citation filter),
+citation_metadata.validate_urls (index-time enrichment, validate_exl_urls.py)
+and scripts/fix_citation_urls.py, so a URL is checked at most once per window
+per host.
+
+DB file: data/url_ledger.db
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).parent.parent.parent
+_DB_PATH = _ROOT / "data" / "url_ledger.db"
+
+STATUS_LIVE = "live"
+STATUS_DEAD = "dead"
+# Timeout, connection error, 429 or 5xx — inconclusive, never "dead".
+STATUS_UNVALIDATED = "unvalidated"
+
+# Seconds a ledger row is trusted before the URL is rechecked.
+FRESH_FOR = {
+    STATUS_LIVE: 86_400,        # 24 h
+    STATUS_DEAD: 3_600,         # 1 h — EXL occasionally restores pages
+    STATUS_UNVALIDATED: 900,    # 15 min — transient failures retry soon
+}
+
+_HTTP_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; ExLChatbot/1.0)"}
+_DEFAULT_TIMEOUT = 8.0
+_DEFAULT_CONCURRENCY = 5
+_MAX_ATTEMPTS = 3
+_RETRY_BASE_DELAY_S = 1.0
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    url: str
+    status: str
+    checked_at: float
+    http_status: Optional[int] = None
+    final_url: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self.checked_at < FRESH_FOR.get(self.status, 0)
+
+
+class UrlLedger:
+    """SQLite-backed store of LedgerEntry rows (one connection per call, WAL)."""
+
+    def __init__(self, path: Path = _DB_PATH):
+        self.path = Path(path)
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        if not self._initialized:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS url_checks (
+                    url           TEXT PRIMARY KEY,
+                    status        TEXT NOT NULL,
+                    http_status   INTEGER,
+                    checked_at    REAL NOT NULL,
+                    final_url     TEXT,
+                    etag          TEXT,
+                    last_modified TEXT
+                )
+            """)
+            self._initialized = True
+        return conn
+
+    def get_many(self, urls: Iterable[str]) -> dict[str, LedgerEntry]:
+        urls = list(urls)
+        found: dict[str, LedgerEntry] = {}
+        with self._connect() as conn:
+            # Stay under SQLite's 999-variable limit.
+            for i in range(0, len(urls), 500):
+                batch = urls[i:i + 500]
+                rows = conn.execute(
+                    "SELECT url, status, checked_at, http_status, final_url, etag, last_modified "
+                    f"FROM url_checks WHERE url IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for row in rows:
+                    found[row[0]] = LedgerEntry(*row)
+        return found
+
+    def record_many(self, entries: Iterable[LedgerEntry]) -> None:
+        rows = [
+            (e.url, e.status, e.http_status, e.checked_at, e.final_url, e.etag, e.last_modified)
+            for e in entries
+        ]
+        if not rows:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO url_checks "
+                "(url, status, http_status, checked_at, final_url, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+
+_default_ledger: Optional[UrlLedger] = None
+
+
+def default_ledger() -> UrlLedger:
+    global _default_ledger
+    if _default_ledger is None:
+        _default_ledger = UrlLedger()
+    return _default_ledger
+
+
+class _AdaptiveLimiter:
+    """
+    AIMD concurrency limit: halve on a throttling/transient response, grow by
+    one after `limit` consecutive clean responses, never above the configured max.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = self.maximum
+        self._active = 0
+        self._clean = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+
+    async def release(self, ok: bool) -> None:
+        async with self._cond:
+            self._active -= 1
+            if ok:
+                self._clean += 1
+                if self._clean >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._clean = 0
+            else:
+                self._clean = 0
+                self.limit = max(self.minimum, self.limit // 2)
+            self._cond.notify_all()
+
+
+def _conditional_headers(entry: Optional[LedgerEntry]) -> dict[str, str]:
+    if entry is None or entry.status != STATUS_LIVE:
+        return {}
+    headers = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+async def check_urls(
+    urls: Iterable[str],
+    *,
+    ledger: Optional[UrlLedger] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    concurrency: int = _DEFAULT_CONCURRENCY,
+    attempts: int = _MAX_ATTEMPTS,
+    timeout: float = _DEFAULT_TIMEOUT,
+) -> dict[str, LedgerEntry]:
+    """
+    Return {url: LedgerEntry} for unique URLs, checking only ledger-stale ones.
+
+    "dead" is reserved for an explicit 404/410. Timeouts, connection errors,
+    429 and 5xx are retried up to `attempts` times with linear backoff and then
+    recorded as "unvalidated". Those same responses shrink the concurrency
+    limit; clean responses grow it back toward `concurrency`.
+
+    Ledger reads and writes run on a worker thread: this is on the chat path,
+    and a writer holding the SQLite lock (offline enrichment, fix_citation_urls)
+    can make them wait up to the connection timeout.
+    """
+    unique = list(dict.fromkeys(u for u in urls if u))
+    if not unique:
+        return {}
+
+    ledger = ledger or default_ledger()
+    now = time.time()
+    try:
+        known = await asyncio.to_thread(ledger.get_many, unique)
+    except (sqlite3.Error, OSError) as exc:
+        # A broken ledger must not break validation — just check everything.
+        logger.warning("URL ledger read failed (%s): %s", ledger.path, exc)
+        known = {}
+    results = {u: e for u, e in known.items() if e.is_fresh(now)}
+    stale = [u for u in unique if u not in results]
+    if not stale:
+        return results
+
+    limiter = _AdaptiveLimiter(concurrency)
+    checked: list[LedgerEntry] = []
+
+    async def _check(http: httpx.AsyncClient, url: str) -> None:
+        previous = known.get(url)
+        headers = _conditional_headers(previous)
+        for attempt in range(1, attempts + 1):
+            await limiter.acquire()
+            r = None
+            try:
+                r = await http.head(url, headers=headers, follow_redirects=True)
+            except Exception as exc:
+                logger.debug("URL check error for %s: %s", url, exc)
+            transient = r is None or r.status_code == 429 or r.status_code >= 500
+            await limiter.release(ok=not transient)
+
+            if transient:
+                if attempt < attempts:
+                    await asyncio.sleep(_RETRY_BASE_DELAY_S * attempt)
+                    continue
+                entry = LedgerEntry(
+                    url, STATUS_UNVALIDATED, time.time(),
+                    http_status=r.status_code if r is not None else None,
+                )
+            elif r.status_code == 304 and previous is not None:
+                entry = replace(previous, status=STATUS_LIVE, checked_at=time.time())
+            else:
+                final = str(r.url)
+                entry = LedgerEntry(
+                    url,
+                    STATUS_DEAD if r.status_code in (404, 410) else STATUS_LIVE,
+                    time.time(),
+                    http_status=r.status_code,
+                    final_url=final if final != url else None,
+                    etag=r.headers.get("etag"),
+                    last_modified=r.headers.get("last-modified"),
+                )
+            results[url] = entry
+            checked.append(entry)
+            return
+
+    if client is not None:
+        await asyncio.gather(*[_check(client, u) for u in stale])
+    else:
+        async with httpx.AsyncClient(headers=_HTTP_HEADERS, timeout=timeout) as http:
+            await asyncio.gather(*[_check(http, u) for u in stale])
+
+    try:
+        await asyncio.to_thread(ledger.record_many, checked)
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("URL ledger write failed (%s): %s", ledger.path, exc)
+    logger.debug(
+        "URL ledger: %d fresh, %d checked (final concurrency %d)",
+        len(unique) - len(stale), len(stale), limiter.limit,
+    )
+    return results
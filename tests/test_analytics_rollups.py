@@ -0,0 +1,108 @@
+"""Analytics rollups maintained by log_query and the TTL cache in front of them."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.core import google_db
+
+
+class _Cursor:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.executed: list[tuple[str, tuple]] = []
+
+    def execute(self, query, params=None):
+        self.executed.append((" ".join(query.split()), params))
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *a):
+        return False
+
+
+class _Conn:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    google_db.invalidate_analytics_cache()
+    yield
+    google_db.invalidate_analytics_cache()
+
+
+def _connect_with(monkeypatch, cursor):
+    opened = []
+
+    def connect():
+        conn = _Conn(cursor)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(google_db, "_connect", connect)
+    return opened
+
+
+def test_log_query_updates_rollups_in_the_same_transaction(monkeypatch):
+    cursor = _Cursor()
+    opened = _connect_with(monkeypatch, cursor)
+
+    google_db.log_query("u1", "a@b.c", "  How do I create a segment?  ", "haiku", 1000, 200)
+
+    statements = [q for q, _ in cursor.executed]
+    assert statements[0].startswith("INSERT INTO exl_query_logs")
+    assert statements[1].startswith("INSERT INTO exl_query_daily_rollup")
+    assert statements[2].startswith("INSERT INTO exl_query_frequency")
+    assert cursor.executed[2][1] == ("How do I create a segment?", "How do I create a segment?")
+    assert len(opened) == 1 and opened[0].commits == 1
+
+
+@pytest.mark.parametrize("text,model", [
+    ("too short", "haiku"),
+    ("x" * 101, "haiku"),
+    ("How do I create a segment?", "blocked_language"),
+])
+def test_queries_outside_the_landing_filter_skip_the_frequency_table(monkeypatch, text, model):
+    cursor = _Cursor()
+    _connect_with(monkeypatch, cursor)
+
+    google_db.log_query("u1", "a@b.c", text, model, 10, 0)
+
+    assert not any("exl_query_frequency" in q for q, _ in cursor.executed)
+    assert any("exl_query_daily_rollup" in q for q, _ in cursor.executed)
+
+
+def test_landing_feed_reads_the_rollup_through_the_ttl_cache(monkeypatch):
+    cursor = _Cursor(rows=[{"query_text": "How do I create a segment?", "times_asked": 4, "last_asked": None}])
+    opened = _connect_with(monkeypatch, cursor)
+
+    first = google_db.get_popular_query_logs(limit=200)
+    second = google_db.get_popular_query_logs(limit=200)
+
+    assert first == second == [{"query_text": "How do I create a segment?", "times_asked": 4, "last_asked": None}]
+    assert len(opened) == 1
+    assert "FROM exl_query_frequency" in cursor.executed[0][0]
+    assert "exl_query_logs" not in cursor.executed[0][0]
+
+    google_db.invalidate_analytics_cache()
+    google_db.get_popular_query_logs(limit=200)
+    assert len(opened) == 2
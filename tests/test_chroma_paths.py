@@ -4,6 +4,8 @@ import sys
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 _ROOT = Path(__file__).parent.parent
 if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
@@ -49,3 +51,21 @@ def test_railway_honours_volume_when_opted_in():
 def test_chroma_persist_dir_override():
     with patch.dict("os.environ", {"CHROMA_PERSIST_DIR": "/data/chroma"}, clear=True):
         assert chroma_paths.chroma_persist_dir() == Path("/data/chroma")
+
+
+def test_index_generation_moves_on_same_size_edit(tmp_path):
+    chromadb = pytest.importorskip("chromadb")
+    assert chroma_paths.index_generation(tmp_path) is None
+
+    client = chromadb.PersistentClient(path=str(tmp_path))
+    col = client.get_or_create_collection("experience_league")
+    col.upsert(ids=["a"], documents=["old text"], embeddings=[[0.1, 0.2]])
+    before = chroma_paths.index_generation(tmp_path)
+
+    col.upsert(ids=["a"], documents=["new text"], embeddings=[[0.3, 0.4]])
+    after = chroma_paths.index_generation(tmp_path)
+
+    assert col.count() == 1
+    assert before is not None and after is not None
+    assert before != after
+    assert chroma_paths.index_generation(tmp_path, collection="missing") is None
@@ -0,0 +1,119 @@
+"""Streaming Chroma restore against an in-memory S3 stand-in."""
+
+import io
+import stat
+import tarfile
+
+import pytest
+
+from backend.core import chroma_restore
+from backend.core import knowledge_bank_status as kb
+
+
+class _FakeBody(io.BytesIO):
+    pass
+
+
+class _FakeS3:
+    """Minimal head_object / get_object(Range=...) stand-in for one bucket."""
+
+    def __init__(self, objects: dict[str, bytes]):
+        self.objects = objects
+        self.ranges: list[str] = []
+
+    def head_object(self, Bucket, Key):
+        return {"ContentLength": len(self.objects[Key]), "ETag": '"abc"'}
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None):
+        data = self.objects[Key]
+        if Range:
+            self.ranges.append(Range)
+            start, end = (int(x) for x in Range.removeprefix("bytes=").split("-"))
+            data = data[start:end + 1]
+        return {"Body": _FakeBody(data)}
+
+
+def _archive(files: dict[str, bytes], *, zstd: bool = False) -> bytes:
+    raw = io.BytesIO()
+    with tarfile.open(fileobj=raw, mode="w") as tar:
+        for name, payload in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(payload)
+            info.mode = 0o400
+            tar.addfile(info, io.BytesIO(payload))
+    data = raw.getvalue()
+    if zstd:
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(data)
+    import gzip
+
+    return gzip.compress(data)
+
+
+_FILES = {
+    "chroma_db/chroma.sqlite3": b"sqlite" * 5000,
+    "chroma_db/seg-1/data_level0.bin": bytes(range(256)) * 400,
+}
+
+
+def _assert_restored(dest):
+    for name, payload in _FILES.items():
+        path = dest / name
+        assert path.read_bytes() == payload
+        assert stat.S_IMODE(path.stat().st_mode) == chroma_restore.FILE_MODE
+    assert stat.S_IMODE((dest / "chroma_db" / "seg-1").stat().st_mode) == chroma_restore.DIR_MODE
+
+
+def test_single_get_streams_and_fixes_permissions(tmp_path):
+    s3 = _FakeS3({"chroma_db/chroma_db.tar.gz": _archive(_FILES)})
+    progress = []
+    result = chroma_restore.stream_restore(
+        s3, "bucket", "chroma_db/chroma_db.tar.gz", tmp_path,
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+    _assert_restored(tmp_path)
+    assert result["files"] == 2
+    assert s3.ranges == []
+    assert progress[-1][0] == progress[-1][1]
+
+
+def test_ranged_parallel_download_reassembles_in_order(tmp_path):
+    archive = _archive(_FILES)
+    s3 = _FakeS3({"chroma_db/chroma_db.tar.gz": archive})
+    chroma_restore.stream_restore(
+        s3, "bucket", "chroma_db/chroma_db.tar.gz", tmp_path,
+        part_size=512, concurrency=4,
+    )
+    _assert_restored(tmp_path)
+    assert len(s3.ranges) == -(-len(archive) // 512)
+
+
+def test_zstd_archive(tmp_path):
+    pytest.importorskip("zstandard")
+    s3 = _FakeS3({"chroma_db/chroma_db.tar.zst": _archive(_FILES, zstd=True)})
+    chroma_restore.stream_restore(s3, "bucket", "chroma_db/chroma_db.tar.zst", tmp_path)
+    _assert_restored(tmp_path)
+
+
+def test_rejects_members_outside_destination(tmp_path):
+    s3 = _FakeS3({"a.tar.gz": _archive({"../escape.txt": b"x"})})
+    with pytest.raises(tarfile.TarError):
+        chroma_restore.stream_restore(s3, "bucket", "a.tar.gz", tmp_path / "dest")
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_progress_feeds_maintenance_eta():
+    kb.clear_restore_progress()
+    try:
+        kb.record_restore_progress(50, 100)
+        progress = kb.restore_progress()
+        assert progress["percent"] == 50.0
+        from types import SimpleNamespace
+
+        app = SimpleNamespace(state=SimpleNamespace(retriever=None, maintenance_started_at=None))
+        payload = kb.build_maintenance_payload(app)
+        assert payload["maintenance"]["progress"]["bytes_total"] == 100
+    finally:
+        kb.clear_restore_progress()
+    assert kb.restore_progress() is None
@@ -0,0 +1,131 @@
+"""Content-addressed Chroma snapshot publish/restore against an in-memory S3."""
+
+import hashlib
+import io
+import json
+
+import pytest
+
+from backend.core import chroma_snapshot as snap
+
+
+class _FakeS3:
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.puts: list[str] = []
+        self.gets: list[str] = []
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.objects[Key] = Body
+        self.puts.append(Key)
+
+    def get_object(self, Bucket, Key):
+        self.gets.append(Key)
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+
+def _noise(n_bytes: int) -> bytes:
+    blocks = (hashlib.sha256(str(i).encode()).digest() for i in range(n_bytes // 32))
+    return b"".join(blocks)
+
+
+def _write_tree(root, sqlite: bytes, index: bytes):
+    (root / "seg").mkdir(parents=True, exist_ok=True)
+    (root / "chroma.sqlite3").write_bytes(sqlite)
+    (root / "seg" / "data_level0.bin").write_bytes(index)
+    (root / "seg" / "empty.bin").write_bytes(b"")
+
+
+def _publish(s3, root, previous=None):
+    manifest, stats = snap.publish_snapshot(s3, "b", root, previous=previous, chunk_size=1024)
+    s3.put_object(Bucket="b", Key=snap.META_KEY, Body=json.dumps({"snapshot": manifest}).encode())
+    return manifest, stats
+
+
+def test_publish_uploads_only_new_chunks(tmp_path):
+    src = tmp_path / "src"
+    sqlite = _noise(4096)  # 4 distinct chunks of 1 KiB
+    _write_tree(src, sqlite, b"\x01" * 2048)
+    s3 = _FakeS3()
+    first, stats = _publish(s3, src)
+    # The two identical index chunks are stored once.
+    assert stats["chunks_uploaded"] == stats["chunks_total"] == 5
+
+    changed = bytearray(sqlite)
+    changed[10] ^= 0xFF
+    _write_tree(src, bytes(changed), b"\x01" * 2048)
+    second, stats = _publish(s3, src, previous=first)
+    assert stats["chunks_uploaded"] == 1
+    assert second["id"] != first["id"]
+    assert snap.load_published_manifest(s3, "b")["id"] == second["id"]
+
+
+def test_restore_reuses_seed_and_fetches_missing(tmp_path):
+    src = tmp_path / "src"
+    sqlite = _noise(4096)
+    _write_tree(src, sqlite, b"\x02" * 3000)
+    s3 = _FakeS3()
+    manifest, _ = _publish(s3, src)
+
+    # Cold restore: everything downloaded.
+    cold = tmp_path / "cold"
+    stats = snap.restore_snapshot(s3, "b", manifest, cold, concurrency=2)
+    assert stats["chunks_reused"] == 0
+    assert (cold / "chroma.sqlite3").read_bytes() == sqlite
+    assert (cold / "seg" / "data_level0.bin").read_bytes() == b"\x02" * 3000
+    assert (cold / "seg" / "empty.bin").read_bytes() == b""
+    assert snap.read_local_marker(cold)["id"] == manifest["id"]
+
+    # Warm restore after a one-byte change: one chunk fetched, rest from seed.
+    changed = bytearray(sqlite)
+    changed[2000] ^= 0xFF
+    _write_tree(src, bytes(changed), b"\x02" * 3000)
+    manifest2, _ = _publish(s3, src, previous=manifest)
+    s3.gets.clear()
+    warm = tmp_path / "warm"
+    stats = snap.restore_snapshot(s3, "b", manifest2, warm, seed_dir=cold)
+    assert stats["chunks_fetched"] == 1
+    assert stats["chunks_reused"] == stats["chunks_total"] - 1
+    assert len(s3.gets) == 1
+    assert (warm / "chroma.sqlite3").read_bytes() == bytes(changed)
+
+
+def test_manifest_without_snapshot_is_ignored():
+    s3 = _FakeS3()
+    s3.put_object(Bucket="b", Key=snap.META_KEY, Body=json.dumps({"uploaded_at": "x"}).encode())
+    assert snap.load_published_manifest(s3, "b") is None
+
+
+def test_startup_retries_the_snapshot_instead_of_the_stale_tarball(tmp_path, monkeypatch):
+    import tempfile
+
+    import boto3
+
+    import backend.main as main
+    from backend.core import chroma_restore
+
+    manifest = {"id": "abc123"}
+    seeds = []
+
+    def restore(s3, bucket, manifest, dest, *, seed_dir=None, **kw):
+        seeds.append(seed_dir)
+        if len(seeds) == 1:
+            raise OSError("transient chunk fetch failure")
+        dest.mkdir(parents=True)
+        (dest / "chroma.sqlite3").write_bytes(b"x")
+
+    monkeypatch.setenv("AWS_S3_BUCKET", "b")
+    monkeypatch.setenv("FORCE_CHROMA_RESTORE", "true")
+    monkeypatch.setattr(boto3, "client", lambda *a, **kw: object())
+    monkeypatch.setattr(snap, "load_published_manifest", lambda s3, bucket: manifest)
+    monkeypatch.setattr(snap, "restore_snapshot", restore)
+    monkeypatch.setattr(chroma_restore, "stream_restore", lambda *a, **kw: pytest.fail("tarball fallback"))
+    monkeypatch.setattr(main, "_chroma_chunk_count_at", lambda path=None: 10)
+    monkeypatch.setattr(main, "_clear_chroma_dir_at", lambda path=None: None)
+    monkeypatch.setattr(main, "_CHROMA_DIR", tmp_path / "old")
+    monkeypatch.setattr(main, "_set_chroma_dir", lambda path: None)
+    staging = iter(range(10))
+    monkeypatch.setattr(tempfile, "mkdtemp", lambda prefix, dir: str(tmp_path / f"{prefix}{next(staging)}"))
+
+    assert main._restore_chroma_from_s3() is True
+    assert seeds == [tmp_path / "old", None]
@@ -181,3 +181,37 @@ def test_apply_url_validation_unvalidated_preserves_exl_url():
     assert unvalidated.exl_url == base.exl_url
     assert unvalidated.url == ""
     assert unvalidated.url_source == URL_SOURCE_UNVALIDATED
+
+
+def test_changed_only_enrichment_fetches_only_changed_documents():
+    import asyncio
+
+    from src.utils.chroma_citation_enrich import enrich_chroma_collection
+
+    changed = "adobe-docs/adobe-journey-optimizer/help/using/campaigns/api-triggered-campaigns.md"
+
+    class _Collection:
+        def __init__(self):
+            self.gets, self.updates = [], []
+            self.rows = {
+                "a": {"s3_key": changed, "product": "AJO"},
+                "b": {"s3_key": "adobe-docs/other/help/untouched.md", "product": "AJO"},
+            }
+
+        def count(self):
+            return len(self.rows)
+
+        def get(self, include, where=None, limit=None, offset=None):
+            self.gets.append(where)
+            keys = set(where["s3_key"]["$in"]) if where else None
+            ids = [i for i, m in self.rows.items() if keys is None or m["s3_key"] in keys]
+            return {"ids": ids, "metadatas": [self.rows[i] for i in ids]}
+
+        def update(self, ids, metadatas):
+            self.updates.extend(ids)
+
+    col = _Collection()
+    asyncio.run(enrich_chroma_collection(changed_s3_keys={changed}, collection=col, skip_validate=True))
+
+    assert col.gets == [{"s3_key": {"$in": [changed]}}]  # one filtered get, no full-collection pages
+    assert col.updates == ["a"]
@@ -0,0 +1,118 @@
+"""Tests for per-generation corpus statistics and their incremental refresh."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.core import corpus_stats
+
+
+class _Collection:
+    """Minimal Chroma collection: count() and paged/filtered get(include=["metadatas"])."""
+
+    def __init__(self, metadatas):
+        self.metadatas = list(metadatas)
+        self.gets = 0
+        self.rows_read = 0
+
+    def count(self):
+        return len(self.metadatas)
+
+    def get(self, include, limit, offset, where=None):
+        self.gets += 1
+        rows = self.metadatas
+        if where:
+            keys = set(where["s3_key"]["$in"])
+            rows = [m for m in rows if m.get("s3_key") in keys]
+        page = rows[offset:offset + limit]
+        self.rows_read += len(page)
+        return {"metadatas": page}
+
+
+def _chunks(s3_key, product, n, url=None, **extra):
+    return [{"s3_key": s3_key, "product": product, "url": url or f"https://x/{s3_key}", "title": "T", **extra}
+            for _ in range(n)]
+
+
+def _corpus():
+    return (
+        _chunks("aa/intro.md", "Adobe Analytics", 3)
+        + _chunks("aa/release-notes/april-2024.md", "Adobe Analytics", 2)
+        + _chunks("cja/overview.md", "Customer Journey Analytics", 4, video_url="v")
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    corpus_stats.unload()
+    yield
+    corpus_stats.unload()
+
+
+def test_summary_matches_a_full_scan():
+    summary = corpus_stats.summarize(corpus_stats.build(_Collection(_corpus())))
+
+    assert summary["product_breakdown"] == [
+        {"product": "Adobe Analytics", "chunks": 5, "pages": 2},
+        {"product": "Customer Journey Analytics", "chunks": 4, "pages": 1},
+    ]
+    assert summary["total_pages"] == 3
+    assert summary["release_notes"]["chunks"] == 2
+    assert summary["release_notes"]["timeline"]["Adobe Analytics"] == {"2024-04": {"chunks": 2, "docs": 1}}
+    assert summary["metadata_coverage"]["video_url"] == round(4 / 9, 4)
+    assert summary["metadata_coverage"]["title"] == 1.0
+
+
+def test_current_serves_sidecar_and_memory_without_rescanning(tmp_path):
+    col = _Collection(_corpus())
+    corpus_stats.refresh(col, tmp_path)
+    corpus_stats.unload()
+
+    col.gets = 0
+    assert corpus_stats.load(tmp_path, chunk_count=col.count())
+    for _ in range(3):
+        corpus_stats.current(col, tmp_path)
+    assert col.gets == 0
+
+
+def test_refresh_reads_only_changed_documents(tmp_path):
+    col = _Collection(_corpus())
+    corpus_stats.refresh(col, tmp_path)
+
+    col.metadatas = [m for m in col.metadatas if m["s3_key"] != "aa/intro.md"] + _chunks(
+        "aa/intro.md", "Adobe Analytics", 6,
+    )
+    col.rows_read = 0
+    summary = corpus_stats.refresh(col, tmp_path, changed_keys={"aa/intro.md"})
+
+    assert col.rows_read == 6
+    aa = next(r for r in summary["product_breakdown"] if r["product"] == "Adobe Analytics")
+    assert aa["chunks"] == 8
+    assert summary == corpus_stats.summarize(corpus_stats.build(col)) | {"built_at": summary["built_at"]}
+
+
+def test_count_drift_falls_back_to_full_scan(tmp_path):
+    col = _Collection(_corpus())
+    corpus_stats.refresh(col, tmp_path)
+    col.metadatas += _chunks("cja/new.md", "Customer Journey Analytics", 2)
+
+    summary = corpus_stats.refresh(col, tmp_path, changed_keys=set())
+    assert summary["chunk_count"] == 11
+    assert summary == corpus_stats.current(col, tmp_path)
+
+
+def test_same_size_reindex_invalidates_stats(tmp_path):
+    chromadb = pytest.importorskip("chromadb")
+    col = chromadb.PersistentClient(path=str(tmp_path)).get_or_create_collection("experience_league")
+    col.upsert(ids=["a"], metadatas=[{"s3_key": "aa/intro.md", "product": "Adobe Analytics"}],
+               embeddings=[[0.1, 0.2]])
+    corpus_stats.refresh(col, tmp_path)
+    assert corpus_stats.current(col, tmp_path)["product_breakdown"][0]["product"] == "Adobe Analytics"
+
+    # Same chunk count, different content: the stats must follow the index.
+    col.upsert(ids=["a"], metadatas=[{"s3_key": "cja/intro.md", "product": "Customer Journey Analytics"}],
+               embeddings=[[0.1, 0.2]])
+    summary = corpus_stats.current(col, tmp_path)
+    assert summary["product_breakdown"] == [{"product": "Customer Journey Analytics", "chunks": 1, "pages": 1}]
+    corpus_stats.unload()
+    assert corpus_stats.load(tmp_path, chunk_count=col.count())
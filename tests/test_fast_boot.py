@@ -0,0 +1,100 @@
+"""Fast boot: import-time budget, lazy heavy imports, liveness vs readiness."""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.routes import health
+
+_ROOT = Path(__file__).parent.parent
+# Cumulative `python -X importtime` for backend.main; ~1.5s locally, ~4s before
+# provider SDKs, chromadb, boto3, mcp and rank_bm25 were made lazy.
+_IMPORT_BUDGET_S = float(os.getenv("IMPORT_TIME_BUDGET_S", "3.0"))
+_LAZY = ("langchain_anthropic", "langchain_aws", "anthropic", "boto3", "chromadb", "openpyxl", "mcp", "rank_bm25")
+
+
+def test_api_import_stays_within_budget_and_skips_heavy_modules():
+    code = (
+        "import sys, backend.main; "
+        f"print(','.join(m for m in {_LAZY!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=_ROOT, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "LANGCHAIN_TRACING_V2": "false"},
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert proc.stdout.strip() == "", f"imported eagerly: {proc.stdout.strip()}"
+
+    m = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| backend\.main$", proc.stderr, re.M)
+    assert m, "backend.main missing from -X importtime output"
+    assert int(m.group(1)) / 1e6 < _IMPORT_BUDGET_S
+
+
+def _client(**state) -> TestClient:
+    app = FastAPI()
+    app.include_router(health.router, prefix="/api")
+    for key, value in state.items():
+        setattr(app.state, key, value)
+    return TestClient(app)
+
+
+def test_liveness_passes_while_readiness_waits_for_warm_up():
+    client = _client(ready=False, warmup={"phase": "database+chroma", "durations_s": {}, "error": None})
+    assert client.get("/api/health/live").json() == {"status": "alive"}
+    resp = client.get("/api/health/ready")
+    assert resp.status_code == 503 and resp.json()["phase"] == "database+chroma"
+
+    client = _client(ready=True, warmup={"phase": "ready", "durations_s": {"chroma": 1.2}, "error": None})
+    resp = client.get("/api/health/ready")
+    assert resp.status_code == 200 and resp.json()["durations_s"] == {"chroma": 1.2}
+
+
+def test_failed_warm_up_fails_liveness():
+    client = _client(ready=False, warmup={"phase": "failed", "durations_s": {}, "error": "S3 timeout"})
+    resp = client.get("/api/health/live")
+    assert resp.status_code == 503 and resp.json() == {"status": "failed", "error": "S3 timeout"}
+
+
+def test_admin_retriever_routes_answer_503_while_warming_up():
+    from backend.api.deps import get_admin_user
+    from backend.api.routes import admin
+
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/api")
+    app.dependency_overrides[get_admin_user] = lambda: "admin"
+    app.state.ready = False
+    app.state.retriever = None
+    app.state.warmup = {"phase": "retriever", "durations_s": {}, "error": None}
+    client = TestClient(app)
+
+    for path in ("/api/admin/status", "/api/admin/readiness/cja"):
+        resp = client.get(path)
+        assert resp.status_code == 503, path
+        assert "retriever" in resp.json()["detail"]
+
+
+def test_lazy_asgi_app_builds_on_first_request():
+    from backend.main import _LazyASGIApp
+
+    built = []
+
+    def factory():
+        inner = FastAPI()
+        inner.get("/ping")(lambda: {"ok": True})
+        built.append(inner)
+        return inner
+
+    app = FastAPI()
+    app.mount("/lazy", _LazyASGIApp(factory))
+    client = TestClient(app)
+    assert built == []
+    assert client.get("/lazy/ping").json() == {"ok": True}
+    assert client.get("/lazy/ping").status_code == 200 and len(built) == 1
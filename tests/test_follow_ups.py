@@ -0,0 +1,98 @@
+"""Tests for cached, deduplicated follow-up question generation."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.core import follow_ups, llm_factory
+
+
+class _Client:
+    def __init__(self, text='["How do I share it?", "Can I schedule it?", "What about CJA?", "Extra?"]'):
+        self.text = text
+        self.calls = 0
+
+    @property
+    def messages(self):
+        return self
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)])
+
+
+_SETTINGS = SimpleNamespace(llm_provider="anthropic")
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    follow_ups.clear()
+    yield
+    follow_ups.clear()
+
+
+@pytest.fixture
+def _install(monkeypatch):
+    def install(client):
+        monkeypatch.setattr(llm_factory, "get_messages_client", lambda settings: client)
+        return client
+    return install
+
+
+def test_repeat_questions_are_served_from_cache(_install):
+    client = _install(_Client())
+
+    first = asyncio.run(follow_ups.generate("How do I create a segment?", "Open the builder.", _SETTINGS))
+    again = asyncio.run(follow_ups.generate("  how do I create a SEGMENT ", "Open the builder.", _SETTINGS))
+
+    assert first == again == ["How do I share it?", "Can I schedule it?", "What about CJA?"]
+    assert client.calls == 1
+    assert follow_ups.stats()["hits"] == 1
+
+
+def test_different_answers_are_cached_separately(_install):
+    client = _install(_Client())
+    asyncio.run(follow_ups.generate("q", "answer one", _SETTINGS))
+    asyncio.run(follow_ups.generate("q", "answer two", _SETTINGS))
+    assert client.calls == 2
+
+
+def test_concurrent_requests_share_one_call(_install):
+    client = _install(_Client())
+
+    async def go():
+        return await asyncio.gather(*(follow_ups.generate("q", "a", _SETTINGS) for _ in range(5)))
+
+    results = asyncio.run(go())
+    assert client.calls == 1
+    assert all(r == results[0] for r in results)
+
+
+def test_unparseable_output_is_not_cached(_install):
+    client = _install(_Client(text="Sorry, no suggestions."))
+    assert asyncio.run(follow_ups.generate("q", "a", _SETTINGS)) == []
+    assert asyncio.run(follow_ups.generate("q", "a", _SETTINGS)) == []
+    assert client.calls == 2
+
+
+def test_client_is_built_per_event_loop(monkeypatch):
+    built = []
+
+    def factory(settings):
+        built.append(_Client())
+        return built[-1]
+
+    monkeypatch.setattr(llm_factory, "get_messages_client", factory)
+
+    async def two_calls():
+        await follow_ups.generate("q1", "a", _SETTINGS)
+        await follow_ups.generate("q2", "a", _SETTINGS)
+
+    asyncio.run(two_calls())
+    assert len(built) == 1  # reused within a loop
+    asyncio.run(follow_ups.generate("q3", "a", _SETTINGS))
+    assert len(built) == 2  # a new loop never gets the old loop's client
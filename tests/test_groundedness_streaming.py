@@ -0,0 +1,136 @@
+"""Tests for the streaming messages API and the incremental groundedness check."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+from backend.core import groundedness
+from backend.core.bedrock_messages import _Messages as BedrockMessages
+from backend.core.llm_exceptions import ContentFilterError, RateLimitError
+
+
+class _FakeBedrock:
+    def __init__(self, events=None, error=None):
+        self.events = events or []
+        self.error = error
+        self.kwargs = None
+
+    def converse_stream(self, **kwargs):
+        self.kwargs = kwargs
+        if self.error:
+            raise self.error
+        return {"stream": iter(self.events)}
+
+
+def _stream(bedrock):
+    async def go():
+        stream = BedrockMessages(bedrock).stream(
+            model="claude-haiku-4-5-20251001", max_tokens=100,
+            messages=[{"role": "user", "content": "hi"}],
+        )
+        deltas = [d async for d in stream]
+        return stream, deltas
+    return asyncio.run(go())
+
+
+def test_bedrock_stream_yields_deltas_and_usage():
+    bedrock = _FakeBedrock([
+        {"contentBlockDelta": {"delta": {"text": "Hello "}}},
+        {"contentBlockDelta": {"delta": {"text": "world"}}},
+        {"messageStop": {"stopReason": "end_turn"}},
+        {"metadata": {"usage": {"inputTokens": 12, "outputTokens": 2, "cacheReadInputTokens": 8}}},
+    ])
+    stream, deltas = _stream(bedrock)
+
+    assert deltas == ["Hello ", "world"]
+    assert stream.text == "Hello world"
+    assert stream.stop_reason == "end_turn"
+    assert (stream.usage.input_tokens, stream.usage.cache_read_input_tokens) == (12, 8)
+    assert bedrock.kwargs["modelId"].startswith("global.anthropic.")
+
+
+def test_bedrock_stream_translates_errors():
+    throttled = ClientError({"Error": {"Code": "ThrottlingException", "Message": "slow down"}}, "ConverseStream")
+    with pytest.raises(RateLimitError):
+        _stream(_FakeBedrock(error=throttled))
+    with pytest.raises(ContentFilterError):
+        _stream(_FakeBedrock([{"messageStop": {"stopReason": "content_filtered"}}]))
+
+
+def _verdict(flagged: bool, claims=(), concentration=None):
+    return json.dumps({
+        "has_unsupported_specifics": flagged, "unsupported_claims": list(claims),
+        "fabrication_concentration": concentration, "reasoning": "r",
+    })
+
+
+class _CheckClient:
+    """Flags any section that mentions 'Bogus menu'; records when each check starts."""
+
+    def __init__(self):
+        self.sections: list[str] = []
+
+    @property
+    def messages(self):
+        return self
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        section = prompt.split("ANSWER:\n", 1)[1].split("\n\nRespond with ONLY", 1)[0]
+        self.sections.append(section)
+        await asyncio.sleep(0)
+        if "Bogus menu" in section:
+            return SimpleNamespace(content=[SimpleNamespace(text=_verdict(True, ["Bogus menu"], "ISOLATED"))])
+        return SimpleNamespace(content=[SimpleNamespace(text=_verdict(False))])
+
+
+def test_sections_are_checked_while_the_answer_streams():
+    answer = "## Overview\nCJA connects datasets.\n\n## Steps\n1. Open the Bogus menu.\n2. Save.\n\n## Notes\nDone."
+
+    async def go():
+        client = _CheckClient()
+        checker = groundedness.IncrementalGroundednessCheck(client, "CTX")
+        for i in range(0, len(answer), 7):
+            checker.feed(answer[i:i + 7])
+        started_before_finish = checker.sections_checked
+        result = await checker.finish()
+        return client, started_before_finish, result
+
+    client, started_before_finish, result = asyncio.run(go())
+
+    assert started_before_finish == 2  # Overview and Steps closed by the next heading
+    assert [s.splitlines()[0] for s in client.sections] == ["## Overview", "## Steps", "## Notes"]
+    assert result["has_unsupported_specifics"] is True
+    assert result["unsupported_claims"] == ["Bogus menu"]
+    assert result["fabrication_concentration"] == "ISOLATED"
+
+
+def test_long_paragraphs_split_but_lists_stay_together():
+    para = "Sentence about datasets. " * 40
+    answer = f"{para}\n\n1. First step\n\n2. Second step\n\n{para}"
+
+    async def go():
+        client = _CheckClient()
+        checker = groundedness.IncrementalGroundednessCheck(client, "CTX")
+        checker.feed(answer)
+        await checker.finish()
+        return client.sections
+
+    sections = asyncio.run(go())
+    assert len(sections) == 2
+    assert "1. First step" in sections[0] and "2. Second step" in sections[0]
+
+
+def test_flags_in_several_sections_are_integrated():
+    merged = groundedness.merge_check_results([
+        {"has_unsupported_specifics": True, "unsupported_claims": ["a"], "fabrication_concentration": "ISOLATED"},
+        {"has_unsupported_specifics": False, "unsupported_claims": []},
+        {"has_unsupported_specifics": True, "unsupported_claims": ["b"], "fabrication_concentration": "ISOLATED"},
+    ])
+    assert merged["fabrication_concentration"] == "INTEGRATED"
+    assert merged["unsupported_claims"] == ["a", "b"]
@@ -0,0 +1,129 @@
+"""Tests for the token-budgeted conversation history window."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from backend.core import history_window
+from backend.core.token_counter import clip_to_tokens, count_tokens
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    history_window.clear()
+    yield
+    history_window.clear()
+
+
+def _settings(budget=2000, verbatim=4):
+    return SimpleNamespace(
+        history_token_budget=budget,
+        history_verbatim_messages=verbatim,
+        history_summaries_enabled=True,
+    )
+
+
+def _history(pairs: int, answer_words: int = 50) -> list[dict]:
+    turns = []
+    for i in range(pairs):
+        turns.append({"role": "user", "content": f"question {i}"})
+        turns.append({"role": "assistant", "content": " ".join(f"answer{i}" for _ in range(answer_words))})
+    return turns
+
+
+def test_short_history_is_sent_verbatim():
+    history = _history(2)
+    window = history_window.build_window("s1", history, _settings())
+
+    assert [m.content for m in window.messages] == [t["content"] for t in history]
+    assert not window.summarized and window.dropped == 0
+
+
+def test_window_stays_within_token_budget():
+    history = _history(6, answer_words=400)
+    window = history_window.build_window("s1", history, _settings(budget=600))
+
+    assert window.tokens <= 600 + 10  # clipping marker
+    assert window.messages[0].type == "human"
+    assert window.messages[-1].content.startswith("answer5")
+
+
+def test_older_turns_use_cached_summary(monkeypatch):
+    calls = []
+
+    async def fake_summarize(previous, turns, settings):
+        calls.append((previous, [t["content"] for t in turns]))
+        return f"summary covering {len(turns)} turns"
+
+    monkeypatch.setattr(history_window, "_summarize", fake_summarize)
+    settings = _settings(verbatim=2)
+
+    async def run():
+        history = _history(2)
+        await history_window.schedule_summary("s1", history, settings)
+        assert history_window.schedule_summary("s1", history, settings) is None  # cached
+        history += _history(3)[4:]
+        await history_window.schedule_summary("s1", history, settings)
+        return history
+
+    import asyncio
+    history = asyncio.run(run())
+
+    assert calls[0] == (None, ["question 0", history[1]["content"]])
+    # The second summary only reads the newly aged-out pair.
+    assert calls[1] == ("summary covering 2 turns", ["question 1", history[3]["content"]])
+
+    window = history_window.build_window("s1", history, settings)
+    assert window.summarized
+    assert window.messages[0].content.startswith("Summary of the earlier conversation: summary covering 2 turns")
+    assert len(window.messages) == 2
+
+
+def test_without_summary_older_turns_become_excerpts():
+    window = history_window.build_window("s1", _history(4, answer_words=400), _settings(budget=1200, verbatim=2))
+
+    assert not window.summarized
+    assert window.messages[0].content.startswith("Earlier in this conversation:")
+    assert window.tokens <= 1200 + 10
+
+
+def test_clip_to_tokens():
+    text = "word " * 500
+    clipped = clip_to_tokens(text, 50)
+    assert clipped.endswith("…")
+    assert count_tokens(clipped) <= 55
+    assert clip_to_tokens("short", 50) == "short"
+
+
+def test_summary_written_by_one_worker_is_used_by_another(monkeypatch, tmp_path):
+    import asyncio
+
+    from backend.core.session_store import SessionStore, SqliteSessionBackend
+
+    async def fake_summarize(previous, turns, settings):
+        return "shared summary"
+
+    monkeypatch.setattr(history_window, "_summarize", fake_summarize)
+    settings = _settings(verbatim=2)
+    store = SessionStore(SqliteSessionBackend(tmp_path / "s.db", max_turns=40, idle_ttl_s=3600, max_bytes=10**7))
+    sid = store.new_session()
+    history = _history(2)
+    for turn in history:
+        store.append_turn(sid, turn["role"], turn["content"])
+
+    async def summarize_on_worker_a():
+        await history_window.schedule_summary(sid, history, settings, store)
+
+    asyncio.run(summarize_on_worker_a())
+    history_window.clear()  # a different worker: empty local cache
+
+    assert not history_window.build_window(sid, history, settings).summarized
+    asyncio.run(history_window.load_summary(sid, history, settings, store))
+    window = history_window.build_window(sid, history, settings)
+    assert window.summarized
+    assert "shared summary" in window.messages[0].content
+
+    store.clear(sid)
+    assert store.get_summary(sid) is None
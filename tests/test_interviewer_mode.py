@@ -424,3 +424,209 @@ async def test_ground_topic_link_returns_none_when_nothing_meets_threshold():
     pipeline._retrieve_for_query = fake_retrieve_for_query
     link = await pipeline._ground_topic_link("obscure topic", session)
     assert link is None
+
+
+# ── Concurrent per-question evaluation ───────────────────────────────────────
+
+def _review_session(n: int):
+    from backend.core.interviewer_pipeline import InterviewSession
+    from config.interview_profiles import InterviewQuestion
+
+    questions = [
+        InterviewQuestion(id=f"q{i}", question=f"Question {i}?", topic=f"topic {i}",
+                          difficulty=1, expected_themes=("x",), retrieval_hint="hint")
+        for i in range(n)
+    ]
+    return InterviewSession(
+        session_id="concurrent-session", user_id="u", level="junior", profile_id="cja",
+        questions=questions, phase="review",
+        draft_answers={q.id: f"answer {q.id}" for q in questions},
+    )
+
+
+def _fake_db(monkeypatch, *, lose_claim_after: int | None = None):
+    from backend.core import google_db
+
+    writes: list[str] = []
+
+    def record(session_id, question_id, *args):
+        writes.append(question_id)
+        return lose_claim_after is None or len(writes) <= lose_claim_after
+
+    monkeypatch.setattr(google_db, "try_claim_interview_session_for_evaluation", lambda *a, **k: "tok")
+    monkeypatch.setattr(google_db, "record_question_evaluation", record)
+    monkeypatch.setattr(google_db, "complete_interview_session", lambda *a: True)
+    return writes
+
+
+def _slow_grading_client(delays: dict[str, float], state: dict):
+    import asyncio as _asyncio
+
+    async def create(**kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        if kwargs["max_tokens"] == 4096:  # session synthesis
+            return _fake_message("{}")
+        qid = next(q for q in delays if f"Question {q[1:]}?" in prompt)
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await _asyncio.sleep(delays[qid])
+        finally:
+            state["in_flight"] -= 1
+        state["finished"].append(qid)
+        return _fake_message(json.dumps({"score": int(qid[1:]) % 5 + 1, "score_pct": 50}))
+
+    return SimpleNamespace(messages=SimpleNamespace(create=create))
+
+
+@pytest.mark.asyncio
+async def test_stream_submit_grades_concurrently_with_order_independent_report(monkeypatch):
+    _fake_db(monkeypatch)
+    monkeypatch.setenv("INTERVIEWER_EVAL_CONCURRENCY", "3")
+    session = _review_session(4)
+    state = {"in_flight": 0, "peak": 0, "finished": []}
+    pipeline = InterviewerPipeline(retriever=None)
+    # Later questions finish first.
+    pipeline._client = _slow_grading_client({"q0": 0.08, "q1": 0.06, "q2": 0.04, "q3": 0.01}, state)
+
+    events = [e async for e in pipeline.stream_submit(session)]
+
+    assert state["peak"] == 3
+    assert state["finished"][0] != "q0"
+    evaluated = [e["question_id"] for e in events if e["type"] == "question_evaluation"]
+    assert evaluated == state["finished"]
+    report = next(e for e in events if e["type"] == "session_report")
+    assert [r["question_id"] for r in report["per_question"]] == ["q0", "q1", "q2", "q3"]
+    assert [r["question_index"] for r in report["per_question"]] == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_stream_submit_cancels_outstanding_grading_on_lost_claim(monkeypatch):
+    writes = _fake_db(monkeypatch, lose_claim_after=0)
+    monkeypatch.setenv("INTERVIEWER_EVAL_CONCURRENCY", "4")
+    session = _review_session(4)
+    state = {"in_flight": 0, "peak": 0, "finished": []}
+    pipeline = InterviewerPipeline(retriever=None)
+    pipeline._client = _slow_grading_client({"q0": 0.01, "q1": 5, "q2": 5, "q3": 5}, state)
+
+    events = [e async for e in pipeline.stream_submit(session)]
+
+    assert events[-1] == {"type": "error", "message": "Evaluation was taken over by another request."}
+    assert writes == ["q0"]
+    assert state["finished"] == ["q0"] and state["in_flight"] == 0
+    assert session.phase == "review"
+
+
+# ── Shared retrieval cache + stream_start prefetch ───────────────────────────
+
+@pytest.fixture
+def retrieval_cache(monkeypatch):
+    from backend.core import interview_retrieval_cache
+
+    interview_retrieval_cache.clear()
+    monkeypatch.setattr(interview_retrieval_cache, "_kb_version", "test-kb:0")
+    yield interview_retrieval_cache
+    interview_retrieval_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_at_start_is_reused_by_grading(retrieval_cache, monkeypatch):
+    import asyncio as _asyncio
+
+    session = _review_session(3)
+    session.phase = "questioning"
+    calls: list[str] = []
+
+    async def fake_retrieve(self, search_query, sess):
+        calls.append(search_query)
+        await _asyncio.sleep(0.01)
+        return [{"content": search_query, "score": 0.9, "metadata": {}}]
+
+    monkeypatch.setattr(InterviewerPipeline, "_retrieve_for_query", fake_retrieve)
+    pipeline = InterviewerPipeline(retriever=object())
+    [e async for e in pipeline.stream_start(session)]
+
+    # Grading for the first question races the still-running prefetch.
+    docs = await pipeline._retrieve_for_question(session.questions[0], session)
+    from backend.core.interviewer_pipeline import _background_tasks
+    await _asyncio.gather(*list(_background_tasks))
+
+    assert docs[0]["content"] == "hint topic 0"
+    assert len(calls) == 3
+
+    other_user = InterviewerPipeline(retriever=object())
+    for q in session.questions:
+        await other_user._retrieve_for_question(q, session)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_retrieval_cache_invalidated_by_kb_generation(retrieval_cache):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return [{"content": "doc"}]
+
+    key = retrieval_cache.make_key("q1", 1, "Adobe Analytics")
+    await retrieval_cache.get_or_fetch(key, fetch)
+    await retrieval_cache.get_or_fetch(key, fetch)
+    assert len(calls) == 1
+
+    retrieval_cache.bump_kb_generation()
+    retrieval_cache._kb_version = "test-kb:1"
+    await retrieval_cache.get_or_fetch(retrieval_cache.make_key("q1", 1, "Adobe Analytics"), fetch)
+    assert len(calls) == 2
+
+
+# ── Topic grounding from grading docs / concurrent fallback ──────────────────
+
+@pytest.mark.asyncio
+async def test_ground_topic_link_prefers_already_retrieved_grading_docs():
+    pipeline = InterviewerPipeline(retriever=None)
+    session = _review_session(1)
+
+    async def no_search(search_query, sess):
+        raise AssertionError("fresh retrieval should not run")
+
+    pipeline._retrieve_for_query = no_search
+    docs = [
+        {"score": 0.9, "content": "Filters and segments.",
+         "metadata": {"url": "https://exl.example/segments", "title": "Segments overview"}},
+        {"score": 0.8, "content": "A data view defines components for reporting.",
+         "metadata": {"url": "https://exl.example/data-views/create", "title": "Create a data view"}},
+    ]
+    link = await pipeline._ground_topic_link("Data views", session, docs)
+    assert link == {"url": "https://exl.example/data-views/create", "title": "Create a data view"}
+
+
+@pytest.mark.asyncio
+async def test_stream_submit_grounds_topics_concurrently_in_report_order(monkeypatch):
+    import asyncio as _asyncio
+
+    _fake_db(monkeypatch)
+    session = _review_session(2)
+    topics = [{"topic": f"Topic {n}", "reason": "r"} for n in range(4)]
+    state = {"in_flight": 0, "peak": 0}
+
+    async def create(**kwargs):
+        if kwargs["max_tokens"] == 4096:
+            return _fake_message(json.dumps({"topics_to_read": topics}))
+        return _fake_message(json.dumps({"score": 3, "score_pct": 60}))
+
+    async def slow_search(search_query, sess):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await _asyncio.sleep(0.02 * (4 - int(search_query[-1])))
+        state["in_flight"] -= 1
+        return [{"score": 0.9, "metadata": {"url": f"https://exl.example/{search_query}", "title": search_query}}]
+
+    pipeline = InterviewerPipeline(retriever=None)
+    pipeline._client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    pipeline._retrieve_for_query = slow_search
+
+    events = [e async for e in pipeline.stream_submit(session)]
+    report = next(e for e in events if e["type"] == "session_report")
+
+    assert state["peak"] == 4
+    assert [t["title"] for t in report["topics_to_read"]] == [t["topic"] for t in topics]
@@ -0,0 +1,107 @@
+"""Published landing-page cache, conditional GETs and the incremental sitemap."""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.routes import chat
+from backend.core import google_db, landing_cache
+
+_PAYLOAD = {
+    "slug": "how-do-i-create-a-segment-abc123",
+    "query": "How do I create a segment?",
+    "answer": "Open the Segment Builder.",
+    "citations": [],
+    "evidence": None,
+    "created_at": "2026-10-01T12:00:00+00:00",
+}
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    landing_cache.clear()
+    yield
+    landing_cache.clear()
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    loads = []
+
+    def load(slug):
+        loads.append(slug)
+        return dict(_PAYLOAD) if slug == _PAYLOAD["slug"] else None
+
+    monkeypatch.setattr(google_db, "get_landing_by_slug", load)
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/api")
+    c = TestClient(app)
+    c.loads = loads
+    return c
+
+
+def test_landing_is_served_from_cache_with_validators(client):
+    first = client.get(f"/api/landing/{_PAYLOAD['slug']}")
+    second = client.get(f"/api/landing/{_PAYLOAD['slug']}")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["query"] == "How do I create a segment?"
+    assert client.loads == [_PAYLOAD["slug"]]
+    assert "s-maxage" in first.headers["cache-control"]
+    assert first.headers["last-modified"] == "Thu, 01 Oct 2026 12:00:00 GMT"
+
+    revalidated = client.get(
+        f"/api/landing/{_PAYLOAD['slug']}", headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+
+
+def test_unknown_slugs_are_remembered_briefly(client):
+    assert client.get("/api/landing/nope").status_code == 404
+    assert client.get("/api/landing/nope").status_code == 404
+    assert client.loads == ["nope"]
+
+
+def test_publish_time_population_skips_the_database(client):
+    landing_cache.publish(dict(_PAYLOAD))
+    assert client.get(f"/api/landing/{_PAYLOAD['slug']}").status_code == 200
+    assert client.loads == []
+
+
+def _sitemap_module():
+    path = Path(__file__).parent.parent / "scripts" / "generate_sitemap.py"
+    spec = importlib.util.spec_from_file_location("generate_sitemap", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_sitemap_shards_and_only_fetches_new_slugs(tmp_path, monkeypatch):
+    sitemap = _sitemap_module()
+    monkeypatch.setattr(sitemap, "MAX_URLS_PER_SHARD", 2)
+    published = [{"slug": f"q{i}", "created_at": f"2026-10-0{i + 1}T00:00:00+00:00"} for i in range(3)]
+    cursors = []
+
+    def iter_after(created_at=None, slug=None):
+        cursors.append((created_at, slug))
+        return iter([r for r in published if created_at is None or (r["created_at"], r["slug"]) > (created_at, slug)])
+
+    monkeypatch.setattr(google_db, "iter_published_slugs_after", iter_after)
+
+    assert sitemap.update_sitemap(tmp_path) == {"added": 3, "total": 3, "shards": 2}
+    full_shard = (tmp_path / "sitemap-q-0001.xml").read_text()
+
+    published.append({"slug": "q3", "created_at": "2026-10-04T00:00:00+00:00"})
+    assert sitemap.update_sitemap(tmp_path) == {"added": 1, "total": 4, "shards": 2}
+
+    assert cursors[-1] == ("2026-10-03T00:00:00+00:00", "q2")
+    assert (tmp_path / "sitemap-q-0001.xml").read_text() == full_shard
+    second = (tmp_path / "sitemap-q-0002.xml").read_text()
+    assert "/q/q2</loc>" in second and "/q/q3</loc>" in second
+    index = (tmp_path / "sitemap.xml").read_text()
+    assert "<sitemapindex" in index and "sitemap-q-0002.xml" in index and "sitemap-pages.xml" in index
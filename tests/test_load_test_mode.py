@@ -0,0 +1,70 @@
+"""Load-test mode: mock LLM provider, hashing embedder and in-memory DB stand-in."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from backend.core import follow_ups, google_db, memory_db, mock_llm
+from backend.core.llm_factory import get_chat_model, get_messages_client
+from config.settings import get_settings
+
+
+def _settings(**overrides):
+    return get_settings().model_copy(update={
+        "llm_provider": "mock", "mock_llm_first_token_ms": 0.0, "mock_llm_tokens_per_s": 10_000.0,
+        "mock_llm_output_tokens": 12, **overrides,
+    })
+
+
+def test_mock_chat_model_streams_deterministic_tokens_with_usage():
+    settings = _settings()
+    chain = ChatPromptTemplate.from_messages([("human", "{query}")]) | get_chat_model("haiku", settings, 2000) | StrOutputParser()
+
+    async def stream():
+        handler = UsageMetadataCallbackHandler()
+        chunks = [c async for c in chain.astream({"query": "What is a data view?"}, config={"callbacks": [handler]})]
+        return chunks, handler.usage_metadata
+
+    chunks, usage = asyncio.run(stream())
+    assert len(chunks) >= 12 and "".join(chunks).startswith("Based on the documentation [1],")
+    assert asyncio.run(stream())[0] == chunks
+    assert sum(u["output_tokens"] for u in usage.values()) == 12
+
+
+def test_mock_messages_client_feeds_follow_ups():
+    settings = _settings()
+    assert isinstance(get_messages_client(settings), mock_llm.MockMessagesClient)
+    follow_ups.clear()
+    suggestions = asyncio.run(follow_ups.generate("What is a data view?", "A data view is…", settings))
+    assert len(suggestions) == 3
+
+
+def test_mock_embedder_answers_in_titan_shape():
+    resp = mock_llm.MockEmbeddingsClient().invoke_model(body=json.dumps({"inputText": "CJA data view"}))
+    embedding = json.loads(resp["body"].read())["embedding"]
+    assert embedding == mock_llm.embed("CJA data view") and len(embedding) == mock_llm.EMBED_DIM
+    assert isinstance(resp["body"], io.BytesIO)
+
+
+def test_memory_db_stands_in_for_the_chat_path(monkeypatch):
+    for fn in memory_db._FUNCTIONS:
+        monkeypatch.setattr(google_db, fn.__name__, getattr(google_db, fn.__name__))
+    memory_db.install()
+
+    assert google_db.get_session("not-a-loadtest-token") is None
+    uid = google_db.get_session(f"{memory_db.TOKEN_PREFIX}7")["user_id"]
+    assert google_db.check_rate_limit(uid)["allowed"]
+    conversation_id = google_db.create_conversation(uid, None, "q")
+    assert google_db.conversation_belongs_to_user(conversation_id, uid)
+    assert not google_db.conversation_belongs_to_user(conversation_id, "someone-else")
+    google_db.append_conversation_message(
+        conversation_id, "assistant", "answer", slug="q-abc", is_published=True, query="q",
+    )
+    assert google_db.get_landing_by_slug("q-abc")["answer"] == "answer"
+    assert google_db.increment_daily_count(uid)["count"] == 1
@@ -0,0 +1,96 @@
+"""
+Unit tests for media extraction and the changed-only media enrichment pass.
+
+Run: pytest tests/test_media_metadata.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from src.utils.media_metadata import document_media, media_to_chroma_fields
+
+S3_KEY = "adobe-docs/adobe-analytics/help/components/segments/seg-overview.md"
+FIRST = (
+    "---\ntitle: Segments\nthumbnail: 334261.jpg\n---\n"
+    ">[!VIDEO](https://video.tv.adobe.com/v/1234)\n"
+    "![Segment builder](assets/builder.png)\n"
+)
+BODY = "![Icon](assets/icon-add.png)\n![Compare](./assets/compare.jpg)\n"
+
+
+def test_document_media_combines_frontmatter_and_body_images():
+    media = document_media(FIRST, [(BODY, S3_KEY)], s3_key=S3_KEY)
+    base = "https://raw.githubusercontent.com/AdobeDocs/analytics.en/main/help/components/segments/"
+    assert media["video_url"] == "https://video.tv.adobe.com/v/1234"
+    assert media["thumbnail_url"].endswith("/334261.jpg")
+    assert media["image_urls"] == [base + "assets/builder.png", base + "assets/compare.jpg"]
+
+
+def test_media_to_chroma_fields_omits_empty_values():
+    fields = media_to_chroma_fields({"thumbnail_url": None, "video_url": "v", "image_urls": ["a"]})
+    assert fields == {"video_url": "v", "image_urls": json.dumps(["a"])}
+
+
+class _FakeCollection:
+    def __init__(self, rows):
+        self.rows = rows  # id -> (doc, meta)
+        self.gets: list[dict] = []
+        self.updates: dict[str, dict] = {}
+
+    def get(self, include=None, limit=None, offset=0, where=None):
+        self.gets.append({"where": where, "limit": limit})
+        ids = list(self.rows)
+        if where is not None:
+            keys = set(where["s3_key"]["$in"])
+            ids = [i for i in ids if self.rows[i][1]["s3_key"] in keys]
+        else:
+            ids = ids[offset:offset + limit]
+        return {
+            "ids": ids,
+            "documents": [self.rows[i][0] for i in ids],
+            "metadatas": [self.rows[i][1] for i in ids],
+        }
+
+    def update(self, ids, metadatas):
+        self.updates.update(zip(ids, metadatas))
+
+
+def _rows():
+    other = "adobe-docs/adobe-target/using/activities.md"
+    return {
+        f"{S3_KEY}#0": (FIRST, {"s3_key": S3_KEY, "chunk_index": 0, "url": "https://exl/seg"}),
+        f"{S3_KEY}#1": (BODY, {"s3_key": S3_KEY, "chunk_index": 1, "url": "https://exl/seg"}),
+        f"{other}#0": (FIRST, {"s3_key": other, "chunk_index": 0, "url": "https://exl/act"}),
+    }
+
+
+def test_process_collection_scoped_to_changed_keys():
+    from scripts.ingest_with_media import process_collection
+
+    col = _FakeCollection(_rows())
+    stats, _ = process_collection(col, changed_keys={S3_KEY})
+
+    assert all(g["where"] is not None for g in col.gets)
+    assert set(col.updates) == {f"{S3_KEY}#0", f"{S3_KEY}#1"}
+    assert stats["pages"] == 1 and stats["chunks"] == 2
+
+    # Fields already present (written at ingest) → nothing to update.
+    written = col.updates
+    col = _FakeCollection({
+        i: (doc, {**meta, **written[i]}) for i, (doc, meta) in _rows().items() if i in written
+    })
+    stats, _ = process_collection(col, changed_keys={S3_KEY})
+    assert col.updates == {} and stats["pages"] == 0
+
+
+def test_process_collection_empty_changed_keys_reads_nothing():
+    from scripts.ingest_with_media import process_collection
+
+    col = _FakeCollection(_rows())
+    stats, _ = process_collection(col, changed_keys=set())
+    assert col.gets == [] and col.updates == {} and stats["chunks"] == 0
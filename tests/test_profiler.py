@@ -0,0 +1,108 @@
+"""Admin profiling: collapsed-stack CPU samples, tracemalloc reports, limits."""
+
+from __future__ import annotations
+
+import threading
+import time
+import tracemalloc
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.deps import get_admin_user
+from backend.api.routes import admin
+from backend.core import profiler
+from config.settings import get_settings
+
+
+def _settings(**overrides):
+    return get_settings().model_copy(update={"profiling_enabled": True, **overrides})
+
+
+def _busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(2000))
+
+
+def test_cpu_profile_samples_the_busy_thread_in_folded_format():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy")
+    worker.start()
+    try:
+        result = profiler.cpu_profile(0.5, _settings(), interval_ms=5)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert result.samples > 10 and profiler.status() is None
+    lines = result.collapsed().splitlines()
+    assert any(line.startswith("busy;") and "test_profiler:_busy_loop" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) >= 1 and "profiler-sampler" not in result.collapsed()
+
+
+def test_sampler_backs_off_past_the_overhead_cap():
+    result = profiler.cpu_profile(0.3, _settings(profiling_max_overhead=0.0), interval_ms=5, include_idle=True)
+    assert result.interval_ms > 5
+
+
+def test_kill_switch_busy_and_early_stop():
+    with pytest.raises(profiler.ProfilingDisabled):
+        profiler.cpu_profile(1, _settings(profiling_enabled=False))
+
+    done = {}
+    runner = threading.Thread(target=lambda: done.update(p=profiler.cpu_profile(30, _settings())))
+    runner.start()
+    while profiler.status() is None:
+        time.sleep(0.01)
+    with pytest.raises(profiler.ProfilerBusy):
+        profiler.memory_profile(1, _settings())
+    started = time.monotonic()
+    assert profiler.stop()
+    runner.join()
+    assert done["p"].stopped_early and time.monotonic() - started < 5
+    assert not profiler.stop()
+
+
+def test_memory_profile_reports_growth_and_stops_tracing():
+    held = []
+    stop = threading.Event()
+
+    def allocate():
+        while not stop.is_set():
+            held.append(bytearray(64 * 1024))
+            time.sleep(0.01)
+
+    worker = threading.Thread(target=allocate)
+    worker.start()
+    try:
+        report = profiler.memory_profile(0.3, _settings(), top=5)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert not tracemalloc.is_tracing()
+    top = report["top_growth"][0]
+    assert "test_profiler.py:" in top["site"] and top["size_diff_kb"] >= 64
+    assert len(report["top_retained"]) <= 5
+
+
+def test_routes_are_admin_only_and_clamped(monkeypatch):
+    from config import settings as settings_module
+
+    monkeypatch.setattr(settings_module, "get_settings", lambda: _settings(profiling_max_seconds=0.2))
+    monkeypatch.setattr(admin, "get_settings", settings_module.get_settings)
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/api")
+    client = TestClient(app)
+    assert client.post("/api/admin/profile/cpu", json={"seconds": 5}).status_code in (401, 403)
+
+    app.dependency_overrides[get_admin_user] = lambda: "admin"
+    resp = client.post("/api/admin/profile/cpu", json={"seconds": 5, "include_idle": True})
+    assert resp.status_code == 200 and resp.headers["content-disposition"].endswith(".folded")
+    assert float(resp.headers["x-profile-duration-s"]) < 1
+
+    assert client.post("/api/admin/profile/memory", json={"seconds": 0.1, "top": 3}).json()["duration_s"] < 1
+    assert client.get("/api/admin/profile").json() == {"enabled": True, "running": None}
+    assert client.delete("/api/admin/profile").json() == {"stopped": False}
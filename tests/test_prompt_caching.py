@@ -0,0 +1,72 @@
+"""Tests for provider prompt-cache breakpoints and cached-token accounting."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from backend.core import groundedness
+from backend.core.bedrock_messages import _converse_content
+from backend.core.google_db import _compute_cost
+from backend.core.rag_pipeline import _HAIKU_SYSTEM, _chat_prompt
+from backend.core.token_counter import reported_usage
+
+
+def test_bedrock_translates_cache_control_to_cache_point():
+    blocks = _converse_content([
+        {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "dynamic"},
+    ])
+    assert blocks == [{"text": "static"}, {"cachePoint": {"type": "default"}}, {"text": "dynamic"}]
+    assert _converse_content("plain") == [{"text": "plain"}]
+
+
+def test_chain_prompt_caches_instructions_ahead_of_context():
+    for provider, marker in (("anthropic", "cache_control"), ("bedrock", "cachePoint")):
+        prompt = _chat_prompt(_HAIKU_SYSTEM, SimpleNamespace(llm_provider=provider))
+        system = prompt.invoke({"context": "DOCS", "history": [], "query": "q"}).messages[0].content
+
+        breakpoint_at = next(i for i, b in enumerate(system) if marker in b)
+        assert "DOCS" not in "".join(b.get("text", "") for b in system[: breakpoint_at + 1])
+        assert system[-1]["text"].endswith("DOCS")
+
+
+def test_groundedness_calls_share_cached_context_prefix():
+    calls = []
+
+    class _Client:
+        class messages:
+            @staticmethod
+            async def create(**kwargs):
+                calls.append(kwargs)
+                return SimpleNamespace(content=[SimpleNamespace(
+                    text='{"has_unsupported_specifics": false, "unsupported_claims": []}'
+                )])
+
+    asyncio.run(groundedness.run_groundedness_check(_Client(), "CTX", "answer one"))
+    asyncio.run(groundedness.run_groundedness_check(_Client(), "CTX", "answer two"))
+
+    first, second = (c["system"] for c in calls)
+    assert first == second
+    assert first[0]["cache_control"] == {"type": "ephemeral"}
+    assert "CTX" in first[0]["text"]
+    assert "CTX" not in calls[0]["messages"][0]["content"]
+
+
+def test_cost_bills_cached_reads_and_writes_at_cache_rates():
+    full = _compute_cost("haiku", 10_000, 0)
+    assert _compute_cost("haiku", 10_000, 0, cache_read_tokens=10_000) == round(full * 0.1, 8)
+    assert _compute_cost("haiku", 10_000, 0, cache_write_tokens=10_000) == round(full * 1.25, 8)
+
+
+def test_reported_usage_includes_cache_details():
+    handler = SimpleNamespace(usage_metadata={
+        "claude-haiku": {
+            "input_tokens": 1200, "output_tokens": 80,
+            "input_token_details": {"cache_read": 900, "cache_creation": 0},
+        },
+    })
+    assert reported_usage(handler) == {
+        "input_tokens": 1200, "output_tokens": 80, "cache_read_tokens": 900, "cache_write_tokens": 0,
+    }
+    assert reported_usage(SimpleNamespace(usage_metadata={})) is None
@@ -0,0 +1,115 @@
+"""Bulk, fingerprint-gated seeding of the interview question bank."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.core import google_db
+from config import interview_profiles
+
+
+class _Cursor:
+    def __init__(self, state_row, inserted=()):
+        self.state_row = state_row
+        self.inserted = list(inserted)
+        self.executed: list[tuple[str, tuple]] = []
+
+    def execute(self, query, params=None):
+        self.executed.append((" ".join(query.split()), params))
+
+    def fetchone(self):
+        return self.state_row
+
+    def fetchall(self):
+        return self.inserted
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *a):
+        return False
+
+
+class _Conn:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def rows():
+    return interview_profiles._seed_rows()
+
+
+def _connect_with(monkeypatch, cursor):
+    opened = []
+
+    def connect():
+        opened.append(_Conn(cursor))
+        return opened[-1]
+
+    monkeypatch.setattr(google_db, "_connect", connect)
+    return opened
+
+
+def test_fingerprint_is_stable_and_tracks_content(rows):
+    fingerprint = interview_profiles.seed_fingerprint(rows)
+    assert fingerprint == interview_profiles.seed_fingerprint(interview_profiles._seed_rows())
+    edited = [dict(rows[0], prompt_text=rows[0]["prompt_text"] + "?"), *rows[1:]]
+    assert interview_profiles.seed_fingerprint(edited) != fingerprint
+    assert {r["profile_id"] for r in rows} >= {"cja", "scenario_troubleshooting"}
+
+
+def test_unchanged_bank_is_a_single_read(monkeypatch, rows):
+    fingerprint = interview_profiles.seed_fingerprint(rows)
+    cursor = _Cursor({"fingerprint": fingerprint, "present": len(rows)})
+    opened = _connect_with(monkeypatch, cursor)
+
+    assert google_db.seed_interview_questions(rows, fingerprint) is None
+    assert len(cursor.executed) == 1 and cursor.executed[0][0].startswith("SELECT")
+    assert len(opened) == 1 and opened[0].commits == 0
+
+
+@pytest.mark.parametrize("state_row", [
+    {"fingerprint": None, "present": 0},           # cold database
+    {"fingerprint": "stale", "present": 115},       # bank edited
+    {"fingerprint": "match", "present": 3},         # rows deleted behind the fingerprint
+])
+def test_changed_bank_is_one_multi_row_insert_in_one_transaction(monkeypatch, rows, state_row):
+    fingerprint = "match" if state_row["fingerprint"] == "match" else interview_profiles.seed_fingerprint(rows)
+    cursor = _Cursor(state_row, inserted=[{"question_id": r["question_id"]} for r in rows[:5]])
+    opened = _connect_with(monkeypatch, cursor)
+
+    assert google_db.seed_interview_questions(rows, fingerprint) == 5
+
+    statements = [q for q, _ in cursor.executed]
+    assert len(statements) == 3
+    assert statements[1].startswith("INSERT INTO interview_questions") and "unnest(" in statements[1]
+    assert "ON CONFLICT (question_id, version) DO NOTHING" in statements[1]
+    columns = cursor.executed[1][1]
+    assert all(len(col) == len(rows) for col in columns)
+    assert columns[0] == [r["question_id"] for r in rows]
+    assert statements[2].startswith("INSERT INTO system_config")
+    assert cursor.executed[2][1] == ("interview_seed_fingerprint", fingerprint)
+    assert len(opened) == 1 and opened[0].commits == 1
+
+
+def test_seed_all_questions_makes_one_bulk_call(monkeypatch):
+    calls = []
+    monkeypatch.setattr(google_db, "seed_interview_questions", lambda rows, fp: calls.append((rows, fp)) or 0)
+    monkeypatch.setattr(google_db, "seed_interview_question", lambda **kw: pytest.fail("per-row seed"))
+
+    interview_profiles.seed_all_questions()
+
+    (rows, fingerprint), = calls
+    assert len(rows) == sum(len(bank) for bank in interview_profiles._SEED_BANK.values())
+    assert fingerprint == interview_profiles.seed_fingerprint(rows)
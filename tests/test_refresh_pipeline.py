@@ -1,5 +1,8 @@
-"""Tests for admin refresh status enrichment."""
+"""Tests for admin refresh status enrichment and the in-process stage runner."""
 
+import pytest
+
+from backend.core import refresh_pipeline as rp
 from backend.core.refresh_pipeline import enrich_status_for_admin
 
 
@@ -50,3 +53,73 @@ def test_enrich_does_not_override_local_pipeline_values():
     assert enriched["chunks_indexed"] == 123
     assert enriched["files_updated"] == 5
     assert enriched["log"] == ["done"]
+
+
+def _stages(calls, *, fail=None, optional_fail=None):
+    def make(name):
+        def run(ctx):
+            calls.append(name)
+            if name == fail or name == optional_fail:
+                raise ValueError(f"{name} broke")
+            if name == "sync":
+                ctx.changed_keys = {"adobe-docs/a.md"}
+                ctx.files_updated = 1
+            return f"{name} ok"
+        return run
+
+    return (
+        # Declared out of order on purpose — the runner sorts by deps.
+        rp.Stage("media", "Media", make("media"), deps=("ingest",), required=optional_fail != "media"),
+        rp.Stage("ingest", "Ingest", make("ingest"), deps=("sync",)),
+        rp.Stage("sync", "Sync", make("sync"), needs_changes=False),
+        rp.Stage("upload", "Upload", make("upload"), deps=("media",), required=False),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _status_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(rp, "STATUS_FILE", tmp_path / "refresh_status.json")
+
+
+def test_run_stages_orders_by_dependencies_and_records_timings():
+    calls, status, log = [], {}, []
+    ctx = rp.RefreshContext()
+    rp.run_stages(_stages(calls), ctx, status, log)
+    assert calls == ["sync", "ingest", "media", "upload"]
+    assert ctx.changed_keys == {"adobe-docs/a.md"}
+    assert all(status["stages"][n]["state"] == "success" for n in calls)
+    assert "duration_s" in status["stages"]["ingest"]
+    assert rp.get_status()["stages"]["upload"]["detail"] == "upload ok"
+
+
+def test_no_changes_skips_downstream_stages():
+    calls, status = [], {}
+
+    def quiet_sync(ctx):
+        calls.append("sync")
+
+    stages = (rp.Stage("sync", "Sync", quiet_sync, needs_changes=False),) + _stages(calls)[:2]
+    rp.run_stages(stages, rp.RefreshContext(), status, [])
+    assert calls == ["sync"]
+    assert status["stages"]["media"]["state"] == "skipped"
+
+
+def test_optional_failure_continues_required_failure_checkpoints():
+    calls, status = [], {}
+    rp.run_stages(_stages(calls, optional_fail="media"), rp.RefreshContext(), status, [])
+    assert status["stages"]["media"]["state"] == "failed"
+    assert calls[-1] == "upload"
+
+    calls, status = [], {}
+    with pytest.raises(RuntimeError):
+        rp.run_stages(_stages(calls, fail="ingest"), rp.RefreshContext(), status, [])
+    assert calls == ["sync", "ingest"]
+    assert status["checkpoint"]["completed"] == ["sync"]
+
+
+def test_resume_skips_completed_stages():
+    calls, status = [], {}
+    ctx = rp.RefreshContext(files_updated=3)
+    rp.run_stages(_stages(calls), ctx, status, [], completed={"sync", "ingest"})
+    assert calls == ["media", "upload"]
+    assert status["stages"]["sync"]["resumed"] is True
@@ -0,0 +1,46 @@
+"""Offline retrieval benchmark: local embedder, synthetic corpus, regression check."""
+
+from __future__ import annotations
+
+import copy
+
+from eval import retrieval_benchmark as bench
+
+
+def test_embedder_is_deterministic_and_normalised():
+    a = bench.embed("Configure a CJA data view")
+    assert a == bench.embed("Configure a CJA data view")
+    assert len(a) == bench.DIM
+    assert abs(sum(x * x for x in a) - 1.0) < 1e-5
+    assert a != bench.embed("Adobe Target activities")
+
+
+def test_small_run_covers_every_phase(tmp_path):
+    bench.build_collection(tmp_path, 300)
+    report = bench.run(bench.BenchRetriever(tmp_path), ["What is a CJA data view?", "bake sourdough"], repeat=1)
+
+    assert report["chunks"] == 300
+    assert set(report["phases"]) == {"refinement", "bm25", "rrf", "topical_gate"}
+    refinement = report["phases"]["refinement"]
+    assert refinement["calls"] == 2 and refinement["qps"] > 0
+    assert {"embed", "vector_query", "bm25", "rrf"} <= set(refinement["stages"])
+    assert bench.compare(report, report) == []
+
+
+def test_compare_flags_slower_phases_but_ignores_sub_ms_jitter():
+    baseline = {
+        "chunks": 20_000, "peak_rss_mb": 500.0,
+        "phases": {
+            "refinement": {"qps": 3.0, "p95_ms": 700.0},
+            "rrf": {"qps": 12_000.0, "p95_ms": 0.1},
+        },
+    }
+    report = copy.deepcopy(baseline)
+    report["phases"]["rrf"] = {"qps": 6_000.0, "p95_ms": 0.3}
+    assert bench.compare(report, baseline) == []
+
+    report["phases"]["refinement"] = {"qps": 2.0, "p95_ms": 950.0}
+    report["peak_rss_mb"] = 700.0
+    assert len(bench.compare(report, baseline)) == 3
+
+    assert "not compared" in bench.compare({**report, "chunks": 100}, baseline)[0]
@@ -0,0 +1,98 @@
+"""Tests for the offline interview retrieval pack."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from backend.core import interview_retrieval_cache, retrieval_pack
+import backend.core.interviewer_pipeline as ip
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    retrieval_pack.unload()
+    interview_retrieval_cache.clear()
+    yield
+    retrieval_pack.unload()
+    interview_retrieval_cache.clear()
+
+
+def _fake_retriever(count: int = 1234):
+    return SimpleNamespace(collection=SimpleNamespace(count=lambda: count))
+
+
+def _fake_docs(retriever, processor, query, product):
+    return [
+        {
+            "content": "x" * 5000,
+            "score": 0.8 - i / 100,
+            "metadata": {"title": f"{query} {i}", "url": f"https://exl/{i}", "product": product,
+                         "s3_key": f"docs/{i}.md", "chunk_index": i},
+        }
+        for i in range(10)
+    ]
+
+
+def _build(monkeypatch, tmp_path, count=1234, generation="coll-1:500"):
+    monkeypatch.setattr(ip, "retrieve_scoped_docs", _fake_docs)
+    pack = retrieval_pack.build_pack(_fake_retriever(count), generation=generation)
+    retrieval_pack.write_pack(pack, tmp_path)
+    return pack
+
+
+def test_build_covers_seed_bank_with_compact_docs(monkeypatch, tmp_path):
+    pack = _build(monkeypatch, tmp_path)
+
+    assert pack["chunk_count"] == 1234
+    seeds = list(retrieval_pack.seed_questions())
+    assert {k.split("@")[0] for k in pack["entries"]} == {q.id for _, q in seeds}
+
+    profile_id, q = next((p, q) for p, q in seeds if p == "cja")
+    docs = pack["entries"][retrieval_pack.pack_key(q.id, q.version, "Customer Journey Analytics")]
+    assert len(docs) == 6
+    assert len(docs[0]["content"]) == 1500
+    # topical_match_score falls back to s3_key/repo_path; unused fields are dropped.
+    assert docs[0]["metadata"]["s3_key"] == "docs/0.md"
+    assert "chunk_index" not in docs[0]["metadata"]
+    assert docs[0]["metadata"]["url"] == "https://exl/0"
+
+
+def test_load_rejects_pack_built_for_another_collection(monkeypatch, tmp_path):
+    _build(monkeypatch, tmp_path, count=100, generation="coll-1:500")
+
+    # Same chunk count, later index generation (e.g. an in-place doc edit).
+    assert retrieval_pack.load(tmp_path, generation="coll-1:512") is False
+    assert retrieval_pack.lookup("cja-j1", 1, "Customer Journey Analytics") is None
+    # No Chroma database to identify the served index: never trust the pack.
+    assert retrieval_pack.load(tmp_path) is False
+    assert retrieval_pack.load(tmp_path, generation="coll-1:500") is True
+
+
+@pytest.mark.asyncio
+async def test_grading_context_served_from_pack_without_live_retrieval(monkeypatch, tmp_path):
+    _build(monkeypatch, tmp_path)
+    retrieval_pack.load(tmp_path, generation="coll-1:500")
+    _, q = next((p, q) for p, q in retrieval_pack.seed_questions() if p == "cja")
+
+    async def live(*_a, **_k):
+        raise AssertionError("live retrieval should not run")
+
+    monkeypatch.setattr(ip.InterviewerPipeline, "_retrieve_for_query", live)
+    pipeline = ip.InterviewerPipeline(retriever=_fake_retriever())
+    session = SimpleNamespace(profile_id="cja")
+
+    docs = await pipeline._retrieve_for_question(q, session)
+    assert docs and docs[0]["metadata"]["product"] == "Customer Journey Analytics"
+
+
+def test_is_current_follows_the_index_generation(monkeypatch, tmp_path):
+    monkeypatch.setattr(retrieval_pack, "index_generation", lambda chroma_dir: "coll-1:500")
+    assert not retrieval_pack.is_current(tmp_path)  # no pack yet
+
+    _build(monkeypatch, tmp_path, generation="coll-1:500")
+    assert retrieval_pack.is_current(tmp_path)
+
+    monkeypatch.setattr(retrieval_pack, "index_generation", lambda chroma_dir: "coll-1:512")
+    assert not retrieval_pack.is_current(tmp_path)
@@ -0,0 +1,198 @@
+"""Tests for the bounded session store and its backends."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from backend.core.session_store import (
+    InMemorySessionBackend,
+    PostgresSessionBackend,
+    SessionStore,
+    SqliteSessionBackend,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _memory(clock, max_turns=4, idle_ttl_s=60, max_bytes=10_000_000):
+    return SessionStore(InMemorySessionBackend(max_turns, idle_ttl_s, max_bytes, clock=clock))
+
+
+def _sqlite(tmp_path, clock, max_turns=4, idle_ttl_s=60, max_bytes=10_000_000):
+    return SessionStore(SqliteSessionBackend(
+        tmp_path / "sessions.db", max_turns=max_turns, idle_ttl_s=idle_ttl_s,
+        max_bytes=max_bytes, clock=clock,
+    ))
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def _make(clock, **kw):
+        return _memory(clock, **kw) if request.param == "memory" else _sqlite(tmp_path, clock, **kw)
+    return _make
+
+
+def test_turn_cap_keeps_most_recent_messages(make_store):
+    store = make_store(_Clock())
+    sid = store.new_session()
+    for i in range(6):
+        store.append_turn(sid, "user" if i % 2 == 0 else "assistant", f"m{i}")
+
+    assert [t["content"] for t in store.get_history(sid)] == ["m2", "m3", "m4", "m5"]
+    stats = store.stats()
+    assert stats["turns"] == 4
+    assert stats["trimmed_turns"] == 2
+
+
+def test_idle_sessions_expire(make_store):
+    clock = _Clock()
+    store = make_store(clock)
+    sid = store.new_session()
+    store.append_turn(sid, "user", "hello")
+
+    clock.now += 61
+    assert store.get_history(sid) == []
+    assert sid not in store.list_sessions()
+
+
+def test_memory_budget_evicts_least_recently_used(make_store, monkeypatch):
+    import backend.core.session_store as mod
+
+    monkeypatch.setattr(mod, "_SWEEP_INTERVAL_S", 0.0)
+    clock = _Clock()
+    store = make_store(clock, max_bytes=1500)
+    old, recent = store.new_session(), store.new_session()
+    store.append_turn(old, "user", "a" * 300)
+    clock.now += 1
+    store.append_turn(recent, "user", "b" * 300)
+    clock.now += 1
+    store.get_history(old)  # old becomes most recently used
+    clock.now += 1
+    newest = store.new_session()
+    store.append_turn(newest, "user", "c" * 300)
+
+    assert store.get_history(recent) == []
+    assert store.get_history(old) and store.get_history(newest)
+    assert store.stats()["evicted_memory"] == 1
+
+
+def test_sqlite_backend_is_shared_between_store_instances(tmp_path):
+    clock = _Clock()
+    worker_a = _sqlite(tmp_path, clock)
+    worker_b = _sqlite(tmp_path, clock)
+
+    sid = worker_a.new_session()
+    worker_a.append_turn(sid, "user", "q")
+    worker_b.append_turn(sid, "assistant", "a")
+
+    assert worker_a.get_history(sid) == [
+        {"role": "user", "content": "q"},
+        {"role": "assistant", "content": "a"},
+    ]
+    worker_b.clear(sid)
+    assert worker_a.get_history(sid) == []
+
+
+def test_from_settings_falls_back_to_memory_for_unknown_backend():
+    from types import SimpleNamespace
+
+    settings = SimpleNamespace(
+        session_store_backend="redis", session_max_turns=10,
+        session_idle_ttl_s=60, session_memory_budget_mb=1,
+    )
+    store = SessionStore.from_settings(settings)
+    assert store.stats()["backend"] == "memory"
+    assert store.backend.max_turns == 10
+
+
+class _PgCursor:
+    """psycopg2-shaped cursor over sqlite: %s placeholders, context manager."""
+
+    def __init__(self, cur):
+        self._cur = cur
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, sql, params=()):
+        sql = sql.replace("%s", "?").replace("BIGSERIAL PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT")
+        self._cur.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+class _PgConn:
+    closed = 0
+    autocommit = False
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+
+    def cursor(self):
+        return _PgCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+
+class _Pool:
+    instances: list = []
+
+    def __init__(self, minconn, maxconn, **kwargs):
+        self.maxconn = maxconn
+        self.opened = 0
+        self.idle: list = []
+        self.path = kwargs["dsn"]
+        _Pool.instances.append(self)
+
+    def getconn(self):
+        if self.idle:
+            return self.idle.pop()
+        self.opened += 1
+        return _PgConn(self.path)
+
+    def putconn(self, conn, close=False):
+        if not close:
+            self.idle.append(conn)
+
+
+def test_postgres_backend_reuses_pooled_connections(tmp_path, monkeypatch):
+    import psycopg2.pool
+
+    from backend.core import google_db
+
+    _Pool.instances = []
+    monkeypatch.setattr(psycopg2.pool, "ThreadedConnectionPool", _Pool)
+    monkeypatch.setattr(google_db, "_connect_kwargs", lambda: {"dsn": tmp_path / "pg.db"})
+    store = SessionStore(PostgresSessionBackend(max_turns=4, idle_ttl_s=60, max_bytes=10_000_000))
+
+    sid = store.new_session()
+    for i in range(3):
+        store.append_turn(sid, "user", f"q{i}")
+        store.get_history(sid)
+
+    assert [t["content"] for t in store.get_history(sid)] == ["q0", "q1", "q2"]
+    assert len(_Pool.instances) == 1
+    assert _Pool.instances[0].opened == 1
+
+
+def test_sql_backend_requires_a_connection_factory():
+    from backend.core.session_store import _SQLSessionBackend
+
+    with pytest.raises(TypeError):
+        _SQLSessionBackend(max_turns=4, idle_ttl_s=60, max_bytes=1)
@@ -0,0 +1,169 @@
+"""Tests for speculative Haiku/Sonnet routing."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.core import google_db, speculative_routing
+from backend.core.smart_router import classify_query, is_borderline
+
+
+class _Chain:
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+        self.started = False
+        self.finished = False
+
+    async def astream(self, inputs, config=None):
+        self.started = True
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield chunk
+        self.finished = True
+
+
+def _run(haiku, sonnet, prompt_tokens=None):
+    async def go():
+        outcome: dict = {}
+        text = "".join([c async for c in speculative_routing.speculate(
+            haiku, sonnet, {}, {}, outcome, prompt_tokens=prompt_tokens,
+        )])
+        return text, outcome
+    return asyncio.run(go())
+
+
+class _FailingChain:
+    async def astream(self, inputs, config=None):
+        raise RuntimeError("throttled")
+        yield  # pragma: no cover
+
+
+@pytest.fixture(autouse=True)
+def _reset_counters():
+    speculative_routing._counters.clear()
+    yield
+    speculative_routing._counters.clear()
+
+
+def test_borderline_band():
+    assert not is_borderline("create a calculated metric for revenue per visit")
+    assert not is_borderline("what is an eVar")
+    assert is_borderline("how to use the attribution panel")
+    assert classify_query("how to use the attribution panel") == "sonnet"
+
+
+def test_confident_haiku_opening_commits_to_haiku():
+    haiku = _Chain(["An eVar is a conversion variable. ", "It persists values. ", "More detail."])
+    sonnet = _Chain(["Sonnet ", "answer."], delay=0.05)
+
+    text, outcome = _run(haiku, sonnet)
+
+    assert outcome["model"] == "haiku"
+    assert text == "An eVar is a conversion variable. It persists values. More detail."
+    assert sonnet.started and not sonnet.finished
+    assert speculative_routing.stats()["won_haiku"] == 1
+
+
+def test_hedging_opening_cuts_over_to_sonnet():
+    haiku = _Chain(["The documentation doesn't cover this directly. ", "It may depend. "])
+    sonnet = _Chain(["Use the ", "Attribution panel."])
+
+    text, outcome = _run(haiku, sonnet)
+
+    assert outcome["model"] == "sonnet"
+    assert text == "Use the Attribution panel."
+    assert speculative_routing.stats()["won_sonnet"] == 1
+
+
+def test_cancelled_branch_spend_is_recorded():
+    haiku = _Chain(["The documentation doesn't cover this directly. ", "It may depend. "])
+    sonnet = _Chain(["Use the ", "Attribution panel."])
+
+    _run(haiku, sonnet, prompt_tokens={"haiku": 1000, "sonnet": 1200})
+
+    stats = speculative_routing.stats()
+    assert stats["discarded_input_tokens"] == 1000  # Haiku's prompt, not Sonnet's
+    assert stats["discarded_output_tokens"] > 0     # the opening it generated
+    assert stats["discarded_cost_usd"] == pytest.approx(
+        google_db._compute_cost("haiku", 1000, stats["discarded_output_tokens"])
+    )
+
+
+class _ReportingChain(_Chain):
+    """Reports provider usage to its config's callbacks when it finishes."""
+
+    def __init__(self, chunks, usage, delay=0.0):
+        super().__init__(chunks, delay)
+        self.usage = usage
+
+    async def astream(self, inputs, config=None):
+        async for chunk in super().astream(inputs, config):
+            yield chunk
+        for callback in (config or {}).get("callbacks", []):
+            callback.usage_metadata["model"] = self.usage
+
+
+def test_each_branch_reports_usage_to_its_own_callbacks():
+    # Haiku finishes inside its opening and is rejected.
+    haiku = _ReportingChain(["It depends."], {"input_tokens": 900, "output_tokens": 7})
+    sonnet = _ReportingChain(["Use the ", "Attribution panel."], {"input_tokens": 1100, "output_tokens": 5})
+    handlers = {"haiku": SimpleNamespace(usage_metadata={}), "sonnet": SimpleNamespace(usage_metadata={})}
+
+    async def go():
+        outcome: dict = {}
+        configs = {m: {"callbacks": [h]} for m, h in handlers.items()}
+        async for _ in speculative_routing.speculate(haiku, sonnet, {}, configs, outcome):
+            pass
+        return outcome
+
+    assert asyncio.run(go())["model"] == "sonnet"
+    assert handlers["sonnet"].usage_metadata == {"model": {"input_tokens": 1100, "output_tokens": 5}}
+    stats = speculative_routing.stats()
+    # The loser's provider-reported usage is counted once, as discarded spend.
+    assert (stats["discarded_input_tokens"], stats["discarded_output_tokens"]) == (900, 7)
+
+
+def test_haiku_failure_counts_as_failed():
+    sonnet = _Chain(["Sonnet ", "answer."], delay=0.05)
+
+    with pytest.raises(RuntimeError, match="throttled"):
+        _run(_FailingChain(), sonnet)
+
+    assert speculative_routing.stats()["failed"] == 1
+
+
+def test_budget_and_concurrency_guardrails(monkeypatch):
+    settings = SimpleNamespace(
+        speculative_routing_enabled=True, speculative_daily_budget=1, speculative_max_concurrent=1,
+    )
+    used = {"n": 0}
+
+    def consume(key, limit):
+        used["n"] += 1
+        return used["n"] <= limit
+
+    monkeypatch.setattr(google_db, "try_consume_daily_budget", consume)
+
+    assert speculative_routing.try_acquire(settings)
+    assert not speculative_routing.try_acquire(settings)  # one already in flight
+    speculative_routing.release()
+    assert not speculative_routing.try_acquire(settings)  # daily budget spent
+    assert speculative_routing.stats()["active"] == 0
+    assert speculative_routing.stats()["skipped_budget"] == 1
+    assert speculative_routing.stats()["skipped_concurrency"] == 1
+
+
+def test_budget_fails_closed_without_database(monkeypatch):
+    def broken(key, limit):
+        raise RuntimeError("DATABASE_URL must be set")
+
+    monkeypatch.setattr(google_db, "try_consume_daily_budget", broken)
+    settings = SimpleNamespace(
+        speculative_routing_enabled=True, speculative_daily_budget=10, speculative_max_concurrent=4,
+    )
+    assert not speculative_routing.try_acquire(settings)
+    assert speculative_routing.stats()["active"] == 0
@@ -0,0 +1,90 @@
+"""Per-stage chat latency: turn breakdowns, quantiles and the /metrics route."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.routes import health
+from backend.core import stage_timing
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    stage_timing.reset()
+    yield
+    stage_timing.reset()
+
+
+def test_turn_follows_tasks_and_threads():
+    async def turn():
+        t = stage_timing.start_turn()
+        stage_timing.record("embed", 0.010)
+
+        async def validate():
+            stage_timing.record("url_validation", 0.020)
+
+        await asyncio.create_task(validate())
+        await asyncio.to_thread(stage_timing.record, "embed", 0.030)
+        return t
+
+    t = contextvars.Context().run(asyncio.run, turn())
+    assert t.breakdown() == {"embed": 40.0, "embed_n": 2, "url_validation": 20.0}
+    assert stage_timing.current_turn() is None
+
+
+def test_quantiles_cover_the_window_and_totals_are_lifetime(monkeypatch):
+    monkeypatch.setattr(stage_timing, "_WINDOW", 100)
+    for ms in range(1, 201):
+        stage_timing.record("retrieval", ms / 1000)
+
+    row = stage_timing.snapshot()["retrieval"]
+    assert row["count"] == 200 and row["window"] == 100
+    assert (row["p50_ms"], row["p95_ms"], row["p99_ms"]) == (150.0, 195.0, 199.0)
+
+
+def test_stage_records_even_when_the_block_raises():
+    with pytest.raises(RuntimeError):
+        with stage_timing.stage("groundedness"):
+            raise RuntimeError("boom")
+    assert stage_timing.snapshot()["groundedness"]["count"] == 1
+
+
+def _metrics_client(monkeypatch, token="s3cret"):
+    from config import settings as settings_module
+
+    real = settings_module.get_settings
+
+    def fake_settings():
+        s = real()
+        s.metrics_token = token
+        return s
+
+    monkeypatch.setattr(health, "get_settings", fake_settings)
+    app = FastAPI()
+    app.include_router(health.metrics_router)
+    return TestClient(app)
+
+
+def test_metrics_is_prometheus_text(monkeypatch):
+    stage_timing.record("llm_first_token", 0.25)
+    body = _metrics_client(monkeypatch).get("/metrics", headers={"Authorization": "Bearer s3cret"}).text
+
+    assert "# TYPE rovr_chat_stage_seconds summary" in body
+    assert 'rovr_chat_stage_seconds{stage="llm_first_token",quantile="0.95"} 0.250000' in body
+    assert 'rovr_chat_stage_seconds_count{stage="llm_first_token"} 1' in body
+
+
+def test_metrics_token_is_enforced(monkeypatch):
+    client = _metrics_client(monkeypatch, token="s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+
+def test_metrics_is_off_without_a_token(monkeypatch):
+    assert _metrics_client(monkeypatch, token="").get("/metrics").status_code == 404
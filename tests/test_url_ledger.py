@@ -0,0 +1,131 @@
+"""
+Unit tests for the shared URL validation ledger.
+
+Run: pytest tests/test_url_ledger.py -v
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+_ROOT = Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import src.utils.url_ledger as url_ledger
+from src.utils.url_ledger import (
+    STATUS_DEAD,
+    STATUS_LIVE,
+    STATUS_UNVALIDATED,
+    LedgerEntry,
+    UrlLedger,
+    check_urls,
+)
+
+LIVE = "https://experienceleague.adobe.com/en/docs/analytics/live"
+GONE = "https://experienceleague.adobe.com/en/docs/analytics/gone"
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _run(urls, ledger, handler, **kw):
+    async def go():
+        async with _client(handler) as client:
+            return await check_urls(urls, ledger=ledger, client=client, **kw)
+    return asyncio.run(go())
+
+
+def test_fresh_entries_skip_network(tmp_path):
+    ledger = UrlLedger(tmp_path / "ledger.db")
+    seen = []
+
+    def handler(request):
+        seen.append(str(request.url))
+        if request.url.path.endswith("gone"):
+            return httpx.Response(404)
+        return httpx.Response(200, headers={"etag": '"v1"'})
+
+    first = _run([LIVE, GONE, LIVE], ledger, handler)
+    assert first[LIVE].status == STATUS_LIVE and first[LIVE].etag == '"v1"'
+    assert first[GONE].status == STATUS_DEAD
+    assert sorted(seen) == sorted([LIVE, GONE])
+
+    seen.clear()
+    second = _run([LIVE, GONE], ledger, handler)
+    assert seen == []
+    assert second[GONE].status == STATUS_DEAD
+
+
+def test_stale_live_entry_revalidates_conditionally(tmp_path):
+    ledger = UrlLedger(tmp_path / "ledger.db")
+    old = time.time() - url_ledger.FRESH_FOR[STATUS_LIVE] - 1
+    ledger.record_many([LedgerEntry(LIVE, STATUS_LIVE, old, http_status=200, etag='"v1"')])
+    headers = {}
+
+    def handler(request):
+        headers.update(request.headers)
+        return httpx.Response(304)
+
+    result = _run([LIVE], ledger, handler)
+    assert headers.get("if-none-match") == '"v1"'
+    assert result[LIVE].status == STATUS_LIVE
+    assert ledger.get_many([LIVE])[LIVE].checked_at > old
+
+
+def test_transient_errors_are_unvalidated_and_shrink_concurrency(tmp_path, monkeypatch):
+    monkeypatch.setattr(url_ledger, "_RETRY_BASE_DELAY_S", 0)
+    ledger = UrlLedger(tmp_path / "ledger.db")
+    limits = []
+    real_release = url_ledger._AdaptiveLimiter.release
+
+    async def spy(self, ok):
+        await real_release(self, ok)
+        limits.append(self.limit)
+
+    monkeypatch.setattr(url_ledger._AdaptiveLimiter, "release", spy)
+
+    result = _run([LIVE], ledger, lambda r: httpx.Response(503), concurrency=8, attempts=2)
+    assert result[LIVE].status == STATUS_UNVALIDATED
+    assert limits == [4, 2]
+
+
+def test_broken_ledger_still_validates(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    ledger = UrlLedger(blocker / "ledger.db")  # parent is a file → mkdir fails
+
+    def handler(request):
+        return httpx.Response(200)
+
+    result = _run([LIVE], ledger, handler)
+    assert result[LIVE].status == STATUS_LIVE
+
+
+def test_slow_ledger_does_not_block_the_event_loop(tmp_path):
+    class SlowLedger(UrlLedger):
+        def get_many(self, urls):
+            time.sleep(0.3)  # e.g. waiting on another process's write lock
+            return super().get_many(urls)
+
+    ledger = SlowLedger(tmp_path / "ledger.db")
+    ticks = []
+
+    async def go():
+        async def heartbeat():
+            for _ in range(15):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+
+        async with _client(lambda request: httpx.Response(200)) as client:
+            beat = asyncio.create_task(heartbeat())
+            await asyncio.sleep(0)
+            await check_urls([LIVE], ledger=ledger, client=client)
+            await beat
+
+    asyncio.run(go())
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.15